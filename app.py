@@ -15,6 +15,7 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.responses import HTMLResponse
 from contextlib import asynccontextmanager
 import uvicorn
+import asyncio
 import os
 from dotenv import load_dotenv
 from cryptography.fernet import Fernet
@@ -147,11 +148,36 @@ async def lifespan(app: FastAPI):
     app_logger.info('%s', '='*60)
     app_logger.info('')
 
+    # Resume workflows interrupted by the previous shutdown or crash, then keep
+    # picking up sessions whose worker died (each session is leased to one worker)
+    recovery_task = None
+    if os.getenv("WORKFLOW_RECOVER_ON_STARTUP", "true").lower() == "true":
+        from core.services.workflow_orchestrator import workflow_orchestrator
+        recovery_task = asyncio.create_task(workflow_orchestrator.run_recovery())
+
+    # First model stats snapshot walks the models directory; build it off the event loop
+    from core.routes.model_management_routes import model_stats
+    await asyncio.to_thread(model_stats.start)
+
     yield  # Server runs here
 
     # Shutdown
     app_logger.info('Shutting down LALO AI System...')
 
+    # Stop background workflow stages; they resume from the database
+    if recovery_task is not None:
+        recovery_task.cancel()
+        await asyncio.gather(recovery_task, return_exceptions=True)
+    from core.services.workflow_engine import workflow_engine
+    await workflow_engine.shutdown()
+
+    # Stop model downloads; their .part files resume on the next request
+    from core.services.model_downloader import model_download_manager
+    await model_download_manager.shutdown()
+
+    from core.routes.model_management_routes import model_stats
+    model_stats.close()
+
 # Create FastAPI app with lifespan
 app = FastAPI(
     title="LALO AI System",
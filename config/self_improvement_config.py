@@ -17,6 +17,7 @@ SANDBOX_SETTINGS = {
     "timeout_seconds": 3600,
     "max_memory_gb": 8,
     "enable_network": False,  # Sandbox network access
+    "provisioning_mode": "auto",  # overlay, reflink, hardlink or copy; auto tries overlay, reflink, copy
 }
 
 # Testing Framework
@@ -1,7 +1,11 @@
 # Copyright (c) 2025 LALO AI LLC. All rights reserved.
 
 from fastapi import FastAPI
-import time
+import asyncio
+import os
+
+# Simulated backend latency; awaited so concurrent requests overlap
+SIMULATED_LATENCY = float(os.getenv("SIMULATED_LATENCY_SECONDS", "0.5"))
 
 app = FastAPI(title="Mock S4/HANA Connector")
 
@@ -10,7 +14,7 @@ async def production_report(year: int, quarter: int):
     """
     Simulates fetching a production report for a given year/quarter.
     """
-    time.sleep(0.5)
+    await asyncio.sleep(SIMULATED_LATENCY)
     return {
         "system": "S4/HANA",
         "year": year,
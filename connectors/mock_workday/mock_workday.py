@@ -1,7 +1,11 @@
 # Copyright (c) 2025 LALO AI LLC. All rights reserved.
 
 from fastapi import FastAPI
-import time
+import asyncio
+import os
+
+# Simulated backend latency; awaited so concurrent requests overlap
+SIMULATED_LATENCY = float(os.getenv("SIMULATED_LATENCY_SECONDS", "0.5"))
 
 app = FastAPI(title="Mock Workday Connector")
 
@@ -10,7 +14,7 @@ async def employee_list(department: str = "All"):
     """
     Simulates fetching employee data from Workday.
     """
-    time.sleep(0.5)
+    await asyncio.sleep(SIMULATED_LATENCY)
     employees = [
         {"name": "Alice Johnson", "department": "Production", "role": "Supervisor"},
         {"name": "Bob Smith", "department": "Marketing", "role": "Analyst"}
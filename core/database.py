@@ -9,7 +9,7 @@ via any medium, is strictly prohibited without the express written permission
 of LALO AI SYSTEMS, LLC.
 """
 
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, ForeignKey, Enum, JSON, Boolean
+from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, ForeignKey, Enum, JSON, Boolean, UniqueConstraint
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from datetime import datetime, timezone
@@ -198,6 +198,55 @@ class WorkflowSession(Base):
     committed_to_permanent_memory = Column(Integer, default=0)  # 0=no, 1=yes
 
 
+class WorkflowCheckpoint(Base):
+    """
+    Output of a completed workflow step, persisted so an interrupted
+    session can resume without repeating model or tool calls
+    """
+    __tablename__ = "workflow_checkpoints"
+    __table_args__ = (UniqueConstraint("session_id", "stage", "step"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    session_id = Column(String, ForeignKey("workflow_sessions.session_id"), nullable=False, index=True)
+    stage = Column(String, nullable=False)  # interpretation, planning, execution, commit
+    step = Column(Integer, nullable=False)  # plan iteration / execution step index
+    payload = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+
+class WorkflowLease(Base):
+    """
+    Claim on an in-flight workflow session by one process, so that only
+    that process runs (or resumes) its stages until the lease expires
+    """
+    __tablename__ = "workflow_leases"
+
+    session_id = Column(String, ForeignKey("workflow_sessions.session_id"), primary_key=True)
+    owner = Column(String, nullable=False)  # host:pid:nonce of the holding process
+    expires_at = Column(DateTime, nullable=False)  # naive UTC; renewed while a stage runs
+
+
+class RoutedResponse(Base):
+    """
+    One answered chat request: how it was routed and its confidence, which
+    the fast path scores after the response has been returned
+    """
+    __tablename__ = "routed_responses"
+
+    id = Column(String, primary_key=True)  # response ID returned to the client
+    user_id = Column(String, nullable=True, index=True)
+    request = Column(String, nullable=False)
+    path = Column(String, nullable=False)  # simple, specialized, complex
+    routing_method = Column(String, nullable=True)  # llm, classifier, heuristic
+    routing_confidence = Column(Float, nullable=True)
+    model = Column(String, nullable=True)
+    confidence_status = Column(String, default="pending")  # pending, scored, failed
+    confidence = Column(Float, nullable=True)
+    confidence_details = Column(JSON, nullable=True)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), index=True)
+    scored_at = Column(DateTime, nullable=True)
+
+
 class ToolExecution(Base):
     """
     Tracks individual tool executions for audit and learning
@@ -26,7 +26,8 @@ from ..services.unified_request_handler import unified_request_handler
 from ..services.local_llm_service import local_llm_service
 from ..services.auth import get_current_user
 from ..services.database_service import database_service
-from ..services.pricing import calculate_cost, estimate_tokens
+from ..services.pricing import calculate_cost
+from ..services.token_accounting import token_counter
 from ..services.router_model import router_model
 try:
     from confidence_system import ConfidenceSystem  # type: ignore
@@ -116,21 +117,7 @@ async def send_ai_request(
     # New clean implementation: validate keys, demo fallback, initialize models, generate
     logger.debug("send_ai_request called for user=%s model=%s", current_user, request.model)
 
-    # **STEP 1: ROUTE THE REQUEST** (Intelligent routing with local inference)
-    try:
-        routing_decision = await router_model.route(request.prompt)
-        logger.info(f"Router decision: path={routing_decision['path']}, complexity={routing_decision['complexity']:.2f}, recommended_model={routing_decision['recommended_model']}")
-    except Exception as e:
-        logger.warning(f"Router failed, using default routing: {e}")
-        routing_decision = {
-            "path": "simple",
-            "complexity": 0.5,
-            "confidence": 0.7,
-            "reasoning": f"Fallback routing (router error: {str(e)})",
-            "recommended_model": "tinyllama-1.1b",
-            "requires_tools": False,
-            "requires_workflow": False
-        }
+    # Routing happens once, inside the unified handler (classifier fast path or LLM router)
 
     # Load API keys and validate which providers are working
     api_keys = key_manager.get_keys(current_user) or {}
@@ -149,9 +136,10 @@ async def send_ai_request(
     # If no keys at all and demo enabled, return a demo echo
     if (not api_keys or all(not v for v in api_keys.values())) and DEMO_MODE:
         mock_text = f"(DEMO) Echo: {request.prompt}"
-        prompt_tokens = estimate_tokens(request.prompt)
-        completion_tokens = estimate_tokens(mock_text)
-        total_tokens = prompt_tokens + completion_tokens
+        usage = token_counter.resolve_usage(request.model, request.prompt, mock_text)
+        prompt_tokens = usage["prompt_tokens"]
+        completion_tokens = usage["completion_tokens"]
+        total_tokens = usage["total_tokens"]
         return AIResponse(
             id=str(uuid4()),
             response=mock_text,
@@ -169,9 +157,10 @@ async def send_ai_request(
     # If keys exist but none validated as working, and demo enabled, return demo echo
     if api_keys and (not any(working_keys.values())) and DEMO_MODE:
         mock_text = f"(DEMO) Echo: {request.prompt}"
-        prompt_tokens = estimate_tokens(request.prompt)
-        completion_tokens = estimate_tokens(mock_text)
-        total_tokens = prompt_tokens + completion_tokens
+        usage = token_counter.resolve_usage(request.model, request.prompt, mock_text)
+        prompt_tokens = usage["prompt_tokens"]
+        completion_tokens = usage["completion_tokens"]
+        total_tokens = usage["total_tokens"]
         return AIResponse(
             id=str(uuid4()),
             response=mock_text,
@@ -234,10 +223,17 @@ async def send_ai_request(
     generated = handler_response.get("response", "")
     model = handler_response.get("model", handler_response.get("models_used", available[0] if available else "unknown"))
 
-    # Calculate token usage and cost
-    prompt_tokens = estimate_tokens(request.prompt)
-    completion_tokens = estimate_tokens(generated)
-    total_tokens = prompt_tokens + completion_tokens
+    # Calculate token usage and cost (provider-reported counts win over tokenizer counts)
+    usage = token_counter.resolve_usage(
+        model if isinstance(model, str) else None,
+        request.prompt,
+        generated,
+        reported=handler_response.get("usage"),
+    )
+    prompt_tokens = usage["prompt_tokens"]
+    completion_tokens = usage["completion_tokens"]
+    total_tokens = usage["total_tokens"]
+    logger.debug("token usage for %s: %s", model, usage)
 
     cost = calculate_cost(
         model,
@@ -279,7 +275,7 @@ async def send_ai_request(
         logger.warning("Failed to record usage for %s: %s", current_user, e)
 
     return AIResponse(
-        id=str(uuid4()),
+        id=handler_response.get("response_id") or str(uuid4()),
         response=generated,
         model=model,
         usage={
@@ -288,7 +284,7 @@ async def send_ai_request(
             "total_tokens": total_tokens
         },
         created_at=datetime.now().isoformat(),
-        routing_info=routing_decision,  # Include routing metadata
+        routing_info=handler_response.get("routing_decision"),  # Include routing metadata
         interpretation=interpretation,
         confidence=confidence_payload,
     )
@@ -584,6 +580,14 @@ async def get_usage_history(
         # Fallback to empty history
         return []
 
+@router.get("/ai/responses/{response_id}/confidence")
+async def get_response_confidence(response_id: str, current_user: str = Depends(get_current_user)):
+    """Routing and confidence of a chat response; fast-path answers report "pending" until scored."""
+    record = await asyncio.to_thread(unified_request_handler.get_confidence, response_id)
+    if record is None or (record.get("user_id") and record["user_id"] != current_user):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Response not found")
+    return record
+
 @router.post("/ai/feedback")
 async def submit_feedback(payload: FeedbackRequest, current_user: str = Depends(get_current_user)):
     """Accept lightweight feedback on AI responses for UX metrics and model tuning."""
@@ -799,8 +803,13 @@ async def send_ai_request_stream(
                 yield f"data: {json.dumps({'type': 'token', 'content': chunk})}\n\n"
 
             # Calculate usage and send completion
-            estimated_tokens = estimate_tokens(request.prompt, full_response)
-            cost = calculate_cost(model, estimated_tokens)
+            usage = token_counter.resolve_usage(model, request.prompt, full_response)
+            estimated_tokens = usage["total_tokens"]
+            cost = calculate_cost(
+                model,
+                prompt_tokens=usage["prompt_tokens"],
+                completion_tokens=usage["completion_tokens"]
+            )
 
             # Record usage
             database_service.record_usage(
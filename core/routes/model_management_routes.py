@@ -10,21 +10,37 @@ Endpoints for managing local AI models:
 - System stats
 """
 
-from fastapi import APIRouter, HTTPException, status, BackgroundTasks, Depends
+from fastapi import APIRouter, HTTPException, status, Depends
 from pydantic import BaseModel
 from typing import Dict, List, Optional
 import os
-import logging
-import psutil
 import asyncio
-import subprocess
+import logging
+import httpx
 
 from ..services.auth import get_current_user
+from ..services.hardware_tuner import hardware_tuner
 from ..services.local_llm_service import local_llm_service
+from ..services.model_downloader import InsufficientDiskSpaceError, model_download_manager
+from ..services.model_stats import ModelStatsCollector
 
 logger = logging.getLogger("lalo.model_management")
 
-router = APIRouter(prefix="/api/admin/models", tags=["Model Management"])
+
+async def _warm_model_stats():
+    """Build a cold stats snapshot off the event loop (normally done at startup)"""
+    if not model_stats.ready:
+        await asyncio.to_thread(model_stats.snapshot)
+
+
+router = APIRouter(
+    prefix="/api/admin/models",
+    tags=["Model Management"],
+    dependencies=[Depends(_warm_model_stats)],
+)
+
+# Model files are fetched from here unless a model's metadata sets "url"
+HF_ENDPOINT = os.getenv("HF_ENDPOINT", "https://huggingface.co")
 
 # Model metadata
 MODELS_METADATA = {
@@ -63,10 +79,6 @@ MODELS_METADATA = {
     },
 }
 
-# Global download status tracker
-download_status: Dict[str, Dict] = {}
-
-
 class ModelInfo(BaseModel):
     name: str
     display_name: str
@@ -91,100 +103,80 @@ class SystemStats(BaseModel):
     available_space: str
     total_memory: str
     available_memory: str
+    snapshot_at: Optional[str] = None  # when the underlying statistics were collected
+
+
+def get_model_path(model_name: str) -> str:
+    """Where a model file lives (models/<name>/<filename>, as the inference server expects)."""
+    filename = MODELS_METADATA[model_name]["filename"]
+    model_path = os.path.join(local_llm_service.model_dir, model_name, filename)
+    legacy_path = os.path.join(local_llm_service.model_dir, filename)
+    if not os.path.exists(model_path) and os.path.exists(legacy_path):
+        return legacy_path
+    return model_path
+
+
+def get_model_url(model_name: str) -> str:
+    """Download URL for a model file."""
+    metadata = MODELS_METADATA[model_name]
+    return metadata.get("url") or f"{HF_ENDPOINT}/{metadata['repo_id']}/resolve/main/{metadata['filename']}"
 
 
 def get_model_status(model_name: str) -> str:
     """Get the current status of a model."""
-    # Check if downloading
-    if model_name in download_status and download_status[model_name].get("status") == "downloading":
+    # Check if downloading (queued and verifying count as downloading)
+    if model_download_manager.is_active(model_name):
         return "downloading"
 
     # Check if loaded in memory
     if model_name in local_llm_service.models:
         return "loaded"
 
-    # Check if file exists (downloaded)
-    model_dir = os.path.join("models")
-    if model_name in MODELS_METADATA:
-        filename = MODELS_METADATA[model_name]["filename"]
-        model_path = os.path.join(model_dir, filename)
-        if os.path.exists(model_path):
-            return "downloaded"
+    # Check if file exists (downloaded), from the stats snapshot
+    if model_name in MODELS_METADATA and model_stats.model(model_name)["on_disk"]:
+        return "downloaded"
 
     return "not_downloaded"
 
 
-def get_disk_usage(path: str = "./models") -> tuple[str, str]:
-    """Get disk space used by models and available space."""
-    total_size = 0
-    if os.path.exists(path):
-        for root, dirs, files in os.walk(path):
-            for file in files:
-                file_path = os.path.join(root, file)
-                if os.path.exists(file_path):
-                    total_size += os.path.getsize(file_path)
-
-    # Format size
-    def format_bytes(bytes_val):
-        for unit in ["B", "KB", "MB", "GB"]:
-            if bytes_val < 1024:
-                return f"{bytes_val:.1f} {unit}"
-            bytes_val /= 1024
-        return f"{bytes_val:.1f} TB"
+def get_download_info(model_name: str) -> Dict:
+    """Status plus byte-level progress of the model's latest download, if any."""
+    status_str = get_model_status(model_name)
+    job = model_download_manager.get(model_name)
+    if job is None:
+        return {"status": status_str, "progress": None, "error": None}
+
+    info = job.to_dict()
+    if status_str == "not_downloaded" and job.status in ("error", "cancelled"):
+        # Surface why the last attempt stopped (its .part file is kept for resume)
+        info["status"] = job.status
+    else:
+        info["status"] = status_str
+        if status_str == "not_downloaded":
+            info["progress"] = None
+    return info
 
-    # Get available disk space
-    disk = psutil.disk_usage(os.path.abspath(path if os.path.exists(path) else "."))
-    available = format_bytes(disk.free)
 
-    return format_bytes(total_size), available
+def format_bytes(bytes_val: float) -> str:
+    for unit in ["B", "KB", "MB", "GB"]:
+        if bytes_val < 1024:
+            return f"{bytes_val:.1f} {unit}"
+        bytes_val /= 1024
+    return f"{bytes_val:.1f} TB"
 
 
-async def download_model_background(model_name: str):
-    """Background task to download a model using the download script."""
-    try:
-        download_status[model_name] = {"status": "downloading", "progress": 0}
-
-        # Run download script
-        script_path = os.path.join("scripts", "download_models.py")
-        process = await asyncio.create_subprocess_exec(
-            "python",
-            script_path,
-            "--model",
-            model_name,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
+def get_disk_usage() -> tuple[str, str]:
+    """Get disk space used by models and available space (from the stats snapshot)."""
+    snapshot = model_stats.snapshot()
+    return format_bytes(snapshot["disk_used_bytes"]), format_bytes(snapshot["disk_free_bytes"])
 
-        # Monitor progress (simplified - in production would parse output)
-        while True:
-            await asyncio.sleep(2)
-            if process.returncode is not None:
-                break
-            # Update progress (simplified - real implementation would parse download progress)
-            current_progress = download_status[model_name].get("progress", 0)
-            download_status[model_name]["progress"] = min(current_progress + 10, 90)
-
-        stdout, stderr = await process.communicate()
-
-        if process.returncode == 0:
-            download_status[model_name] = {"status": "downloaded", "progress": 100}
-            logger.info(f"Model {model_name} downloaded successfully")
-        else:
-            error_msg = stderr.decode() if stderr else "Download failed"
-            download_status[model_name] = {
-                "status": "error",
-                "error": error_msg,
-                "progress": 0,
-            }
-            logger.error(f"Model {model_name} download failed: {error_msg}")
 
-    except Exception as e:
-        logger.error(f"Error downloading model {model_name}: {e}")
-        download_status[model_name] = {
-            "status": "error",
-            "error": str(e),
-            "progress": 0,
-        }
+# Disk, memory and per-model file stats, refreshed in the background and on model events
+model_stats = ModelStatsCollector(
+    model_dir=local_llm_service.model_dir,
+    model_paths=lambda: {name: get_model_path(name) for name in MODELS_METADATA},
+)
+model_download_manager.add_listener(lambda job: model_stats.invalidate(job.model_name))
 
 
 @router.get("")
@@ -193,23 +185,16 @@ async def list_models(current_user: str = Depends(get_current_user)) -> Dict:
     models = []
 
     for model_name, metadata in MODELS_METADATA.items():
-        status = get_model_status(model_name)
-        progress = None
-        error_msg = None
-
-        if model_name in download_status:
-            status = download_status[model_name].get("status", status)
-            progress = download_status[model_name].get("progress")
-            error_msg = download_status[model_name].get("error")
+        info = get_download_info(model_name)
 
         models.append(
             ModelInfo(
                 name=model_name,
                 display_name=metadata["display_name"],
                 size=metadata["size"],
-                status=status,
-                download_progress=progress,
-                error_message=error_msg,
+                status=info["status"],
+                download_progress=info["progress"],
+                error_message=info["error"],
                 repo_id=metadata["repo_id"],
                 filename=metadata["filename"],
                 description=metadata["description"],
@@ -220,41 +205,64 @@ async def list_models(current_user: str = Depends(get_current_user)) -> Dict:
             )
         )
 
-    return {"models": models}
+    return {"models": models, "snapshot_at": model_stats.snapshot()["timestamp"]}
 
 
 @router.get("/stats")
 async def get_system_stats(current_user: str = Depends(get_current_user)) -> SystemStats:
-    """Get system statistics for models."""
+    """Get system statistics for models (served from the background stats snapshot)."""
+    snapshot = model_stats.snapshot()
     total_models = len(MODELS_METADATA)
     downloaded_models = sum(1 for name in MODELS_METADATA if get_model_status(name) in ["downloaded", "loaded"])
     loaded_models = sum(1 for name in MODELS_METADATA if get_model_status(name) == "loaded")
 
-    disk_used, disk_available = get_disk_usage()
-
-    # Memory stats
-    mem = psutil.virtual_memory()
-    total_mem = f"{mem.total / (1024**3):.1f} GB"
-    available_mem = f"{mem.available / (1024**3):.1f} GB"
-
     return SystemStats(
         total_models=total_models,
         downloaded_models=downloaded_models,
         loaded_models=loaded_models,
-        disk_space_used=disk_used,
-        available_space=disk_available,
-        total_memory=total_mem,
-        available_memory=available_mem,
+        disk_space_used=format_bytes(snapshot["disk_used_bytes"]),
+        available_space=format_bytes(snapshot["disk_free_bytes"]),
+        total_memory=f"{snapshot['memory_total_bytes'] / (1024**3):.1f} GB",
+        available_memory=f"{snapshot['memory_available_bytes'] / (1024**3):.1f} GB",
+        snapshot_at=snapshot["timestamp"],
     )
 
 
+@router.get("/memory")
+async def get_memory_stats(current_user: str = Depends(get_current_user)) -> Dict:
+    """Memory of this worker process and the residency of each loaded model's mmap'd weights."""
+    return await asyncio.to_thread(local_llm_service.get_memory_stats)
+
+
+@router.get("/tuning")
+async def get_tuning(current_user: str = Depends(get_current_user)) -> Dict:
+    """Detected hardware, the thread split between loaded models and persisted calibrations."""
+    return {
+        "hardware": hardware_tuner.profile.to_dict(),
+        "reserved_cores": hardware_tuner.reserved_cores,
+        "loaded": local_llm_service.model_settings,
+        "calibrated": hardware_tuner.all_settings(),
+    }
+
+
+@router.get("/speculation")
+async def get_speculation_stats(current_user: str = Depends(get_current_user)) -> Dict:
+    """Speculative decoding per loaded model: draft source, acceptance rate and fallback state."""
+    return {"models": local_llm_service.get_speculative_stats()}
+
+
+@router.get("/structured-output")
+async def get_structured_output_stats(current_user: str = Depends(get_current_user)) -> Dict:
+    """JSON-schema generations per model: requests, parse failures and unused max_tokens budget."""
+    return {"models": local_llm_service.structured_stats}
+
+
 @router.post("/{model_name}/download")
 async def download_model(
     model_name: str,
-    background_tasks: BackgroundTasks,
     current_user: str = Depends(get_current_user),
 ):
-    """Start downloading a model."""
+    """Queue a resumable, checksum-verified download of a model."""
     if model_name not in MODELS_METADATA:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -274,10 +282,23 @@ async def download_model(
             detail=f"Model {model_name} is already downloaded",
         )
 
-    # Start download in background
-    background_tasks.add_task(download_model_background, model_name)
+    try:
+        job = await model_download_manager.enqueue(
+            model_name,
+            url=get_model_url(model_name),
+            dest_path=os.path.join(local_llm_service.model_dir, model_name, MODELS_METADATA[model_name]["filename"]),
+            sha256=MODELS_METADATA[model_name].get("sha256"),
+        )
+    except InsufficientDiskSpaceError as e:
+        raise HTTPException(status_code=status.HTTP_507_INSUFFICIENT_STORAGE, detail=str(e))
+    except httpx.HTTPError as e:
+        logger.error(f"Could not reach download source for {model_name}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"Could not reach download source for {model_name}: {e}",
+        )
 
-    return {"message": f"Started downloading {model_name}", "status": "downloading"}
+    return {"message": f"Started downloading {model_name}", "status": "downloading", "total_bytes": job.total_bytes}
 
 
 @router.get("/{model_name}/status")
@@ -291,16 +312,7 @@ async def get_model_status_endpoint(
             detail=f"Model {model_name} not found",
         )
 
-    status_str = get_model_status(model_name)
-    progress = None
-    error = None
-
-    if model_name in download_status:
-        status_str = download_status[model_name].get("status", status_str)
-        progress = download_status[model_name].get("progress")
-        error = download_status[model_name].get("error")
-
-    return {"status": status_str, "progress": progress, "error": error}
+    return get_download_info(model_name)
 
 
 @router.post("/{model_name}/load")
@@ -325,6 +337,7 @@ async def load_model(model_name: str, current_user: str = Depends(get_current_us
     try:
         # Load the model
         await local_llm_service._load_model(model_name)
+        model_stats.invalidate(model_name)
         logger.info(f"Model {model_name} loaded successfully")
         return {"message": f"Model {model_name} loaded successfully"}
     except Exception as e:
@@ -335,6 +348,39 @@ async def load_model(model_name: str, current_user: str = Depends(get_current_us
         )
 
 
+@router.post("/{model_name}/calibrate")
+async def calibrate_model(model_name: str, current_user: str = Depends(get_current_user)):
+    """Benchmark thread counts and batch sizes for a model and persist the fastest settings."""
+    if model_name not in MODELS_METADATA:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Model {model_name} not found",
+        )
+
+    if get_model_status(model_name) == "not_downloaded":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Model {model_name} must be downloaded first",
+        )
+
+    if not local_llm_service.is_available():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Local inference (llama-cpp-python) is not installed",
+        )
+
+    try:
+        result = await asyncio.to_thread(local_llm_service.calibrate_model, model_name)
+    except Exception as e:
+        logger.error(f"Failed to calibrate model {model_name}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to calibrate model: {str(e)}",
+        )
+
+    return {"message": f"Model {model_name} calibrated", "settings": result}
+
+
 @router.post("/{model_name}/unload")
 async def unload_model(model_name: str, current_user: str = Depends(get_current_user)):
     """Unload a model from memory."""
@@ -349,7 +395,8 @@ async def unload_model(model_name: str, current_user: str = Depends(get_current_
 
     try:
         # Unload the model
-        del local_llm_service.models[model_name]
+        local_llm_service.unload_model(model_name)
+        model_stats.invalidate(model_name)
         logger.info(f"Model {model_name} unloaded successfully")
         return {"message": f"Model {model_name} unloaded successfully"}
     except Exception as e:
@@ -371,16 +418,20 @@ async def delete_model(model_name: str, current_user: str = Depends(get_current_
 
     # Unload if loaded
     if model_name in local_llm_service.models:
-        del local_llm_service.models[model_name]
+        local_llm_service.unload_model(model_name)
+
+    # Stop an in-progress download
+    model_download_manager.cancel(model_name)
 
     # Delete file
-    model_dir = os.path.join("models")
-    filename = MODELS_METADATA[model_name]["filename"]
-    model_path = os.path.join(model_dir, filename)
+    model_path = get_model_path(model_name)
 
     if os.path.exists(model_path):
         try:
             os.remove(model_path)
+            # Make the deletion visible before responding
+            model_stats.invalidate(model_name)
+            await asyncio.to_thread(model_stats.flush, 5)
             logger.info(f"Model {model_name} deleted successfully")
             return {"message": f"Model {model_name} deleted successfully"}
         except Exception as e:
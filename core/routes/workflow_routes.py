@@ -21,10 +21,12 @@ Implements the 5-step LALO workflow process:
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Dict, List, Optional
 from datetime import datetime
 from uuid import uuid4
+import asyncio
 import json
 import os
 
@@ -33,6 +35,7 @@ from ..services.auth import get_current_user
 from ..services.ai_service import ai_service
 from ..services.key_management import key_manager
 from ..services.workflow_orchestrator import workflow_orchestrator
+from ..services.workflow_engine import workflow_event_bus, StageInProgressError, TERMINAL_STATES
 
 router = APIRouter(prefix="/api/workflow", tags=["LALO Workflow"])
 
@@ -40,6 +43,10 @@ router = APIRouter(prefix="/api/workflow", tags=["LALO Workflow"])
 DEMO_MODE = os.getenv("DEMO_MODE", "false").lower() == "true"
 # If AUTO_APPROVE is not explicitly set, default to True in DEMO_MODE; otherwise False
 AUTO_APPROVE = os.getenv("AUTO_APPROVE", "true" if DEMO_MODE else "false").lower() == "true"
+# Keep-alive comment interval for the workflow event stream
+EVENT_STREAM_HEARTBEAT_SECONDS = float(os.getenv("WORKFLOW_EVENT_HEARTBEAT_SECONDS", "15"))
+# How often the event stream re-reads a session whose stage runs in another worker
+EVENT_STREAM_POLL_SECONDS = float(os.getenv("WORKFLOW_EVENT_POLL_SECONDS", "2"))
 
 # ============================================================================
 # Request/Response Models
@@ -118,9 +125,8 @@ async def start_workflow(
     """
     Step 1: Start a new LALO workflow
     - Creates session
-    - Performs semantic interpretation
-    - Generates confidence score
-    - Returns interpretation for user approval
+    - Schedules semantic interpretation and confidence scoring in the background
+    - Returns immediately; follow progress via /{session_id}/events
     """
     try:
         # Ensure user has API keys and models initialized
@@ -191,6 +197,72 @@ async def get_workflow_status(
         )
 
 
+@router.get("/{session_id}/events")
+async def stream_workflow_events(
+    session_id: str,
+    current_user: str = Depends(get_current_user)
+) -> StreamingResponse:
+    """
+    Server-Sent Events stream of workflow state transitions
+
+    Emits the current status first, then one event per transition, and
+    closes once the workflow completes or errors.
+
+    Transitions are published in the worker that runs the stage. While no
+    stage of the session runs in this worker (it may run in another one
+    sharing the database), the session row is re-read every
+    WORKFLOW_EVENT_POLL_SECONDS and each change is sent as a status event.
+    """
+    # Listen before reading the status: a transition in between is queued, not lost
+    queue = workflow_event_bus.listen(session_id)
+    try:
+        session_dict = await workflow_orchestrator.get_workflow_status(session_id=session_id)
+    except Exception:
+        workflow_event_bus.unlisten(session_id, queue)
+        raise
+    if not session_dict or session_dict.get("error"):
+        workflow_event_bus.unlisten(session_id, queue)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Workflow session {session_id} not found"
+        )
+
+    async def event_stream():
+        try:
+            snapshot = {"type": "status", "state": session_dict["current_state"], "session": session_dict}
+            yield f"data: {json.dumps(snapshot, default=str)}\n\n"
+            if session_dict["current_state"] in TERMINAL_STATES:
+                return
+            loop = asyncio.get_running_loop()
+            seen = (session_dict["current_state"], session_dict.get("updated_at"))
+            last_sent = loop.time()
+            tick = min(EVENT_STREAM_POLL_SECONDS, EVENT_STREAM_HEARTBEAT_SECONDS)
+            async for event in workflow_event_bus.events(queue, heartbeat=tick):
+                if event is not None:
+                    if event.get("session"):
+                        seen = (event["session"]["current_state"], event["session"].get("updated_at"))
+                    yield f"data: {json.dumps(event, default=str)}\n\n"
+                    last_sent = loop.time()
+                    continue
+                if not workflow_orchestrator.engine.is_running(session_id):
+                    current = await workflow_orchestrator.get_workflow_status(session_id=session_id)
+                    if current and not current.get("error") and (current["current_state"], current.get("updated_at")) != seen:
+                        seen = (current["current_state"], current.get("updated_at"))
+                        update = {"type": "status", "state": current["current_state"], "session": current}
+                        yield f"data: {json.dumps(update, default=str)}\n\n"
+                        last_sent = loop.time()
+                        if current["current_state"] in TERMINAL_STATES:
+                            return
+                        continue
+                if loop.time() - last_sent >= EVENT_STREAM_HEARTBEAT_SECONDS:
+                    yield ": keep-alive\n\n"
+                    last_sent = loop.time()
+        finally:
+            workflow_event_bus.unlisten(session_id, queue)
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
 @router.post("/{session_id}/approve_interpretation")
 async def approve_interpretation(
     session_id: str,
@@ -205,6 +277,8 @@ async def approve_interpretation(
             feedback=feedback
         )
         return WorkflowStatusResponse(**session_dict)
+    except StageInProgressError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     except HTTPException:
         raise
     except Exception as e:
@@ -227,6 +301,8 @@ async def approve_plan(
             feedback=feedback
         )
         return WorkflowStatusResponse(**session_dict)
+    except StageInProgressError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     except HTTPException:
         raise
     except Exception as e:
@@ -251,6 +327,8 @@ async def approve_results(
             rating=rating
         )
         return WorkflowStatusResponse(**session_dict)
+    except StageInProgressError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     except HTTPException:
         raise
     except Exception as e:
@@ -317,6 +395,8 @@ async def submit_feedback(
             message=feedback.message
         )
         return WorkflowStatusResponse(**session_dict)
+    except StageInProgressError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     except HTTPException:
         raise
     except Exception as e:
@@ -331,6 +411,8 @@ async def advance_workflow(
     try:
         session_dict = await workflow_orchestrator.advance_workflow(session_id=session_id, user_id=current_user)
         return WorkflowStatusResponse(**session_dict)
+    except StageInProgressError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     except HTTPException:
         raise
     except Exception as e:
@@ -10,13 +10,16 @@ This is Step 2 of the LALO workflow:
 4. Repeat until confidence threshold met (max 3 iterations)
 """
 
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 from pydantic import BaseModel
 from dataclasses import dataclass, asdict
 from core.services.ai_service import ai_service
 from core.services.microservices_client import rti_client
+import asyncio
 import logging
 import json
+import os
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -44,23 +47,50 @@ class ActionPlanner:
     5. Repeat until confidence >= threshold or max iterations reached
     """
 
-    def __init__(self, ai_service_instance=None, max_iterations: int = 3):
+    def __init__(
+        self,
+        ai_service_instance=None,
+        max_iterations: int = 3,
+        mode: Optional[str] = None,
+        candidate_models: Optional[List[str]] = None,
+        num_candidates: Optional[int] = None,
+        latency_budget_s: Optional[float] = None,
+        max_llm_calls: Optional[int] = None
+    ):
         """
         Initialize action planner
 
         Args:
             ai_service_instance: AIService instance
-            max_iterations: Maximum refinement iterations
+            max_iterations: Maximum refinement iterations (sequential mode)
+            mode: "sequential" (generate -> critique -> refine) or "speculative"
+                (K candidates generated and critiqued concurrently). Default PLANNER_MODE.
+            candidate_models: Models that draft candidates besides RTI (PLANNER_CANDIDATE_MODELS)
+            num_candidates: K, including the RTI candidate (PLANNER_CANDIDATES, default 3)
+            latency_budget_s: Wall-clock budget for speculative planning (PLANNER_LATENCY_BUDGET_S)
+            max_llm_calls: Cap on generation + critique calls per plan (PLANNER_MAX_LLM_CALLS)
         """
         self.ai_service_instance = ai_service_instance or ai_service
         self.max_iterations = max_iterations
         self.confidence_threshold = 0.8
+        self.mode = (mode or os.getenv("PLANNER_MODE", "sequential")).lower()
+        self.candidate_models = candidate_models or [
+            m.strip() for m in os.getenv(
+                "PLANNER_CANDIDATE_MODELS",
+                "gpt-4-turbo-preview,claude-3-5-sonnet-20241022,gpt-3.5-turbo"
+            ).split(",") if m.strip()
+        ]
+        self.num_candidates = num_candidates or int(os.getenv("PLANNER_CANDIDATES", "3"))
+        self.latency_budget_s = latency_budget_s or float(os.getenv("PLANNER_LATENCY_BUDGET_S", "30"))
+        self.max_llm_calls = max_llm_calls or int(os.getenv("PLANNER_MAX_LLM_CALLS", "6"))
 
     async def create_plan(
         self,
         interpreted_intent: str,
         user_id: str,
-        context: Dict = None
+        context: Dict = None,
+        checkpoints: Optional[List[Dict]] = None,
+        on_iteration: Optional[Callable[[Dict], None]] = None
     ) -> ActionPlan:
         """
         Create action plan with recursive refinement
@@ -69,17 +99,40 @@ class ActionPlanner:
             interpreted_intent: Semantic interpretation from Step 1
             user_id: User ID for accessing API keys
             context: Optional context (user history, available tools, etc.)
+            checkpoints: Iteration records from an interrupted run; planning
+                resumes after the last one instead of starting over
+            on_iteration: Called with each iteration record as soon as it completes
 
         Returns:
             ActionPlan with refined steps and confidence score
         """
         logger.info(f"Creating action plan for: {interpreted_intent[:100]}...")
 
+        if checkpoints and checkpoints[-1].get("done"):
+            logger.info("Plan restored from checkpoint")
+            return ActionPlan(**checkpoints[-1]["action_plan"])
+
+        if self.mode == "speculative":
+            plan = await self.create_plan_speculative(interpreted_intent, user_id, context)
+            if on_iteration:
+                on_iteration({"iteration": 1, "done": True, "action_plan": asdict(plan)})
+            return plan
+
         plan = None
         critiques = []
         best_confidence = 0.0
-
-        for iteration in range(self.max_iterations):
+        iteration = 0
+        done = False
+
+        for record in checkpoints or []:
+            plan = record["plan"]
+            critiques.append(record["critique_text"])
+            best_confidence = record["best_confidence"]
+            iteration = record["iteration"]
+        if checkpoints:
+            logger.info(f"Resuming planning after iteration {iteration}")
+
+        while not done and iteration < self.max_iterations:
             logger.info(f"Plan iteration {iteration + 1}/{self.max_iterations}")
 
             # Generate or refine plan
@@ -111,27 +164,54 @@ class ActionPlanner:
 
             critiques.append(critique["critique_text"])
             confidence = critique["confidence"]
+            iteration += 1
 
             logger.info(f"Plan confidence: {confidence:.2f}")
 
             # Check if we've reached acceptable quality
             if confidence >= self.confidence_threshold:
-                logger.info(f"Plan meets confidence threshold after {iteration + 1} iterations")
-                break
-
-            if confidence < best_confidence:
+                logger.info(f"Plan meets confidence threshold after {iteration} iterations")
+                best_confidence = confidence
+                done = True
+            elif confidence < best_confidence:
                 # Not improving, stop iterating
                 logger.info("Plan quality not improving, stopping iterations")
-                break
-
-            best_confidence = confidence
+                done = True
+            else:
+                best_confidence = confidence
+
+            if on_iteration:
+                record = {
+                    "iteration": iteration,
+                    "done": done or iteration >= self.max_iterations,
+                    "plan": plan,
+                    "critique_text": critiques[-1],
+                    "best_confidence": best_confidence
+                }
+                if record["done"]:
+                    # The final record carries the finished plan so a resume returns it directly
+                    record["action_plan"] = asdict(
+                        self._build_plan(interpreted_intent, user_id, plan, best_confidence, iteration, critiques)
+                    )
+                on_iteration(record)
 
         # Return final plan
+        return self._build_plan(interpreted_intent, user_id, plan, best_confidence, iteration, critiques)
+
+    def _build_plan(
+        self,
+        interpreted_intent: str,
+        user_id: str,
+        plan: Dict,
+        confidence: float,
+        iterations: int,
+        critiques: List[str]
+    ) -> ActionPlan:
         return ActionPlan(
             steps=plan.get("steps", []),
-            confidence=best_confidence,
-            iterations=iteration + 1,
-            critiques=critiques,
+            confidence=confidence,
+            iterations=iterations,
+            critiques=list(critiques),
             retrieved_examples=plan.get("retrieved_examples", []),
             metadata={
                 "interpreted_intent": interpreted_intent,
@@ -140,6 +220,169 @@ class ActionPlanner:
             }
         )
 
+    async def create_plan_speculative(
+        self,
+        interpreted_intent: str,
+        user_id: str,
+        context: Dict = None
+    ) -> ActionPlan:
+        """
+        Generate K candidate plans concurrently and critique each as it lands
+
+        RTI and the candidate models draft in parallel; every finished draft is
+        critiqued immediately. The first candidate whose critique clears
+        confidence_threshold wins and all outstanding calls are cancelled.
+        Otherwise the best-scoring candidate is returned once every critique
+        is in, the latency budget expires, or the LLM call budget is spent.
+
+        Args:
+            interpreted_intent: Semantic interpretation from Step 1
+            user_id: User ID for accessing API keys
+            context: Optional context (unused by the drafting prompts)
+
+        Returns:
+            ActionPlan for the selected candidate
+        """
+        started = time.monotonic()
+        deadline = started + self.latency_budget_s
+        calls = 0
+
+        # Candidate sources: RTI (retrieval-backed, no LLM cost) plus models
+        available = getattr(self.ai_service_instance, "models", {}).get(user_id)
+        models = [m for m in self.candidate_models if available is None or m in available]
+        sources = ["rti"] + models[:max(0, self.num_candidates - 1)]
+
+        pending: Dict[asyncio.Task, tuple] = {}
+        for source in sources:
+            if source != "rti":
+                if calls >= self.max_llm_calls:
+                    break
+                calls += 1
+            task = asyncio.ensure_future(self._generate_candidate(source, interpreted_intent, user_id, context))
+            pending[task] = ("generate", source, None)
+
+        candidates: List[Dict] = []
+        winner = None
+        early_stop = False
+
+        try:
+            while pending and winner is None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.info("Speculative planning hit its latency budget")
+                    break
+                done, _ = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    kind, source, plan = pending.pop(task)
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        logger.warning(f"Planner candidate {source} failed during {kind}: {e}")
+                        continue
+
+                    if kind == "generate":
+                        if not result or not result.get("steps"):
+                            continue
+                        if calls >= self.max_llm_calls:
+                            # Out of budget: keep the draft uncritiqued
+                            candidates.append({"source": source, "plan": result, "critique": None})
+                            continue
+                        calls += 1
+                        critique_task = asyncio.ensure_future(self._critique_plan(interpreted_intent, result, user_id))
+                        pending[critique_task] = ("critique", source, result)
+                    else:
+                        candidate = {"source": source, "plan": plan, "critique": result}
+                        candidates.append(candidate)
+                        if result.get("confidence", 0.0) >= self.confidence_threshold:
+                            winner = candidate
+                            early_stop = bool(pending)
+                            break
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if winner is None:
+            winner = max(
+                candidates,
+                key=lambda c: c["critique"]["confidence"] if c["critique"] else c["plan"].get("rti_confidence", 0.0) * 0.5,
+                default=None
+            )
+
+        if winner is None:
+            # Nothing usable arrived in time; degrade to the single-model path,
+            # still inside the latency and call budgets
+            fallback = None
+            fallback_model = models[0] if models else next(iter(available or {}), None)
+            remaining = deadline - time.monotonic()
+            if fallback_model and calls < self.max_llm_calls and remaining > 0:
+                calls += 1
+                try:
+                    fallback = await asyncio.wait_for(
+                        self._fallback_plan_generation(interpreted_intent, user_id, model_name=fallback_model),
+                        remaining
+                    )
+                except asyncio.TimeoutError:
+                    logger.info("Speculative planning fallback hit its latency budget")
+            if fallback is None:
+                fallback = {
+                    "steps": [{"step": 1, "action": "Unable to generate plan", "tool": "none", "expected_outcome": "error"}],
+                    "rti_confidence": 0.0,
+                    "retrieved_examples": [],
+                    "raw_plan": "Error: no plan within the planning budget"
+                }
+            winner = {"source": "fallback", "plan": fallback, "critique": None}
+
+        critique = winner["critique"] or {"confidence": 0.0, "critique_text": "Not critiqued within budget"}
+        latency_ms = (time.monotonic() - started) * 1000.0
+        logger.info(
+            f"Speculative plan from {winner['source']} (confidence {critique['confidence']:.2f}, "
+            f"{len(candidates)} candidates, {calls} LLM calls, {latency_ms:.0f} ms)"
+        )
+
+        return ActionPlan(
+            steps=winner["plan"].get("steps", []),
+            confidence=critique["confidence"],
+            iterations=1,
+            critiques=[c["critique"]["critique_text"] for c in candidates if c["critique"]],
+            retrieved_examples=winner["plan"].get("retrieved_examples", []),
+            metadata={
+                "interpreted_intent": interpreted_intent,
+                "user_id": user_id,
+                "final_critique": critique["critique_text"],
+                "mode": "speculative",
+                "selected_source": winner["source"],
+                "candidates": [
+                    {"source": c["source"], "confidence": c["critique"]["confidence"] if c["critique"] else None}
+                    for c in candidates
+                ],
+                "early_stop": early_stop,
+                "llm_calls": calls,
+                "latency_ms": round(latency_ms, 1)
+            }
+        )
+
+    async def _generate_candidate(
+        self,
+        source: str,
+        intent: str,
+        user_id: str,
+        context: Dict = None
+    ) -> Optional[Dict]:
+        """Draft one candidate plan from RTI or a specific model."""
+        if source == "rti":
+            rti_result = await rti_client.interpret(intent)
+            if not rti_result.get("confidence"):
+                # RTI reported an error; let the model candidates win
+                return None
+            return {
+                "steps": self._parse_plan_steps(rti_result.get("plan", "")),
+                "rti_confidence": rti_result.get("confidence", 0.5),
+                "retrieved_examples": rti_result.get("retrieved_examples", []),
+                "raw_plan": rti_result.get("plan", "")
+            }
+        plan = await self._fallback_plan_generation(intent, user_id, model_name=source)
+        return plan if plan.get("rti_confidence", 0.0) > 0.0 else None
+
     async def _generate_initial_plan(
         self,
         intent: str,
@@ -168,10 +411,15 @@ class ActionPlanner:
             # Fallback: Generate plan using AI service directly
             return await self._fallback_plan_generation(intent, user_id)
 
-    async def _fallback_plan_generation(self, intent: str, user_id: str) -> Dict:
+    async def _fallback_plan_generation(
+        self,
+        intent: str,
+        user_id: str,
+        model_name: str = "gpt-4-turbo-preview"
+    ) -> Dict:
         """
         Fallback plan generation when RTI is unavailable
-        Uses GPT-4 directly
+        Uses GPT-4 directly unless another model is given
         """
         prompt = f"""Create a detailed action plan to accomplish this goal:
 
@@ -195,7 +443,7 @@ Provide ONLY the JSON, no other text."""
         try:
             response = await self.ai_service_instance.generate(
                 prompt=prompt,
-                model_name="gpt-4-turbo-preview",
+                model_name=model_name,
                 user_id=user_id,
                 max_tokens=1000,
                 temperature=0.5
@@ -83,6 +83,32 @@ except ImportError:
     logger.warning("WorkflowManager not available - using standalone mode")
 
 
+def plan_schema(available_models: List[str]) -> Dict:
+    """Shape of the workflow plan the planner model is asked for (enforced by grammar)"""
+    model = {"enum": list(available_models)} if available_models else {"type": "string", "maxLength": 40}
+    return {
+        "type": "object",
+        "properties": {
+            "steps": {
+                "type": "array",
+                "minItems": 1,
+                "maxItems": 8,
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "id": {"type": "integer"},
+                        "action": {"type": "string", "maxLength": 30},
+                        "model": model,
+                        "description": {"type": "string", "maxLength": 200},
+                        "dependencies": {"type": "array", "items": {"type": "integer"}, "maxItems": 8},
+                        "parallel": {"type": "boolean"},
+                    },
+                },
+            },
+        },
+    }
+
+
 class AgentOrchestrator:
     """
     Coordinates complex multi-step workflows
@@ -242,7 +268,8 @@ Routing Info: Complexity={routing_decision.get('complexity', 0.5):.2f}, Path={ro
                 prompt=prompt,
                 model_name=planner_model,
                 max_tokens=512,
-                temperature=0.3
+                temperature=0.3,
+                json_schema=plan_schema(available_models)
             )
 
             # Parse JSON plan
@@ -426,12 +453,17 @@ Routing Info: Complexity={routing_decision.get('complexity', 0.5):.2f}, Path={ro
         user_request: str,
         routing_decision: Dict,
         user_id: str,
-        available_models: List[str]
+        available_models: List[str],
+        score: bool = True
     ) -> Dict:
         """
         Execute simple request (direct model call)
 
         Simpler than complex workflow - just call model and validate
+
+        Args:
+            score: Run the confidence model before returning; False returns
+                after the single generation with confidence left to the caller
         """
         model = routing_decision.get("recommended_model", "tinyllama-1.1b")
 
@@ -442,13 +474,24 @@ Routing Info: Complexity={routing_decision.get('complexity', 0.5):.2f}, Path={ro
         logger.info(f"Executing simple request with {model}")
 
         try:
-            # Generate response
-            output = await self.inference_server.generate(
+            # Generate response (keep llama.cpp's token usage for billing)
+            generation = await self.inference_server.generate_with_usage(
                 prompt=user_request,
                 model_name=model,
                 max_tokens=512,
                 temperature=0.7
             )
+            output = generation["text"]
+
+            if not score:
+                return {
+                    "response": output,
+                    "model": model,
+                    "confidence": None,
+                    "confidence_details": {"status": "pending"},
+                    "path": "simple",
+                    "usage": generation.get("usage")
+                }
 
             # Quick confidence check
             confidence_score = await self.confidence.score(
@@ -462,7 +505,8 @@ Routing Info: Complexity={routing_decision.get('complexity', 0.5):.2f}, Path={ro
                 "model": model,
                 "confidence": confidence_score["confidence"],
                 "confidence_details": confidence_score,
-                "path": "simple"
+                "path": "simple",
+                "usage": generation.get("usage")
             }
 
         except Exception as e:
@@ -40,6 +40,7 @@ except ImportError:
 
 # Import local model wrapper
 from core.models.local_model import LocalAIModel
+from core.services.hardware_tuner import hardware_tuner
 
 class BaseAIModel(ABC):
     @abstractmethod
@@ -115,10 +116,12 @@ class LocalLLaMAModel(BaseAIModel):
         if not LLAMA_AVAILABLE:
             raise ImportError("llama-cpp-python is not installed. Llama models are not available.")
             
+        settings = hardware_tuner.settings_for(os.path.basename(model_path), model_path, n_ctx=2048)
         self.model = Llama(
             model_path=model_path,
-            n_ctx=2048,
-            n_threads=os.cpu_count()
+            n_ctx=settings["n_ctx"],
+            n_threads=settings["n_threads"],
+            n_batch=settings["n_batch"]
         )
 
     async def generate(self, prompt: str, **kwargs) -> str:
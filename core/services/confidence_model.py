@@ -26,6 +26,19 @@ logger = logging.getLogger(__name__)
 
 RecommendationType = Literal["accept", "retry", "escalate", "human_review"]
 
+# Shape of the scores the model is asked for (enforced by grammar)
+SCORES_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "factual": {"type": "number"},
+        "consistent": {"type": "number"},
+        "complete": {"type": "number"},
+        "grounded": {"type": "number"},
+        "issues": {"type": "array", "items": {"type": "string", "maxLength": 120}, "maxItems": 5},
+        "reasoning": {"type": "string", "maxLength": 200},
+    },
+}
+
 
 class ConfidenceModel:
     """
@@ -101,7 +114,8 @@ class ConfidenceModel:
                 model_name=self.model_name,
                 max_tokens=256,
                 temperature=0.2,  # Low temp for consistent scoring
-                stop=["<|user|>", "\n\n\n"]
+                stop=["<|user|>", "\n\n\n"],
+                json_schema=SCORES_SCHEMA
             )
 
             # Parse JSON response
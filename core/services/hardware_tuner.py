@@ -0,0 +1,359 @@
+# Copyright (c) 2025 LALO AI LLC. All rights reserved.
+"""
+Hardware Tuner
+
+Chooses llama.cpp thread, batch and context settings from the machine
+instead of per-model constants.
+- Detects physical cores, NUMA nodes and RAM once per process
+- Splits the usable cores between models that can run at the same time,
+  keeping each model inside one NUMA node
+- Shrinks a model's context when its KV cache would not fit in free RAM
+- calibrate() benchmarks tokens/sec per thread count and prompt
+  throughput per batch size, and persists the winner (MODEL_TUNING_FILE)
+  keyed by hardware fingerprint and model file size
+"""
+
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional
+import glob
+import json
+import logging
+import os
+import threading
+import time
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH = 512
+MIN_CONTEXT = 512
+# Upper estimate of f16 KV-cache bytes per context token per byte of Q4
+# weights (7B without GQA: ~512KB/token for ~4GB of weights)
+KV_BYTES_PER_TOKEN_PER_WEIGHT_BYTE = 1 / 8000
+# Share of free RAM (after weights) a model's KV cache may take
+KV_MEMORY_FRACTION = 0.5
+
+GENERATION_PROMPT = "Write a short paragraph about the history of the printing press."
+PREFILL_PROMPT = " ".join(["The quick brown fox jumps over the lazy dog."] * 40)
+
+
+def parse_cpu_list(text: str) -> List[int]:
+    """Parse a sysfs cpulist such as "0-3,8-11" """
+    cpus: List[int] = []
+    for part in text.strip().split(","):
+        if not part:
+            continue
+        if "-" in part:
+            start, end = part.split("-")
+            cpus.extend(range(int(start), int(end) + 1))
+        else:
+            cpus.append(int(part))
+    return cpus
+
+
+@dataclass
+class HardwareProfile:
+    physical_cores: int
+    logical_cores: int
+    numa_nodes: List[List[int]] = field(default_factory=list)  # logical CPU ids per node
+    memory_total_bytes: int = 0
+
+    @property
+    def physical_cores_per_node(self) -> int:
+        """Physical cores in the smallest NUMA node"""
+        if len(self.numa_nodes) <= 1:
+            return self.physical_cores
+        smt = max(1, self.logical_cores // max(1, self.physical_cores))
+        return max(1, min(len(cpus) for cpus in self.numa_nodes) // smt)
+
+    @property
+    def fingerprint(self) -> str:
+        gib = round(self.memory_total_bytes / 1024**3)
+        return f"{self.physical_cores}c{self.logical_cores}t-{max(1, len(self.numa_nodes))}n-{gib}g"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            **asdict(self),
+            "physical_cores_per_node": self.physical_cores_per_node,
+            "fingerprint": self.fingerprint,
+        }
+
+
+def detect_hardware(node_root: str = "/sys/devices/system/node") -> HardwareProfile:
+    """
+    Detect cores, NUMA layout and RAM
+
+    Args:
+        node_root: sysfs NUMA directory (Linux); missing means a single node
+
+    Returns:
+        HardwareProfile for this machine (respecting the process CPU affinity)
+    """
+    logical = os.cpu_count() or 1
+    physical = psutil.cpu_count(logical=False) or logical
+    try:
+        allowed = len(os.sched_getaffinity(0))
+        if allowed < logical:  # containers / taskset restrict the usable CPUs
+            physical = max(1, physical * allowed // logical)
+            logical = allowed
+    except (AttributeError, OSError):
+        pass
+
+    nodes = []
+    for path in sorted(glob.glob(os.path.join(node_root, "node[0-9]*", "cpulist"))):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                cpus = parse_cpu_list(f.read())
+        except (OSError, ValueError):
+            continue
+        if cpus:
+            nodes.append(cpus)
+
+    return HardwareProfile(
+        physical_cores=physical,
+        logical_cores=logical,
+        numa_nodes=nodes,
+        memory_total_bytes=psutil.virtual_memory().total,
+    )
+
+
+class HardwareTuner:
+    """
+    Per-model llama.cpp settings derived from hardware and calibration
+    """
+
+    def __init__(
+        self,
+        settings_path: Optional[str] = None,
+        profile: Optional[HardwareProfile] = None,
+        reserved_cores: Optional[int] = None
+    ):
+        """
+        Initialize tuner
+
+        Args:
+            settings_path: JSON file for calibration results (MODEL_TUNING_FILE)
+            profile: Hardware profile (detected on first use when omitted)
+            reserved_cores: Cores left for the API itself (LOCAL_LLM_RESERVED_CORES, default 0)
+        """
+        self.settings_path = settings_path or os.getenv("MODEL_TUNING_FILE", "./data/model_tuning.json")
+        self.reserved_cores = (
+            reserved_cores if reserved_cores is not None
+            else int(os.getenv("LOCAL_LLM_RESERVED_CORES", "0"))
+        )
+        self._profile = profile
+        self._settings: Optional[Dict[str, Dict]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def profile(self) -> HardwareProfile:
+        if self._profile is None:
+            self._profile = detect_hardware()
+            logger.info(f"Detected hardware: {self._profile.to_dict()}")
+        return self._profile
+
+    # ----- thread split -----
+
+    def thread_budget(self, concurrent: int = 1) -> int:
+        """
+        Threads for one model when `concurrent` models generate at once
+
+        Args:
+            concurrent: Models that can run simultaneously
+
+        Returns:
+            Usable physical cores divided between them, capped at one NUMA
+            node (remote memory traffic costs more than the extra cores gain)
+        """
+        usable = max(1, self.profile.physical_cores - self.reserved_cores)
+        share = max(1, usable // max(1, concurrent))
+        return min(share, self.profile.physical_cores_per_node)
+
+    def thread_candidates(self, budget: int) -> List[int]:
+        """Thread counts worth benchmarking up to `budget`"""
+        return sorted({max(1, budget * k // 4) for k in (1, 2, 3, 4)})
+
+    # ----- context -----
+
+    def context_size(
+        self,
+        requested: int,
+        model_bytes: int,
+        available_bytes: Optional[int] = None,
+        extra_bytes_per_token: int = 0
+    ) -> int:
+        """
+        Largest context (halving from `requested`) whose KV cache fits in free RAM
+
+        Args:
+            requested: Context length the model is configured for
+            model_bytes: Size of the weights file
+            available_bytes: Free RAM (read now when omitted)
+            extra_bytes_per_token: Other per-position buffers, e.g. the
+                logits_all buffer speculative decoding needs
+
+        Returns:
+            Context length, never below MIN_CONTEXT
+        """
+        if available_bytes is None:
+            available_bytes = psutil.virtual_memory().available
+        budget = max(0, available_bytes - model_bytes) * KV_MEMORY_FRACTION
+        per_token = model_bytes * KV_BYTES_PER_TOKEN_PER_WEIGHT_BYTE + extra_bytes_per_token
+        n_ctx = requested
+        while n_ctx > MIN_CONTEXT and n_ctx * per_token > budget:
+            n_ctx //= 2
+        return max(min(requested, MIN_CONTEXT), n_ctx)
+
+    # ----- settings -----
+
+    def settings_for(
+        self,
+        model_name: str,
+        model_path: str,
+        n_ctx: int,
+        concurrent: int = 1,
+        extra_bytes_per_token: int = 0
+    ) -> Dict[str, Any]:
+        """
+        Settings to load a model with
+
+        Args:
+            model_name: Model name (key for calibration results)
+            model_path: Weights file
+            n_ctx: Configured (maximum) context length
+            concurrent: Models that can run simultaneously
+            extra_bytes_per_token: Per-position memory besides the KV cache (see context_size)
+
+        Returns:
+            {"n_threads", "n_batch", "n_ctx", "source": "calibrated" | "hardware"}
+        """
+        model_bytes = os.path.getsize(model_path) if os.path.exists(model_path) else 0
+        budget = self.thread_budget(concurrent)
+        calibrated = self.calibrated(model_name, model_bytes)
+        return {
+            "n_threads": min(calibrated["n_threads"], budget) if calibrated else budget,
+            "n_batch": calibrated["n_batch"] if calibrated else DEFAULT_BATCH,
+            "n_ctx": self.context_size(n_ctx, model_bytes, extra_bytes_per_token=extra_bytes_per_token),
+            "source": "calibrated" if calibrated else "hardware",
+        }
+
+    def calibrated(self, model_name: str, model_bytes: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Persisted calibration for this model, if it matches this hardware and file"""
+        entry = self._load().get(model_name)
+        if not entry or entry.get("fingerprint") != self.profile.fingerprint:
+            return None
+        if model_bytes is not None and entry.get("file_bytes") != model_bytes:
+            return None
+        return entry
+
+    def all_settings(self) -> Dict[str, Dict]:
+        return dict(self._load())
+
+    def _load(self) -> Dict[str, Dict]:
+        if self._settings is None:
+            with self._lock:
+                if self._settings is None:
+                    try:
+                        with open(self.settings_path, "r", encoding="utf-8") as f:
+                            self._settings = json.load(f)
+                    except FileNotFoundError:
+                        self._settings = {}
+                    except (OSError, ValueError) as e:
+                        logger.warning(f"Ignoring unreadable tuning file {self.settings_path}: {e}")
+                        self._settings = {}
+        return self._settings
+
+    def _save(self, model_name: str, entry: Dict[str, Any]):
+        with self._lock:
+            settings = dict(self._settings or {})
+            settings[model_name] = entry
+            directory = os.path.dirname(os.path.abspath(self.settings_path))
+            os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.settings_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(settings, f, indent=2)
+            os.replace(tmp_path, self.settings_path)
+            self._settings = settings
+
+    # ----- calibration -----
+
+    def calibrate(
+        self,
+        model_name: str,
+        model_path: str,
+        factory: Callable[[int, int], Any],
+        thread_candidates: Optional[Iterable[int]] = None,
+        batch_candidates: Iterable[int] = (128, 256, 512),
+        max_tokens: int = 32
+    ) -> Dict[str, Any]:
+        """
+        Benchmark a model and persist the fastest settings
+
+        Generation speed is measured per thread count; prompt (prefill)
+        speed is then measured per batch size at the winning thread count.
+
+        Args:
+            model_name: Model name
+            model_path: Weights file
+            factory: factory(n_threads, n_batch) returns a llama.cpp-style callable model
+            thread_candidates: Thread counts to try (default: quarters of the full budget)
+            batch_candidates: n_batch values to try
+            max_tokens: Tokens generated per measurement
+
+        Returns:
+            The persisted entry: n_threads, n_batch, tokens_per_second,
+            prompt_tokens_per_second and every measurement
+        """
+        threads = sorted(set(thread_candidates or self.thread_candidates(self.thread_budget(1))))
+        runs: List[Dict[str, Any]] = []
+
+        generation = {}
+        for n_threads in threads:
+            model = factory(n_threads, DEFAULT_BATCH)
+            model("Hi", max_tokens=1, temperature=0.0)  # page weights in, warm caches
+            tps = self._throughput(model, GENERATION_PROMPT, max_tokens, "completion_tokens")
+            generation[n_threads] = tps
+            runs.append({"n_threads": n_threads, "n_batch": DEFAULT_BATCH, "tokens_per_second": tps})
+            del model
+        best_threads = max(generation, key=generation.get)
+
+        prefill = {}
+        for n_batch in sorted(set(batch_candidates)):
+            model = factory(best_threads, n_batch)
+            model("Hi", max_tokens=1, temperature=0.0)
+            pps = self._throughput(model, PREFILL_PROMPT, 1, "prompt_tokens")
+            prefill[n_batch] = pps
+            runs.append({"n_threads": best_threads, "n_batch": n_batch, "prompt_tokens_per_second": pps})
+            del model
+        best_batch = max(prefill, key=prefill.get)
+
+        entry = {
+            "n_threads": best_threads,
+            "n_batch": best_batch,
+            "tokens_per_second": generation[best_threads],
+            "prompt_tokens_per_second": prefill[best_batch],
+            "fingerprint": self.profile.fingerprint,
+            "file_bytes": os.path.getsize(model_path),
+            "calibrated_at": datetime.now(timezone.utc).isoformat(),
+            "runs": runs,
+        }
+        self._save(model_name, entry)
+        logger.info(
+            f"Calibrated {model_name}: n_threads={best_threads} ({entry['tokens_per_second']} tok/s), "
+            f"n_batch={best_batch} ({entry['prompt_tokens_per_second']} prompt tok/s)"
+        )
+        return entry
+
+    @staticmethod
+    def _throughput(model: Any, prompt: str, max_tokens: int, usage_key: str) -> float:
+        start = time.perf_counter()
+        result = model(prompt, max_tokens=max_tokens, temperature=0.0)
+        elapsed = max(time.perf_counter() - start, 1e-9)
+        tokens = (result.get("usage") or {}).get(usage_key) or 0
+        return round(tokens / elapsed, 2)
+
+
+# Global instance
+hardware_tuner = HardwareTuner()
@@ -0,0 +1,126 @@
+# Copyright (c) 2025 LALO AI LLC. All rights reserved.
+"""
+JSON Schema → llama.cpp Grammar
+
+Compiles the JSON schemas our structured prompts expect into GBNF, so
+llama.cpp can only sample tokens that keep the output valid JSON of that
+shape. Once the root object closes the grammar admits nothing but EOS,
+which ends generation there instead of at max_tokens.
+
+Supported subset: object (every listed property, in order, no extras),
+array (items, minItems, maxItems), string (maxLength), number, integer,
+boolean, null, enum, const and type lists such as ["string", "null"].
+Whitespace is limited to one optional space after ',' and ':' so the
+model cannot spend tokens on indentation.
+"""
+
+from typing import Any, Dict, List
+import json
+import re
+
+PRIMITIVES = {
+    "ws": '" "?',
+    "char": r'[^"\\\x00-\x1f] | "\\" (["\\/bfnrt] | "u" [0-9a-fA-F]{4})',
+    "string": r'"\"" char* "\""',
+    "integer": '"-"? ("0" | [1-9] [0-9]{0,15})',
+    "number": '"-"? ("0" | [1-9] [0-9]{0,15}) ("." [0-9]{1,16})? ([eE] [-+]? [0-9]{1,3})?',
+    "boolean": '"true" | "false"',
+    "null": '"null"',
+}
+
+# Rules each primitive depends on
+PRIMITIVE_DEPS = {"string": ["char"]}
+
+
+def gbnf_literal(text: str) -> str:
+    """Quote text as a GBNF string literal"""
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+class _GrammarBuilder:
+    def __init__(self):
+        self.rules: Dict[str, str] = {}
+
+    def add(self, name: str, body: str) -> str:
+        name = re.sub(r"[^a-zA-Z0-9-]+", "-", name).strip("-") or "rule"
+        if self.rules.get(name, body) != body:
+            suffix = 2
+            while f"{name}{suffix}" in self.rules and self.rules[f"{name}{suffix}"] != body:
+                suffix += 1
+            name = f"{name}{suffix}"
+        self.rules[name] = body
+        return name
+
+    def primitive(self, name: str) -> str:
+        for dep in PRIMITIVE_DEPS.get(name, []):
+            self.rules.setdefault(dep, PRIMITIVES[dep])
+        self.rules.setdefault(name, PRIMITIVES[name])
+        return name
+
+    def visit(self, schema: Dict[str, Any], name: str) -> str:
+        if "const" in schema:
+            return self.add(name, gbnf_literal(json.dumps(schema["const"])))
+        if "enum" in schema:
+            return self.add(name, " | ".join(gbnf_literal(json.dumps(v)) for v in schema["enum"]))
+
+        schema_type = schema.get("type")
+        if isinstance(schema_type, list):
+            alternatives = [self.visit({**schema, "type": t}, f"{name}-{t}") for t in schema_type]
+            return self.add(name, " | ".join(alternatives))
+        if schema_type == "object":
+            return self._object(schema, name)
+        if schema_type == "array":
+            return self._array(schema, name)
+        if schema_type == "string" and "maxLength" in schema:
+            self.primitive("char")
+            return self.add(name, f'"\\"" char{{0,{int(schema["maxLength"])}}} "\\""')
+        if schema_type in PRIMITIVES:
+            return self.primitive(schema_type)
+        raise ValueError(f"Unsupported JSON schema at {name}: {schema}")
+
+    def _object(self, schema: Dict[str, Any], name: str) -> str:
+        properties = schema.get("properties")
+        if not properties:
+            raise ValueError(f"Object schema at {name} needs properties")
+        self.primitive("ws")
+        parts = []
+        for key, prop in properties.items():
+            value = self.visit(prop, f"{name}-{key}")
+            parts.append(f'{gbnf_literal(json.dumps(key))} ":" ws {value}')
+        return self.add(name, '"{" ' + ' "," ws '.join(parts) + ' "}"')
+
+    def _array(self, schema: Dict[str, Any], name: str) -> str:
+        self.primitive("ws")
+        item = self.visit(schema.get("items", {"type": "string"}), f"{name}-item")
+        min_items = int(schema.get("minItems", 0))
+        max_items = schema.get("maxItems")
+        more = f'("," ws {item})'
+        if max_items is None:
+            items = f"{item} {more}{{{max(0, min_items - 1)},}}"
+        elif int(max_items) > 1:
+            items = f"{item} {more}{{{max(0, min_items - 1)},{int(max_items) - 1}}}"
+        else:
+            items = item
+        body = f'"[" {items} "]"' if min_items > 0 else f'"[" ({items})? "]"'
+        return self.add(name, body)
+
+
+def schema_to_gbnf(schema: Dict[str, Any]) -> str:
+    """
+    Compile a JSON schema to a GBNF grammar whose root rule is "root"
+
+    Args:
+        schema: JSON schema (see module docstring for the supported subset)
+
+    Returns:
+        Grammar text for LlamaGrammar.from_string
+
+    Raises:
+        ValueError: If the schema uses unsupported constructs
+    """
+    builder = _GrammarBuilder()
+    builder.rules["root"] = ""  # keep root first
+    top = builder.visit(schema, "root-value")
+    builder.rules["root"] = top
+    lines: List[str] = [f"{name} ::= {body}" for name, body in builder.rules.items()]
+    return "\n".join(lines) + "\n"
@@ -17,16 +17,37 @@ Optimized for 8GB RAM CPU-only development, scales to enterprise GPU clusters.
 """
 
 import os
+import re
+import json
 import logging
 import asyncio
-from typing import Dict, Optional, List, Any
+from functools import lru_cache
+from typing import Dict, Optional, List, Any, Iterable
 from concurrent.futures import ThreadPoolExecutor
 
+from .hardware_tuner import hardware_tuner
+from .json_grammar import schema_to_gbnf
+from .speculative_decoding import (
+    DEFAULT_VOCAB, DRAFT_MODELS, SPECULATIVE_ENABLED, SpeculativeDraft, logits_buffer_bytes,
+    logits_bytes_per_token, vocab_compatible
+)
+
 logger = logging.getLogger(__name__)
 
+# Weights are memory-mapped read-only (llama-cpp-python's own default), so
+# every worker process shares one copy through the page cache; false reads
+# them into private memory instead
+USE_MMAP = os.getenv("LOCAL_LLM_USE_MMAP", "true").lower() == "true"
+# Benchmark a model's thread/batch settings the first time it is loaded
+CALIBRATE_ON_LOAD = os.getenv("LOCAL_LLM_CALIBRATE_ON_LOAD", "false").lower() == "true"
+# Models whose pages are locked in RAM (never paged out); needs RLIMIT_MEMLOCK
+MLOCK_MODELS = {m.strip() for m in os.getenv("LOCAL_LLM_MLOCK_MODELS", "").split(",") if m.strip()}
+
+SMAPS_HEADER = re.compile(r"^[0-9a-f]+-[0-9a-f]+\s")
+
 # Try to import llama-cpp-python
 try:
-    from llama_cpp import Llama
+    from llama_cpp import Llama, LlamaGrammar
     LLAMA_CPP_AVAILABLE = True
 except ImportError:
     LLAMA_CPP_AVAILABLE = False
@@ -49,12 +70,18 @@ class LocalInferenceServer:
     def __init__(self, model_dir: str = "./models"):
         self.model_dir = model_dir
         self.models: Dict[str, Any] = {}  # Loaded model instances
+        self.model_paths: Dict[str, str] = {}  # Loaded model → weights file
+        self.model_settings: Dict[str, Dict[str, Any]] = {}  # Loaded model → tuned llama.cpp settings
+        self.drafts: Dict[str, SpeculativeDraft] = {}  # Loaded target → speculative draft
+        self.draft_models: Dict[str, Any] = {}  # Loaded target → its own draft Llama instance
+        self.structured_stats: Dict[str, Dict[str, int]] = {}  # Model → JSON-schema generation counters
+        # n_ctx is each model's maximum context; threads, batch and the
+        # effective context come from hardware_tuner at load time
         self.model_configs = {
             # ===== ROUTING & ORCHESTRATION =====
             "liquid-tool": {
                 "path": "liquid-tool/Liquid-1.2B-Tool-Q4_K_M.gguf",
                 "n_ctx": 2048,
-                "n_threads": 4,
                 "description": "Function calling, tool use, and request routing",
                 "specialty": "routing",
                 "priority": 1
@@ -64,45 +91,48 @@ class LocalInferenceServer:
             "deepseek-math": {
                 "path": "deepseek-math/deepseek-math-7b-instruct.Q4_K_M.gguf",
                 "n_ctx": 4096,
-                "n_threads": 6,
+                "n_vocab": 102400,
                 "description": "Mathematical reasoning, finance calculations, quantitative analysis",
                 "specialty": "math",
-                "priority": 1
+                "priority": 1,
+                "speculative": True
             },
 
             # ===== CODE GENERATION =====
             "deepseek-coder": {
                 "path": "deepseek-coder/deepseek-coder-6.7b-instruct.Q4_K_M.gguf",
                 "n_ctx": 4096,
-                "n_threads": 6,
+                "n_vocab": 32256,
                 "description": "Code generation, debugging, refactoring (Python, JS, Java, etc.)",
                 "specialty": "coding",
-                "priority": 1
+                "priority": 1,
+                "speculative": True
             },
 
             # ===== RESEARCH & ANALYSIS =====
             "openchat": {
                 "path": "openchat/openchat-3.5-0106.Q4_K_M.gguf",
                 "n_ctx": 4096,
-                "n_threads": 6,
+                "n_vocab": 32002,
                 "description": "Research synthesis, analysis, business intelligence",
                 "specialty": "research",
-                "priority": 1
+                "priority": 1,
+                "speculative": True
             },
             "mistral-instruct": {
                 "path": "mistral-instruct/mistral-7b-instruct-v0.2.Q4_K_M.gguf",
                 "n_ctx": 4096,
-                "n_threads": 6,
+                "n_vocab": 32000,
                 "description": "General reasoning, analysis, report generation",
                 "specialty": "research",
-                "priority": 1
+                "priority": 1,
+                "speculative": True
             },
 
             # ===== GENERAL PURPOSE =====
             "tinyllama": {
                 "path": "tinyllama/tinyllama-1.1b-chat-v1.0.Q4_K_M.gguf",
                 "n_ctx": 2048,
-                "n_threads": 4,
                 "description": "Fast general-purpose chat, quick responses",
                 "specialty": "general",
                 "priority": 1
@@ -112,7 +142,6 @@ class LocalInferenceServer:
             "phi-2": {
                 "path": "phi-2/phi-2.Q4_K_M.gguf",
                 "n_ctx": 2048,
-                "n_threads": 4,
                 "description": "Phi-2 for routing and general reasoning (replacement for liquid-tool)",
                 "specialty": "routing",
                 "priority": 1
@@ -122,15 +151,16 @@ class LocalInferenceServer:
             "qwen-0.5b": {
                 "path": "qwen-0.5b/qwen2.5-0.5b-instruct-q4_k_m.gguf",
                 "n_ctx": 512,  # Small context for fast loading (0.8s tested)
-                "n_threads": 4,  # Optimal for most CPUs
                 "description": "Ultra-fast confidence scoring and validation",
                 "specialty": "validation",
                 "priority": 1
             },
         }
 
-        # Thread pool for async execution (llama.cpp is blocking)
-        self.executor = ThreadPoolExecutor(max_workers=2)
+        # Thread pool for async execution (llama.cpp is blocking); at most
+        # this many models generate at once, so they split the cores this way
+        self.max_concurrent_generations = 2
+        self.executor = ThreadPoolExecutor(max_workers=self.max_concurrent_generations)
 
         logger.info(f"LocalInferenceServer initialized (llama.cpp available: {LLAMA_CPP_AVAILABLE})")
 
@@ -176,14 +206,57 @@ class LocalInferenceServer:
             return False
 
         try:
-            logger.info(f"Loading {model_name} from {model_path}")
+            if CALIBRATE_ON_LOAD and not hardware_tuner.calibrated(base_name, os.path.getsize(model_path)):
+                self.calibrate_model(base_name)
+
+            options = self._load_options(base_name, config, model_path)
+            concurrent = self._concurrency(len(self.models) + 1)
+            settings = hardware_tuner.settings_for(base_name, model_path, config["n_ctx"], concurrent=concurrent)
+            speculate = bool(SPECULATIVE_ENABLED and config.get("speculative"))
+            if speculate:
+                # The draft's logits_all buffer grows with the context like the KV cache
+                n_vocab = config.get("n_vocab", DEFAULT_VOCAB)
+                with_logits = hardware_tuner.settings_for(
+                    base_name, model_path, config["n_ctx"], concurrent=concurrent,
+                    extra_bytes_per_token=logits_bytes_per_token(n_vocab)
+                )
+                if with_logits["n_ctx"] < settings["n_ctx"]:
+                    logger.warning(
+                        f"Not speculating on {model_name}: its "
+                        f"{logits_buffer_bytes(settings['n_ctx'], n_vocab) / 1024**2:.0f} MB logits buffer "
+                        f"would shrink the context from {settings['n_ctx']} to {with_logits['n_ctx']}"
+                    )
+                    speculate = False
+            logger.info(
+                f"Loading {model_name} from {model_path} (mmap={options['use_mmap']}, mlock={options['use_mlock']}, "
+                f"threads={settings['n_threads']}, batch={settings['n_batch']}, ctx={settings['n_ctx']}, {settings['source']})"
+            )
+
+            draft = None
+            if speculate:
+                # llama.cpp needs the draft at construction (it keeps logits for every position)
+                draft = SpeculativeDraft(model_name)
+                options["draft_model"] = draft
 
             self.models[model_name] = Llama(
                 model_path=model_path,
-                n_ctx=config["n_ctx"],
-                n_threads=config["n_threads"],
-                verbose=False
+                n_ctx=settings["n_ctx"],
+                n_threads=settings["n_threads"],
+                n_batch=settings["n_batch"],
+                verbose=False,
+                **options
             )
+            self.model_paths[model_name] = model_path
+            # Memory options as applied (mlock may have been skipped for RLIMIT_MEMLOCK)
+            self.model_settings[model_name] = {
+                **settings, "base_name": base_name,
+                "use_mmap": options["use_mmap"], "use_mlock": options["use_mlock"],
+                "mlock_requested": self._mlock_requested(base_name, config),
+            }
+            if draft is not None:
+                self.drafts[model_name] = draft
+                self._attach_draft_model(model_name, base_name, settings)
+            self._rebalance_threads()
 
             logger.info(f"✓ {model_name} loaded successfully")
             return True
@@ -192,6 +265,162 @@ class LocalInferenceServer:
             logger.error(f"Failed to load {model_name}: {e}")
             return False
 
+    def _load_options(self, model_name: str, config: Dict, model_path: str) -> Dict[str, bool]:
+        """
+        Memory options for a model: read-only mmap (shared page cache) and
+        optional mlock for pinned models ("pinned" in config or LOCAL_LLM_MLOCK_MODELS)
+        """
+        use_mmap = config.get("use_mmap", USE_MMAP)
+        use_mlock = self._mlock_requested(model_name, config)
+        if use_mlock:
+            limit = memlock_limit()
+            size = os.path.getsize(model_path)
+            if limit is not None and limit < size:
+                logger.warning(
+                    f"Not pinning {model_name}: RLIMIT_MEMLOCK is {limit} bytes, model is {size} bytes "
+                    f"(raise it with 'ulimit -l' or LimitMEMLOCK=)"
+                )
+                use_mlock = False
+        return {"use_mmap": use_mmap, "use_mlock": use_mlock}
+
+    @staticmethod
+    def _mlock_requested(model_name: str, config: Dict) -> bool:
+        return bool(config.get("pinned") or model_name in MLOCK_MODELS)
+
+    def _attach_draft_model(self, model_name: str, base_name: str, settings: Dict[str, Any]):
+        """
+        Draft with a smaller model when one is paired with this target and
+        shares its vocabulary; otherwise the draft keeps using prompt lookup
+        """
+        draft_name = DRAFT_MODELS.get(base_name) or self.model_configs[base_name].get("draft_model")
+        if not draft_name:
+            return
+        draft_config = self.model_configs.get(draft_name)
+        draft_path = os.path.join(self.model_dir, draft_config["path"]) if draft_config else None
+        if not draft_path or not os.path.exists(draft_path):
+            logger.warning(f"Draft model {draft_name} for {model_name} is not available; using prompt lookup")
+            return
+
+        # A dedicated instance: the draft's KV cache follows the target's
+        # context, so it cannot be shared with requests to the small model.
+        # Its weights are mmap'd, so the page cache holds them only once.
+        draft_llama = Llama(
+            model_path=draft_path,
+            n_ctx=settings["n_ctx"],
+            n_threads=settings["n_threads"],
+            n_batch=settings["n_batch"],
+            use_mmap=True,
+            verbose=False,
+        )
+        if not vocab_compatible(self.models[model_name], draft_llama):
+            logger.warning(f"Draft model {draft_name} does not share {model_name}'s vocabulary; using prompt lookup")
+            return
+        self.draft_models[model_name] = draft_llama
+        self.drafts[model_name].use_model(draft_llama, draft_name)
+        logger.info(f"Speculative decoding for {model_name} drafts with {draft_name}")
+
+    def get_speculative_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Draft source, acceptance rate and fallback state per loaded target model"""
+        return {name: draft.stats() for name, draft in self.drafts.items()}
+
+    def _concurrency(self, resident: int) -> int:
+        """Models that can generate at the same time with `resident` loaded"""
+        return max(1, min(resident, self.max_concurrent_generations))
+
+    def _rebalance_threads(self):
+        """
+        Re-split the cores after a load/unload so resident models neither
+        oversubscribe the CPU nor leave cores idle
+        """
+        concurrent = self._concurrency(len(self.models))
+        for name, model in self.models.items():
+            settings = self.model_settings.get(name)
+            if not settings:
+                continue
+            path = self.model_paths[name]
+            calibrated = hardware_tuner.calibrated(settings["base_name"], os.path.getsize(path) if os.path.exists(path) else None)
+            budget = hardware_tuner.thread_budget(concurrent)
+            n_threads = min(calibrated["n_threads"], budget) if calibrated else budget
+            if n_threads != settings["n_threads"] and set_model_threads(model, n_threads):
+                logger.info(f"Rebalanced {name}: {settings['n_threads']} -> {n_threads} threads")
+                settings["n_threads"] = n_threads
+
+    def calibrate_model(self, model_name: str) -> Dict[str, Any]:
+        """
+        Benchmark thread counts and batch sizes for a model and persist the best
+
+        Args:
+            model_name: Model to calibrate (must be downloaded)
+
+        Returns:
+            Calibration entry (see HardwareTuner.calibrate)
+
+        Raises:
+            RuntimeError: If llama.cpp is unavailable
+            ValueError: If the model is unknown or not downloaded
+        """
+        if not LLAMA_CPP_AVAILABLE:
+            raise RuntimeError("llama-cpp-python not installed")
+        if model_name not in self.model_configs:
+            raise ValueError(f"Unknown model: {model_name}")
+        model_path = os.path.join(self.model_dir, self.model_configs[model_name]["path"])
+        if not os.path.exists(model_path):
+            raise ValueError(f"Model file not found: {model_path}")
+
+        def _factory(n_threads: int, n_batch: int):
+            return Llama(
+                model_path=model_path,
+                n_ctx=min(self.model_configs[model_name]["n_ctx"], 1024),
+                n_threads=n_threads,
+                n_batch=n_batch,
+                use_mmap=True,
+                verbose=False,
+            )
+
+        logger.info(f"Calibrating {model_name} on {hardware_tuner.profile.fingerprint}")
+        return hardware_tuner.calibrate(model_name, model_path, _factory)
+
+    def get_memory_stats(self) -> Dict[str, Any]:
+        """
+        Memory used by this process and by each loaded model's weights
+
+        RSS counts shared page-cache pages in every process that maps them;
+        PSS divides them between those processes, so summing PSS across
+        workers gives the real footprint.
+
+        Per model, "mlock_requested" is the configuration and "mlocked" whether
+        the load asked llama.cpp to lock it; mapped_locked_bytes shows what the
+        kernel actually locked.
+
+        Returns:
+            Dict with pid, rss/pss/uss bytes and per-model mapped residency
+        """
+        info = {"pid": os.getpid(), "use_mmap": USE_MMAP}
+        try:
+            import psutil
+            mem = psutil.Process().memory_full_info()
+            info.update({
+                "rss_bytes": mem.rss,
+                "pss_bytes": getattr(mem, "pss", None),
+                "uss_bytes": getattr(mem, "uss", None),
+            })
+        except Exception as e:
+            logger.debug(f"Process memory info unavailable: {e}")
+
+        mapped = mapped_file_memory(self.model_paths.values())
+        info["models"] = {}
+        for name, path in self.model_paths.items():
+            settings = self.model_settings.get(name, {})
+            info["models"][name] = {
+                "path": path,
+                "file_bytes": os.path.getsize(path) if os.path.exists(path) else None,
+                "use_mmap": settings.get("use_mmap"),
+                "mlock_requested": bool(settings.get("mlock_requested")),
+                "mlocked": bool(settings.get("use_mlock")),
+                **mapped.get(os.path.realpath(path), {}),
+            }
+        return info
+
     def _heuristic_generate(self, prompt: str, model_name: Optional[str] = None) -> str:
         """
         Lightweight heuristic generator used when models are not available.
@@ -276,7 +505,12 @@ class LocalInferenceServer:
         """Unload a model to free memory"""
         if model_name in self.models:
             del self.models[model_name]
+            self.model_paths.pop(model_name, None)
+            self.model_settings.pop(model_name, None)
+            self.drafts.pop(model_name, None)
+            self.draft_models.pop(model_name, None)
             logger.info(f"Unloaded {model_name}")
+            self._rebalance_threads()
 
     def unload_all_models(self):
         """Unload all models"""
@@ -291,6 +525,7 @@ class LocalInferenceServer:
         temperature: float = 0.7,
         top_p: float = 0.95,
         stop: Optional[List[str]] = None,
+        json_schema: Optional[Dict[str, Any]] = None,
         **kwargs
     ) -> str:
         """
@@ -303,6 +538,9 @@ class LocalInferenceServer:
             temperature: Sampling temperature (0-1)
             top_p: Top-p sampling (0-1)
             stop: Stop sequences
+            json_schema: Constrain the output to JSON matching this schema
+                (compiled to a llama.cpp grammar; decoding ends when the
+                object closes, so max_tokens is only a cap)
             **kwargs: Additional llama.cpp parameters
 
         Returns:
@@ -312,43 +550,92 @@ class LocalInferenceServer:
             ValueError: If model not available
             RuntimeError: If generation fails
         """
+        result = await self.generate_with_usage(
+            prompt,
+            model_name=model_name,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            top_p=top_p,
+            stop=stop,
+            json_schema=json_schema,
+            **kwargs
+        )
+        return result["text"]
+
+    async def generate_with_usage(
+        self,
+        prompt: str,
+        model_name: str = "tinyllama",
+        max_tokens: int = 512,
+        temperature: float = 0.7,
+        top_p: float = 0.95,
+        stop: Optional[List[str]] = None,
+        json_schema: Optional[Dict[str, Any]] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Generate text and return the token usage reported by llama.cpp
+
+        Same arguments as generate().
+
+        Returns:
+            {"text": str, "usage": {"prompt_tokens", "completion_tokens", "total_tokens"} or None,
+             "speculative": {"source", "drafted", "accepted", "acceptance_rate"} or None}
+            usage is None when the heuristic generator answered; speculative is
+            None unless the model decodes speculatively.
+        """
         # DEMO MODE: Always use heuristic fallback (model loading is too slow for demo)
-        import os
         if os.getenv("DEMO_MODE", "false").lower() == "true":
             logger.info(f"[DEMO] Using heuristic generation for {model_name} (DEMO_MODE enabled)")
-            return self._heuristic_generate(prompt, model_name)
+            return {"text": self._heuristic_generate(prompt, model_name), "usage": None}
 
         if not LLAMA_CPP_AVAILABLE:
             # Use heuristic generator when llama-cpp not installed to allow tests/demo runs
             logger.warning("llama-cpp-python not installed - using heuristic generator for demo responses")
-            return self._heuristic_generate(prompt, model_name)
+            return {"text": self._heuristic_generate(prompt, model_name), "usage": None}
 
         # Load model if not already loaded
         if model_name not in self.models:
             if not self.load_model(model_name):
                 # Fallback to heuristic generator instead of failing hard
                 logger.warning(f"Falling back to heuristic generator for model: {model_name}")
-                return self._heuristic_generate(prompt, model_name)
+                return {"text": self._heuristic_generate(prompt, model_name), "usage": None}
 
         model = self.models[model_name]
 
         # Run inference in thread pool (llama.cpp is blocking)
         loop = asyncio.get_event_loop()
 
+        draft = self.drafts.get(model_name)
+
         def _generate():
-            return model(
-                prompt,
-                max_tokens=max_tokens,
-                temperature=temperature,
-                top_p=top_p,
-                stop=stop or [],
-                echo=False,
-                **kwargs
-            )
+            self._begin_speculation(model, draft)
+            try:
+                result = model(
+                    prompt,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    top_p=top_p,
+                    stop=stop or [],
+                    echo=False,
+                    **kwargs
+                )
+            finally:
+                speculative = draft.end() if draft else None
+            return result, speculative
 
         try:
-            result = await loop.run_in_executor(self.executor, _generate)
-            return result['choices'][0]['text'].strip()
+            if json_schema is not None:
+                kwargs["grammar"] = LlamaGrammar.from_string(compile_json_grammar(json.dumps(json_schema, sort_keys=True)), verbose=False)
+            result, speculative = await loop.run_in_executor(self.executor, _generate)
+            text = result['choices'][0]['text'].strip()
+            if json_schema is not None:
+                self._record_structured(model_name, text, result.get('usage'), max_tokens)
+            return {
+                "text": text,
+                "usage": result.get('usage'),
+                "speculative": speculative,
+            }
         except Exception as e:
             logger.error(f"Generation failed with {model_name}: {e}")
             raise RuntimeError(f"Generation failed: {e}")
@@ -390,9 +677,11 @@ class LocalInferenceServer:
                 return
 
         model = self.models[model_name]
+        draft = self.drafts.get(model_name)
         loop = asyncio.get_event_loop()
 
         def _generate_stream():
+            self._begin_speculation(model, draft)
             return model(
                 prompt,
                 max_tokens=max_tokens,
@@ -412,6 +701,32 @@ class LocalInferenceServer:
         except Exception as e:
             logger.error(f"Streaming failed with {model_name}: {e}")
             raise RuntimeError(f"Streaming failed: {e}")
+        finally:
+            if draft:
+                draft.end()
+
+    def _record_structured(self, model_name: str, text: str, usage: Optional[Dict], max_tokens: int):
+        """Count a JSON-schema generation: parse failures and the max_tokens budget left unused"""
+        stats = self.structured_stats.setdefault(
+            model_name, {"requests": 0, "parse_failures": 0, "completion_tokens": 0, "tokens_saved": 0}
+        )
+        stats["requests"] += 1
+        try:
+            json.loads(text)
+        except ValueError:
+            # Only possible when max_tokens cut the object short
+            stats["parse_failures"] += 1
+            logger.warning(f"Structured output from {model_name} did not parse (max_tokens={max_tokens})")
+        completion_tokens = (usage or {}).get("completion_tokens")
+        if completion_tokens is not None:
+            stats["completion_tokens"] += completion_tokens
+            stats["tokens_saved"] += max(0, max_tokens - completion_tokens)
+
+    @staticmethod
+    def _begin_speculation(model: Any, draft: Optional[SpeculativeDraft]):
+        """Attach the draft for this generation, or detach it while its fallback is in effect"""
+        if draft is not None:
+            model.draft_model = draft if draft.begin() else None
 
     def get_available_models(self) -> List[Dict[str, Any]]:
         """
@@ -432,7 +747,8 @@ class LocalInferenceServer:
                 "path": model_path,
                 "downloaded": exists,
                 "loaded": loaded,
-                "n_ctx": config["n_ctx"]
+                "n_ctx": config["n_ctx"],
+                "settings": self.model_settings.get(name)
             })
 
         return available
@@ -454,5 +770,83 @@ class LocalInferenceServer:
         logger.info("LocalInferenceServer shutdown complete")
 
 
+@lru_cache(maxsize=64)
+def compile_json_grammar(schema_json: str) -> str:
+    """GBNF for a JSON schema (cached by its canonical JSON text)"""
+    return schema_to_gbnf(json.loads(schema_json))
+
+
+def set_model_threads(model: Any, n_threads: int) -> bool:
+    """
+    Change the thread count of a loaded llama.cpp model in place
+
+    Returns:
+        True if applied; False if this llama-cpp-python build cannot
+        (the new count then applies from the next load)
+    """
+    try:
+        import llama_cpp
+        llama_cpp.llama_set_n_threads(model.ctx, n_threads, n_threads)
+    except Exception as e:
+        logger.debug(f"Cannot change threads of a loaded model: {e}")
+        return False
+    model.n_threads = n_threads
+    model.n_threads_batch = n_threads
+    return True
+
+
+def memlock_limit() -> Optional[int]:
+    """Soft RLIMIT_MEMLOCK in bytes, or None if unlimited/unknown"""
+    try:
+        import resource
+        soft, _ = resource.getrlimit(resource.RLIMIT_MEMLOCK)
+        return None if soft == resource.RLIM_INFINITY else soft
+    except (ImportError, AttributeError, ValueError, OSError):
+        return None
+
+
+def mapped_file_memory(paths: Iterable[str], smaps_path: str = "/proc/self/smaps") -> Dict[str, Dict[str, int]]:
+    """
+    Resident memory of file mappings, from /proc/<pid>/smaps (Linux)
+
+    Args:
+        paths: Files of interest (e.g. memory-mapped GGUF weights)
+        smaps_path: smaps file to read (defaults to this process)
+
+    Returns:
+        {realpath: {"mapped_rss_bytes", "mapped_pss_bytes", "mapped_shared_bytes",
+        "mapped_private_bytes", "mapped_locked_bytes"}}; empty where smaps is unavailable
+    """
+    wanted = {os.path.realpath(p) for p in paths}
+    totals: Dict[str, Dict[str, int]] = {}
+    if not wanted or not os.path.exists(smaps_path):
+        return totals
+
+    fields = {
+        "Rss": "mapped_rss_bytes",
+        "Pss": "mapped_pss_bytes",
+        "Shared_Clean": "mapped_shared_bytes",
+        "Shared_Dirty": "mapped_shared_bytes",
+        "Private_Clean": "mapped_private_bytes",
+        "Private_Dirty": "mapped_private_bytes",
+        "Locked": "mapped_locked_bytes",
+    }
+    current = None
+    with open(smaps_path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            if SMAPS_HEADER.match(line):
+                # Mapping header: "start-end perms offset dev inode [path]"
+                parts = line.split(None, 5)
+                path = parts[5].strip() if len(parts) > 5 else ""
+                current = path if path in wanted else None
+                if current and current not in totals:
+                    totals[current] = {key: 0 for key in set(fields.values())}
+                continue
+            head, _, rest = line.partition(":")
+            if current and head in fields:
+                totals[current][fields[head]] += int(rest.split()[0]) * 1024
+    return totals
+
+
 # Global instance
 local_llm_service = LocalInferenceServer()
@@ -66,6 +66,28 @@ class RTIClient:
                     "retrieved_examples": []
                 }
 
+    async def add_plan_examples(self, plans: List[Dict]) -> Dict:
+        """
+        Append successful plans to RTI's persistent plan-example index
+
+        Args:
+            plans: Dicts with request, plan, rating and session_id
+
+        Returns:
+            added/skipped counts, or an error entry if RTI is unreachable
+        """
+        async with httpx.AsyncClient() as client:
+            try:
+                response = await client.post(
+                    f"{self.base_url}/plans",
+                    json={"plans": plans},
+                    timeout=10.0
+                )
+                response.raise_for_status()
+                return response.json()
+            except Exception as e:
+                return {"added": 0, "error": str(e)}
+
 
 class MCPClient:
     """Client for Model Control Protocol service"""
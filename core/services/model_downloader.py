@@ -0,0 +1,516 @@
+# Copyright (c) 2025 LALO AI LLC. All rights reserved.
+"""
+Model Download Manager
+
+In-process, resumable downloads of model files (multi-GB GGUFs).
+- Jobs queue behind a concurrency limit (MODEL_DOWNLOAD_CONCURRENCY files at once)
+- Files served with range support are split into chunks fetched over
+  several connections (MODEL_DOWNLOAD_CONNECTIONS) into a preallocated .part file
+- Completed chunks are recorded next to the .part file, so an interrupted
+  download resumes with range requests for the missing chunks only
+- The finished file is checked against its SHA-256 (given explicitly or
+  taken from the Hugging Face X-Linked-ETag header, which is sent on the
+  /resolve/ redirect) before it is moved into place
+- Free disk space is checked before anything is written
+- Byte-level progress is available per model for the status endpoints
+"""
+
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import time
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+SHA256_RE = re.compile(r"^[0-9a-f]{64}$")
+# Received bytes are written to disk in blocks of this size
+WRITE_BUFFER_BYTES = 1024 * 1024
+
+
+class InsufficientDiskSpaceError(Exception):
+    """Not enough free space for the remaining bytes of a download"""
+
+
+class ChecksumMismatchError(Exception):
+    """Downloaded file does not match its expected SHA-256"""
+
+
+@dataclass
+class DownloadJob:
+    """State of one model download"""
+    model_name: str
+    url: str
+    dest_path: str
+    sha256: Optional[str] = None
+    status: str = "queued"  # queued, downloading, verifying, downloaded, error, cancelled
+    total_bytes: Optional[int] = None
+    downloaded_bytes: int = 0
+    resumed_bytes: int = 0
+    accept_ranges: bool = False
+    etag: Optional[str] = None
+    error: Optional[str] = None
+    queued_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def part_path(self) -> str:
+        return self.dest_path + ".part"
+
+    @property
+    def state_path(self) -> str:
+        return self.dest_path + ".part.json"
+
+    def to_dict(self) -> Dict:
+        progress = None
+        if self.status == "downloaded":
+            progress = 100.0
+        elif self.total_bytes:
+            progress = round(100.0 * self.downloaded_bytes / self.total_bytes, 1)
+
+        speed = None
+        eta = None
+        if self.started_at and self.status in ("downloading", "verifying"):
+            elapsed = time.time() - self.started_at
+            fetched = self.downloaded_bytes - self.resumed_bytes
+            if elapsed > 0:
+                speed = fetched / elapsed
+                if speed > 0 and self.total_bytes:
+                    eta = (self.total_bytes - self.downloaded_bytes) / speed
+
+        return {
+            "model_name": self.model_name,
+            "status": self.status,
+            "progress": progress,
+            "downloaded_bytes": self.downloaded_bytes,
+            "total_bytes": self.total_bytes,
+            "resumed_bytes": self.resumed_bytes,
+            "speed_bps": round(speed) if speed is not None else None,
+            "eta_seconds": round(eta, 1) if eta is not None else None,
+            "error": self.error,
+        }
+
+
+class ModelDownloadManager:
+    """
+    Queue of resumable, verified, parallel model downloads
+    """
+
+    def __init__(
+        self,
+        max_concurrent_downloads: Optional[int] = None,
+        connections_per_file: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        min_free_bytes: Optional[int] = None,
+        retries: Optional[int] = None,
+        timeout: float = 60.0
+    ):
+        """
+        Initialize download manager
+
+        Args:
+            max_concurrent_downloads: Files downloaded at once (MODEL_DOWNLOAD_CONCURRENCY, default 2)
+            connections_per_file: Parallel range requests per file (MODEL_DOWNLOAD_CONNECTIONS, default 4)
+            chunk_size: Bytes per range request (MODEL_DOWNLOAD_CHUNK_MB, default 16 MB)
+            min_free_bytes: Free space to leave after a download (MODEL_DOWNLOAD_MIN_FREE_MB, default 512 MB)
+            retries: Attempts per chunk after the first (MODEL_DOWNLOAD_RETRIES, default 3)
+            timeout: HTTP timeout per read in seconds
+        """
+        self.max_concurrent_downloads = max_concurrent_downloads or int(os.getenv("MODEL_DOWNLOAD_CONCURRENCY", "2"))
+        self.connections_per_file = connections_per_file or int(os.getenv("MODEL_DOWNLOAD_CONNECTIONS", "4"))
+        self.chunk_size = chunk_size or int(float(os.getenv("MODEL_DOWNLOAD_CHUNK_MB", "16")) * 1024 * 1024)
+        self.min_free_bytes = (
+            min_free_bytes if min_free_bytes is not None
+            else int(float(os.getenv("MODEL_DOWNLOAD_MIN_FREE_MB", "512")) * 1024 * 1024)
+        )
+        self.retries = retries if retries is not None else int(os.getenv("MODEL_DOWNLOAD_RETRIES", "3"))
+        self.timeout = timeout
+
+        self.jobs: Dict[str, DownloadJob] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        # Placeholder per model while enqueue() probes, so a second call waits instead of starting a duplicate
+        self._enqueuing: Dict[str, asyncio.Future] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._listeners: List[Callable[[DownloadJob], None]] = []
+
+    def _bind_loop(self):
+        """The HTTP client and queue semaphore belong to the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._client = None
+            self._semaphore = asyncio.Semaphore(self.max_concurrent_downloads)
+
+    def _http(self) -> httpx.AsyncClient:
+        self._bind_loop()
+        if self._client is None or self._client.is_closed:
+            limits = httpx.Limits(max_connections=self.max_concurrent_downloads * self.connections_per_file + 4)
+            self._client = httpx.AsyncClient(follow_redirects=True, timeout=self.timeout, limits=limits)
+        return self._client
+
+    # ----- public API -----
+
+    def add_listener(self, callback: Callable[[DownloadJob], None]):
+        """Register a callback run whenever a download finishes, fails or is cancelled"""
+        self._listeners.append(callback)
+
+    def _notify(self, job: DownloadJob):
+        for callback in self._listeners:
+            try:
+                callback(job)
+            except Exception as e:
+                logger.warning(f"Download listener failed for {job.model_name}: {e}")
+
+    def get(self, model_name: str) -> Optional[DownloadJob]:
+        return self.jobs.get(model_name)
+
+    def is_active(self, model_name: str) -> bool:
+        task = self._tasks.get(model_name)
+        return task is not None and not task.done()
+
+    def list_jobs(self) -> List[Dict]:
+        return [job.to_dict() for job in self.jobs.values()]
+
+    async def enqueue(
+        self,
+        model_name: str,
+        url: str,
+        dest_path: str,
+        sha256: Optional[str] = None
+    ) -> DownloadJob:
+        """
+        Probe the file, check disk space and queue the download
+
+        Args:
+            model_name: Model key (one job per model at a time)
+            url: File URL
+            dest_path: Final path of the model file
+            sha256: Expected SHA-256 (defaults to the server's linked ETag if it is one)
+
+        Returns:
+            The queued DownloadJob
+
+        Raises:
+            InsufficientDiskSpaceError: If the remaining bytes do not fit on disk
+            httpx.HTTPError: If the file cannot be probed
+        """
+        pending = self._enqueuing.get(model_name)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        if self.is_active(model_name):
+            return self.jobs[model_name]
+
+        placeholder = asyncio.get_running_loop().create_future()
+        # Callers that gave up on the placeholder must not trigger "exception never retrieved"
+        placeholder.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._enqueuing[model_name] = placeholder
+        try:
+            job = DownloadJob(model_name=model_name, url=url, dest_path=dest_path, sha256=sha256)
+            await self._probe(job)
+            self._preflight(job)
+
+            self.jobs[model_name] = job
+            task = asyncio.create_task(self._run(job), name=f"model-download:{model_name}")
+            self._tasks[model_name] = task
+            task.add_done_callback(lambda t: self._forget(model_name, t))
+            placeholder.set_result(job)
+        except asyncio.CancelledError:
+            placeholder.cancel()
+            raise
+        except Exception as e:
+            placeholder.set_exception(e)
+            raise
+        finally:
+            self._enqueuing.pop(model_name, None)
+        logger.info(f"Queued download of {model_name} ({job.total_bytes or 'unknown'} bytes)")
+        return job
+
+    def _forget(self, model_name: str, task: asyncio.Task):
+        if self._tasks.get(model_name) is task:
+            del self._tasks[model_name]
+
+    async def wait(self, model_name: str, timeout: Optional[float] = None):
+        task = self._tasks.get(model_name)
+        if task is not None:
+            await asyncio.wait_for(asyncio.shield(task), timeout=timeout)
+
+    def cancel(self, model_name: str) -> bool:
+        """Stop a download; its .part file is kept so it can resume later"""
+        task = self._tasks.get(model_name)
+        if task is None or task.done():
+            return False
+        task.cancel()
+        return True
+
+    async def shutdown(self):
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    # ----- probing -----
+
+    async def _probe(self, job: DownloadJob):
+        """Learn size, range support and checksum from a HEAD request"""
+        response = await self._http().head(job.url)
+        probes = [response]
+        if response.status_code >= 400 or "content-length" not in response.headers:
+            # Some servers do not answer HEAD; a 1-byte range tells us the same
+            async with self._http().stream("GET", job.url, headers={"Range": "bytes=0-0"}) as ranged:
+                ranged.raise_for_status()
+                content_range = ranged.headers.get("content-range", "")
+                if ranged.status_code == 206 and "/" in content_range and not content_range.endswith("*"):
+                    job.total_bytes = int(content_range.rsplit("/", 1)[1])
+                    job.accept_ranges = True
+                elif "content-length" in ranged.headers:
+                    job.total_bytes = int(ranged.headers["content-length"])
+                headers = ranged.headers
+                probes.append(ranged)
+        else:
+            headers = response.headers
+            job.total_bytes = int(headers["content-length"])
+            job.accept_ranges = headers.get("accept-ranges", "").lower() == "bytes"
+
+        etag = self._linked_etag(probes) or headers.get("etag") or ""
+        if etag.startswith("W/"):
+            etag = etag[2:]
+        etag = etag.strip('"')
+        job.etag = etag or None
+        if job.sha256 is None and SHA256_RE.match(etag.lower()):
+            job.sha256 = etag.lower()
+
+    @staticmethod
+    def _linked_etag(probes: List[httpx.Response]) -> Optional[str]:
+        """
+        X-Linked-ETag of a probe or of any redirect it followed
+
+        Hugging Face /resolve/ URLs send it on the 302, not on the CDN
+        response the client ends up at.
+        """
+        for probe in reversed(probes):
+            for hop in [probe, *reversed(probe.history)]:
+                if "x-linked-etag" in hop.headers:
+                    return hop.headers["x-linked-etag"]
+        return None
+
+    def _preflight(self, job: DownloadJob):
+        """Refuse downloads that would leave less than min_free_bytes free"""
+        directory = os.path.dirname(os.path.abspath(job.dest_path))
+        os.makedirs(directory, exist_ok=True)
+        if job.total_bytes is None:
+            return
+        # The chunked .part file is preallocated to full size, so its length says
+        # nothing about progress; only chunks recorded in .part.json count
+        already = 0
+        if job.accept_ranges:
+            already = sum(end - start + 1 for i, start, end in self._chunks(job.total_bytes) if i in self._load_state(job))
+        needed = max(0, job.total_bytes - already)
+        free = shutil.disk_usage(directory).free
+        if free - needed < self.min_free_bytes:
+            raise InsufficientDiskSpaceError(
+                f"{job.model_name} needs {needed} bytes but only {free} are free "
+                f"(keeping {self.min_free_bytes} in reserve)"
+            )
+
+    # ----- download -----
+
+    async def _run(self, job: DownloadJob):
+        self._bind_loop()
+        try:
+            async with self._semaphore:
+                job.status = "downloading"
+                job.started_at = time.time()
+                if job.accept_ranges and job.total_bytes:
+                    await self._download_chunked(job)
+                else:
+                    await self._download_stream(job)
+
+                job.status = "verifying"
+                await asyncio.to_thread(self._verify, job)
+                os.replace(job.part_path, job.dest_path)
+                if os.path.exists(job.state_path):
+                    os.remove(job.state_path)
+
+                job.status = "downloaded"
+                job.finished_at = time.time()
+                logger.info(
+                    f"Downloaded {job.model_name}: {job.downloaded_bytes} bytes in "
+                    f"{job.finished_at - job.started_at:.1f}s ({job.resumed_bytes} resumed)"
+                )
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+            raise
+        except Exception as e:
+            job.status = "error"
+            job.error = str(e)
+            job.finished_at = time.time()
+            logger.error(f"Download of {job.model_name} failed: {e}")
+        finally:
+            self._notify(job)
+
+    def _load_state(self, job: DownloadJob) -> set:
+        """Completed chunk indexes from a previous attempt at the same file"""
+        if not (os.path.exists(job.state_path) and os.path.exists(job.part_path)):
+            return set()
+        try:
+            with open(job.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return set()
+        same_file = (
+            state.get("url") == job.url
+            and state.get("total_bytes") == job.total_bytes
+            and state.get("chunk_size") == self.chunk_size
+            and state.get("etag") == job.etag
+            and os.path.getsize(job.part_path) == job.total_bytes
+        )
+        return set(state.get("done", [])) if same_file else set()
+
+    def _save_state(self, job: DownloadJob, done: set):
+        tmp = job.state_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({
+                "url": job.url,
+                "total_bytes": job.total_bytes,
+                "chunk_size": self.chunk_size,
+                "etag": job.etag,
+                "done": sorted(done)
+            }, f)
+        os.replace(tmp, job.state_path)
+
+    def _chunks(self, total: int) -> List[tuple]:
+        """(index, first byte, last byte) of each range request"""
+        return [(i, start, min(start + self.chunk_size, total) - 1)
+                for i, start in enumerate(range(0, total, self.chunk_size))]
+
+    async def _download_chunked(self, job: DownloadJob):
+        total = job.total_bytes
+        chunks = self._chunks(total)
+        done = self._load_state(job)
+        if not done:
+            # Fresh start: preallocate (sparse) so chunks can be written in any order
+            with open(job.part_path, "wb") as f:
+                f.truncate(total)
+            self._save_state(job, done)
+
+        job.resumed_bytes = sum(end - start + 1 for i, start, end in chunks if i in done)
+        job.downloaded_bytes = job.resumed_bytes
+        if done:
+            logger.info(f"Resuming {job.model_name}: {len(done)}/{len(chunks)} chunks on disk")
+
+        connections = asyncio.Semaphore(self.connections_per_file)
+        state_lock = asyncio.Lock()
+        failed = asyncio.Event()
+        fd = os.open(job.part_path, os.O_RDWR)
+
+        async def _chunk(index: int, start: int, end: int):
+            async with connections:
+                if failed.is_set():
+                    # Another chunk gave up; leave this one for the resume
+                    return
+                try:
+                    await self._fetch_range(job, fd, start, end)
+                except Exception:
+                    failed.set()
+                    raise
+            async with state_lock:
+                done.add(index)
+                await asyncio.to_thread(self._save_state, job, set(done))
+
+        try:
+            # In-flight chunks finish (and are recorded) even if another chunk fails
+            results = await asyncio.gather(
+                *(_chunk(i, s, e) for i, s, e in chunks if i not in done),
+                return_exceptions=True
+            )
+        finally:
+            os.close(fd)
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if errors:
+            raise errors[0]
+
+    async def _fetch_range(self, job: DownloadJob, fd: int, start: int, end: int):
+        """Fetch bytes start..end (inclusive) into the .part file, with retries"""
+        expected = end - start + 1
+        for attempt in range(self.retries + 1):
+            written = 0
+            buffer = bytearray()
+            try:
+                headers = {"Range": f"bytes={start}-{end}"}
+                async with self._http().stream("GET", job.url, headers=headers) as response:
+                    if response.status_code != 206:
+                        raise httpx.HTTPStatusError(
+                            f"Expected 206 for range {start}-{end}, got {response.status_code}",
+                            request=response.request, response=response
+                        )
+                    async for block in response.aiter_bytes():
+                        buffer += block
+                        job.downloaded_bytes += len(block)
+                        if len(buffer) >= WRITE_BUFFER_BYTES:
+                            await asyncio.to_thread(os.pwrite, fd, bytes(buffer), start + written)
+                            written += len(buffer)
+                            buffer.clear()
+                if buffer:
+                    await asyncio.to_thread(os.pwrite, fd, bytes(buffer), start + written)
+                    written += len(buffer)
+                    buffer.clear()
+                if written != expected:
+                    raise IOError(f"Short read for range {start}-{end}: {written} of {expected} bytes")
+                return
+            except (httpx.HTTPError, OSError) as e:
+                # This attempt's bytes will be fetched again
+                job.downloaded_bytes -= written + len(buffer)
+                if attempt >= self.retries:
+                    raise
+                logger.warning(f"Range {start}-{end} of {job.model_name} failed ({e}); retrying")
+                await asyncio.sleep(min(0.5 * 2 ** attempt, 10))
+
+    async def _download_stream(self, job: DownloadJob):
+        """Single sequential transfer for servers without range support"""
+        job.downloaded_bytes = 0
+        async with self._http().stream("GET", job.url) as response:
+            response.raise_for_status()
+            with open(job.part_path, "wb") as f:
+                async for block in response.aiter_bytes(WRITE_BUFFER_BYTES):
+                    await asyncio.to_thread(f.write, block)
+                    job.downloaded_bytes += len(block)
+        if job.total_bytes is None:
+            job.total_bytes = job.downloaded_bytes
+
+    def _verify(self, job: DownloadJob):
+        size = os.path.getsize(job.part_path)
+        if job.total_bytes is not None and size != job.total_bytes:
+            raise IOError(f"Size mismatch: expected {job.total_bytes} bytes, got {size}")
+        if not job.sha256:
+            logger.warning(f"No checksum available for {job.model_name}; size verified only")
+            return
+
+        digest = hashlib.sha256()
+        with open(job.part_path, "rb") as f:
+            for block in iter(lambda: f.read(4 * 1024 * 1024), b""):
+                digest.update(block)
+        if digest.hexdigest() != job.sha256.lower():
+            # A corrupt file must not be resumed from
+            os.remove(job.part_path)
+            if os.path.exists(job.state_path):
+                os.remove(job.state_path)
+            raise ChecksumMismatchError(
+                f"SHA-256 mismatch for {job.model_name}: expected {job.sha256}, got {digest.hexdigest()}"
+            )
+
+
+# Global download manager instance
+model_download_manager = ModelDownloadManager()
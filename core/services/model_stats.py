@@ -0,0 +1,204 @@
+# Copyright (c) 2025 LALO AI LLC. All rights reserved.
+"""
+Model Stats Collector
+
+Keeps model-management statistics off the request path.
+- A background thread rebuilds a snapshot every MODEL_STATS_REFRESH_SECONDS:
+  per-model file size/presence, total size of the models directory,
+  free disk space and system memory
+- Download, delete, load and unload events refresh just the affected
+  model (plus free space and memory) without walking the whole tree
+- Endpoints read the latest snapshot, an immutable dict swapped in whole,
+  so serving it costs no filesystem or psutil calls
+- The first snapshot is built at application startup, off the event loop
+"""
+
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional, Set
+import logging
+import os
+import threading
+import time
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+
+class ModelStatsCollector:
+    """
+    Periodically refreshed snapshot of model files, disk and memory
+    """
+
+    def __init__(
+        self,
+        model_dir: str,
+        model_paths: Callable[[], Dict[str, str]],
+        refresh_seconds: Optional[float] = None
+    ):
+        """
+        Initialize stats collector
+
+        Args:
+            model_dir: Directory holding all model files
+            model_paths: Returns {model_name: file path} for the known models
+            refresh_seconds: Full refresh interval (MODEL_STATS_REFRESH_SECONDS, default 60)
+        """
+        self.model_dir = model_dir
+        self.model_paths = model_paths
+        self.refresh_seconds = refresh_seconds or float(os.getenv("MODEL_STATS_REFRESH_SECONDS", "60"))
+
+        self._snapshot: Optional[Dict] = None
+        self._pending: Set[str] = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.full_refreshes = 0
+        self.model_refreshes = 0
+
+    # ----- reading -----
+
+    def snapshot(self) -> Dict:
+        """
+        Latest statistics; the first call builds them synchronously
+
+        Returns:
+            Dict with "models" ({name: {path, on_disk, size_bytes}}), disk and
+            memory byte counts, and "timestamp" (ISO time of the last refresh)
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self._snapshot = self._build_full()
+                snapshot = self._snapshot
+            self._ensure_thread()
+        return snapshot
+
+    @property
+    def ready(self) -> bool:
+        """True once the first snapshot exists and reads no longer touch the filesystem"""
+        return self._snapshot is not None
+
+    def start(self):
+        """Build the first snapshot and start the refresh thread (blocking; run at startup)"""
+        self.snapshot()
+
+    def model(self, model_name: str) -> Dict:
+        return self.snapshot()["models"].get(model_name, {"on_disk": False, "size_bytes": 0})
+
+    # ----- events -----
+
+    def invalidate(self, model_name: Optional[str] = None):
+        """
+        Schedule a refresh after a download/delete/load event
+
+        Args:
+            model_name: Model whose file changed; None refreshes everything
+        """
+        with self._lock:
+            self._pending.add(model_name or "*")
+            self._idle.clear()
+        self._ensure_thread()
+        self._wake.set()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until pending invalidations are reflected in the snapshot"""
+        return self._idle.wait(timeout)
+
+    def close(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    # ----- background refresh -----
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="model-stats", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            woken = self._wake.wait(self.refresh_seconds)
+            self._wake.clear()
+            if self._stop.is_set():
+                return
+
+            with self._lock:
+                pending, self._pending = self._pending, set()
+            try:
+                if not woken or "*" in pending or self._snapshot is None:
+                    snapshot = self._build_full()
+                else:
+                    snapshot = self._build_incremental(self._snapshot, pending)
+                self._snapshot = snapshot
+            except Exception as e:
+                logger.error(f"Model stats refresh failed: {e}")
+            finally:
+                with self._lock:
+                    if not self._pending:
+                        self._idle.set()
+
+    @staticmethod
+    def _file_entry(path: str) -> Dict:
+        try:
+            size = os.stat(path).st_size
+            return {"path": path, "on_disk": True, "size_bytes": size}
+        except OSError:
+            return {"path": path, "on_disk": False, "size_bytes": 0}
+
+    def _directory_size(self) -> int:
+        total = 0
+        stack = [self.model_dir]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            total += entry.stat(follow_symlinks=False).st_size
+            except OSError:
+                continue
+        return total
+
+    def _system(self) -> Dict:
+        directory = self.model_dir if os.path.exists(self.model_dir) else "."
+        disk = psutil.disk_usage(os.path.abspath(directory))
+        mem = psutil.virtual_memory()
+        return {
+            "disk_free_bytes": disk.free,
+            "memory_total_bytes": mem.total,
+            "memory_available_bytes": mem.available,
+        }
+
+    def _finish(self, snapshot: Dict) -> Dict:
+        now = time.time()
+        snapshot["refreshed_at"] = now
+        snapshot["timestamp"] = datetime.fromtimestamp(now, tz=timezone.utc).isoformat()
+        return snapshot
+
+    def _build_full(self) -> Dict:
+        self.full_refreshes += 1
+        models = {name: self._file_entry(path) for name, path in self.model_paths().items()}
+        return self._finish({"models": models, "disk_used_bytes": self._directory_size(), **self._system()})
+
+    def _build_incremental(self, previous: Dict, model_names: Set[str]) -> Dict:
+        self.model_refreshes += len(model_names)
+        paths = self.model_paths()
+        models = dict(previous["models"])
+        used = previous["disk_used_bytes"]
+        for name in model_names:
+            if name not in paths:
+                continue
+            entry = self._file_entry(paths[name])
+            used += entry["size_bytes"] - models.get(name, {}).get("size_bytes", 0)
+            models[name] = entry
+        return self._finish({"models": models, "disk_used_bytes": max(0, used), **self._system()})
@@ -20,6 +20,8 @@ Last updated: 2025-01
 
 from typing import Dict, Optional
 
+from core.services.token_accounting import token_counter
+
 # Pricing per 1,000 tokens (as of January 2025)
 PRICING: Dict[str, Dict[str, float]] = {
     # OpenAI Models
@@ -104,21 +106,22 @@ def calculate_cost(
     return round(total_cost, 6)
 
 
-def estimate_tokens(text: str) -> int:
+def estimate_tokens(text: str, model: Optional[str] = None) -> int:
     """
-    Rough estimation of token count from text.
+    Token count for text, using the model's tokenizer when available.
 
-    Uses a simple heuristic: ~1.3 tokens per word.
-    For accurate counts, use the provider's tokenizer.
+    Delegates to the shared TokenCounter (tiktoken for OpenAI models, GGUF
+    vocabulary for local models, calibrated approximation otherwise).
+    Counts are cached by content hash.
 
     Args:
         text: Input text to estimate
+        model: Model name used to select the tokenizer (optional)
 
     Returns:
         Estimated token count
     """
-    words = len(text.split())
-    return int(words * 1.3)
+    return token_counter.count(text, model)
 
 
 def get_model_pricing_info(model: str) -> Optional[Dict[str, float]]:
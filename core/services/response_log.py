@@ -0,0 +1,122 @@
+# Copyright (c) 2025 LALO AI LLC. All rights reserved.
+"""
+Response Log
+
+Persists one RoutedResponse row per answered chat request, keyed by the
+response ID returned to the client.
+- Records the routing path and method (llm, classifier, heuristic)
+- The fast path returns its answer before the confidence model has run;
+  the score is attached later and served by
+  GET /api/ai/responses/{response_id}/confidence
+- The rows are the labelled routing history the route classifier trains on
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+import json
+import logging
+
+from core.database import RoutedResponse, SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseLog:
+    """Reads and writes RoutedResponse rows"""
+
+    def record(
+        self,
+        response_id: str,
+        user_id: Optional[str],
+        request: str,
+        routing_decision: Dict[str, Any],
+        model: Optional[str] = None,
+        confidence: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Store an answered request
+
+        Args:
+            response_id: ID returned to the client
+            user_id: Requesting user
+            request: Request text
+            routing_decision: Decision the request was executed with
+            model: Model that answered
+            confidence: Confidence result when already scored; None leaves it pending
+        """
+        db = SessionLocal()
+        try:
+            db.add(RoutedResponse(
+                id=response_id,
+                user_id=user_id,
+                request=request,
+                path=routing_decision.get("path", "simple"),
+                routing_method=routing_decision.get("routing_method", "llm"),
+                routing_confidence=routing_decision.get("confidence"),
+                model=model if isinstance(model, str) else json.dumps(model),
+                confidence_status="scored" if confidence is not None else "pending",
+                confidence=(confidence or {}).get("confidence"),
+                confidence_details=_jsonable(confidence),
+                scored_at=datetime.now(timezone.utc) if confidence is not None else None,
+            ))
+            db.commit()
+        finally:
+            db.close()
+
+    def attach_confidence(self, response_id: str, confidence: Optional[Dict[str, Any]], error: Optional[str] = None):
+        """
+        Store the deferred confidence of a response
+
+        Args:
+            response_id: Response ID
+            confidence: ConfidenceModel.score() result (None if scoring failed)
+            error: Failure reason when scoring failed
+        """
+        db = SessionLocal()
+        try:
+            row = db.query(RoutedResponse).filter(RoutedResponse.id == response_id).first()
+            if row is None:
+                logger.warning(f"No routed response {response_id} to attach confidence to")
+                return
+            if confidence is not None:
+                row.confidence_status = "scored"
+                row.confidence = confidence.get("confidence")
+                row.confidence_details = _jsonable(confidence)
+            else:
+                row.confidence_status = "failed"
+                row.confidence_details = {"error": error}
+            row.scored_at = datetime.now(timezone.utc)
+            db.commit()
+        finally:
+            db.close()
+
+    def get(self, response_id: str) -> Optional[Dict[str, Any]]:
+        """Routing and confidence of a response, or None if unknown"""
+        db = SessionLocal()
+        try:
+            row = db.query(RoutedResponse).filter(RoutedResponse.id == response_id).first()
+            if row is None:
+                return None
+            return {
+                "response_id": row.id,
+                "user_id": row.user_id,
+                "path": row.path,
+                "routing_method": row.routing_method,
+                "routing_confidence": row.routing_confidence,
+                "model": row.model,
+                "status": row.confidence_status,
+                "confidence": row.confidence,
+                "confidence_details": row.confidence_details,
+                "created_at": row.created_at.isoformat() if row.created_at else None,
+                "scored_at": row.scored_at.isoformat() if row.scored_at else None,
+            }
+        finally:
+            db.close()
+
+
+def _jsonable(value: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    return json.loads(json.dumps(value, default=str)) if value is not None else None
+
+
+# Global response log instance
+response_log = ResponseLog()
@@ -0,0 +1,298 @@
+# Copyright (c) 2025 LALO AI LLC. All rights reserved.
+"""
+Route Classifier
+
+Non-LLM request router: a multinomial logistic regression over a hashed
+bag-of-words request embedding plus RouterModel's heuristic features
+(keyword complexity, tool keywords, length, questions). Prediction is a
+dot product, so it runs in microseconds.
+- Embedding: signed feature hashing of word unigrams and bigrams into
+  HASH_DIM buckets (crc32, stable across processes), IDF-weighted once
+  trained, L2-normalized
+- Training: fit() on (request, path) pairs, e.g. decisions logged from the
+  LLM router (see route_training); weights are saved as .npz
+- Versions: RouteClassifierRegistry keeps v<N>.npz files and a manifest
+  naming the active version under ROUTE_CLASSIFIER_DIR
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+import json
+import logging
+import os
+import re
+import zlib
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+PATHS = ("simple", "specialized", "complex")
+HASH_DIM = 2 ** 12
+HEURISTIC_FEATURES = ("complexity", "requires_tools", "length", "questions", "math", "code")
+
+_WORD = re.compile(r"[a-z0-9']+")
+
+
+def embed_request(text: str, dim: int = HASH_DIM, idf: Optional[np.ndarray] = None) -> np.ndarray:
+    """Signed hashed unigram+bigram vector of a request (TF-IDF when idf is given), L2-normalized"""
+    vector = np.zeros(dim, dtype=np.float32)
+    words = _WORD.findall((text or "").lower())
+    for gram in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+        h = zlib.crc32(gram.encode("utf-8"))
+        vector[h % dim] += 1.0 if (h >> 31) & 1 else -1.0
+    if idf is not None:
+        vector *= idf
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def inverse_document_frequency(texts: Sequence[str], dim: int = HASH_DIM) -> np.ndarray:
+    """Smoothed IDF per hash bucket: log((1 + n) / (1 + df)) + 1"""
+    df = np.zeros(dim, dtype=np.float32)
+    for text in texts:
+        df += embed_request(text, dim) != 0
+    return (np.log((1 + len(texts)) / (1 + df)) + 1).astype(np.float32)
+
+
+def request_features(
+    text: str,
+    heuristic: Sequence[float],
+    dim: int = HASH_DIM,
+    idf: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """Heuristic features followed by the hashed embedding"""
+    return np.concatenate([np.asarray(heuristic, dtype=np.float32), embed_request(text, dim, idf)])
+
+
+class RouteClassifier:
+    """
+    Softmax regression from request features to a routing path
+    """
+
+    def __init__(
+        self,
+        weights: Optional[np.ndarray] = None,
+        bias: Optional[np.ndarray] = None,
+        dim: int = HASH_DIM,
+        meta: Optional[Dict[str, Any]] = None,
+        idf: Optional[np.ndarray] = None
+    ):
+        """
+        Initialize classifier
+
+        Args:
+            weights: (len(PATHS), n_features) matrix; None until trained
+            bias: (len(PATHS),) vector
+            dim: Hash buckets of the request embedding
+            meta: Free-form training metadata saved with the weights
+            idf: Per-bucket IDF weights (None for raw term counts)
+        """
+        self.dim = dim
+        self.idf = idf
+        self.weights = weights
+        self.bias = bias if bias is not None else np.zeros(len(PATHS), dtype=np.float32)
+        self.meta = meta or {}
+
+    @property
+    def trained(self) -> bool:
+        return self.weights is not None
+
+    @property
+    def n_features(self) -> int:
+        return len(HEURISTIC_FEATURES) + self.dim
+
+    def predict_proba(self, text: str, heuristic: Sequence[float]) -> Dict[str, float]:
+        """
+        Path probabilities for one request
+
+        Args:
+            text: Request text
+            heuristic: Values for HEURISTIC_FEATURES
+
+        Returns:
+            {path: probability}
+        """
+        if not self.trained:
+            raise RuntimeError("RouteClassifier is not trained")
+        logits = self.weights @ request_features(text, heuristic, self.dim, self.idf) + self.bias
+        return dict(zip(PATHS, _softmax(logits).tolist()))
+
+    def fit(
+        self,
+        texts: Sequence[str],
+        heuristics: Sequence[Sequence[float]],
+        labels: Sequence[str],
+        epochs: int = 300,
+        learning_rate: float = 1.0,
+        l2: float = 1e-4,
+        tfidf: bool = True
+    ) -> "RouteClassifier":
+        """
+        Train with full-batch gradient descent on the cross-entropy loss
+
+        Args:
+            texts: Requests
+            heuristics: Heuristic feature rows (one per request)
+            labels: Path per request (one of PATHS)
+            epochs: Gradient steps
+            learning_rate: Step size
+            l2: Weight decay
+            tfidf: Weight the embedding by IDF computed from `texts`
+
+        Returns:
+            self
+        """
+        self.idf = inverse_document_frequency(texts, self.dim) if tfidf else None
+        X = np.stack([request_features(t, h, self.dim, self.idf) for t, h in zip(texts, heuristics)])
+        y = np.array([PATHS.index(label) for label in labels])
+        Y = np.eye(len(PATHS), dtype=np.float32)[y]
+        W = np.zeros((len(PATHS), X.shape[1]), dtype=np.float32)
+        b = np.zeros(len(PATHS), dtype=np.float32)
+        for _ in range(epochs):
+            P = _softmax(X @ W.T + b)
+            grad = (P - Y) / len(X)
+            W -= learning_rate * (grad.T @ X + l2 * W)
+            b -= learning_rate * grad.sum(axis=0)
+        self.weights, self.bias = W, b
+        self.meta = {**self.meta, "examples": int(len(X)), "classes": {p: int((y == i).sum()) for i, p in enumerate(PATHS)}}
+        return self
+
+    def save(self, path: str):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp.npz"
+        arrays = {"idf": self.idf} if self.idf is not None else {}
+        np.savez_compressed(
+            tmp_path, weights=self.weights, bias=self.bias,
+            dim=np.array(self.dim), meta=np.array(json.dumps(self.meta)), **arrays,
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "RouteClassifier":
+        with np.load(path) as data:
+            return cls(
+                weights=data["weights"], bias=data["bias"], dim=int(data["dim"]),
+                meta=json.loads(str(data["meta"])),
+                idf=data["idf"] if "idf" in data.files else None,
+            )
+
+
+class RouteClassifierRegistry:
+    """
+    Versioned classifiers on disk: v<N>.npz plus manifest.json
+    ({"current": N, "versions": [{"version", "created_at", "metrics", ...}]})
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        """
+        Initialize registry
+
+        Args:
+            directory: Storage directory (ROUTE_CLASSIFIER_DIR, default ./data/route_classifier)
+        """
+        self.directory = directory or os.getenv("ROUTE_CLASSIFIER_DIR", "./data/route_classifier")
+        self.manifest_path = os.path.join(self.directory, "manifest.json")
+
+    def manifest(self) -> Dict[str, Any]:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"current": None, "versions": []}
+
+    def versions(self) -> List[Dict[str, Any]]:
+        return self.manifest()["versions"]
+
+    def current_version(self) -> Optional[int]:
+        return self.manifest()["current"]
+
+    def path(self, version: int) -> str:
+        return os.path.join(self.directory, f"v{version}.npz")
+
+    def save(self, classifier: RouteClassifier, metrics: Optional[Dict[str, Any]] = None, activate: bool = True) -> int:
+        """
+        Store a trained classifier as the next version
+
+        Args:
+            classifier: Trained classifier
+            metrics: Evaluation results kept in the manifest
+            activate: Make it the version RouterModel loads
+
+        Returns:
+            The new version number
+        """
+        manifest = self.manifest()
+        version = max((v["version"] for v in manifest["versions"]), default=0) + 1
+        classifier.meta = {**classifier.meta, "version": version}
+        classifier.save(self.path(version))
+        manifest["versions"].append({
+            "version": version,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "examples": classifier.meta.get("examples"),
+            "classes": classifier.meta.get("classes"),
+            "metrics": metrics or {},
+        })
+        if activate:
+            manifest["current"] = version
+        self._write(manifest)
+        return version
+
+    def activate(self, version: int):
+        """Point the manifest at an existing version (roll forward or back)"""
+        manifest = self.manifest()
+        if not any(v["version"] == version for v in manifest["versions"]):
+            raise ValueError(f"Unknown route classifier version {version}")
+        manifest["current"] = version
+        self._write(manifest)
+
+    def load(self, version: Optional[int] = None) -> Optional[RouteClassifier]:
+        """A stored version (default: the active one), or None if there is none"""
+        version = version if version is not None else self.current_version()
+        if version is None:
+            return None
+        return RouteClassifier.load(self.path(version))
+
+    def _write(self, manifest: Dict[str, Any]):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+
+def margin_of(probabilities: Dict[str, float]) -> float:
+    """Gap between the two most likely paths"""
+    top = sorted(probabilities.values(), reverse=True)
+    return top[0] - (top[1] if len(top) > 1 else 0.0)
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    shifted = np.exp(logits - logits.max(axis=-1, keepdims=True))
+    return shifted / shifted.sum(axis=-1, keepdims=True)
+
+
+def load_route_classifier(path: Optional[str] = None, registry: Optional[RouteClassifierRegistry] = None) -> RouteClassifier:
+    """
+    Classifier to route with: an explicit weights file if given, else the
+    active registry version, else an untrained one
+
+    Args:
+        path: .npz weights file (default ROUTE_CLASSIFIER_PATH, unset)
+        registry: Version registry (default ROUTE_CLASSIFIER_DIR)
+    """
+    path = path or os.getenv("ROUTE_CLASSIFIER_PATH")
+    registry = registry or RouteClassifierRegistry()
+    source = path or registry.directory
+    try:
+        classifier = RouteClassifier.load(path) if path and os.path.exists(path) else (None if path else registry.load())
+        if classifier is not None:
+            logger.info(
+                f"Loaded route classifier {classifier.meta.get('version', path)} from {source} "
+                f"({classifier.meta.get('examples', '?')} examples)"
+            )
+            return classifier
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable route classifier in {source}: {e}")
+    return RouteClassifier()
@@ -0,0 +1,266 @@
+# Copyright (c) 2025 LALO AI LLC. All rights reserved.
+"""
+Route Classifier Training
+
+Turns the request logs into labelled routing examples, trains the route
+classifier on them and compares it with the LLM router offline.
+- routed_responses rows routed by the LLM router are labelled with the
+  path it chose, unless the answer got "not helpful" feedback
+- rows routed by the classifier or heuristics are only kept when the
+  answer got "helpful" feedback, so the classifier does not learn from
+  its own unreviewed decisions
+- workflow sessions the user approved (FeedbackEvent) are "complex"
+- The requests table stores no route and is not used
+- Each example records whether user feedback confirmed its label; the
+  rest are the LLM router's own decisions, so scoring the LLM router on
+  them measures agreement with itself, not accuracy
+
+The train/holdout split is by a hash of the request text, so an example
+stays on the same side across exports.
+"""
+
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+import json
+import logging
+import time
+import zlib
+
+import numpy as np
+
+from core.database import Feedback, FeedbackEvent, RoutedResponse, SessionLocal, WorkflowSession
+from core.services.route_classifier import PATHS, RouteClassifier, margin_of
+
+logger = logging.getLogger(__name__)
+
+
+def export_routing_examples(db=None, since: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """
+    Labelled routing examples from the request and feedback logs
+
+    Args:
+        db: SQLAlchemy session (a new SessionLocal when omitted)
+        since: Only rows created at or after this time
+
+    Returns:
+        [{"request", "label", "source", "feedback"}], one per distinct request
+        text (the most recent label wins); feedback is True when a user
+        confirmed the label
+    """
+    own_session = db is None
+    db = db or SessionLocal()
+    try:
+        helpful: Dict[str, bool] = {}
+        for response_id, value in db.query(Feedback.response_id, Feedback.helpful).order_by(Feedback.created_at):
+            if value is not None:
+                helpful[response_id] = bool(value)
+
+        examples: Dict[str, Dict[str, Any]] = {}
+        query = db.query(RoutedResponse).order_by(RoutedResponse.created_at)
+        if since is not None:
+            query = query.filter(RoutedResponse.created_at >= since)
+        for row in query:
+            verdict = helpful.get(row.id)
+            if row.path not in PATHS or verdict is False:
+                continue
+            if row.routing_method != "llm" and verdict is not True:
+                continue
+            examples[row.request.strip()] = {
+                "request": row.request, "label": row.path, "source": f"routed:{row.routing_method}",
+                "feedback": verdict is True,
+            }
+
+        sessions = db.query(WorkflowSession.session_id, WorkflowSession.original_request, WorkflowSession.created_at)
+        if since is not None:
+            sessions = sessions.filter(WorkflowSession.created_at >= since)
+        events: Dict[str, List[Any]] = {}
+        for event in db.query(FeedbackEvent):
+            events.setdefault(event.workflow_session_id, []).append(event)
+        for session_id, request, _ in sessions:
+            session_events = events.get(session_id, [])
+            approved = any(
+                e.feedback_type == "approve" or (e.rating is not None and e.rating >= 0.5) for e in session_events
+            )
+            if approved and not any(e.feedback_type == "reject" for e in session_events):
+                examples[request.strip()] = {
+                    "request": request, "label": "complex", "source": "workflow", "feedback": True,
+                }
+
+        return list(examples.values())
+    finally:
+        if own_session:
+            db.close()
+
+
+def write_examples(examples: Sequence[Dict[str, Any]], path: str):
+    """Write examples as JSON lines"""
+    with open(path, "w", encoding="utf-8") as f:
+        for example in examples:
+            f.write(json.dumps(example) + "\n")
+
+
+def read_examples(path: str) -> List[Dict[str, Any]]:
+    """Read examples written by write_examples"""
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def split_examples(examples: Sequence[Dict[str, Any]], holdout: float = 0.2) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Deterministic train/holdout split by request hash
+
+    Returns:
+        (train, holdout)
+    """
+    train, test = [], []
+    for example in examples:
+        bucket = zlib.crc32(example["request"].strip().lower().encode("utf-8")) % 1000
+        (test if bucket < holdout * 1000 else train).append(example)
+    return train, test
+
+
+def train_route_classifier(examples: Sequence[Dict[str, Any]], router, **fit_kwargs) -> RouteClassifier:
+    """
+    Fit a classifier on labelled examples
+
+    Args:
+        examples: [{"request", "label"}]
+        router: RouterModel (supplies heuristic_features)
+        fit_kwargs: Passed to RouteClassifier.fit
+
+    Returns:
+        Trained classifier
+    """
+    texts = [e["request"] for e in examples]
+    return RouteClassifier().fit(
+        texts, [router.heuristic_features(t) for t in texts], [e["label"] for e in examples], **fit_kwargs
+    )
+
+
+async def evaluate_routers(
+    examples: Sequence[Dict[str, Any]],
+    classifier: RouteClassifier,
+    router,
+    margin: float,
+    llm_route: Optional[Callable[[str], Awaitable[Dict]]] = None
+) -> Dict[str, Any]:
+    """
+    Offline comparison of the classifier, the LLM router and the tiered
+    router (classifier above `margin`, LLM below)
+
+    Every router gets "agreement" with the logged labels on all examples
+    and "accuracy" only on examples whose label user feedback confirmed.
+    Unreviewed labels are the LLM router's own decisions, so the LLM's
+    agreement mostly measures how consistently it repeats itself.
+
+    Args:
+        examples: Held-out [{"request", "label", "feedback"}]
+        classifier: Trained classifier
+        router: RouterModel (supplies heuristic_features)
+        margin: Classifier margin below which the tiered router asks the LLM
+        llm_route: async request -> routing decision; omit to skip the LLM columns
+
+    Returns:
+        {"examples", "feedback_examples", "margin", "classifier": {...}, "llm": {...} | None,
+        "tiered": {...}} with agreement, accuracy (None without feedback-labelled
+        examples), latency_ms p50/p95 and a confusion matrix per router
+    """
+    labels = [e["label"] for e in examples]
+    reviewed = [bool(e.get("feedback")) for e in examples]
+    predictions, margins, latencies = [], [], []
+    for example in examples:
+        start = time.perf_counter()
+        probabilities = classifier.predict_proba(example["request"], router.heuristic_features(example["request"]))
+        latencies.append((time.perf_counter() - start) * 1000)
+        predictions.append(max(probabilities, key=probabilities.get))
+        margins.append(margin_of(probabilities))
+    report: Dict[str, Any] = {
+        "examples": len(examples),
+        "feedback_examples": sum(reviewed),
+        "margin": margin,
+        "classifier": _router_metrics(labels, predictions, latencies, reviewed),
+        "llm": None,
+    }
+
+    confident = [m >= margin for m in margins]
+    tiered, tiered_latencies = list(predictions), list(latencies)
+    if llm_route is not None:
+        llm_predictions, llm_latencies = [], []
+        for example in examples:
+            start = time.perf_counter()
+            try:
+                decision = await llm_route(example["request"])
+                llm_predictions.append(decision.get("path"))
+            except Exception as e:
+                logger.warning(f"LLM router failed during evaluation: {e}")
+                llm_predictions.append(None)
+            llm_latencies.append((time.perf_counter() - start) * 1000)
+        report["llm"] = _router_metrics(labels, llm_predictions, llm_latencies, reviewed)
+        for i, sure in enumerate(confident):
+            if not sure:
+                tiered[i] = llm_predictions[i]
+                tiered_latencies[i] += llm_latencies[i]
+
+    covered = [i for i, sure in enumerate(confident) if sure]
+    report["tiered"] = {
+        **_router_metrics(labels, tiered, tiered_latencies, reviewed),
+        "classifier_share": round(len(covered) / len(examples), 4) if examples else None,
+        "classifier_agreement_when_confident": (
+            round(sum(predictions[i] == labels[i] for i in covered) / len(covered), 4) if covered else None
+        ),
+        "includes_llm": llm_route is not None,
+    }
+    return report
+
+
+def _router_metrics(
+    labels: Sequence[str],
+    predictions: Sequence[Optional[str]],
+    latencies: Sequence[float],
+    reviewed: Sequence[bool]
+) -> Dict[str, Any]:
+    confusion = {actual: {predicted: 0 for predicted in PATHS} for actual in PATHS}
+    for actual, predicted in zip(labels, predictions):
+        if predicted in PATHS:
+            confusion[actual][predicted] += 1
+    confirmed = [(a, p) for a, p, r in zip(labels, predictions, reviewed) if r]
+    return {
+        "agreement": round(sum(a == p for a, p in zip(labels, predictions)) / len(labels), 4) if labels else None,
+        "accuracy": round(sum(a == p for a, p in confirmed) / len(confirmed), 4) if confirmed else None,
+        "latency_ms": {
+            "p50": round(float(np.percentile(latencies, 50)), 3) if latencies else None,
+            "p95": round(float(np.percentile(latencies, 95)), 3) if latencies else None,
+        },
+        "confusion": confusion,
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Markdown summary of evaluate_routers()"""
+    lines = [
+        f"# Routing evaluation ({report['examples']} held-out examples, margin {report['margin']})",
+        "",
+        "| router | agreement with logged labels | accuracy on feedback labels | p50 ms | p95 ms |",
+        "|---|---|---|---|---|",
+    ]
+    for name in ("classifier", "llm", "tiered"):
+        metrics = report.get(name)
+        if metrics is None:
+            lines.append(f"| {name} | not run | | | |")
+            continue
+        lines.append(
+            f"| {name} | {metrics['agreement']} | {metrics['accuracy']} "
+            f"| {metrics['latency_ms']['p50']} | {metrics['latency_ms']['p95']} |"
+        )
+    tiered = report["tiered"]
+    lines += [
+        "",
+        f"Logged labels without feedback are the LLM router's own decisions, so the LLM's agreement "
+        f"measures consistency, not accuracy. Accuracy uses the {report['feedback_examples']} "
+        f"feedback-labelled examples only.",
+        "",
+        f"Classifier decides {tiered['classifier_share']} of requests "
+        f"(agreement {tiered['classifier_agreement_when_confident']} on those)"
+        + ("" if tiered["includes_llm"] else "; LLM router not run, tiered uses classifier predictions throughout"),
+    ]
+    return "\n".join(lines) + "\n"
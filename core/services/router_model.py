@@ -14,18 +14,41 @@ Router Model Service - Intelligent request classification and routing
 
 First-touch layer that determines the optimal execution path for each request.
 Uses lightweight models for fast classification (<1s response time).
+
+A trained route classifier (see route_training) answers first; the LLM
+router is only asked when the classifier's margin between its two most
+likely paths is below ROUTE_CLASSIFIER_MARGIN.
 """
 
 import json
 import logging
 import asyncio
-from typing import Dict, Literal, Optional
+import math
+import os
+from typing import Dict, List, Literal, Optional
 from core.services.local_llm_service import local_llm_service
+from core.services.route_classifier import RouteClassifier, load_route_classifier, margin_of
 
 logger = logging.getLogger(__name__)
 
+ROUTE_CLASSIFIER_MARGIN = float(os.getenv("ROUTE_CLASSIFIER_MARGIN", "0.3"))
+
 PathType = Literal["simple", "complex", "specialized"]
 
+# Shape of the routing decision the model is asked for (enforced by grammar)
+ROUTING_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "complexity": {"type": "number"},
+        "confidence": {"type": "number"},
+        "path": {"enum": ["simple", "complex", "specialized"]},
+        "reasoning": {"type": "string", "maxLength": 200},
+        "recommended_model": {"type": "string", "maxLength": 40},
+        "requires_tools": {"type": "boolean"},
+        "requires_workflow": {"type": "boolean"},
+    },
+}
+
 
 class RouterModel:
     """
@@ -42,15 +65,34 @@ class RouterModel:
         self.model_name = "phi-2"
         self.server = local_llm_service
         self.fallback_enabled = True
+        self.classifier_margin = ROUTE_CLASSIFIER_MARGIN
+        self._classifier: Optional[RouteClassifier] = None
         logger.info("RouterModel initialized")
 
-    async def route(self, user_request: str, context: Optional[Dict] = None) -> Dict:
+    @property
+    def classifier(self) -> RouteClassifier:
+        """Trained route classifier (ROUTE_CLASSIFIER_PATH), loaded on first use"""
+        if self._classifier is None:
+            self._classifier = load_route_classifier()
+        return self._classifier
+
+    @classifier.setter
+    def classifier(self, value: RouteClassifier):
+        self._classifier = value
+
+    def reload_classifier(self) -> RouteClassifier:
+        """Pick up a newly trained or activated classifier version"""
+        self._classifier = load_route_classifier()
+        return self._classifier
+
+    async def route(self, user_request: str, context: Optional[Dict] = None, use_classifier: bool = True) -> Dict:
         """
         Analyze request and determine optimal execution path
 
         Args:
             user_request: User's input text
             context: Optional context (conversation history, user preferences, etc.)
+            use_classifier: Try the trained route classifier before the LLM
 
         Returns:
             {
@@ -76,11 +118,25 @@ class RouterModel:
                         "reasoning": "Deterministic math detection",
                         "recommended_model": "tinyllama",
                         "requires_tools": False,
-                        "requires_workflow": False
+                        "requires_workflow": False,
+                        "routing_method": "heuristic"
                     }
             except Exception:
                 pass
 
+            # First tier: trained classifier, when it is sure enough
+            if use_classifier and self.classifier.trained:
+                decision = self.fast_route(user_request)
+                if decision.get("margin", 0.0) >= self.classifier_margin:
+                    decision.setdefault("reasoning", "Route classifier")
+                    decision.setdefault("required_models", [])
+                    decision.setdefault("action_plan", [])
+                    logger.info(
+                        f"Routing: {decision['path']} by classifier "
+                        f"(confidence={decision['confidence']:.2f}, margin={decision['margin']:.2f})"
+                    )
+                    return decision
+
             # Check if local inference is available
             if not self.server.is_available():
                 logger.warning("Local inference not available, using fallback routing")
@@ -95,7 +151,8 @@ class RouterModel:
                 model_name=self.model_name,
                 max_tokens=256,
                 temperature=0.3,  # Low temp for consistent routing
-                stop=["<|user|>", "\n\n\n"]
+                stop=["<|user|>", "\n\n\n"],
+                json_schema=ROUTING_SCHEMA
             )
 
             # Parse JSON response
@@ -103,6 +160,7 @@ class RouterModel:
 
             # Validate and normalize decision
             decision = self._validate_decision(decision)
+            decision["routing_method"] = "llm"
 
             logger.info(
                 f"Routing: {decision['path']} "
@@ -212,6 +270,7 @@ Context: {json.dumps(context) if context else "None"}
             "confidence": 0.6,
             "path": path,
             "reasoning": "Heuristic-based routing (model unavailable)",
+            "routing_method": "heuristic",
             "recommended_model": model,
             "requires_tools": self._check_tool_keywords(request),
             "requires_workflow": complexity > 0.6,
@@ -298,6 +357,47 @@ Context: {json.dumps(context) if context else "None"}
         """
         return self.estimate_complexity_sync(request)
 
+    def heuristic_features(self, request: str) -> List[float]:
+        """Heuristic inputs of the route classifier (route_classifier.HEURISTIC_FEATURES)"""
+        request = request or ""
+        low_request = request.lower()
+        return [
+            self.estimate_complexity_sync(request),
+            float(self._check_tool_keywords(request)),
+            math.log1p(len(request.split())) / 5,
+            min(request.count('?'), 3) / 3,
+            float(any(op in low_request for op in ['+', '-', '*', '/'])),
+            float('```' in request or 'def ' in request or '()' in request),
+        ]
+
+    def fast_route(self, request: str) -> Dict:
+        """
+        Route without an LLM call: the trained route classifier when one is
+        saved, otherwise the keyword heuristics of classify()
+
+        Returns same structure as route() plus "routing_method"
+        ("classifier" | "heuristic") and, when trained, "probabilities"
+        and "margin" (gap between the two most likely paths)
+        """
+        if not self.classifier.trained or not request or not request.strip():
+            return self.classify(request)
+
+        probabilities = self.classifier.predict_proba(request, self.heuristic_features(request))
+        path = max(probabilities, key=probabilities.get)
+        complexity = self.estimate_complexity_sync(request)
+        return {
+            "complexity": complexity,
+            "confidence": probabilities[path],
+            "path": path,
+            "routing_method": "classifier",
+            "probabilities": {p: round(v, 4) for p, v in probabilities.items()},
+            "margin": margin_of(probabilities),
+            "classifier_version": self.classifier.meta.get("version"),
+            "recommended_model": "liquid-tool" if path == "specialized" else "tinyllama",
+            "requires_tools": self._check_tool_keywords(request),
+            "requires_workflow": path == "complex"
+        }
+
     def classify(self, request: str, context: Optional[Dict] = None) -> Dict:
         """
         Synchronous classification for testing and heuristic mode
@@ -0,0 +1,283 @@
+# Copyright (c) 2025 LALO AI LLC. All rights reserved.
+"""
+Snapshot Store
+
+Content-addressed undo journals for tool-step rollback.
+- A snapshot starts empty; tools call record_touch(path) just before they
+  write or delete a file, and the first touch per snapshot saves the
+  file's prior content (or notes that it did not exist)
+- Restore reverts exactly the paths the step touched, so files written by
+  other sessions sharing the tool root are never affected, and neither
+  snapshot nor restore walks the tree
+- File contents are stored once per SHA-256 under objects/
+- Finished workflow sessions are garbage collected (journals + orphaned objects)
+- Journals of steps a crash interrupted are restored before the step re-runs
+- Nothing is created on disk until a step first touches a file
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# (size, mtime_ns, sha256), or None when the path did not exist
+Entry = Optional[Tuple[int, int, str]]
+
+# Snapshot the current step's tool calls record into
+_active: ContextVar[Optional[Tuple["SnapshotStore", str]]] = ContextVar("active_snapshot", default=None)
+
+
+class SnapshotStore:
+    """
+    Per-step undo journals backed by a deduplicated object store
+
+    Layout under store_dir:
+        objects/<sha[:2]>/<sha>                  file contents
+        sessions/<session_id>/<snapshot_id>.json  {path: entry} prior states
+    """
+
+    def __init__(self, store_dir: Optional[str] = None):
+        """
+        Initialize snapshot store
+
+        Args:
+            store_dir: Directory for objects and journals (SNAPSHOT_DIR, default ./backups)
+        """
+        self.store_dir = store_dir or os.getenv("SNAPSHOT_DIR", "./backups")
+        self.objects_dir = os.path.join(self.store_dir, "objects")
+        self.sessions_dir = os.path.join(self.store_dir, "sessions")
+        self._journals: Dict[str, Dict[str, Entry]] = {}
+        self._lock = threading.Lock()
+
+    # ----- helpers -----
+
+    def _object_path(self, sha: str) -> str:
+        return os.path.join(self.objects_dir, sha[:2], sha)
+
+    def _journal_path(self, snapshot_id: str) -> str:
+        session_id = snapshot_id.rsplit("@", 1)[0]
+        return os.path.join(self.sessions_dir, session_id, f"{snapshot_id}.json")
+
+    def _store_object(self, path: str) -> str:
+        """Hash a file and copy it into the object store if it is new"""
+        os.makedirs(self.objects_dir, exist_ok=True)
+        sha = hashlib.sha256()
+        fd, tmp = tempfile.mkstemp(dir=self.objects_dir, prefix=".incoming_")
+        try:
+            with open(path, "rb") as src, os.fdopen(fd, "wb") as dst:
+                for block in iter(lambda: src.read(1024 * 1024), b""):
+                    sha.update(block)
+                    dst.write(block)
+            digest = sha.hexdigest()
+            target = self._object_path(digest)
+            if os.path.exists(target):
+                os.remove(tmp)
+            else:
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                os.replace(tmp, target)
+            return digest
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def _journal(self, snapshot_id: str) -> Dict[str, Entry]:
+        journal = self._journals.get(snapshot_id)
+        if journal is None:
+            try:
+                with open(self._journal_path(snapshot_id), "r", encoding="utf-8") as f:
+                    journal = {p: tuple(e) if e else None for p, e in json.load(f).items()}
+            except FileNotFoundError:
+                journal = {}
+            self._journals[snapshot_id] = journal
+        return journal
+
+    # ----- snapshots -----
+
+    def snapshot(self, session_id: str) -> str:
+        """
+        Start an (empty) undo journal for one step
+
+        Args:
+            session_id: Workflow session owning the snapshot
+
+        Returns:
+            Snapshot ID, used for record/restore
+        """
+        snapshot_id = f"{session_id}@{uuid.uuid4().hex[:8]}"
+        with self._lock:
+            self._journals[snapshot_id] = {}
+        return snapshot_id
+
+    def record(self, snapshot_id: str, path: str):
+        """
+        Save a path's current state before it is modified (first touch only)
+
+        Args:
+            snapshot_id: Snapshot of the running step
+            path: File about to be written or deleted
+        """
+        path = os.path.abspath(path)
+        with self._lock:
+            journal = self._journal(snapshot_id)
+            if path in journal:
+                return
+            if os.path.isfile(path):
+                st = os.stat(path)
+                journal[path] = (st.st_size, st.st_mtime_ns, self._store_object(path))
+            else:
+                journal[path] = None
+            target = self._journal_path(snapshot_id)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            tmp = f"{target}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(journal, f)
+            os.replace(tmp, target)
+
+    def touched(self, snapshot_id: str) -> List[str]:
+        """Paths recorded in a snapshot"""
+        with self._lock:
+            return sorted(self._journal(snapshot_id))
+
+    def restore(self, snapshot_id: str) -> int:
+        """
+        Return every path the step touched to its recorded state
+
+        Args:
+            snapshot_id: ID returned by snapshot()
+
+        Returns:
+            Number of files rewritten or removed
+        """
+        touched = 0
+        with self._lock:
+            for path, entry in self._journal(snapshot_id).items():
+                if entry is None:
+                    if os.path.isfile(path):
+                        os.remove(path)
+                        touched += 1
+                    continue
+                try:
+                    st = os.stat(path)
+                    if st.st_size == entry[0] and st.st_mtime_ns == entry[1]:
+                        continue
+                except FileNotFoundError:
+                    pass
+                self._restore_file(path, entry)
+                touched += 1
+
+        logger.info(f"Restored snapshot {snapshot_id}: {touched} files changed")
+        return touched
+
+    def _restore_file(self, path: str, entry: Tuple[int, int, str]):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".restore_")
+        os.close(fd)
+        shutil.copyfile(self._object_path(entry[2]), tmp)
+        os.utime(tmp, ns=(entry[1], entry[1]))
+        os.replace(tmp, path)
+
+    def restore_session(self, session_id: str, keep: Iterable[str] = ()) -> int:
+        """
+        Roll back steps a crash interrupted: restore every journal of the
+        session not listed in keep, newest first, and drop it
+
+        Args:
+            session_id: Workflow session whose journals are still on disk
+            keep: Snapshot IDs of steps that finished (their effects stay)
+
+        Returns:
+            Number of journals restored
+        """
+        session_dir = os.path.join(self.sessions_dir, session_id)
+        if not os.path.isdir(session_dir):
+            return 0
+        keep = set(keep)
+        journals = [
+            os.path.join(session_dir, name) for name in os.listdir(session_dir)
+            if name.endswith(".json") and name[:-len(".json")] not in keep
+        ]
+        journals.sort(key=os.path.getmtime, reverse=True)
+        for path in journals:
+            snapshot_id = os.path.basename(path)[:-len(".json")]
+            self.restore(snapshot_id)
+            with self._lock:
+                self._journals.pop(snapshot_id, None)
+                os.remove(path)
+        return len(journals)
+
+    # ----- garbage collection -----
+
+    def release_session(self, session_id: str) -> int:
+        """
+        Drop a finished session's journals and any objects no longer referenced
+
+        Returns:
+            Number of objects removed
+        """
+        with self._lock:
+            prefix = f"{session_id}@"
+            for snapshot_id in [s for s in self._journals if s.startswith(prefix)]:
+                del self._journals[snapshot_id]
+            shutil.rmtree(os.path.join(self.sessions_dir, session_id), ignore_errors=True)
+            if not os.path.isdir(self.objects_dir):
+                return 0
+
+            live = set()
+            for journal in self._journals.values():
+                live.update(e[2] for e in journal.values() if e)
+            if os.path.isdir(self.sessions_dir):
+                for session in os.listdir(self.sessions_dir):
+                    session_dir = os.path.join(self.sessions_dir, session)
+                    for name in os.listdir(session_dir):
+                        if not name.endswith(".json"):
+                            continue
+                        with open(os.path.join(session_dir, name), "r", encoding="utf-8") as f:
+                            live.update(e[2] for e in json.load(f).values() if e)
+
+            removed = 0
+            for sha_prefix in os.listdir(self.objects_dir):
+                prefix_dir = os.path.join(self.objects_dir, sha_prefix)
+                if not os.path.isdir(prefix_dir):
+                    continue
+                for sha in os.listdir(prefix_dir):
+                    if sha not in live:
+                        os.remove(os.path.join(prefix_dir, sha))
+                        removed += 1
+
+        logger.info(f"Released snapshots for session {session_id}; removed {removed} objects")
+        return removed
+
+
+@contextmanager
+def tracking(store: SnapshotStore, snapshot_id: str) -> Iterator[None]:
+    """Route record_touch() calls made by this task (and its threads) to a snapshot"""
+    token = _active.set((store, snapshot_id))
+    try:
+        yield
+    finally:
+        _active.reset(token)
+
+
+def record_touch(path: str):
+    """
+    Called by tools just before they write or delete `path`; a no-op
+    outside a tracked tool step
+    """
+    active = _active.get()
+    if active is not None:
+        store, snapshot_id = active
+        store.record(snapshot_id, path)
+
+
+# Global snapshot store instance (touches the disk only once a step records a file)
+snapshot_store = SnapshotStore()
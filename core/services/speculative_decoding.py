@@ -0,0 +1,269 @@
+# Copyright (c) 2025 LALO AI LLC. All rights reserved.
+"""
+Speculative Decoding
+
+Speeds up CPU generation on the large local models. A cheap drafter
+proposes the next few tokens; llama.cpp (Llama(draft_model=...)) checks
+all of them in one batched forward pass of the target model and keeps
+only the tokens the target samples itself, so output is unchanged.
+- Opt-in (LOCAL_LLM_SPECULATIVE=true): a draft forces logits_all, and
+  llama-cpp-python then keeps an n_ctx x n_vocab float32 scores array
+  (logits_buffer_bytes: 500 MB for a 32k vocabulary at 4096 context,
+  1.6 GB for deepseek-math's 102k) until the model is unloaded, even
+  while the acceptance fallback has detached the draft. Measured with
+  scripts/measure_speculative_memory.py on a 32k-vocabulary model with
+  the context filled: +585 MB USS (the rest is llama.cpp's per-batch
+  output buffer). The hardware tuner budgets the scores array with the
+  KV cache, and a model loads without speculation rather than with a
+  smaller context
+- Draft sources: a smaller model with the same vocabulary
+  (LOCAL_LLM_DRAFT_MODELS="target=draft,..." or "draft_model" in the
+  model config), or prompt lookup (n-gram matches in the prompt and the
+  output so far), which needs no extra model
+- The acceptance rate is tracked per target over the last
+  LOCAL_LLM_SPECULATIVE_WINDOW proposals; below LOCAL_LLM_MIN_ACCEPTANCE
+  speculation is switched off for that target and re-tried after
+  LOCAL_LLM_SPECULATIVE_RETRY plain generations
+"""
+
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+import logging
+import os
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SPECULATIVE_ENABLED = os.getenv("LOCAL_LLM_SPECULATIVE", "false").lower() == "true"
+DRAFT_TOKENS = int(os.getenv("LOCAL_LLM_DRAFT_TOKENS", "6"))
+MIN_ACCEPTANCE = float(os.getenv("LOCAL_LLM_MIN_ACCEPTANCE", "0.3"))
+WINDOW = int(os.getenv("LOCAL_LLM_SPECULATIVE_WINDOW", "64"))
+RETRY_AFTER = int(os.getenv("LOCAL_LLM_SPECULATIVE_RETRY", "20"))
+
+PROMPT_LOOKUP = "prompt-lookup"
+COMPATIBILITY_PROBE = b"Speculative decoding check: def total(x): return sum(x) * 1.5  # OK"
+
+
+def parse_draft_models(value: str) -> Dict[str, str]:
+    """Parse "target=draft,target2=draft2" """
+    pairs = {}
+    for item in value.split(","):
+        target, _, draft = item.partition("=")
+        if target.strip() and draft.strip():
+            pairs[target.strip()] = draft.strip()
+    return pairs
+
+
+DRAFT_MODELS = parse_draft_models(os.getenv("LOCAL_LLM_DRAFT_MODELS", ""))
+
+# Vocabulary size assumed for models whose config has no "n_vocab" (Llama/Mistral)
+DEFAULT_VOCAB = 32000
+
+
+def logits_bytes_per_token(n_vocab: int) -> int:
+    """Bytes of the logits_all buffer per context position (float32 per vocabulary entry)"""
+    return 4 * n_vocab
+
+
+def logits_buffer_bytes(n_ctx: int, n_vocab: int) -> int:
+    """Size of the logits buffer llama.cpp allocates when a draft model is attached"""
+    return n_ctx * logits_bytes_per_token(n_vocab)
+
+
+def prompt_lookup(input_ids: np.ndarray, num_pred_tokens: int, max_ngram_size: int = 3) -> np.ndarray:
+    """
+    Propose the tokens that followed the latest earlier occurrence of the
+    trailing n-gram (longest n-gram first)
+
+    Args:
+        input_ids: Prompt and generated tokens so far
+        num_pred_tokens: Maximum tokens to propose
+        max_ngram_size: Longest suffix to match
+
+    Returns:
+        Proposed token ids (empty when nothing repeats)
+    """
+    length = input_ids.shape[0]
+    for size in range(min(max_ngram_size, length - 1), 0, -1):
+        windows = np.lib.stride_tricks.sliding_window_view(input_ids[:-1], size)
+        matches = np.nonzero(np.all(windows == input_ids[-size:], axis=1))[0]
+        # Most recent match first: nearby context repeats most reliably
+        for idx in matches[::-1]:
+            start = idx + size
+            if start < length:
+                return input_ids[start:min(start + num_pred_tokens, length)].astype(np.intc)
+    return np.array([], dtype=np.intc)
+
+
+class DraftModelProposer:
+    """Greedy proposals from a smaller llama.cpp model"""
+
+    def __init__(self, draft: Any):
+        self.draft = draft
+
+    def __call__(self, input_ids: np.ndarray, num_pred_tokens: int) -> np.ndarray:
+        if input_ids.shape[0] + num_pred_tokens > self.draft.n_ctx():
+            return np.array([], dtype=np.intc)
+        proposal = []
+        # generate() reuses the KV cache for the prefix shared with the last call
+        tokens = self.draft.generate(input_ids.tolist(), temp=0.0)
+        try:
+            for token in tokens:
+                proposal.append(token)
+                if len(proposal) >= num_pred_tokens:
+                    break
+        finally:
+            tokens.close()
+        return np.array(proposal, dtype=np.intc)
+
+
+def vocab_compatible(target: Any, draft: Any) -> bool:
+    """True if both models share a vocabulary (same size, EOS and tokenization)"""
+    try:
+        return (
+            target.n_vocab() == draft.n_vocab()
+            and target.token_eos() == draft.token_eos()
+            and list(target.tokenize(COMPATIBILITY_PROBE)) == list(draft.tokenize(COMPATIBILITY_PROBE))
+        )
+    except Exception as e:
+        logger.debug(f"Vocabulary comparison failed: {e}")
+        return False
+
+
+class SpeculativeDraft:
+    """
+    llama.cpp draft model for one target; measures how many proposed tokens
+    the target accepts and switches speculation off when too few are
+    """
+
+    def __init__(
+        self,
+        target_name: str,
+        num_pred_tokens: Optional[int] = None,
+        min_acceptance: Optional[float] = None,
+        window: Optional[int] = None,
+        retry_after: Optional[int] = None
+    ):
+        """
+        Initialize draft
+
+        Args:
+            target_name: Model being accelerated
+            num_pred_tokens: Tokens proposed per step (LOCAL_LLM_DRAFT_TOKENS, default 6)
+            min_acceptance: Fallback threshold (LOCAL_LLM_MIN_ACCEPTANCE, default 0.3)
+            window: Proposals the rolling rate covers (LOCAL_LLM_SPECULATIVE_WINDOW, default 64)
+            retry_after: Plain generations before re-trying (LOCAL_LLM_SPECULATIVE_RETRY, default 20)
+        """
+        self.target_name = target_name
+        self.num_pred_tokens = num_pred_tokens or DRAFT_TOKENS
+        self.min_acceptance = min_acceptance if min_acceptance is not None else MIN_ACCEPTANCE
+        self.retry_after = retry_after if retry_after is not None else RETRY_AFTER
+        self.source = PROMPT_LOOKUP
+        self._proposer: Callable[[np.ndarray, int], np.ndarray] = prompt_lookup
+
+        self.active = True
+        self._window: Deque[Tuple[int, int]] = deque(maxlen=window or WINDOW)
+        self._pending: Optional[Tuple[int, np.ndarray]] = None
+        self._skipped = 0
+        self._call = [0, 0]
+        self.generations = 0
+        self.drafted = 0
+        self.accepted = 0
+        self.fallbacks = 0
+
+    def use_model(self, draft: Any, name: str):
+        """Draft with a smaller model instead of prompt lookup"""
+        self._proposer = DraftModelProposer(draft)
+        self.source = name
+
+    # ----- llama.cpp draft model protocol -----
+
+    def __call__(self, input_ids: np.ndarray, /, **kwargs: Any) -> np.ndarray:
+        self._resolve(input_ids)
+        proposal = self._proposer(input_ids, self.num_pred_tokens)
+        self._pending = (input_ids.shape[0], proposal) if len(proposal) else None
+        return proposal
+
+    def _resolve(self, input_ids: np.ndarray):
+        """Count how much of the previous proposal the target kept"""
+        if self._pending is None:
+            return
+        base, proposal = self._pending
+        self._pending = None
+        produced = input_ids[base:base + len(proposal)]
+        accepted = 0
+        for proposed, actual in zip(proposal, produced):
+            if proposed != actual:
+                break
+            accepted += 1
+        self._window.append((len(proposal), accepted))
+        self._call[0] += len(proposal)
+        self._call[1] += accepted
+
+    # ----- per generation -----
+
+    def begin(self) -> bool:
+        """
+        Start a generation
+
+        Returns:
+            True to speculate, False to decode plainly (fallback in effect)
+        """
+        self._pending = None
+        self._call = [0, 0]
+        if not self.active:
+            self._skipped += 1
+            if self._skipped > self.retry_after:
+                logger.info(f"Re-trying speculative decoding for {self.target_name}")
+                self.active = True
+                self._window.clear()
+        return self.active
+
+    def end(self) -> Dict[str, Any]:
+        """
+        Finish a generation and apply the fallback rule
+
+        Returns:
+            {"source", "drafted", "accepted", "acceptance_rate"} for this generation
+        """
+        self._pending = None  # no later call shows how much of the last proposal was kept
+        drafted, accepted = self._call
+        self.drafted += drafted
+        self.accepted += accepted
+        self.generations += 1
+
+        rate = self.window_acceptance_rate
+        if self.active and len(self._window) >= self._window.maxlen // 4 and rate < self.min_acceptance:
+            logger.warning(
+                f"Speculative decoding off for {self.target_name}: acceptance {rate:.0%} "
+                f"< {self.min_acceptance:.0%} with {self.source} drafts"
+            )
+            self.active = False
+            self._skipped = 0
+            self.fallbacks += 1
+
+        return {
+            "source": self.source,
+            "drafted": drafted,
+            "accepted": accepted,
+            "acceptance_rate": round(accepted / drafted, 3) if drafted else None,
+        }
+
+    @property
+    def window_acceptance_rate(self) -> float:
+        drafted = sum(d for d, _ in self._window)
+        return sum(a for _, a in self._window) / drafted if drafted else 1.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "source": self.source,
+            "active": self.active,
+            "num_pred_tokens": self.num_pred_tokens,
+            "generations": self.generations,
+            "drafted_tokens": self.drafted,
+            "accepted_tokens": self.accepted,
+            "acceptance_rate": round(self.accepted / self.drafted, 3) if self.drafted else None,
+            "window_acceptance_rate": round(self.window_acceptance_rate, 3),
+            "fallbacks": self.fallbacks,
+        }
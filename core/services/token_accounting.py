@@ -0,0 +1,318 @@
+"""
+Copyright (c) 2025 LALO AI SYSTEMS, LLC. All rights reserved.
+
+PROPRIETARY AND CONFIDENTIAL
+
+This file is part of LALO AI Platform and is protected by copyright law.
+Unauthorized copying, modification, distribution, or use of this software,
+via any medium, is strictly prohibited without the express written permission
+of LALO AI SYSTEMS, LLC.
+"""
+
+"""
+Token Accounting - Tokenizer-accurate token counts for pricing and quotas
+
+Resolves a tokenizer per model family:
+- OpenAI models: tiktoken (encoding for the model, cl100k_base fallback)
+- Local llama.cpp models: the GGUF vocabulary via Llama.tokenize
+- Everything else: a calibrated character/word approximation
+
+Tokenizers are loaded once and reused. Counts are cached by content hash so
+the same prompt/response is never tokenized twice.
+"""
+
+import hashlib
+import logging
+import math
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Optional tokenizer backends
+try:
+    import tiktoken  # type: ignore
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    tiktoken = None  # type: ignore
+    TIKTOKEN_AVAILABLE = False
+
+try:
+    from llama_cpp import Llama  # type: ignore
+    LLAMA_CPP_AVAILABLE = True
+except ImportError:
+    Llama = None  # type: ignore
+    LLAMA_CPP_AVAILABLE = False
+
+
+# Average characters per token for families without a local tokenizer.
+# Calibrated against provider-reported usage on mixed English/code prompts.
+CHARS_PER_TOKEN: Dict[str, float] = {
+    "anthropic": 3.5,
+    "google": 4.0,
+    "llama": 3.6,
+    "default": 3.8,
+}
+
+# Word pieces, single punctuation/symbol characters, and CJK-style characters
+_PIECE_RE = re.compile(r"[A-Za-z0-9_]+|[^\sA-Za-z0-9_]")
+
+# Usage sources reported in resolve_usage()
+SOURCE_PROVIDER = "provider"
+SOURCE_TOKENIZER = "tokenizer"
+SOURCE_APPROXIMATION = "approximation"
+
+
+def approximate_token_count(text: str, chars_per_token: float = CHARS_PER_TOKEN["default"]) -> int:
+    """
+    Calibrated token approximation used when no real tokenizer is available.
+
+    Alphanumeric runs are split into sub-word pieces of ~chars_per_token
+    characters, punctuation/symbols count as one token each and every
+    non-ASCII character counts as a token (close to BPE behavior on code
+    and non-English text, where a plain word count under-estimates badly).
+
+    Args:
+        text: Input text
+        chars_per_token: Average characters per sub-word token
+
+    Returns:
+        Approximate token count
+    """
+    if not text:
+        return 0
+
+    count = 0
+    for piece in _PIECE_RE.findall(text):
+        if len(piece) == 1 or not piece.isascii():
+            count += 1
+        else:
+            count += max(1, math.ceil(len(piece) / chars_per_token))
+    return count
+
+
+def model_family(model: Optional[str]) -> str:
+    """
+    Map a model name to its tokenizer family.
+
+    Returns:
+        One of "openai", "anthropic", "google", "llama" or "default"
+    """
+    if not model:
+        return "default"
+
+    name = model.lower()
+    if name.startswith(("gpt-", "o1", "o3", "text-embedding", "davinci", "babbage")):
+        return "openai"
+    if name.startswith("claude"):
+        return "anthropic"
+    if name.startswith("gemini"):
+        return "google"
+    if _local_model_base(name):
+        return "llama"
+    return "default"
+
+
+def _local_model_base(model: str) -> Optional[str]:
+    """Resolve a local model name or alias ('tinyllama-1.1b') to its config key."""
+    from core.services.local_llm_service import local_llm_service
+
+    configs = local_llm_service.model_configs
+    if model in configs:
+        return model
+
+    # Aliases carry a size suffix: strip trailing dash-separated parts until a match
+    parts = model.split("-")
+    while len(parts) > 1:
+        parts = parts[:-1]
+        candidate = "-".join(parts)
+        if candidate in configs:
+            return candidate
+    return None
+
+
+class TokenCounter:
+    """
+    Counts tokens with the most accurate tokenizer available per model
+
+    Features:
+    - One tokenizer instance per encoding/model, loaded lazily and reused
+    - LRU cache of counts keyed by (tokenizer, content hash)
+    - Provider-reported usage takes precedence over local counting
+    """
+
+    def __init__(self, cache_size: int = 4096):
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[str, str], int]" = OrderedDict()
+        self._tokenizers: Dict[str, Optional[Callable[[str], int]]] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def count(self, text: str, model: Optional[str] = None) -> int:
+        """
+        Count tokens in text for the given model.
+
+        Args:
+            text: Input text
+            model: Model name used to pick the tokenizer (optional)
+
+        Returns:
+            Token count
+        """
+        if not text:
+            return 0
+
+        key, tokenize = self._get_tokenizer(model)
+        cache_key = (key, hashlib.blake2b(text.encode("utf-8", "ignore"), digest_size=16).hexdigest())
+
+        with self._lock:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                self._cache.move_to_end(cache_key)
+                self.stats["hits"] += 1
+                return cached
+            self.stats["misses"] += 1
+
+        try:
+            n = tokenize(text)
+        except Exception as e:
+            logger.warning(f"Tokenizer {key} failed, using approximation: {e}")
+            n = approximate_token_count(text)
+
+        with self._lock:
+            self._cache[cache_key] = n
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return n
+
+    def is_exact(self, model: Optional[str]) -> bool:
+        """True if counts for this model come from a real tokenizer."""
+        key, _ = self._get_tokenizer(model)
+        return not key.startswith("approx:")
+
+    def resolve_usage(
+        self,
+        model: Optional[str],
+        prompt: str,
+        completion: str,
+        reported: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Build a usage dict for a request, preferring provider-reported counts.
+
+        Args:
+            model: Model that served the request
+            prompt: Prompt text
+            completion: Generated text
+            reported: Usage returned by the provider, if any
+                      ({"prompt_tokens": int, "completion_tokens": int, ...})
+
+        Returns:
+            {"prompt_tokens": int, "completion_tokens": int, "total_tokens": int, "source": str}
+        """
+        if reported:
+            prompt_tokens = reported.get("prompt_tokens", reported.get("input_tokens"))
+            completion_tokens = reported.get("completion_tokens", reported.get("output_tokens"))
+            if isinstance(prompt_tokens, int) and isinstance(completion_tokens, int):
+                return {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                    "source": SOURCE_PROVIDER,
+                }
+
+        prompt_tokens = self.count(prompt, model)
+        completion_tokens = self.count(completion, model)
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "source": SOURCE_TOKENIZER if self.is_exact(model) else SOURCE_APPROXIMATION,
+        }
+
+    def clear_cache(self):
+        """Drop cached counts (tokenizers stay loaded)."""
+        with self._lock:
+            self._cache.clear()
+            self.stats = {"hits": 0, "misses": 0}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache and tokenizer statistics."""
+        with self._lock:
+            total = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "hit_rate": (self.stats["hits"] / total) if total else 0.0,
+                "cached_entries": len(self._cache),
+                "tokenizers_loaded": sorted(k for k, v in self._tokenizers.items() if v is not None),
+            }
+
+    def _get_tokenizer(self, model: Optional[str]) -> Tuple[str, Callable[[str], int]]:
+        """Return (cache key, tokenize fn) for a model, loading the tokenizer once."""
+        family = model_family(model)
+
+        if family == "openai":
+            key = f"tiktoken:{model}"
+            tokenize = self._load_once(key, lambda: self._load_tiktoken(model))
+            if tokenize:
+                return key, tokenize
+
+        elif family == "llama":
+            base = _local_model_base(model.lower())
+            key = f"gguf:{base}"
+            tokenize = self._load_once(key, lambda: self._load_gguf_vocab(base))
+            if tokenize:
+                return key, tokenize
+
+        ratio = CHARS_PER_TOKEN.get(family, CHARS_PER_TOKEN["default"])
+        return f"approx:{family}", lambda text: approximate_token_count(text, ratio)
+
+    def _load_once(self, key: str, loader: Callable[[], Optional[Callable[[str], int]]]):
+        with self._lock:
+            if key in self._tokenizers:
+                return self._tokenizers[key]
+
+        tokenize = None
+        try:
+            tokenize = loader()
+        except Exception as e:
+            logger.warning(f"Failed to load tokenizer {key}: {e}")
+
+        with self._lock:
+            # Cache failures too so we don't retry a missing tokenizer on every call
+            self._tokenizers.setdefault(key, tokenize)
+            return self._tokenizers[key]
+
+    @staticmethod
+    def _load_tiktoken(model: str) -> Optional[Callable[[str], int]]:
+        if not TIKTOKEN_AVAILABLE:
+            return None
+        try:
+            enc = tiktoken.encoding_for_model(model)
+        except KeyError:
+            enc = tiktoken.get_encoding("cl100k_base")
+        return lambda text: len(enc.encode(text, disallowed_special=()))
+
+    @staticmethod
+    def _load_gguf_vocab(base: str) -> Optional[Callable[[str], int]]:
+        from core.services.local_llm_service import local_llm_service
+
+        if not LLAMA_CPP_AVAILABLE:
+            return None
+
+        model_path = os.path.join(local_llm_service.model_dir, local_llm_service.model_configs[base]["path"])
+        if not os.path.exists(model_path):
+            return None
+
+        # vocab_only loads just the tokenizer from the GGUF file (no weights), so
+        # counting never pins or duplicates a model that the server may unload
+        vocab = Llama(model_path=model_path, vocab_only=True, verbose=False)
+        logger.info(f"Loaded GGUF vocabulary for {base}")
+        return lambda text: len(vocab.tokenize(text.encode("utf-8"), add_bos=False))
+
+
+# Global instance
+token_counter = TokenCounter()
@@ -10,17 +10,18 @@ This is Step 3 of the LALO workflow (execution phase):
 4. Rollback if verification fails or error occurs
 """
 
-from typing import Dict, Any, Optional, List
+from typing import Callable, Dict, Any, Optional, List
 from dataclasses import dataclass, asdict
 from datetime import datetime
 from core.tools import tool_registry, ToolExecutionResult
 from core.database import SessionLocal, ToolExecution
 from core.services.microservices_client import mcp_client
+from core.services.snapshot_store import SnapshotStore, snapshot_store, tracking
+import asyncio
 import logging
 import json
 import uuid
 import shutil
-import os
 
 logger = logging.getLogger(__name__)
 
@@ -56,22 +57,25 @@ class ToolExecutor:
     - Comprehensive audit logging
     """
 
-    def __init__(self, backup_dir: str = "./backups"):
+    def __init__(self, backup_dir: Optional[str] = None, snapshots: Optional[SnapshotStore] = None):
         """
         Initialize tool executor
 
         Args:
-            backup_dir: Directory for storing backups
+            backup_dir: Directory for storing backups (defaults to the shared snapshot store)
+            snapshots: Snapshot store used for backup and rollback
         """
-        self.backup_dir = backup_dir
-        os.makedirs(backup_dir, exist_ok=True)
+        self.snapshots = snapshots or (SnapshotStore(backup_dir) if backup_dir else snapshot_store)
+        self.backup_dir = self.snapshots.store_dir
 
     async def execute_plan(
         self,
         action_plan: Any,  # ActionPlan from action_planner
         user_id: str,
         workflow_session_id: str,
-        human_approval: bool = True
+        human_approval: bool = True,
+        completed: Optional[List[ExecutionResult]] = None,
+        on_result: Optional[Callable[[ExecutionResult], None]] = None
     ) -> List[ExecutionResult]:
         """
         Execute complete action plan step by step
@@ -81,15 +85,36 @@ class ToolExecutor:
             user_id: User ID
             workflow_session_id: Workflow session ID for tracking
             human_approval: Whether human approved the plan
+            completed: Results of steps already executed by an interrupted run;
+                those steps are not executed again
+            on_result: Called with each new ExecutionResult as soon as its step finishes
 
         Returns:
             List of ExecutionResult for each step
         """
         logger.info(f"Executing plan with {len(action_plan.steps)} steps for user {user_id}")
 
-        results = []
+        try:
+            return await self._execute_steps(action_plan, user_id, workflow_session_id, completed, on_result)
+        finally:
+            # Snapshots are only needed while the plan runs
+            await self.release_session(workflow_session_id)
+
+    async def _execute_steps(
+        self,
+        action_plan: Any,
+        user_id: str,
+        workflow_session_id: str,
+        completed: Optional[List[ExecutionResult]] = None,
+        on_result: Optional[Callable[[ExecutionResult], None]] = None
+    ) -> List[ExecutionResult]:
+        results = list(completed or [])
+        if results:
+            logger.info(f"Resuming plan after step {results[-1].step_number} ({len(results)} steps done)")
+            if not results[-1].success and not results[-1].backup_restored:
+                return results
 
-        for step in action_plan.steps:
+        for step in action_plan.steps[len(results):]:
             step_num = step.get("step", 0)
             logger.info(f"Executing step {step_num}: {step.get('action', 'unknown')[:100]}...")
 
@@ -100,6 +125,8 @@ class ToolExecutor:
             )
 
             results.append(result)
+            if on_result:
+                on_result(result)
 
             # Stop execution if step failed and couldn't be recovered
             if not result.success and not result.backup_restored:
@@ -141,20 +168,21 @@ class ToolExecutor:
 
             logger.info(f"Using tool: {tool_name}")
 
-            # Execute tool
-            tool_result = await self._execute_tool(
-                tool_name=tool_name,
-                action=action,
-                user_id=user_id,
-                workflow_session_id=workflow_session_id
-            )
+            # Execute tool; files it writes or deletes are journaled for rollback
+            with tracking(self.snapshots, backup_id):
+                tool_result = await self._execute_tool(
+                    tool_name=tool_name,
+                    action=action,
+                    user_id=user_id,
+                    workflow_session_id=workflow_session_id
+                )
 
             if not tool_result.success:
                 # Tool execution failed
                 logger.error(f"Tool execution failed: {tool_result.error}")
 
                 # Attempt rollback
-                await self._restore_backup(backup_id)
+                restored = await self._restore_backup(backup_id)
 
                 elapsed = (datetime.now() - start_time).total_seconds() * 1000
                 return ExecutionResult(
@@ -165,7 +193,7 @@ class ToolExecutor:
                     verification_passed=False,
                     error=tool_result.error,
                     backup_id=backup_id,
-                    backup_restored=True,
+                    backup_restored=restored,
                     execution_time_ms=int(elapsed)
                 )
 
@@ -180,7 +208,7 @@ class ToolExecutor:
                 # Verification failed - rollback
                 logger.warning(f"Verification failed: {verification['reason']}")
 
-                await self._restore_backup(backup_id)
+                restored = await self._restore_backup(backup_id)
 
                 elapsed = (datetime.now() - start_time).total_seconds() * 1000
                 return ExecutionResult(
@@ -191,7 +219,7 @@ class ToolExecutor:
                     verification_passed=False,
                     error=f"Verification failed: {verification['reason']}",
                     backup_id=backup_id,
-                    backup_restored=True,
+                    backup_restored=restored,
                     execution_time_ms=int(elapsed)
                 )
 
@@ -215,7 +243,7 @@ class ToolExecutor:
             # Unexpected error - rollback
             logger.error(f"Unexpected error executing step: {e}")
 
-            await self._restore_backup(backup_id)
+            restored = await self._restore_backup(backup_id)
 
             elapsed = (datetime.now() - start_time).total_seconds() * 1000
             return ExecutionResult(
@@ -226,7 +254,7 @@ class ToolExecutor:
                 verification_passed=False,
                 error=f"Unexpected error: {str(e)}",
                 backup_id=backup_id,
-                backup_restored=True,
+                backup_restored=restored,
                 execution_time_ms=int(elapsed)
             )
 
@@ -234,36 +262,56 @@ class ToolExecutor:
         """
         Create backup/snapshot before execution
 
-        For now, just creates a backup ID. In production, would:
-        - Snapshot database state
-        - Save file system state
-        - Record current configurations
+        Starts an undo journal for the step: tools save each file's prior
+        content just before they first modify it during the step.
+        Database state and configuration are not snapshotted.
         """
-        backup_id = f"backup_{workflow_session_id}_{uuid.uuid4().hex[:8]}"
-        backup_path = os.path.join(self.backup_dir, backup_id)
-
-        # Create backup directory
-        os.makedirs(backup_path, exist_ok=True)
-
-        # TODO: Implement actual backup logic
-        # For MVP, just creating placeholder
-
+        backup_id = await asyncio.to_thread(self.snapshots.snapshot, workflow_session_id)
         logger.info(f"Created backup: {backup_id}")
         return backup_id
 
-    async def _restore_backup(self, backup_id: str):
+    async def _restore_backup(self, backup_id: str) -> bool:
         """
         Restore from backup
 
-        In production would:
-        - Restore database state
-        - Restore file system
-        - Revert configurations
+        Reverts only the files this step touched: rewrites edited or
+        deleted ones and removes those it created.
+
+        Returns:
+            True if the rollback succeeded
         """
         logger.info(f"Restoring backup: {backup_id}")
+        try:
+            await asyncio.to_thread(self.snapshots.restore, backup_id)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to restore backup {backup_id}: {e}")
+            return False
+
+    async def restore_interrupted(self, workflow_session_id: str, completed: List[ExecutionResult]) -> int:
+        """
+        Undo the half-applied file writes of a step a crash interrupted
+
+        Journals of completed steps are kept; any other journal still on
+        disk belongs to a step that never finished and is restored.
 
-        # TODO: Implement actual restore logic
-        # For MVP, just logging
+        Returns:
+            Number of journals restored
+        """
+        keep = [r.backup_id for r in completed if r.backup_id]
+        restored = await asyncio.to_thread(self.snapshots.restore_session, workflow_session_id, keep)
+        if restored:
+            logger.info(f"Rolled back {restored} interrupted step(s) of {workflow_session_id}")
+        return restored
+
+    async def release_session(self, workflow_session_id: str):
+        """
+        Garbage collect snapshots of a finished workflow session
+        """
+        try:
+            await asyncio.to_thread(self.snapshots.release_session, workflow_session_id)
+        except Exception as e:
+            logger.warning(f"Failed to release snapshots for {workflow_session_id}: {e}")
 
     async def _determine_tool(self, action: str) -> str:
         """
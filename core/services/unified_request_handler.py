@@ -16,18 +16,30 @@ Orchestrates the complete request flow:
 Router → Simple/Complex Path → Confidence → Response
 
 This is the "brain" of LALO that coordinates all Phase 1 & 2 components.
+
+Fast path (FAST_PATH_ENABLED): requests the non-LLM route classifier marks
+simple with confidence >= FAST_PATH_MIN_CONFIDENCE are answered with a
+single generation; the confidence model runs after the response is
+returned and its score is attached to the response ID (response_log).
 """
 
+import asyncio
 import logging
-from typing import Dict, List, Optional
+import os
+from typing import Dict, List, Optional, Set
 from datetime import datetime
+from uuid import uuid4
 
 from core.services.router_model import router_model
 from core.services.agent_orchestrator import agent_orchestrator
 from core.services.local_llm_service import local_llm_service
+from core.services.response_log import response_log
 
 logger = logging.getLogger(__name__)
 
+FAST_PATH_ENABLED = os.getenv("FAST_PATH_ENABLED", "false").lower() == "true"
+FAST_PATH_MIN_CONFIDENCE = float(os.getenv("FAST_PATH_MIN_CONFIDENCE", "0.8"))
+
 
 class UnifiedRequestHandler:
     """
@@ -49,6 +61,11 @@ class UnifiedRequestHandler:
         self.router = router_model
         self.orchestrator = agent_orchestrator
         self.inference_server = local_llm_service
+        self.responses = response_log
+        self.fast_path_enabled = FAST_PATH_ENABLED
+        self.fast_path_min_confidence = FAST_PATH_MIN_CONFIDENCE
+        # Strong references so background scoring tasks are not collected mid-flight
+        self._background: Set[asyncio.Task] = set()
         logger.info("UnifiedRequestHandler initialized")
 
     async def handle_request(
@@ -57,7 +74,8 @@ class UnifiedRequestHandler:
         user_id: str,
         available_models: List[str],
         context: Optional[Dict] = None,
-        stream: bool = False
+        stream: bool = False,
+        fast_path: Optional[bool] = None
     ) -> Dict:
         """
         Process user request through intelligent routing system
@@ -68,15 +86,18 @@ class UnifiedRequestHandler:
             available_models: List of available model names
             context: Optional context (conversation history, preferences, etc.)
             stream: Whether to stream response
+            fast_path: Try the fused route-and-answer path (default FAST_PATH_ENABLED)
 
         Returns:
             {
+                "response_id": str,
                 "response": str,
                 "model": str or [str],
                 "path": "simple" | "complex" | "specialized",
                 "routing_decision": {...},
-                "confidence": float,
+                "confidence": float or None,  # None while the fast path scores in the background
                 "confidence_details": {...},
+                "usage": {...} or None,  # provider-reported token usage, if any
                 "metadata": {...}
             }
         """
@@ -89,8 +110,19 @@ class UnifiedRequestHandler:
             logger.error("Empty user_request provided")
             raise ValueError("Empty user_request")
 
-        # STEP 1: Route the request
-        routing_decision = await self.router.route(user_request, context)
+        response_id = str(uuid4())
+
+        # STEP 1: Route the request (classifier first on the fast path, LLM router otherwise)
+        fused = False
+        routing_decision = None
+        if self.fast_path_enabled if fast_path is None else fast_path:
+            candidate = self.router.fast_route(user_request)
+            fused = candidate["path"] == "simple" and candidate["confidence"] >= self.fast_path_min_confidence
+            if fused:
+                routing_decision = candidate
+        if routing_decision is None:
+            routing_decision = await self.router.route(user_request, context)
+            routing_decision.setdefault("routing_method", "llm")
 
         logger.info(
             f"Routing decision: path={routing_decision['path']}, "
@@ -106,7 +138,8 @@ class UnifiedRequestHandler:
                     user_request=user_request,
                     routing_decision=routing_decision,
                     user_id=user_id,
-                    available_models=available_models
+                    available_models=available_models,
+                    score=not fused
                 )
 
             elif routing_decision["path"] == "complex":
@@ -132,6 +165,7 @@ class UnifiedRequestHandler:
             logger.error(f"Request execution failed: {e}")
             # Return error response
             return {
+                "response_id": response_id,
                 "response": f"Error processing request: {str(e)}",
                 "model": "error",
                 "path": routing_decision["path"],
@@ -154,27 +188,88 @@ class UnifiedRequestHandler:
 
         # STEP 3: Package response with metadata
         response = {
+            "response_id": response_id,
             "response": result.get("response", ""),
             "model": result.get("model", result.get("models_used", ["unknown"])),
             "path": routing_decision["path"],
             "routing_decision": routing_decision,
-            "confidence": result.get("confidence", 0.7),
+            "confidence": result.get("confidence", 0.7) if not fused else None,
             "confidence_details": result.get("confidence_details", {}),
+            "usage": result.get("usage"),
             "metadata": {
                 **result.get("metadata", {}),
                 "execution_time_ms": execution_time_ms,
-                "user_id": user_id
+                "user_id": user_id,
+                "fast_path": fused
             }
         }
 
+        if fused:
+            # Row first, so the response ID resolves (as pending) as soon as the client has it
+            await self._record(response_id, user_id, user_request, routing_decision, response["model"], None)
+            self._spawn(self._score_later(response_id, user_request, response["response"], response["model"]))
+        else:
+            self._spawn(self._record(
+                response_id, user_id, user_request, routing_decision, response["model"],
+                response["confidence_details"] or {"confidence": response["confidence"]}
+            ))
+
         logger.info(
             f"Request completed: path={routing_decision['path']}, "
-            f"confidence={result.get('confidence', 0):.2f}, "
+            f"confidence={'pending' if fused else format(result.get('confidence') or 0, '.2f')}, "
             f"time={execution_time_ms:.0f}ms"
         )
 
         return response
 
+    def _spawn(self, coroutine):
+        task = asyncio.create_task(coroutine)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _record(
+        self,
+        response_id: str,
+        user_id: str,
+        user_request: str,
+        routing_decision: Dict,
+        model,
+        confidence: Optional[Dict]
+    ):
+        try:
+            await asyncio.to_thread(
+                self.responses.record, response_id, user_id, user_request, routing_decision, model, confidence
+            )
+        except Exception as e:
+            logger.warning(f"Failed to record response {response_id}: {e}")
+
+    async def _score_later(self, response_id: str, user_request: str, output: str, model):
+        """Run the confidence model on a fast-path answer and attach the score"""
+        try:
+            confidence = await self.orchestrator.confidence.score(
+                output=output,
+                original_request=user_request,
+                model_used=model if isinstance(model, str) else None
+            )
+        except Exception as e:
+            logger.warning(f"Deferred confidence scoring failed for {response_id}: {e}")
+            confidence, error = None, str(e)
+        else:
+            error = None
+        try:
+            await asyncio.to_thread(self.responses.attach_confidence, response_id, confidence, error)
+        except Exception as e:
+            logger.warning(f"Failed to store confidence for {response_id}: {e}")
+
+    async def drain(self):
+        """Wait for pending background scoring and logging (shutdown, tests)"""
+        while self._background:
+            await asyncio.gather(*list(self._background), return_exceptions=True)
+
+    def get_confidence(self, response_id: str) -> Optional[Dict]:
+        """Routing and (possibly deferred) confidence of a response, or None if unknown"""
+        return self.responses.get(response_id)
+
     async def _execute_specialized(
         self,
         user_request: str,
@@ -225,6 +320,10 @@ class UnifiedRequestHandler:
             "router_available": self.router is not None,
             "orchestrator_available": self.orchestrator is not None,
             "inference_server_available": self.inference_server.is_available(),
+            "fast_path_enabled": self.fast_path_enabled,
+            "route_classifier_trained": self.router.classifier.trained,
+            "route_classifier_version": self.router.classifier.meta.get("version"),
+            "pending_background_tasks": len(self._background),
             "loaded_models": self.inference_server.get_loaded_models()
         }
 
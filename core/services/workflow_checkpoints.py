@@ -0,0 +1,95 @@
+# Copyright (c) 2025 LALO AI LLC. All rights reserved.
+"""
+Workflow Checkpoints
+
+Durable per-step outputs for LALO workflow sessions.
+- interpretation: the semantic interpretation result
+- planning: one record per plan iteration (draft, critique, running best)
+- execution: one record per ExecutionResult, in step order
+- commit: marker written once the plan example has been sent to RTI
+
+Each record is written in its own short transaction as soon as the step
+finishes, so a restart loses at most the step that was in flight.
+Checkpoints are dropped when the session reaches a terminal state.
+"""
+
+from typing import Any, Dict, List, Optional
+import json
+import logging
+
+from core.database import SessionLocal, WorkflowCheckpoint
+
+logger = logging.getLogger(__name__)
+
+
+class WorkflowCheckpointStore:
+    """Reads and writes WorkflowCheckpoint rows"""
+
+    def save(self, session_id: str, stage: str, step: int, payload: Dict[str, Any]):
+        """
+        Persist the output of a completed step (replaces an existing record)
+
+        Args:
+            session_id: Workflow session ID
+            stage: interpretation, refinement, planning, execution or commit
+            step: Step index within the stage
+            payload: JSON-serializable step output (non-JSON values are stringified)
+        """
+        payload = json.loads(json.dumps(payload, default=str))
+        db = SessionLocal()
+        try:
+            record = db.query(WorkflowCheckpoint).filter(
+                WorkflowCheckpoint.session_id == session_id,
+                WorkflowCheckpoint.stage == stage,
+                WorkflowCheckpoint.step == step
+            ).first()
+            if record:
+                record.payload = payload
+            else:
+                db.add(WorkflowCheckpoint(session_id=session_id, stage=stage, step=step, payload=payload))
+            db.commit()
+        finally:
+            db.close()
+
+    def load(self, session_id: str, stage: str) -> List[Dict[str, Any]]:
+        """
+        Completed step outputs for a stage, in step order
+
+        Args:
+            session_id: Workflow session ID
+            stage: Stage name
+
+        Returns:
+            List of payloads (empty if the stage has no checkpoints)
+        """
+        db = SessionLocal()
+        try:
+            records = db.query(WorkflowCheckpoint).filter(
+                WorkflowCheckpoint.session_id == session_id,
+                WorkflowCheckpoint.stage == stage
+            ).order_by(WorkflowCheckpoint.step).all()
+            return [r.payload for r in records]
+        finally:
+            db.close()
+
+    def clear(self, session_id: str, stage: Optional[str] = None) -> int:
+        """
+        Delete checkpoints for a session (or one of its stages)
+
+        Returns:
+            Number of records removed
+        """
+        db = SessionLocal()
+        try:
+            query = db.query(WorkflowCheckpoint).filter(WorkflowCheckpoint.session_id == session_id)
+            if stage:
+                query = query.filter(WorkflowCheckpoint.stage == stage)
+            removed = query.delete(synchronize_session=False)
+            db.commit()
+            return removed
+        finally:
+            db.close()
+
+
+# Global checkpoint store instance
+workflow_checkpoints = WorkflowCheckpointStore()
@@ -0,0 +1,241 @@
+# Copyright (c) 2025 LALO AI LLC. All rights reserved.
+"""
+Workflow Engine
+
+Runs LALO workflow stages in the background, off the HTTP request path.
+- Each session has at most one running stage task; stages chain inside it
+- Stage progress is published as events to per-session subscribers
+  (consumed by the SSE stream in workflow_routes)
+- Per-session state is dropped once the session reaches a terminal state
+"""
+
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set
+from datetime import datetime
+import asyncio
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATES = {"completed", "error"}
+
+
+class StageInProgressError(Exception):
+    """Raised when feedback arrives while a session's stage is still running"""
+
+    def __init__(self, session_id: str):
+        super().__init__(f"Workflow {session_id} has a stage in progress; retry after its next event")
+        self.session_id = session_id
+
+
+class WorkflowEventBus:
+    """
+    Fan-out of workflow events to per-session subscribers
+
+    The latest event per session is retained so late subscribers start
+    from the current state instead of waiting for the next transition.
+    Sessions parked on a human (approval) keep theirs until they finish,
+    so only the most recently active max_retained sessions are kept.
+    """
+
+    def __init__(self, queue_size: int = 100, max_retained: Optional[int] = None):
+        """
+        Initialize event bus
+
+        Args:
+            queue_size: Events buffered per subscriber
+            max_retained: Sessions whose latest event is kept (WORKFLOW_EVENT_RETAIN_SESSIONS, default 1000)
+        """
+        self.queue_size = queue_size
+        self.max_retained = max_retained or int(os.getenv("WORKFLOW_EVENT_RETAIN_SESSIONS", "1000"))
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._latest: "OrderedDict[str, Dict]" = OrderedDict()
+
+    def publish(self, session_id: str, event: Dict):
+        """
+        Deliver an event to every subscriber of a session
+
+        Args:
+            session_id: Workflow session ID
+            event: Event payload; "state" in TERMINAL_STATES ends the stream
+        """
+        event = {"session_id": session_id, "timestamp": datetime.utcnow().isoformat(), **event}
+        self._latest[session_id] = event
+        self._latest.move_to_end(session_id)
+        while len(self._latest) > self.max_retained:
+            self._latest.popitem(last=False)
+        for queue in list(self._subscribers.get(session_id, ())):
+            if queue.full():
+                # Slow consumer: drop its oldest event rather than block the engine
+                queue.get_nowait()
+            queue.put_nowait(event)
+        if event.get("state") in TERMINAL_STATES:
+            self.evict(session_id)
+
+    def evict(self, session_id: str):
+        """Forget retained state for a session (subscribers keep their queues)"""
+        self._latest.pop(session_id, None)
+        self._subscribers.pop(session_id, None)
+
+    def latest(self, session_id: str) -> Optional[Dict]:
+        return self._latest.get(session_id)
+
+    def listen(self, session_id: str) -> asyncio.Queue:
+        """
+        Register a subscriber queue right away
+
+        Callers that read session state themselves listen first, so no
+        transition between that read and the first event is lost. Pair
+        with events() and unlisten().
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(session_id, set()).add(queue)
+        return queue
+
+    def unlisten(self, session_id: str, queue: asyncio.Queue):
+        subscribers = self._subscribers.get(session_id)
+        if subscribers is not None:
+            subscribers.discard(queue)
+            if not subscribers:
+                self._subscribers.pop(session_id, None)
+
+    async def events(self, queue: asyncio.Queue, heartbeat: Optional[float] = None) -> AsyncIterator[Optional[Dict]]:
+        """
+        Yield events from a listen() queue until a terminal state
+
+        Args:
+            queue: Queue returned by listen()
+            heartbeat: Seconds of silence after which None is yielded (keep-alive)
+        """
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield None
+                continue
+            yield event
+            if event.get("state") in TERMINAL_STATES:
+                return
+
+    async def subscribe(self, session_id: str, heartbeat: Optional[float] = None) -> AsyncIterator[Optional[Dict]]:
+        """
+        Yield events for a session until it reaches a terminal state,
+        starting with the retained latest event
+
+        Args:
+            session_id: Workflow session ID
+            heartbeat: Seconds of silence after which None is yielded (keep-alive)
+        """
+        queue = self.listen(session_id)
+        try:
+            latest = self._latest.get(session_id)
+            if latest:
+                queue.put_nowait(latest)
+            async for event in self.events(queue, heartbeat):
+                yield event
+        finally:
+            self.unlisten(session_id, queue)
+
+    def get_stats(self) -> Dict:
+        return {
+            "sessions_tracked": len(self._latest),
+            "subscribers": sum(len(s) for s in self._subscribers.values())
+        }
+
+
+class WorkflowEngine:
+    """
+    Background runner for workflow stage tasks
+
+    Stages are coroutines; a session runs one stage chain at a time and a
+    new submission for a busy session waits for the running one to finish.
+    """
+
+    def __init__(self, max_concurrent: Optional[int] = None):
+        """
+        Initialize workflow engine
+
+        Args:
+            max_concurrent: Stage chains allowed to run at once (WORKFLOW_MAX_CONCURRENT)
+        """
+        self.max_concurrent = max_concurrent or int(os.getenv("WORKFLOW_MAX_CONCURRENT", "16"))
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def submit(
+        self,
+        session_id: str,
+        stage: str,
+        run: Callable[[], Awaitable[Any]],
+        on_error: Optional[Callable[[Exception], Awaitable[Any]]] = None
+    ) -> asyncio.Task:
+        """
+        Schedule a stage for a session and return immediately
+
+        Args:
+            session_id: Workflow session ID
+            stage: Stage name (for logging)
+            run: Zero-argument coroutine factory that runs the stage
+            on_error: Coroutine factory called with the exception if the stage fails
+        """
+        previous = self._tasks.get(session_id)
+
+        async def _runner():
+            if previous is not None and not previous.done():
+                await asyncio.gather(previous, return_exceptions=True)
+            if self._semaphore is None:
+                self._semaphore = asyncio.Semaphore(self.max_concurrent)
+            async with self._semaphore:
+                logger.info(f"Workflow {session_id}: running stage {stage}")
+                try:
+                    return await run()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Workflow {session_id}: stage {stage} failed: {e}")
+                    if on_error is not None:
+                        await on_error(e)
+
+        task = asyncio.create_task(_runner(), name=f"workflow:{session_id}:{stage}")
+        self._tasks[session_id] = task
+        task.add_done_callback(lambda t: self._forget(session_id, t))
+        return task
+
+    def _forget(self, session_id: str, task: asyncio.Task):
+        if self._tasks.get(session_id) is task:
+            del self._tasks[session_id]
+
+    def is_running(self, session_id: str) -> bool:
+        task = self._tasks.get(session_id)
+        return task is not None and not task.done()
+
+    async def wait(self, session_id: str, timeout: Optional[float] = None):
+        """Wait for the session's current stage chain (if any) to finish"""
+        task = self._tasks.get(session_id)
+        if task is not None:
+            await asyncio.wait_for(asyncio.shield(task), timeout=timeout)
+
+    def cancel(self, session_id: str) -> bool:
+        """Cancel the session's running stage chain, e.g. after a rejection"""
+        task = self._tasks.get(session_id)
+        if task is None or task.done():
+            return False
+        task.cancel()
+        return True
+
+    def running_sessions(self) -> List[str]:
+        return [sid for sid, task in self._tasks.items() if not task.done()]
+
+    async def shutdown(self):
+        """Cancel running stage tasks (they are resumable from the database)"""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+
+
+# Global workflow engine and event bus
+workflow_event_bus = WorkflowEventBus()
+workflow_engine = WorkflowEngine()
@@ -0,0 +1,112 @@
+# Copyright (c) 2025 LALO AI LLC. All rights reserved.
+"""
+Workflow Leases
+
+Cross-process ownership of in-flight LALO workflow sessions.
+- A process claims a session before running one of its stages; the claim is
+  a conditional UPDATE (own or expired lease) or an INSERT, so exactly one
+  process wins when several try at once
+- The holder renews the lease while the stage runs and releases it when the
+  stage chain ends; a crashed holder's lease simply expires
+- Approvals claim the lease too, so feedback sent to any worker gets a 409
+  while another worker is still running the session's stage
+"""
+
+from datetime import datetime, timedelta
+from typing import Optional
+import logging
+import os
+import socket
+import uuid
+
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
+
+from core.database import SessionLocal, WorkflowLease
+
+logger = logging.getLogger(__name__)
+
+
+class WorkflowLeaseStore:
+    """Claims, renews and releases WorkflowLease rows for one process"""
+
+    def __init__(self, owner: Optional[str] = None, lease_seconds: Optional[float] = None):
+        """
+        Initialize lease store
+
+        Args:
+            owner: Identity of this process (default host:pid:nonce)
+            lease_seconds: Lease length (WORKFLOW_LEASE_SECONDS, default 60)
+        """
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.lease_seconds = lease_seconds or float(os.getenv("WORKFLOW_LEASE_SECONDS", "60"))
+
+    def _expiry(self) -> datetime:
+        return datetime.utcnow() + timedelta(seconds=self.lease_seconds)
+
+    def new_lease(self, session_id: str) -> WorkflowLease:
+        """Lease row to add in the transaction that creates the session"""
+        return WorkflowLease(session_id=session_id, owner=self.owner, expires_at=self._expiry())
+
+    def claim(self, session_id: str) -> bool:
+        """
+        Take (or extend) the lease on a session
+
+        Args:
+            session_id: Workflow session ID
+
+        Returns:
+            True if this process now holds the lease, False if another
+            process holds an unexpired one
+        """
+        db = SessionLocal()
+        try:
+            taken = db.query(WorkflowLease).filter(
+                WorkflowLease.session_id == session_id,
+                or_(WorkflowLease.owner == self.owner, WorkflowLease.expires_at < datetime.utcnow())
+            ).update({"owner": self.owner, "expires_at": self._expiry()}, synchronize_session=False)
+            if not taken:
+                db.add(self.new_lease(session_id))
+            try:
+                db.commit()
+            except IntegrityError:
+                # Row exists and is held by someone else
+                db.rollback()
+                return False
+            return True
+        finally:
+            db.close()
+
+    def renew(self, session_id: str) -> bool:
+        """
+        Extend a lease this process holds
+
+        Returns:
+            False if the lease was lost (expired and claimed elsewhere)
+        """
+        db = SessionLocal()
+        try:
+            renewed = db.query(WorkflowLease).filter(
+                WorkflowLease.session_id == session_id,
+                WorkflowLease.owner == self.owner
+            ).update({"expires_at": self._expiry()}, synchronize_session=False)
+            db.commit()
+            return bool(renewed)
+        finally:
+            db.close()
+
+    def release(self, session_id: str):
+        """Drop this process's lease so any process may pick the session up"""
+        db = SessionLocal()
+        try:
+            db.query(WorkflowLease).filter(
+                WorkflowLease.session_id == session_id,
+                WorkflowLease.owner == self.owner
+            ).delete(synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+
+# Global lease store instance (one owner identity per process)
+workflow_leases = WorkflowLeaseStore()
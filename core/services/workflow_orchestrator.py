@@ -10,6 +10,9 @@ Coordinates the complete 5-step LALO workflow:
 5. Commit (to permanent memory)
 
 This is the main orchestration engine that brings everything together.
+
+Several worker processes may share one database: a stage only runs in the
+process holding the session's lease (see workflow_leases).
 """
 
 from typing import Dict, Any, Optional, Callable, List
@@ -17,9 +20,22 @@ from datetime import datetime
 from core.database import SessionLocal, WorkflowSession, WorkflowState, FeedbackEvent
 from core.services.semantic_interpreter import semantic_interpreter
 from core.services.action_planner import action_planner
-from core.services.tool_executor import tool_executor
+from core.services.tool_executor import ExecutionResult, tool_executor
+from core.services.microservices_client import rti_client
+from core.services.workflow_engine import (
+    TERMINAL_STATES,
+    StageInProgressError,
+    WorkflowEngine,
+    WorkflowEventBus,
+    workflow_engine,
+    workflow_event_bus,
+)
+from core.services.workflow_checkpoints import WorkflowCheckpointStore, workflow_checkpoints
+from core.services.workflow_leases import WorkflowLeaseStore, workflow_leases
 from dataclasses import asdict
+import asyncio
 import logging
+import os
 import uuid
 import json
 
@@ -38,9 +54,241 @@ class WorkflowOrchestrator:
     5. FINALIZING: Approved results → Commit to permanent memory
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        engine: WorkflowEngine = None,
+        event_bus: WorkflowEventBus = None,
+        checkpoints: WorkflowCheckpointStore = None,
+        leases: WorkflowLeaseStore = None
+    ):
         """Initialize workflow orchestrator"""
-        self.active_workflows = {}  # session_id → workflow state
+        self.engine = engine or workflow_engine
+        self.event_bus = event_bus or workflow_event_bus
+        self.checkpoints = checkpoints or workflow_checkpoints
+        self.leases = leases or workflow_leases
+        self.active_workflows = {}  # session_id → in-flight workflow info (evicted when terminal)
+        self._lease_holds: Dict[str, int] = {}  # session_id → scheduled stage chains holding its lease
+
+    # ------------------------------------------------------------------
+    # Short-lived persistence helpers
+    # ------------------------------------------------------------------
+
+    def _read_session(self, session_id: str) -> Optional[Dict]:
+        """Load a session as a dict in its own short transaction"""
+        db = SessionLocal()
+        try:
+            session = db.query(WorkflowSession).filter(
+                WorkflowSession.session_id == session_id
+            ).first()
+            return self._session_to_dict(session) if session else None
+        finally:
+            db.close()
+
+    def _write_session(
+        self,
+        session_id: str,
+        event: str = None,
+        feedback: Dict = None,
+        **fields
+    ) -> Optional[Dict]:
+        """
+        Update session columns in one short transaction and publish the change
+
+        Args:
+            session_id: Workflow session ID
+            event: Event name published to stream subscribers
+            feedback: Optional FeedbackEvent fields recorded in the same transaction
+            **fields: WorkflowSession columns to set
+
+        Returns:
+            Updated session dict, or None if the session does not exist
+        """
+        db = SessionLocal()
+        try:
+            session = db.query(WorkflowSession).filter(
+                WorkflowSession.session_id == session_id
+            ).first()
+            if not session:
+                logger.error(f"Session {session_id} not found")
+                return None
+            for name, value in fields.items():
+                setattr(session, name, value)
+            session.updated_at = datetime.utcnow()
+            if feedback:
+                self._record_feedback(db=db, session_id=session_id, **feedback)
+            db.commit()
+            data = self._session_to_dict(session)
+        finally:
+            db.close()
+
+        self._publish(session_id, data, event or "updated")
+        return data
+
+    def _publish(self, session_id: str, data: Dict, event: str):
+        state = data.get("current_state")
+        self.event_bus.publish(session_id, {"type": event, "state": state, "session": data})
+        if state in TERMINAL_STATES:
+            self.active_workflows.pop(session_id, None)
+            # Finished sessions never resume
+            self.checkpoints.clear(session_id)
+
+    def _claim(self, session_id: str):
+        """
+        Take the session's lease before acting on it
+
+        Raises:
+            StageInProgressError: A stage is running here or in another process
+        """
+        if self.engine.is_running(session_id) or not self.leases.claim(session_id):
+            raise StageInProgressError(session_id)
+
+    def _unclaim(self, session_id: str):
+        """Release a lease taken by _claim() if no stage was scheduled under it"""
+        if not self._lease_holds.get(session_id):
+            self.leases.release(session_id)
+
+    async def _keep_lease(self, session_id: str, task: asyncio.Task):
+        """Renew the lease while the stage chain runs; stop it if the lease is lost"""
+        while not task.done():
+            await asyncio.sleep(self.leases.lease_seconds / 3)
+            if not task.done() and not self.leases.renew(session_id):
+                logger.warning(f"Lost lease on workflow {session_id}; stopping its stage")
+                task.cancel()
+                return
+
+    def _drop_hold(self, session_id: str, renewer: asyncio.Task):
+        renewer.cancel()
+        holds = self._lease_holds.get(session_id, 0) - 1
+        if holds > 0:
+            self._lease_holds[session_id] = holds
+            return
+        self._lease_holds.pop(session_id, None)
+        self.leases.release(session_id)
+
+    def _schedule(self, session_id: str, user_id: str, stage: str) -> bool:
+        """
+        Run a stage in the background; /start and approvals return immediately
+
+        The stage holds the session's lease until it finishes.
+
+        Returns:
+            False if another process holds the lease (nothing was scheduled)
+        """
+        if not self.leases.claim(session_id):
+            logger.info(f"Workflow {session_id} is leased by another process; not scheduling {stage}")
+            return False
+
+        stage_fn = {
+            "interpretation": self._run_interpretation,
+            "refinement": self._run_refinement,
+            "planning": self._run_planning,
+            "execution": self._run_execution,
+            "commit": self._commit_to_memory,
+        }[stage]
+
+        async def _fail(error: Exception):
+            self._write_session(
+                session_id,
+                event="error",
+                current_state=WorkflowState.ERROR,
+                error_message=f"{stage} failed: {error}"
+            )
+
+        self.active_workflows[session_id] = {"user_id": user_id, "stage": stage}
+        self._lease_holds[session_id] = self._lease_holds.get(session_id, 0) + 1
+        task = self.engine.submit(session_id, stage, lambda: stage_fn(session_id, user_id), on_error=_fail)
+        renewer = asyncio.create_task(self._keep_lease(session_id, task))
+        task.add_done_callback(lambda _: self._drop_hold(session_id, renewer))
+        return True
+
+    # ------------------------------------------------------------------
+    # Crash recovery
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _pending_stage(session: Dict) -> Optional[str]:
+        """
+        Stage an interrupted session was running, or None if it is waiting
+        on a human (or finished)
+        """
+        state = session["current_state"]
+        if state == WorkflowState.INTERPRETING.value:
+            if session["interpretation_approved"] == 1:
+                return "refinement"
+            return "interpretation" if session["interpreted_intent"] is None else None
+        if state == WorkflowState.PLANNING.value:
+            return "planning" if session["interpretation_approved"] == 1 and session["action_plan"] is None else None
+        if state in (WorkflowState.BACKUP_VERIFY.value, WorkflowState.EXECUTING.value):
+            return "execution"
+        if state == WorkflowState.FINALIZING.value:
+            return "commit"
+        return None
+
+    async def recover_workflows(self) -> List[str]:
+        """
+        Resume sessions that were mid-stage when the process stopped
+
+        Each resumed stage starts after its last checkpointed step, so
+        completed model and tool calls are not repeated. A session is only
+        resumed by the process that wins its lease; sessions whose holder is
+        still alive are left alone, so several workers may run this at once.
+
+        Returns:
+            IDs of the sessions that were rescheduled
+        """
+        in_flight = [
+            WorkflowState.INTERPRETING, WorkflowState.PLANNING, WorkflowState.BACKUP_VERIFY,
+            WorkflowState.EXECUTING, WorkflowState.FINALIZING
+        ]
+        db = SessionLocal()
+        try:
+            sessions = [
+                self._session_to_dict(s)
+                for s in db.query(WorkflowSession).filter(WorkflowSession.current_state.in_(in_flight)).all()
+            ]
+        finally:
+            db.close()
+
+        resumed = []
+        for session in sessions:
+            session_id = session["session_id"]
+            if self._pending_stage(session) is None or self.engine.is_running(session_id):
+                continue
+            if not self.leases.claim(session_id):
+                continue
+            # Re-read under the lease: the previous holder may have moved it on
+            session = self._read_session(session_id)
+            stage = self._pending_stage(session) if session else None
+            if stage is None or not self._schedule(session_id, session["user_id"], stage):
+                self._unclaim(session_id)
+                continue
+            logger.info(f"Resuming workflow {session_id} at stage {stage}")
+            self._publish(session_id, session, "resumed")
+            resumed.append(session_id)
+
+        if resumed:
+            logger.info(f"Recovered {len(resumed)} in-flight workflows")
+        return resumed
+
+    async def run_recovery(self, interval: Optional[float] = None):
+        """
+        Recover now, then keep picking up sessions whose holder died
+
+        Args:
+            interval: Seconds between passes (WORKFLOW_RECOVERY_INTERVAL,
+                default the lease length)
+        """
+        interval = interval or float(os.getenv("WORKFLOW_RECOVERY_INTERVAL", str(self.leases.lease_seconds)))
+        while True:
+            try:
+                await self.recover_workflows()
+            except Exception as e:
+                logger.warning(f"Workflow recovery failed: {e}")
+            await asyncio.sleep(interval)
+
+    # ------------------------------------------------------------------
+    # Workflow steps
+    # ------------------------------------------------------------------
 
     async def start_workflow(
         self,
@@ -51,6 +299,8 @@ class WorkflowOrchestrator:
         """
         Start a new LALO workflow
 
+        Creates the session and schedules interpretation in the background.
+
         Args:
             user_request: The user's original request
             user_id: User ID
@@ -74,26 +324,20 @@ class WorkflowOrchestrator:
                 updated_at=datetime.utcnow()
             )
             db.add(session)
+            db.flush()
+            # Leased from the start, so no other worker's recovery can take it
+            db.add(self.leases.new_lease(session_id))
             db.commit()
-            db.refresh(session)
-
-            # Store in active workflows
-            self.active_workflows[session_id] = {
-                "session": session,
-                "callbacks": {}
-            }
-
-            # Start Step 1: Semantic Interpretation
-            await self._run_interpretation(session_id, user_id)
-
-            # Get updated session
-            db.refresh(session)
-
-            return self._session_to_dict(session)
-
+            data = self._session_to_dict(session)
         finally:
             db.close()
 
+        self._publish(session_id, data, "started")
+
+        # Step 1: Semantic Interpretation runs in the background
+        self._schedule(session_id, user_id, "interpretation")
+        return data
+
     async def _run_interpretation(self, session_id: str, user_id: str):
         """
         Step 1: Semantic Interpretation
@@ -102,59 +346,63 @@ class WorkflowOrchestrator:
         - Score confidence
         - Generate clarifications if needed
         """
-        db = SessionLocal()
-        try:
-            session = db.query(WorkflowSession).filter(
-                WorkflowSession.session_id == session_id
-            ).first()
-
-            if not session:
-                logger.error(f"Session {session_id} not found")
-                return
-
-            logger.info(f"Running interpretation for workflow {session_id}")
-
-            # Run semantic interpretation
+        session = self._read_session(session_id)
+        if not session:
+            logger.error(f"Session {session_id} not found")
+            return
+
+        logger.info(f"Running interpretation for workflow {session_id}")
+
+        checkpoint = self.checkpoints.load(session_id, "interpretation")
+        if checkpoint:
+            logger.info(f"Interpretation for {session_id} restored from checkpoint")
+            fields = dict(checkpoint[-1])
+        else:
+            # Run semantic interpretation (no DB connection held while awaiting)
             result = await semantic_interpreter.interpret(
-                user_request=session.original_request,
+                user_request=session["original_request"],
                 user_id=user_id
             )
-
-            # Update session with interpretation results
-            session.interpreted_intent = result.interpreted_intent
-            session.confidence_score = result.confidence_score
-            session.reasoning_trace = result.reasoning_trace
-            session.suggested_clarifications = result.suggested_clarifications
-            session.updated_at = datetime.utcnow()
-
-            # Determine next state
-            if result.feedback_required:
-                # Need clarification - wait for human feedback
-                session.current_state = WorkflowState.INTERPRETING
-                session.interpretation_approved = 0  # Pending
-                logger.info("Interpretation requires clarification")
-            else:
-                # Auto-approve high confidence interpretations
-                session.interpretation_approved = 1
-                session.current_state = WorkflowState.PLANNING
-                logger.info("Interpretation approved, moving to planning")
-
-                # Immediately start planning
-                db.commit()
-                await self._run_planning(session_id, user_id)
-                return  # Return early as state already updated
-
-            db.commit()
-
-        finally:
-            db.close()
+            fields = dict(
+                interpreted_intent=result.interpreted_intent,
+                confidence_score=result.confidence_score,
+                reasoning_trace=result.reasoning_trace,
+                suggested_clarifications=result.suggested_clarifications,
+                feedback_required=result.feedback_required
+            )
+            self.checkpoints.save(session_id, "interpretation", 0, fields)
+        feedback_required = fields.pop("feedback_required")
+
+        # Determine next state
+        if feedback_required:
+            # Need clarification - wait for human feedback
+            logger.info("Interpretation requires clarification")
+            self._write_session(
+                session_id,
+                event="awaiting_approval",
+                current_state=WorkflowState.INTERPRETING,
+                interpretation_approved=0,
+                **fields
+            )
+            return
+
+        # Auto-approve high confidence interpretations
+        logger.info("Interpretation approved, moving to planning")
+        self._write_session(
+            session_id,
+            event="interpreted",
+            current_state=WorkflowState.PLANNING,
+            interpretation_approved=1,
+            **fields
+        )
+        await self._run_planning(session_id, user_id)
 
     async def approve_interpretation(
         self,
         session_id: str,
         user_id: str,
         feedback: str = None
-    ):
+    ) -> Optional[Dict]:
         """
         Human approves interpretation or provides clarification
 
@@ -163,49 +411,92 @@ class WorkflowOrchestrator:
             user_id: User ID
             feedback: Optional clarification feedback
         """
-        db = SessionLocal()
-        try:
-            session = db.query(WorkflowSession).filter(
-                WorkflowSession.session_id == session_id
-            ).first()
+        session = self._read_session(session_id)
+        if not session:
+            return session
+        self._claim(session_id)
 
-            if feedback:
-                # User provided clarification - refine interpretation
-                logger.info(f"Refining interpretation with user feedback for {session_id}")
-
-                result = await semantic_interpreter.refine_with_feedback(
-                    original_request=session.original_request,
-                    user_feedback=feedback,
-                    user_id=user_id
-                )
-
-                session.interpreted_intent = result.interpreted_intent
-                session.confidence_score = result.confidence_score
-                session.reasoning_trace = result.reasoning_trace
-
-            # Mark as approved
-            session.interpretation_approved = 1
-            session.current_state = WorkflowState.PLANNING
-            session.updated_at = datetime.utcnow()
-
-            # Record feedback event
-            self._record_feedback(
-                db=db,
-                session_id=session_id,
-                user_id=user_id,
-                step="interpretation",
-                feedback_type="approve",
-                feedback_value=feedback
+        feedback_event = dict(
+            user_id=user_id, step="interpretation", feedback_type="approve", feedback_value=feedback
+        )
+        if feedback:
+            # Refinement is a model call: record the approval (it carries the
+            # clarification) and refine in the background before planning
+            data = self._write_session(
+                session_id,
+                event="interpretation_approved",
+                feedback=feedback_event,
+                interpretation_approved=1,
+                current_state=WorkflowState.INTERPRETING
             )
+            if data is not None:
+                self.checkpoints.clear(session_id, "refinement")
+                self._schedule(session_id, user_id, "refinement")
+            self._unclaim(session_id)
+            return data
+
+        # Mark as approved and record feedback event
+        data = self._write_session(
+            session_id,
+            event="interpretation_approved",
+            feedback=feedback_event,
+            interpretation_approved=1,
+            current_state=WorkflowState.PLANNING
+        )
 
-            db.commit()
-
-            # Move to next step: Planning
-            await self._run_planning(session_id, user_id)
+        # Move to next step: Planning
+        if data is not None:
+            self._schedule(session_id, user_id, "planning")
+        self._unclaim(session_id)
+        return data
 
+    def _interpretation_feedback(self, session_id: str) -> Optional[str]:
+        """Clarification given with the latest interpretation approval"""
+        db = SessionLocal()
+        try:
+            event = db.query(FeedbackEvent).filter(
+                FeedbackEvent.workflow_session_id == session_id,
+                FeedbackEvent.step == "interpretation",
+                FeedbackEvent.feedback_type == "approve"
+            ).order_by(FeedbackEvent.created_at.desc()).first()
+            return event.feedback_value if event else None
         finally:
             db.close()
 
+    async def _run_refinement(self, session_id: str, user_id: str):
+        """
+        Step 1b: Refine an approved interpretation with the user's clarification,
+        then continue with planning
+        """
+        session = self._read_session(session_id)
+        if not session:
+            return
+
+        checkpoint = self.checkpoints.load(session_id, "refinement")
+        if checkpoint:
+            fields = dict(checkpoint[-1])
+        else:
+            logger.info(f"Refining interpretation with user feedback for {session_id}")
+            result = await semantic_interpreter.refine_with_feedback(
+                original_request=session["original_request"],
+                user_feedback=self._interpretation_feedback(session_id),
+                user_id=user_id
+            )
+            fields = dict(
+                interpreted_intent=result.interpreted_intent,
+                confidence_score=result.confidence_score,
+                reasoning_trace=result.reasoning_trace
+            )
+            self.checkpoints.save(session_id, "refinement", 0, fields)
+
+        self._write_session(
+            session_id,
+            event="interpreted",
+            current_state=WorkflowState.PLANNING,
+            **fields
+        )
+        await self._run_planning(session_id, user_id)
+
     async def _run_planning(self, session_id: str, user_id: str):
         """
         Step 2: Action Planning
@@ -214,54 +505,55 @@ class WorkflowOrchestrator:
         - Self-critique and refine
         - Iterate until confidence threshold met
         """
-        db = SessionLocal()
-        try:
-            session = db.query(WorkflowSession).filter(
-                WorkflowSession.session_id == session_id
-            ).first()
+        session = self._read_session(session_id)
+        if not session:
+            return
 
-            logger.info(f"Running planning for workflow {session_id}")
+        logger.info(f"Running planning for workflow {session_id}")
 
-            # Create action plan
-            plan = await action_planner.create_plan(
-                interpreted_intent=session.interpreted_intent,
-                user_id=user_id
-            )
+        # Create action plan; each iteration is checkpointed as it completes
+        plan = await action_planner.create_plan(
+            interpreted_intent=session["interpreted_intent"],
+            user_id=user_id,
+            checkpoints=self.checkpoints.load(session_id, "planning"),
+            on_iteration=lambda record: self.checkpoints.save(session_id, "planning", record["iteration"], record)
+        )
 
-            # Update session with plan
-            session.action_plan = {
+        fields = dict(
+            action_plan={
                 "steps": plan.steps,
                 "retrieved_examples": plan.retrieved_examples,
                 "iterations": plan.iterations,
                 "critiques": plan.critiques
-            }
-            session.plan_confidence_score = plan.confidence
-            session.updated_at = datetime.utcnow()
-
-            # Determine if plan needs approval
-            if plan.confidence >= 0.85:
-                # High confidence - auto-approve
-                session.plan_approved = 1
-                session.current_state = WorkflowState.BACKUP_VERIFY
-                logger.info("Plan auto-approved, moving to execution")
-
-                db.commit()
-                # Start execution
-                await self._run_execution(session_id, user_id)
-                return
-
-            else:
-                # Lower confidence - request human approval
-                session.plan_approved = 0
-                session.current_state = WorkflowState.PLANNING
-                logger.info("Plan requires human approval")
-
-            db.commit()
+            },
+            plan_confidence_score=plan.confidence
+        )
 
-        finally:
-            db.close()
+        # Determine if plan needs approval
+        if plan.confidence >= 0.85:
+            # High confidence - auto-approve
+            logger.info("Plan auto-approved, moving to execution")
+            self._write_session(
+                session_id,
+                event="planned",
+                plan_approved=1,
+                current_state=WorkflowState.BACKUP_VERIFY,
+                **fields
+            )
+            await self._run_execution(session_id, user_id)
+            return
+
+        # Lower confidence - request human approval
+        logger.info("Plan requires human approval")
+        self._write_session(
+            session_id,
+            event="awaiting_approval",
+            plan_approved=0,
+            current_state=WorkflowState.PLANNING,
+            **fields
+        )
 
-    async def approve_plan(self, session_id: str, user_id: str, feedback: str = None):
+    async def approve_plan(self, session_id: str, user_id: str, feedback: str = None) -> Optional[Dict]:
         """
         Human approves action plan
 
@@ -270,34 +562,22 @@ class WorkflowOrchestrator:
             user_id: User ID
             feedback: Optional feedback on plan
         """
-        db = SessionLocal()
-        try:
-            session = db.query(WorkflowSession).filter(
-                WorkflowSession.session_id == session_id
-            ).first()
-
-            # Mark plan as approved
-            session.plan_approved = 1
-            session.current_state = WorkflowState.BACKUP_VERIFY
-            session.updated_at = datetime.utcnow()
-
-            # Record feedback
-            self._record_feedback(
-                db=db,
-                session_id=session_id,
-                user_id=user_id,
-                step="planning",
-                feedback_type="approve",
-                feedback_value=feedback
-            )
-
-            db.commit()
-
-            # Start execution
-            await self._run_execution(session_id, user_id)
+        self._claim(session_id)
+
+        data = self._write_session(
+            session_id,
+            event="plan_approved",
+            feedback=dict(user_id=user_id, step="planning", feedback_type="approve", feedback_value=feedback),
+            plan_approved=1,
+            current_state=WorkflowState.BACKUP_VERIFY
+        )
+        if data is None:
+            self._unclaim(session_id)
+            return None
 
-        finally:
-            db.close()
+        # Start execution
+        self._schedule(session_id, user_id, "execution")
+        return data
 
     async def _run_execution(self, session_id: str, user_id: str):
         """
@@ -308,44 +588,70 @@ class WorkflowOrchestrator:
         - Verify results
         - Rollback on failure
         """
-        db = SessionLocal()
-        try:
-            session = db.query(WorkflowSession).filter(
-                WorkflowSession.session_id == session_id
-            ).first()
-
-            logger.info(f"Running execution for workflow {session_id}")
-
-            # Transition to executing state
-            session.current_state = WorkflowState.EXECUTING
-            session.updated_at = datetime.utcnow()
-            db.commit()
+        logger.info(f"Running execution for workflow {session_id}")
+
+        previous = self._read_session(session_id)
+        if not previous:
+            return
+
+        # Transition to executing state
+        session = self._write_session(session_id, event="executing", current_state=WorkflowState.EXECUTING)
+        if not session:
+            return
+
+        # Reconstruct ActionPlan from stored data
+        from core.services.action_planner import ActionPlan
+
+        plan_data = session["action_plan"] or {}
+        plan = ActionPlan(
+            steps=plan_data.get("steps", []),
+            confidence=session["plan_confidence_score"] or 0.5,
+            iterations=plan_data.get("iterations", 1),
+            critiques=plan_data.get("critiques", []),
+            retrieved_examples=plan_data.get("retrieved_examples", []),
+            metadata={}
+        )
 
-            # Parse action plan
-            from core.services.action_planner import ActionPlan
-            from dataclasses import dataclass
-
-            # Reconstruct ActionPlan from stored data
-            plan_data = session.action_plan
-            plan = ActionPlan(
-                steps=plan_data.get("steps", []),
-                confidence=session.plan_confidence_score or 0.5,
-                iterations=plan_data.get("iterations", 1),
-                critiques=plan_data.get("critiques", []),
-                retrieved_examples=plan_data.get("retrieved_examples", []),
-                metadata={}
-            )
+        # Steps finished before an interruption are not executed again
+        completed = [
+            ExecutionResult(**record)
+            for record in self.checkpoints.load(session_id, "execution")
+        ]
+
+        if completed or previous["current_state"] == WorkflowState.EXECUTING.value:
+            # A step was cut off mid-write: undo it before it runs again
+            await tool_executor.restore_interrupted(session_id, completed)
+
+        def _step_done(result: ExecutionResult):
+            index = len(completed)
+            completed.append(result)
+            self.checkpoints.save(session_id, "execution", index, asdict(result))
+            self.event_bus.publish(session_id, {
+                "type": "step_completed",
+                "state": WorkflowState.EXECUTING.value,
+                "step": result.step_number,
+                "success": result.success
+            })
+
+        # Execute plan
+        results = await tool_executor.execute_plan(
+            action_plan=plan,
+            user_id=user_id,
+            workflow_session_id=session_id,
+            human_approval=True,
+            completed=list(completed),
+            on_result=_step_done
+        )
 
-            # Execute plan
-            results = await tool_executor.execute_plan(
-                action_plan=plan,
-                user_id=user_id,
-                workflow_session_id=session_id,
-                human_approval=True
-            )
+        # Determine overall success
+        all_success = all(r.success for r in results)
+        logger.info(f"Execution {'succeeded' if all_success else 'failed'}")
 
-            # Update session with results
-            session.execution_results = {
+        # Update session with results and move to review
+        self._write_session(
+            session_id,
+            event="executed",
+            execution_results={
                 "steps": [
                     {
                         "step": r.step_number,
@@ -356,31 +662,18 @@ class WorkflowOrchestrator:
                     }
                     for r in results
                 ]
-            }
-
-            session.execution_steps_log = [
+            },
+            execution_steps_log=[
                 {
                     "step": r.step_number,
                     "status": "success" if r.success else "failed",
                     "backup_restored": r.backup_restored
                 }
                 for r in results
-            ]
-
-            # Determine overall success
-            all_success = all(r.success for r in results)
-            session.execution_success = 1 if all_success else 0
-
-            # Move to review
-            session.current_state = WorkflowState.REVIEWING
-            session.updated_at = datetime.utcnow()
-
-            logger.info(f"Execution {'succeeded' if all_success else 'failed'}")
-
-            db.commit()
-
-        finally:
-            db.close()
+            ],
+            execution_success=1 if all_success else 0,
+            current_state=WorkflowState.REVIEWING
+        )
 
     async def approve_results(
         self,
@@ -388,7 +681,7 @@ class WorkflowOrchestrator:
         user_id: str,
         rating: float = None,
         feedback: str = None
-    ):
+    ) -> Optional[Dict]:
         """
         Human approves final results
 
@@ -398,37 +691,24 @@ class WorkflowOrchestrator:
             rating: Quality rating (0.0-1.0)
             feedback: Final feedback
         """
-        db = SessionLocal()
-        try:
-            session = db.query(WorkflowSession).filter(
-                WorkflowSession.session_id == session_id
-            ).first()
-
-            # Mark as approved
-            session.review_approved = 1
-            session.final_feedback = feedback
-            session.success_rating = rating
-            session.current_state = WorkflowState.FINALIZING
-            session.updated_at = datetime.utcnow()
-
-            # Record feedback
-            self._record_feedback(
-                db=db,
-                session_id=session_id,
-                user_id=user_id,
-                step="review",
-                feedback_type="approve",
-                rating=rating,
-                comments=feedback
-            )
-
-            db.commit()
-
-            # Commit to permanent memory
-            await self._commit_to_memory(session_id, user_id)
+        self._claim(session_id)
+
+        data = self._write_session(
+            session_id,
+            event="results_approved",
+            feedback=dict(user_id=user_id, step="review", feedback_type="approve", rating=rating, comments=feedback),
+            review_approved=1,
+            final_feedback=feedback,
+            success_rating=rating,
+            current_state=WorkflowState.FINALIZING
+        )
+        if data is None:
+            self._unclaim(session_id)
+            return None
 
-        finally:
-            db.close()
+        # Commit to permanent memory
+        self._schedule(session_id, user_id, "commit")
+        return data
 
     async def _commit_to_memory(self, session_id: str, user_id: str):
         """
@@ -436,32 +716,38 @@ class WorkflowOrchestrator:
 
         Save successful workflow for future learning
         """
-        db = SessionLocal()
-        try:
-            session = db.query(WorkflowSession).filter(
-                WorkflowSession.session_id == session_id
-            ).first()
-
-            logger.info(f"Committing workflow {session_id} to permanent memory")
-
-            # Mark as committed
-            session.committed_to_permanent_memory = 1
-            session.current_state = WorkflowState.COMPLETED
-            session.completed_at = datetime.utcnow()
-            session.updated_at = datetime.utcnow()
-
-            # TODO: Actual memory storage
-            # In production:
-            # - Store in vector database for RAG
-            # - Update RTI examples
-            # - Fine-tune models with feedback
-
-            db.commit()
-
-            logger.info(f"Workflow {session_id} completed successfully")
-
-        finally:
-            db.close()
+        logger.info(f"Committing workflow {session_id} to permanent memory")
+        session = self._read_session(session_id)
+        if not session:
+            return
+
+        # TODO: Actual memory storage
+        # In production:
+        # - Store in vector database for RAG
+        # - Fine-tune models with feedback
+
+        # Rated plans become retrieval examples for future planning (once per session)
+        already_sent = bool(self.checkpoints.load(session_id, "commit"))
+        if session["success_rating"] is not None and session["action_plan"] and not already_sent:
+            result = await rti_client.add_plan_examples([{
+                "request": session["interpreted_intent"] or session["original_request"],
+                "plan": json.dumps(session["action_plan"], default=str),
+                "rating": session["success_rating"],
+                "session_id": session_id
+            }])
+            if result.get("error"):
+                logger.warning(f"Could not add plan example for {session_id}: {result['error']}")
+            self.checkpoints.save(session_id, "commit", 0, {"plan_example_sent": True})
+
+        # Mark as committed
+        self._write_session(
+            session_id,
+            event="completed",
+            committed_to_permanent_memory=1,
+            current_state=WorkflowState.COMPLETED,
+            completed_at=datetime.utcnow()
+        )
+        logger.info(f"Workflow {session_id} completed successfully")
 
     def _record_feedback(
         self,
@@ -516,10 +802,12 @@ class WorkflowOrchestrator:
             "plan_confidence_score": session.plan_confidence_score,
             "plan_approved": session.plan_approved,
             "execution_results": session.execution_results,
+            "execution_steps_log": session.execution_steps_log,
             "execution_success": session.execution_success,
             "review_approved": session.review_approved,
             "final_feedback": session.final_feedback,
             "success_rating": session.success_rating,
+            "error_message": session.error_message,
             "created_at": session.created_at.isoformat() if session.created_at else None,
             "updated_at": session.updated_at.isoformat() if session.updated_at else None,
             "completed_at": session.completed_at.isoformat() if session.completed_at else None
@@ -535,40 +823,25 @@ class WorkflowOrchestrator:
         Returns:
             Dict with current workflow state
         """
-        db = SessionLocal()
-        try:
-            session = db.query(WorkflowSession).filter(
-                WorkflowSession.session_id == session_id
-            ).first()
-
-            if not session:
-                return {"error": "Workflow not found"}
-
-            return self._session_to_dict(session)
-
-        finally:
-            db.close()
-
-
-
+        session = self._read_session(session_id)
+        if not session:
+            return {"error": "Workflow not found"}
+        return session
 
     async def reject_step(self, session_id: str, user_id: str, reason: str = None) -> Dict:
         """
         Mark current step as rejected and move workflow to ERROR state
         """
-        db = SessionLocal()
-        try:
-            session = db.query(WorkflowSession).filter(WorkflowSession.session_id == session_id).first()
-            if not session:
-                return {}
-            session.current_state = WorkflowState.ERROR
-            session.error_message = reason or 'Rejected by user'
-            session.updated_at = datetime.utcnow()
-            self._record_feedback(db=db, session_id=session_id, user_id=user_id, step='reject', feedback_type='reject', feedback_value=reason)
-            db.commit()
-            return self._session_to_dict(session)
-        finally:
-            db.close()
+        # Stop any in-flight stage so it cannot overwrite the rejection
+        self.engine.cancel(session_id)
+        data = self._write_session(
+            session_id,
+            event="rejected",
+            feedback=dict(user_id=user_id, step='reject', feedback_type='reject', feedback_value=reason),
+            current_state=WorkflowState.ERROR,
+            error_message=reason or 'Rejected by user'
+        )
+        return data or {}
 
     async def list_sessions(self, user_id: str, limit: int = 20, offset: int = 0) -> List[Dict]:
         db = SessionLocal()
@@ -584,25 +857,27 @@ class WorkflowOrchestrator:
         feedback_type: approve|reject|clarify|final
         """
         # Fetch session to determine current state
-        db = SessionLocal()
-        try:
-            session = db.query(WorkflowSession).filter(WorkflowSession.session_id == session_id).first()
-            if not session:
-                return {"error": "not_found"}
+        session = self._read_session(session_id)
+        if not session:
+            return {"error": "not_found"}
 
-            # Map feedback to actions based on current_state
-            state = session.current_state
+        # Map feedback to actions based on current_state
+        state = session["current_state"]
 
-            if feedback_type == 'reject':
-                return await self.reject_step(session_id, user_id, reason=message)
+        if feedback_type == 'reject':
+            return await self.reject_step(session_id, user_id, reason=message)
 
+        # A stage is still running (here or in another worker); approvals
+        # apply once it pauses for review
+        self._claim(session_id)
+        try:
             if feedback_type == 'approve' or feedback_type == 'final':
                 # If interpretation pending
-                if state == WorkflowState.INTERPRETING or state.value == 'interpreting':
+                if state == WorkflowState.INTERPRETING.value:
                     await self.approve_interpretation(session_id, user_id, feedback=message)
-                elif state == WorkflowState.PLANNING or state.value == 'planning':
+                elif state == WorkflowState.PLANNING.value:
                     await self.approve_plan(session_id, user_id, feedback=message)
-                elif state == WorkflowState.REVIEWING or state.value == 'reviewing' or feedback_type == 'final':
+                elif state == WorkflowState.REVIEWING.value or feedback_type == 'final':
                     await self.approve_results(session_id, user_id, feedback=message, rating=rating)
 
                 # Return updated status
@@ -614,42 +889,44 @@ class WorkflowOrchestrator:
                 return await self.get_workflow_status(session_id)
 
             # Unknown feedback type: record and return status
-            self._record_feedback(db=db, session_id=session_id, user_id=user_id, step='generic', feedback_type=feedback_type, feedback_value=message)
-            db.commit()
-            return self._session_to_dict(session)
+            return self._write_session(
+                session_id,
+                event="feedback",
+                feedback=dict(user_id=user_id, step='generic', feedback_type=feedback_type, feedback_value=message)
+            )
         finally:
-            db.close()
+            self._unclaim(session_id)
 
     async def advance_workflow(self, session_id: str, user_id: str) -> Dict:
         """
         Manually advance workflow to next logical step if allowed.
         """
-        db = SessionLocal()
-        try:
-            session = db.query(WorkflowSession).filter(WorkflowSession.session_id == session_id).first()
-            if not session:
-                return {"error": "not_found"}
-
-            cur = session.current_state
-            # If interpreting and pending approval, treat advance as approve
-            if cur == WorkflowState.INTERPRETING and session.interpretation_approved == 0:
-                await self.approve_interpretation(session_id, user_id, feedback=None)
-                return await self.get_workflow_status(session_id)
-
-            # If planning pending approval, approve to advance
-            if cur == WorkflowState.PLANNING and session.plan_approved == 0:
-                await self.approve_plan(session_id, user_id, feedback=None)
-                return await self.get_workflow_status(session_id)
-
-            # If reviewing, approve results
-            if cur == WorkflowState.REVIEWING:
-                await self.approve_results(session_id, user_id, feedback=None, rating=None)
-                return await self.get_workflow_status(session_id)
-
-            # If executing or backup_verify, can't manually advance here
-            return self._session_to_dict(session)
-        finally:
-            db.close()
+        session = self._read_session(session_id)
+        if not session:
+            return {"error": "not_found"}
+
+        # A running stage advances on its own
+        if self.engine.is_running(session_id):
+            return session
+
+        cur = session["current_state"]
+        # If interpreting and pending approval, treat advance as approve
+        if cur == WorkflowState.INTERPRETING.value and session["interpretation_approved"] == 0:
+            await self.approve_interpretation(session_id, user_id, feedback=None)
+            return await self.get_workflow_status(session_id)
+
+        # If planning pending approval, approve to advance
+        if cur == WorkflowState.PLANNING.value and session["plan_approved"] == 0:
+            await self.approve_plan(session_id, user_id, feedback=None)
+            return await self.get_workflow_status(session_id)
+
+        # If reviewing, approve results
+        if cur == WorkflowState.REVIEWING.value:
+            await self.approve_results(session_id, user_id, feedback=None, rating=None)
+            return await self.get_workflow_status(session_id)
+
+        # If executing or backup_verify, can't manually advance here
+        return session
 
 
 # Global workflow orchestrator instance
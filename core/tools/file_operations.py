@@ -17,6 +17,7 @@ from typing import Any, Dict, List, Optional
 from pydantic import BaseModel
 
 from core.tools.base import BaseTool, ToolDefinition, ToolParameter, ToolExecutionResult
+from core.services.snapshot_store import record_touch
 
 # Defaults (can be overridden via env vars later)
 ALLOWED_ROOT = os.getenv("FILE_TOOL_ROOT", os.path.abspath("./sandbox"))
@@ -115,6 +116,7 @@ class FileOperationsTool(BaseTool):
                 data_bytes = content.encode("utf-8", errors="replace")
                 if len(data_bytes) > MAX_BYTES:
                     return ToolExecutionResult(success=False, error="Content too large")
+                record_touch(target)  # lets a failed step roll this write back
                 with io.open(target, "w", encoding="utf-8") as f:
                     f.write(content)
                 return ToolExecutionResult(success=True, output={"path": rel_path, "bytes": len(data_bytes)})
@@ -124,6 +126,7 @@ class FileOperationsTool(BaseTool):
                     return ToolExecutionResult(success=False, error="Refusing to delete directories for safety")
                 if not os.path.isfile(target):
                     return ToolExecutionResult(success=False, error="File not found")
+                record_touch(target)
                 os.remove(target)
                 return ToolExecutionResult(success=True, output={"deleted": rel_path})
 
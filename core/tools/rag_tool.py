@@ -95,6 +95,13 @@ class RAGTool(BaseTool):
                     description="Metadata filters to apply to search (optional)",
                     required=False
                 ),
+                ToolParameter(
+                    name="fusion",
+                    type="string",
+                    description="Retrieval mode when hybrid search is enabled: 'rrf' or 'weighted' (BM25 + vector fusion), 'vector' or 'bm25' (single retriever)",
+                    required=False,
+                    enum=["rrf", "weighted", "vector", "bm25"]
+                ),
                 ToolParameter(
                     name="document_ids",
                     type="array",
@@ -148,21 +155,42 @@ class RAGTool(BaseTool):
         top_k = kwargs.get("top_k", 5)
         filter_metadata = kwargs.get("filter_metadata")
 
-        # Perform semantic search via vector store
-        results = await self._store.query(query, top_k=top_k, filter_metadata=filter_metadata)
+        # Perform semantic (or hybrid) search via vector store
+        query_kwargs = {"top_k": top_k, "filter_metadata": filter_metadata}
+        fusion = kwargs.get("fusion")
+        if fusion and getattr(self._store, "supports_fusion", False):
+            query_kwargs["fusion"] = fusion
+        results = await self._store.query(query, **query_kwargs)
 
-        # Format results
+        # Format results (fused results carry RRF "scores" instead of distances)
         documents = []
         if results["ids"] and len(results["ids"]) > 0:
             for i in range(len(results["ids"][0])):
+                distance = results["distances"][0][i] if results.get("distances") else None
+                if results.get("scores"):
+                    relevance = results["scores"][0][i]
+                else:
+                    relevance = 1.0 - (distance if distance is not None else 0.5)
                 documents.append({
                     "id": results["ids"][0][i],
                     "content": results["documents"][0][i],
                     "metadata": results["metadatas"][0][i] if results["metadatas"] else {},
-                    "distance": results["distances"][0][i] if results.get("distances") else None,
-                    "relevance_score": 1.0 - (results["distances"][0][i] if results.get("distances") else 0.5)
+                    "distance": distance,
+                    "relevance_score": relevance
                 })
 
+        metadata = {
+            "top_k": top_k,
+            "collection": self._collection_name
+        }
+        if "cache_hit" in results:
+            metadata["cache_hit"] = results["cache_hit"]
+        if results.get("fusion"):
+            metadata["fusion"] = results["fusion"]
+        if results.get("backends"):
+            # Per-backend status/latency from a federated query
+            metadata["backends"] = results["backends"]
+
         return ToolExecutionResult(
             success=True,
             output={
@@ -171,10 +199,7 @@ class RAGTool(BaseTool):
                 "count": len(documents),
                 "timestamp": datetime.utcnow().isoformat()
             },
-            metadata={
-                "top_k": top_k,
-                "collection": self._collection_name
-            }
+            metadata=metadata
         )
 
     async def _index_documents(self, kwargs: Dict) -> ToolExecutionResult:
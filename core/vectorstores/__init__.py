@@ -40,11 +40,45 @@ class VectorStore:
         raise NotImplementedError()
 
 
+def _create_backend(backend: str, **options) -> VectorStore:
+    """Instantiate a single named backend.
+
+    Options the backend does not take (e.g. persist_directory for qdrant)
+    are ignored; unset options fall back to the backend's env vars.
+    """
+    if backend == "chroma":
+        from core.vectorstores.chroma_store import ChromaStore
+
+        return ChromaStore(
+            persist_directory=options.get("persist_directory"),
+            collection_name=options.get("collection_name"),
+        )
+    elif backend == "qdrant":
+        from core.vectorstores.qdrant_store import QdrantStore
+
+        return QdrantStore(collection_name=options.get("collection_name"))
+    else:
+        raise ValueError(f"Unknown VECTOR_BACKEND: {backend}")
+
+
 def get_vector_store() -> VectorStore:
     """Factory: return an instance of the configured vector store backend.
 
     Uses env var VECTOR_BACKEND (default 'chroma'). Additional backends
-    should be registered here.
+    should be registered in _create_backend.
+
+    VECTOR_BACKEND='federated' queries every backend listed in
+    VECTOR_BACKENDS (comma-separated, default 'chroma,qdrant') concurrently
+    and fuses the results; writes go to VECTOR_WRITE_BACKEND (default: the
+    first listed backend).
+
+    RAG_HYBRID=true wraps the configured store in a HybridStore that keeps a
+    local BM25 index (BM25_INDEX_DIR/<collection>, default ./data/bm25) in sync and fuses
+    lexical and dense results (RAG_FUSION: rrf | weighted | vector | bm25).
+
+    Query results are cached per collection version (RAG_QUERY_CACHE,
+    default true); writes through this process's store invalidate them, and
+    RAG_QUERY_CACHE_TTL bounds staleness from writes made anywhere else.
     """
     # Use a module-level cached instance for fast repeated access
     global _STORE_INSTANCE
@@ -56,26 +90,37 @@ def get_vector_store() -> VectorStore:
     if _STORE_INSTANCE is not None:
         return _STORE_INSTANCE
 
-    backend = os.getenv("VECTOR_BACKEND", "chroma").lower()
+    _STORE_INSTANCE = _build_store()
+    return _STORE_INSTANCE
 
-    if backend == "chroma":
-        try:
-            from core.vectorstores.chroma_store import ChromaStore
 
-            _STORE_INSTANCE = ChromaStore()
-            return _STORE_INSTANCE
-        except Exception:
-            raise
-    elif backend == "qdrant":
-        try:
-            from core.vectorstores.qdrant_store import QdrantStore
+def _build_store(**options) -> VectorStore:
+    """Build the configured backend and its wrappers, passing options to the backend."""
+    backend = os.getenv("VECTOR_BACKEND", "chroma").lower()
+    collection = options.get("collection_name") or os.getenv("CHROMA_COLLECTION", "lalo_documents")
 
-            _STORE_INSTANCE = QdrantStore()
-            return _STORE_INSTANCE
-        except Exception:
-            raise
+    if backend == "federated":
+        from core.vectorstores.federated_store import FederatedStore
+
+        names = [n.strip().lower() for n in os.getenv("VECTOR_BACKENDS", "chroma,qdrant").split(",") if n.strip()]
+        store = FederatedStore(
+            backends={name: _create_backend(name, **options) for name in names},
+            write_backend=os.getenv("VECTOR_WRITE_BACKEND") or None,
+        )
     else:
-        raise ValueError(f"Unknown VECTOR_BACKEND: {backend}")
+        store = _create_backend(backend, **options)
+
+    if os.getenv("RAG_HYBRID", "false").lower() == "true":
+        from core.vectorstores.hybrid_store import HybridStore
+
+        store = HybridStore(store, collection=collection)
+
+    if os.getenv("RAG_QUERY_CACHE", "true").lower() == "true":
+        from core.vectorstores.cached_store import CachedStore
+
+        store = CachedStore(store, collection=collection)
+
+    return store
 
 
 def reinit_vector_store(backend: Optional[str] = None, **kwargs) -> VectorStore:
@@ -83,7 +128,7 @@ def reinit_vector_store(backend: Optional[str] = None, **kwargs) -> VectorStore:
 
     Args:
         backend: optional backend name (overrides VECTOR_BACKEND env var)
-        kwargs: optional backend-specific constructor args (e.g., persist_directory)
+        kwargs: optional backend constructor args (persist_directory, collection_name)
 
     Returns the new VectorStore instance.
     """
@@ -94,18 +139,6 @@ def reinit_vector_store(backend: Optional[str] = None, **kwargs) -> VectorStore:
     if backend:
         os.environ["VECTOR_BACKEND"] = backend
 
-    # Create new instance using factory
-    instance = get_vector_store()
-
-    # If backend-specific kwargs are provided and the instance has attributes, set them
-    try:
-        # Common options
-        if hasattr(instance, "_persist_directory") and "persist_directory" in kwargs:
-            instance._persist_directory = kwargs["persist_directory"]
-        if hasattr(instance, "_collection_name") and "collection_name" in kwargs:
-            instance._collection_name = kwargs["collection_name"]
-    except Exception:
-        # Non-fatal - clients should call initialize() explicitly if needed
-        pass
-
-    return instance
+    # Options go to the backend constructor, beneath any cache/hybrid wrappers
+    _STORE_INSTANCE = _build_store(**kwargs)
+    return _STORE_INSTANCE
@@ -0,0 +1,331 @@
+"""
+Copyright (c) 2025 LALO AI SYSTEMS, LLC. All rights reserved.
+
+PROPRIETARY AND CONFIDENTIAL
+
+This file is part of LALO AI Platform and is protected by copyright law.
+Unauthorized copying, modification, distribution, or use of this software,
+via any medium, is strictly prohibited without the express written permission
+of LALO AI SYSTEMS, LLC.
+"""
+
+"""Local inverted-index BM25 engine persisted next to the vector store.
+
+Dense embeddings miss exact identifiers (part numbers, SAP codes), so this
+index keeps compound identifiers such as ``MAT-10023`` as whole terms (plus
+their parts) and scores them with Okapi BM25.
+
+Each collection gets its own directory, ``$BM25_INDEX_DIR/<collection>``
+(default ``./data/bm25/<collection>``), so collections never share postings.
+
+On-disk layout (``<index_dir>/``):
+- ``bm25.idx``: snapshot. Magic + JSON doc table + posting lists, each
+  posting list stored as varint-encoded (docnum delta, term frequency) pairs.
+- ``bm25.journal``: append-only JSON-lines log of add/delete operations made
+  since the snapshot. Replayed at load, folded into the snapshot on compact().
+  A snapshot that fails to load is never overwritten: compaction is refused
+  until a later load succeeds, so the journal keeps every change meanwhile.
+"""
+from typing import Dict, List, Any, Optional, Tuple
+import json
+import logging
+import math
+import os
+import re
+import struct
+import threading
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"BM25"
+FORMAT_VERSION = 1
+
+# Identifier-aware tokens: "MAT-10023", "4711/01", "sap_code" stay whole
+_TOKEN_RE = re.compile(r"[A-Za-z0-9]+(?:[-_./][A-Za-z0-9]+)*")
+_PART_RE = re.compile(r"[A-Za-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased terms; compound identifiers also emit their parts."""
+    terms: List[str] = []
+    for match in _TOKEN_RE.findall(text or ""):
+        token = match.lower()
+        terms.append(token)
+        if not token.isalnum():
+            terms.extend(part for part in _PART_RE.findall(token) if part != token)
+    return terms
+
+
+def _encode_varint(value: int, out: bytearray) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _decode_varint(buf: bytes, pos: int) -> Tuple[int, int]:
+    result = shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+class BM25Index:
+    """Incrementally updated BM25 inverted index with compact persistence."""
+
+    def __init__(
+        self,
+        index_dir: Optional[str] = None,
+        k1: float = 1.5,
+        b: float = 0.75,
+        compact_every: int = 500,
+        collection: Optional[str] = None,
+    ):
+        self._index_dir = index_dir or os.path.join(
+            os.getenv("BM25_INDEX_DIR", "./data/bm25"),
+            collection or os.getenv("CHROMA_COLLECTION", "lalo_documents"),
+        )
+        self.k1 = k1
+        self.b = b
+        self._compact_every = compact_every
+
+        # term -> {docnum: tf}
+        self._postings: Dict[str, Dict[int, int]] = {}
+        # docnum -> {"id", "text", "metadata", "length"}
+        self._docs: Dict[int, Dict[str, Any]] = {}
+        self._id_to_docnum: Dict[str, int] = {}
+        self._next_docnum = 0
+        self._total_length = 0
+        self._journal_ops = 0
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._snapshot_unreadable = False
+
+    @property
+    def snapshot_path(self) -> str:
+        return os.path.join(self._index_dir, "bm25.idx")
+
+    @property
+    def journal_path(self) -> str:
+        return os.path.join(self._index_dir, "bm25.journal")
+
+    def __len__(self) -> int:
+        self.load()
+        return len(self._docs)
+
+    # ----- mutation -----
+
+    def add_documents(self, documents: List[str], ids: List[str], metadatas: Optional[List[Dict[str, Any]]] = None) -> None:
+        metadatas = metadatas or [{} for _ in documents]
+        with self._lock:
+            self.load()
+            for doc_id, text, metadata in zip(ids, documents, metadatas):
+                self._add(str(doc_id), text or "", metadata or {})
+            self._append_journal({"op": "add", "ids": [str(i) for i in ids], "documents": documents, "metadatas": metadatas})
+
+    def delete(self, ids: List[str]) -> None:
+        with self._lock:
+            self.load()
+            for doc_id in ids:
+                self._remove(str(doc_id))
+            self._append_journal({"op": "delete", "ids": [str(i) for i in ids]})
+
+    def _add(self, doc_id: str, text: str, metadata: Dict[str, Any]) -> None:
+        # Upsert semantics, matching the vector stores
+        self._remove(doc_id)
+
+        docnum = self._next_docnum
+        self._next_docnum += 1
+
+        terms = tokenize(text)
+        tfs: Dict[str, int] = {}
+        for term in terms:
+            tfs[term] = tfs.get(term, 0) + 1
+        for term, tf in tfs.items():
+            self._postings.setdefault(term, {})[docnum] = tf
+
+        self._docs[docnum] = {"id": doc_id, "text": text, "metadata": metadata, "length": len(terms), "terms": list(tfs)}
+        self._id_to_docnum[doc_id] = docnum
+        self._total_length += len(terms)
+
+    def _remove(self, doc_id: str) -> None:
+        docnum = self._id_to_docnum.pop(doc_id, None)
+        if docnum is None:
+            return
+        doc = self._docs.pop(docnum)
+        self._total_length -= doc["length"]
+        for term in doc["terms"]:
+            plist = self._postings.get(term)
+            if plist is not None:
+                plist.pop(docnum, None)
+                if not plist:
+                    del self._postings[term]
+
+    # ----- search -----
+
+    def search(self, query_text: str, top_k: int = 5, filter_metadata: Optional[Dict] = None) -> Dict[str, Any]:
+        """BM25 search returning chroma-style results plus "scores"."""
+        with self._lock:
+            self.load()
+            n_docs = len(self._docs)
+            if not n_docs:
+                return {"ids": [[]], "documents": [[]], "metadatas": [[]], "scores": [[]]}
+
+            avgdl = self._total_length / n_docs if n_docs else 0.0
+            scores: Dict[int, float] = {}
+            for term in set(tokenize(query_text)):
+                plist = self._postings.get(term)
+                if not plist:
+                    continue
+                df = len(plist)
+                idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                for docnum, tf in plist.items():
+                    length = self._docs[docnum]["length"]
+                    norm = tf * (self.k1 + 1) / (tf + self.k1 * (1 - self.b + self.b * length / (avgdl or 1.0)))
+                    scores[docnum] = scores.get(docnum, 0.0) + idf * norm
+
+            if filter_metadata:
+                scores = {
+                    d: s for d, s in scores.items()
+                    if all(self._docs[d]["metadata"].get(k) == v for k, v in filter_metadata.items())
+                }
+
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:top_k]
+            docs = [self._docs[d] for d, _ in ranked]
+            return {
+                "ids": [[d["id"] for d in docs]],
+                "documents": [[d["text"] for d in docs]],
+                "metadatas": [[d["metadata"] for d in docs]],
+                "scores": [[s for _, s in ranked]],
+            }
+
+    # ----- persistence -----
+
+    def load(self) -> None:
+        """Load snapshot + journal from disk (once)."""
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+
+            if os.path.exists(self.snapshot_path):
+                try:
+                    self._read_snapshot()
+                except Exception as e:
+                    # Keep the file: compacting now would replace the corpus with what the journal holds
+                    logger.error("Failed to read BM25 snapshot %s; compaction disabled: %s", self.snapshot_path, e)
+                    self._snapshot_unreadable = True
+
+            if os.path.exists(self.journal_path):
+                with open(self.journal_path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        line = line.strip()
+                        if not line:
+                            continue
+                        try:
+                            self._replay(json.loads(line))
+                        except ValueError:
+                            # Torn final write from a crash; everything before it is intact
+                            logger.warning("Skipping corrupt BM25 journal entry")
+                        self._journal_ops += 1
+
+    def compact(self) -> None:
+        """Fold the journal into a fresh snapshot."""
+        with self._lock:
+            self.load()
+            if self._snapshot_unreadable:
+                logger.warning("Not compacting BM25 index %s: its snapshot could not be read", self._index_dir)
+                return
+            os.makedirs(self._index_dir, exist_ok=True)
+            tmp_path = self.snapshot_path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(self._encode_snapshot())
+            os.replace(tmp_path, self.snapshot_path)
+            open(self.journal_path, "w").close()
+            self._journal_ops = 0
+
+    def _replay(self, entry: Dict[str, Any]) -> None:
+        if entry.get("op") == "add":
+            metadatas = entry.get("metadatas") or [{} for _ in entry["ids"]]
+            for doc_id, text, metadata in zip(entry["ids"], entry["documents"], metadatas):
+                self._add(doc_id, text or "", metadata or {})
+        elif entry.get("op") == "delete":
+            for doc_id in entry["ids"]:
+                self._remove(doc_id)
+
+    def _append_journal(self, entry: Dict[str, Any]) -> None:
+        os.makedirs(self._index_dir, exist_ok=True)
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, default=str) + "\n")
+        self._journal_ops += 1
+        if self._journal_ops >= self._compact_every:
+            self.compact()
+
+    def _encode_snapshot(self) -> bytes:
+        # Renumber live docs densely so deltas stay small after deletes
+        renumber = {old: new for new, old in enumerate(sorted(self._docs))}
+        doc_table = [
+            [self._docs[old]["id"], self._docs[old]["text"], self._docs[old]["metadata"], self._docs[old]["length"]]
+            for old in sorted(self._docs)
+        ]
+        header = json.dumps({"version": FORMAT_VERSION, "docs": doc_table}, default=str).encode("utf-8")
+
+        postings = bytearray()
+        _encode_varint(len(self._postings), postings)
+        for term in sorted(self._postings):
+            term_bytes = term.encode("utf-8")
+            _encode_varint(len(term_bytes), postings)
+            postings.extend(term_bytes)
+            entries = sorted((renumber[d], tf) for d, tf in self._postings[term].items())
+            _encode_varint(len(entries), postings)
+            previous = 0
+            for docnum, tf in entries:
+                _encode_varint(docnum - previous, postings)
+                _encode_varint(tf, postings)
+                previous = docnum
+
+        return MAGIC + struct.pack("<BI", FORMAT_VERSION, len(header)) + header + bytes(postings)
+
+    def _read_snapshot(self) -> None:
+        with open(self.snapshot_path, "rb") as f:
+            data = f.read()
+
+        if data[:4] != MAGIC:
+            raise ValueError("not a BM25 index file")
+        version, header_len = struct.unpack_from("<BI", data, 4)
+        if version != FORMAT_VERSION:
+            raise ValueError(f"unsupported BM25 index version {version}")
+
+        offset = 4 + struct.calcsize("<BI")
+        header = json.loads(data[offset:offset + header_len].decode("utf-8"))
+        pos = offset + header_len
+
+        self._docs = {}
+        self._id_to_docnum = {}
+        self._total_length = 0
+        for docnum, (doc_id, text, metadata, length) in enumerate(header["docs"]):
+            self._docs[docnum] = {"id": doc_id, "text": text, "metadata": metadata, "length": length, "terms": []}
+            self._id_to_docnum[doc_id] = docnum
+            self._total_length += length
+        self._next_docnum = len(self._docs)
+
+        self._postings = {}
+        n_terms, pos = _decode_varint(data, pos)
+        for _ in range(n_terms):
+            term_len, pos = _decode_varint(data, pos)
+            term = data[pos:pos + term_len].decode("utf-8")
+            pos += term_len
+            df, pos = _decode_varint(data, pos)
+            plist: Dict[int, int] = {}
+            docnum = 0
+            for _ in range(df):
+                delta, pos = _decode_varint(data, pos)
+                tf, pos = _decode_varint(data, pos)
+                docnum += delta
+                plist[docnum] = tf
+                self._docs[docnum]["terms"].append(term)
+            self._postings[term] = plist
@@ -0,0 +1,202 @@
+"""
+Copyright (c) 2025 LALO AI SYSTEMS, LLC. All rights reserved.
+
+PROPRIETARY AND CONFIDENTIAL
+
+This file is part of LALO AI Platform and is protected by copyright law.
+Unauthorized copying, modification, distribution, or use of this software,
+via any medium, is strictly prohibited without the express written permission
+of LALO AI SYSTEMS, LLC.
+"""
+
+"""Query-result cache with corpus-version invalidation.
+
+Planner workflows often issue the same retrieval several times. CachedStore
+wraps any VectorStore and memoizes query results keyed on
+(collection, collection version, normalized query, top_k, filter, options).
+Every add_documents/delete through the store bumps the collection version,
+so entries computed against an older corpus are not served again by this
+process; they simply age out of the LRU.
+
+Versions live in process memory only. Writes made by other workers, or
+directly against Chroma/Qdrant, do not bump them, so for those the TTL
+(RAG_QUERY_CACHE_TTL, default 300 s) is the only staleness bound. Degraded
+federated results (any backend not "ok") are not cached.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+from collections import OrderedDict
+import copy
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class CollectionVersions:
+    """Monotonically increasing version counter per collection."""
+
+    def __init__(self):
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, collection: str) -> int:
+        with self._lock:
+            return self._versions.get(collection, 0)
+
+    def bump(self, collection: str) -> int:
+        with self._lock:
+            self._versions[collection] = self._versions.get(collection, 0) + 1
+            return self._versions[collection]
+
+
+# Process-wide versions so every wrapper over the same collection agrees
+collection_versions = CollectionVersions()
+
+
+def normalize_query(text: str) -> str:
+    return " ".join((text or "").lower().split())
+
+
+class QueryResultCache:
+    """Thread-safe LRU of query results with hit-rate metrics."""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: Optional[float] = None):
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._entries: "OrderedDict[Tuple, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Tuple) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._ttl is not None and time.monotonic() - entry[0] > self._ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(entry[1])
+
+    def put(self, key: Tuple, value: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self._max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits / total) if total else 0.0,
+            }
+
+
+class CachedStore:
+    """VectorStore wrapper that caches query results per collection version."""
+
+    def __init__(
+        self,
+        store: Any,
+        collection: Optional[str] = None,
+        cache: Optional[QueryResultCache] = None,
+        versions: Optional[CollectionVersions] = None,
+    ):
+        self._store = store
+        self._collection = collection or getattr(store, "_collection_name", None) or "default"
+        ttl = os.getenv("RAG_QUERY_CACHE_TTL", "300")
+        self._cache = cache or QueryResultCache(
+            max_entries=int(os.getenv("RAG_QUERY_CACHE_SIZE", "1024")),
+            ttl_seconds=float(ttl) if ttl else None,
+        )
+        self._versions = versions or collection_versions
+
+    @property
+    def store(self) -> Any:
+        return self._store
+
+    @property
+    def supports_fusion(self) -> bool:
+        return getattr(self._store, "supports_fusion", False)
+
+    @property
+    def collection_version(self) -> int:
+        return self._versions.get(self._collection)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._cache.get_stats(),
+            "collection": self._collection,
+            "collection_version": self.collection_version,
+        }
+
+    async def initialize(self) -> None:
+        await self._store.initialize()
+
+    async def add_documents(self, documents: List[str], ids: List[str], metadatas: List[Dict[str, Any]]) -> None:
+        try:
+            await self._store.add_documents(documents, ids, metadatas)
+        finally:
+            # Bump even on partial failure: some documents may have landed
+            self._versions.bump(self._collection)
+
+    async def delete(self, ids: List[str]) -> None:
+        try:
+            await self._store.delete(ids)
+        finally:
+            self._versions.bump(self._collection)
+
+    async def query(
+        self,
+        query_text: str,
+        top_k: int = 5,
+        filter_metadata: Optional[Dict] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        # Version is read before searching: a concurrent write bumps it and
+        # the result is stored under the old version, which is never read again
+        version = self._versions.get(self._collection)
+        key = (
+            self._collection,
+            version,
+            normalize_query(query_text),
+            top_k,
+            json.dumps(filter_metadata or {}, sort_keys=True, default=str),
+            json.dumps(kwargs, sort_keys=True, default=str),
+        )
+
+        cached = self._cache.get(key)
+        if cached is not None:
+            cached["cache_hit"] = True
+            return cached
+
+        results = await self._store.query(query_text, top_k=top_k, filter_metadata=filter_metadata, **kwargs)
+        # Partial results from a timed-out or failing backend must not outlive the outage
+        backends = results.get("backends") or {}
+        if all(status.get("status") == "ok" for status in backends.values()):
+            self._cache.put(key, results)
+        return {**results, "cache_hit": False}
+
+    async def count(self) -> int:
+        return await self._store.count()
+
+    async def get_sample(self, limit: int = 100) -> Dict[str, Any]:
+        return await self._store.get_sample(limit=limit)
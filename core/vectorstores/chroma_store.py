@@ -12,9 +12,12 @@ of LALO AI SYSTEMS, LLC.
 """ChromaDB adapter for the VectorStore interface."""
 from typing import Dict, List, Any, Optional
 from datetime import datetime
+import asyncio
 import logging
 import os
 
+from core.vectorstores.embedding_cache import embedding_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -68,15 +71,26 @@ class ChromaStore:
         if not self._initialized:
             await self.initialize()
 
-        # chroma expects documents, ids, metadatas
-        self._collection.add(documents=documents, ids=ids, metadatas=metadatas)
+        # chroma expects documents, ids, metadatas (blocking: embeds + writes)
+        await asyncio.to_thread(self._collection.add, documents=documents, ids=ids, metadatas=metadatas)
 
     async def query(self, query_text: str, top_k: int = 5, filter_metadata: Optional[Dict] = None) -> Dict[str, Any]:
         if not self._initialized:
             await self.initialize()
 
-        results = self._collection.query(
-            query_texts=[query_text],
+        # Embed through the shared cache so repeated queries skip the model
+        model_key = f"chroma:{type(self._embedding_function).__name__}"
+        embeddings = await asyncio.to_thread(
+            embedding_cache.get_or_compute,
+            model_key,
+            [query_text],
+            lambda texts: [[float(x) for x in v] for v in self._embedding_function(texts)],
+        )
+
+        # Run off the event loop so concurrent queries (e.g. FederatedStore) overlap
+        results = await asyncio.to_thread(
+            self._collection.query,
+            query_embeddings=embeddings,
             n_results=top_k,
             where=filter_metadata if filter_metadata else None
         )
@@ -86,16 +100,16 @@ class ChromaStore:
     async def count(self) -> int:
         if not self._initialized:
             await self.initialize()
-        return self._collection.count()
+        return await asyncio.to_thread(self._collection.count)
 
     async def get_sample(self, limit: int = 100) -> Dict[str, Any]:
         if not self._initialized:
             await self.initialize()
 
-        sample_results = self._collection.get(limit=limit, include=["metadatas"])
+        sample_results = await asyncio.to_thread(self._collection.get, limit=limit, include=["metadatas"])
         return sample_results
 
     async def delete(self, ids: List[str]) -> None:
         if not self._initialized:
             await self.initialize()
-        self._collection.delete(ids=ids)
+        await asyncio.to_thread(self._collection.delete, ids=ids)
@@ -0,0 +1,96 @@
+"""
+Copyright (c) 2025 LALO AI SYSTEMS, LLC. All rights reserved.
+
+PROPRIETARY AND CONFIDENTIAL
+
+This file is part of LALO AI Platform and is protected by copyright law.
+Unauthorized copying, modification, distribution, or use of this software,
+via any medium, is strictly prohibited without the express written permission
+of LALO AI SYSTEMS, LLC.
+"""
+
+"""Shared LRU cache of text embeddings.
+
+Embedding a query is the most expensive part of a vector search on CPU.
+Every component that embeds text (vector store adapters, plan memory)
+should go through ``embedding_cache`` so repeated texts are embedded once
+per model.
+"""
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from collections import OrderedDict
+import hashlib
+import os
+import threading
+
+
+def _text_key(model_key: str, text: str) -> Tuple[str, str]:
+    return model_key, hashlib.sha1(text.encode("utf-8", "ignore")).hexdigest()
+
+
+class EmbeddingCache:
+    """Thread-safe LRU of embeddings keyed by (model, sha1(text))."""
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self._max_entries = max_entries or int(os.getenv("EMBEDDING_CACHE_SIZE", "10000"))
+        self._entries: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, model_key: str, text: str) -> Optional[Any]:
+        key = _text_key(model_key, text)
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return vector
+
+    def put(self, model_key: str, text: str, vector: Any) -> None:
+        key = _text_key(model_key, text)
+        with self._lock:
+            self._entries[key] = vector
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(
+        self,
+        model_key: str,
+        texts: Sequence[str],
+        embed: Callable[[List[str]], Sequence[Any]],
+    ) -> List[Any]:
+        """Return embeddings for texts, calling embed() once for all misses."""
+        vectors: List[Any] = [self.get(model_key, t) for t in texts]
+        missing = [i for i, v in enumerate(vectors) if v is None]
+
+        if missing:
+            computed = embed([texts[i] for i in missing])
+            for i, vector in zip(missing, computed):
+                vectors[i] = vector
+                self.put(model_key, texts[i], vector)
+
+        return vectors
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self._max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / total) if total else 0.0,
+            }
+
+
+# Global instance shared by all embedders in the process
+embedding_cache = EmbeddingCache()
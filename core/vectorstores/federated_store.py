@@ -0,0 +1,178 @@
+"""
+Copyright (c) 2025 LALO AI SYSTEMS, LLC. All rights reserved.
+
+PROPRIETARY AND CONFIDENTIAL
+
+This file is part of LALO AI Platform and is protected by copyright law.
+Unauthorized copying, modification, distribution, or use of this software,
+via any medium, is strictly prohibited without the express written permission
+of LALO AI SYSTEMS, LLC.
+"""
+
+"""Federated adapter that fans queries out to several VectorStore backends.
+
+Queries run concurrently against every backend with a per-backend timeout
+and the ranked lists are merged with reciprocal-rank fusion (RRF). A slow
+or failing backend only drops its own results, so latency is bounded by the
+slowest backend within the timeout rather than the sum of all backends.
+"""
+from typing import Dict, List, Any, Optional, Tuple
+import asyncio
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+# Standard RRF damping constant (Cormack et al.)
+RRF_K = 60
+
+
+def rrf_fuse(ranked_results: List[Tuple[str, Dict[str, Any]]], top_k: int = 5, k: int = RRF_K) -> Dict[str, Any]:
+    """Merge chroma-style query results with reciprocal-rank fusion.
+
+    Args:
+        ranked_results: list of (backend_name, results) where results has the
+            {"ids": [[...]], "documents": [[...]], "metadatas": [[...]]} shape
+        top_k: number of fused results to return
+        k: RRF damping constant
+
+    Returns:
+        Chroma-style results with an extra "scores" list (higher is better)
+        and a "sources" list naming the backends each hit came from.
+    """
+    scores: Dict[str, float] = {}
+    docs: Dict[str, Any] = {}
+    metas: Dict[str, Any] = {}
+    sources: Dict[str, List[str]] = {}
+
+    for backend, results in ranked_results:
+        ids = (results.get("ids") or [[]])[0] or []
+        documents = (results.get("documents") or [[]])[0] or []
+        metadatas = (results.get("metadatas") or [[]])[0] or []
+
+        for rank, doc_id in enumerate(ids):
+            doc_id = str(doc_id)
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank + 1)
+            sources.setdefault(doc_id, []).append(backend)
+            if doc_id not in docs:
+                docs[doc_id] = documents[rank] if rank < len(documents) else None
+                metas[doc_id] = metadatas[rank] if rank < len(metadatas) else {}
+
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:top_k]
+
+    return {
+        "ids": [[doc_id for doc_id, _ in ranked]],
+        "documents": [[docs[doc_id] for doc_id, _ in ranked]],
+        "metadatas": [[metas[doc_id] for doc_id, _ in ranked]],
+        "scores": [[score for _, score in ranked]],
+        "sources": [[sources[doc_id] for doc_id, _ in ranked]],
+    }
+
+
+class FederatedStore:
+    """VectorStore that queries several named backends concurrently.
+
+    Writes go to a single write backend (local uploads); deletes are sent to
+    every backend since an id may live in any of them.
+    """
+
+    def __init__(
+        self,
+        backends: Dict[str, Any],
+        write_backend: Optional[str] = None,
+        timeout: Optional[float] = None,
+        rrf_k: int = RRF_K,
+    ):
+        if not backends:
+            raise ValueError("FederatedStore requires at least one backend")
+
+        self._backends = dict(backends)
+        self._write_backend = write_backend or next(iter(self._backends))
+        if self._write_backend not in self._backends:
+            raise ValueError(f"Unknown write backend: {self._write_backend}")
+
+        self._timeout = timeout if timeout is not None else float(os.getenv("VECTOR_BACKEND_TIMEOUT", "2.0"))
+        self._rrf_k = rrf_k
+        self._initialized = False
+
+    @property
+    def backends(self) -> Dict[str, Any]:
+        return self._backends
+
+    async def initialize(self) -> None:
+        if self._initialized:
+            return
+
+        names = list(self._backends)
+        outcomes = await asyncio.gather(
+            *(self._backends[name].initialize() for name in names),
+            return_exceptions=True,
+        )
+
+        for name, outcome in zip(names, outcomes):
+            if isinstance(outcome, Exception):
+                logger.warning("Vector backend %s failed to initialize: %s", name, outcome)
+                if name == self._write_backend:
+                    raise outcome
+
+        self._initialized = True
+
+    async def add_documents(self, documents: List[str], ids: List[str], metadatas: List[Dict[str, Any]]) -> None:
+        await self._backends[self._write_backend].add_documents(documents, ids, metadatas)
+
+    async def _query_backend(self, name: str, query_text: str, top_k: int, filter_metadata: Optional[Dict]):
+        start = time.perf_counter()
+        try:
+            results = await asyncio.wait_for(
+                self._backends[name].query(query_text, top_k=top_k, filter_metadata=filter_metadata),
+                timeout=self._timeout,
+            )
+            status = {"status": "ok", "count": len((results.get("ids") or [[]])[0] or [])}
+        except asyncio.TimeoutError:
+            logger.warning("Vector backend %s timed out after %.2fs", name, self._timeout)
+            results, status = None, {"status": "timeout", "count": 0}
+        except Exception as e:
+            logger.warning("Vector backend %s query failed: %s", name, e)
+            results, status = None, {"status": "error", "count": 0, "error": str(e)}
+
+        status["latency_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        return name, results, status
+
+    async def query(self, query_text: str, top_k: int = 5, filter_metadata: Optional[Dict] = None) -> Dict[str, Any]:
+        outcomes = await asyncio.gather(
+            *(self._query_backend(name, query_text, top_k, filter_metadata) for name in self._backends)
+        )
+
+        ranked = [(name, results) for name, results, _ in outcomes if results is not None]
+        fused = rrf_fuse(ranked, top_k=top_k, k=self._rrf_k)
+        fused["backends"] = {name: status for name, _, status in outcomes}
+        return fused
+
+    async def count(self) -> int:
+        counts = await asyncio.gather(
+            *(store.count() for store in self._backends.values()),
+            return_exceptions=True,
+        )
+        return sum(c for c in counts if isinstance(c, int))
+
+    async def get_sample(self, limit: int = 100) -> Dict[str, Any]:
+        samples = await asyncio.gather(
+            *(store.get_sample(limit=limit) for store in self._backends.values()),
+            return_exceptions=True,
+        )
+
+        metadatas: List[Dict[str, Any]] = []
+        for sample in samples:
+            if isinstance(sample, dict):
+                metadatas.extend(sample.get("metadatas") or [])
+        return {"metadatas": metadatas[:limit]}
+
+    async def delete(self, ids: List[str]) -> None:
+        outcomes = await asyncio.gather(
+            *(store.delete(ids) for store in self._backends.values()),
+            return_exceptions=True,
+        )
+        for name, outcome in zip(self._backends, outcomes):
+            if isinstance(outcome, Exception):
+                logger.warning("Vector backend %s delete failed: %s", name, outcome)
@@ -0,0 +1,170 @@
+"""
+Copyright (c) 2025 LALO AI SYSTEMS, LLC. All rights reserved.
+
+PROPRIETARY AND CONFIDENTIAL
+
+This file is part of LALO AI Platform and is protected by copyright law.
+Unauthorized copying, modification, distribution, or use of this software,
+via any medium, is strictly prohibited without the express written permission
+of LALO AI SYSTEMS, LLC.
+"""
+
+"""Hybrid BM25 + dense vector store.
+
+Wraps any VectorStore and keeps a local BM25Index in sync through the same
+add_documents/delete calls. Queries run lexical and dense search
+concurrently and fuse the rankings:
+- "rrf": reciprocal-rank fusion (default, scale-free)
+- "weighted": min-max normalized scores blended with RAG_HYBRID_ALPHA
+- "vector" / "bm25": a single retriever only
+"""
+from typing import Dict, List, Any, Optional
+import asyncio
+import logging
+import os
+
+from core.vectorstores.bm25_index import BM25Index
+from core.vectorstores.federated_store import rrf_fuse
+
+logger = logging.getLogger(__name__)
+
+FUSION_MODES = ("rrf", "weighted", "vector", "bm25")
+
+
+def _normalized_scores(results: Dict[str, Any]) -> List[float]:
+    """Min-max normalize a ranked result list to [0, 1], best = 1.
+
+    Uses "scores" (higher is better) when present; otherwise "distances",
+    whose direction is inferred from the backend's own ranking order.
+    """
+    ids = (results.get("ids") or [[]])[0] or []
+    if not ids:
+        return []
+
+    raw = (results.get("scores") or [[]])[0] or (results.get("distances") or [[]])[0] or []
+    if len(raw) != len(ids):
+        # No usable scores: fall back to rank position
+        return [1.0 - i / len(ids) for i in range(len(ids))]
+
+    lo, hi = min(raw), max(raw)
+    if hi == lo:
+        return [1.0] * len(raw)
+    if results.get("scores") or raw[0] >= raw[-1]:
+        return [(r - lo) / (hi - lo) for r in raw]
+    return [(hi - r) / (hi - lo) for r in raw]
+
+
+def weighted_fuse(vector_results: Dict[str, Any], bm25_results: Dict[str, Any], alpha: float, top_k: int) -> Dict[str, Any]:
+    """Blend normalized scores: alpha * vector + (1 - alpha) * bm25."""
+    fused: Dict[str, float] = {}
+    docs: Dict[str, Any] = {}
+    metas: Dict[str, Any] = {}
+
+    for weight, results in ((alpha, vector_results), (1.0 - alpha, bm25_results)):
+        ids = (results.get("ids") or [[]])[0] or []
+        documents = (results.get("documents") or [[]])[0] or []
+        metadatas = (results.get("metadatas") or [[]])[0] or []
+        for i, (doc_id, score) in enumerate(zip(ids, _normalized_scores(results))):
+            doc_id = str(doc_id)
+            fused[doc_id] = fused.get(doc_id, 0.0) + weight * score
+            docs.setdefault(doc_id, documents[i] if i < len(documents) else None)
+            metas.setdefault(doc_id, metadatas[i] if i < len(metadatas) else {})
+
+    ranked = sorted(fused.items(), key=lambda item: item[1], reverse=True)[:top_k]
+    return {
+        "ids": [[doc_id for doc_id, _ in ranked]],
+        "documents": [[docs[doc_id] for doc_id, _ in ranked]],
+        "metadatas": [[metas[doc_id] for doc_id, _ in ranked]],
+        "scores": [[score for _, score in ranked]],
+    }
+
+
+class HybridStore:
+    """VectorStore that pairs a dense backend with a local BM25 index."""
+
+    supports_fusion = True
+
+    def __init__(
+        self,
+        vector_store: Any,
+        bm25_index: Optional[BM25Index] = None,
+        fusion: Optional[str] = None,
+        alpha: Optional[float] = None,
+        collection: Optional[str] = None,
+    ):
+        self._vector_store = vector_store
+        self._bm25 = bm25_index if bm25_index is not None else BM25Index(collection=collection)
+        self._fusion = (fusion or os.getenv("RAG_FUSION", "rrf")).lower()
+        self._alpha = alpha if alpha is not None else float(os.getenv("RAG_HYBRID_ALPHA", "0.5"))
+        if self._fusion not in FUSION_MODES:
+            raise ValueError(f"Unknown fusion mode: {self._fusion}")
+
+    @property
+    def vector_store(self) -> Any:
+        return self._vector_store
+
+    @property
+    def bm25_index(self) -> BM25Index:
+        return self._bm25
+
+    async def initialize(self) -> None:
+        await asyncio.gather(
+            self._vector_store.initialize(),
+            asyncio.to_thread(self._bm25.load),
+        )
+
+    async def add_documents(self, documents: List[str], ids: List[str], metadatas: List[Dict[str, Any]]) -> None:
+        await self._vector_store.add_documents(documents, ids, metadatas)
+        await asyncio.to_thread(self._bm25.add_documents, documents, ids, metadatas)
+
+    async def query(
+        self,
+        query_text: str,
+        top_k: int = 5,
+        filter_metadata: Optional[Dict] = None,
+        fusion: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        mode = (fusion or self._fusion).lower()
+        if mode not in FUSION_MODES:
+            raise ValueError(f"Unknown fusion mode: {mode}")
+
+        if mode == "vector":
+            results = dict(await self._vector_store.query(query_text, top_k=top_k, filter_metadata=filter_metadata))
+            results["fusion"] = mode
+            return results
+        if mode == "bm25":
+            results = await asyncio.to_thread(self._bm25.search, query_text, top_k, filter_metadata)
+            results["fusion"] = mode
+            return results
+
+        # Over-fetch from each retriever so fusion has candidates to reorder
+        fetch_k = top_k * 2
+        vector_results, bm25_results = await asyncio.gather(
+            self._vector_store.query(query_text, top_k=fetch_k, filter_metadata=filter_metadata),
+            asyncio.to_thread(self._bm25.search, query_text, fetch_k, filter_metadata),
+            return_exceptions=True,
+        )
+
+        if isinstance(vector_results, Exception):
+            logger.warning("Dense retrieval failed, using BM25 only: %s", vector_results)
+            vector_results = {"ids": [[]]}
+        if isinstance(bm25_results, Exception):
+            logger.warning("BM25 retrieval failed, using dense only: %s", bm25_results)
+            bm25_results = {"ids": [[]]}
+
+        if mode == "weighted":
+            fused = weighted_fuse(vector_results, bm25_results, self._alpha, top_k)
+        else:
+            fused = rrf_fuse([("vector", vector_results), ("bm25", bm25_results)], top_k=top_k)
+        fused["fusion"] = mode
+        return fused
+
+    async def count(self) -> int:
+        return await self._vector_store.count()
+
+    async def get_sample(self, limit: int = 100) -> Dict[str, Any]:
+        return await self._vector_store.get_sample(limit=limit)
+
+    async def delete(self, ids: List[str]) -> None:
+        await self._vector_store.delete(ids)
+        await asyncio.to_thread(self._bm25.delete, ids)
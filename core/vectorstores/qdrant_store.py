@@ -15,6 +15,8 @@ import logging
 import os
 import asyncio
 
+from core.vectorstores.embedding_cache import embedding_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -103,8 +105,13 @@ class QdrantStore:
             await self.initialize()
 
         await self._ensure_model()
-        q_vector = await asyncio.to_thread(self._model.encode, [query_text], convert_to_numpy=True)
-        qv = q_vector[0].tolist()
+        q_vectors = await asyncio.to_thread(
+            embedding_cache.get_or_compute,
+            "sentence-transformers:all-MiniLM-L6-v2",
+            [query_text],
+            lambda texts: [v.tolist() for v in self._model.encode(texts, convert_to_numpy=True)],
+        )
+        qv = q_vectors[0]
 
         # Convert filter_metadata into Qdrant Filter if provided (simple exact match only)
         q_filter = None
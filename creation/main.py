@@ -2,9 +2,13 @@
 
 from fastapi import FastAPI
 from pydantic import BaseModel
-import time
+import asyncio
+import os
 import random
 
+# Simulated generation latency; awaited so concurrent requests overlap
+SIMULATED_LATENCY = float(os.getenv("SIMULATED_LATENCY_SECONDS", "0.5"))
+
 app = FastAPI(title="Creation Protocol Server (CPS)")
 
 class CreationRequest(BaseModel):
@@ -22,7 +26,7 @@ async def generate(req: CreationRequest):
     """
     Simulate generation of a connector/subagent/RPA script and test it.
     """
-    time.sleep(0.5)
+    await asyncio.sleep(SIMULATED_LATENCY)
 
     artifact_id = f"{req.type}_{random.randint(1000,9999)}"
     status = "Generated"
@@ -24,11 +24,31 @@ Purpose:
 
 Architecture:
 - Session Memory: Fast, temporary storage for active workflows
+  - Hot tier: in-process LRU with byte accounting
+  - Warm tier: least recently used sessions spilled to a compressed SQLite file
 - Permanent Memory: Long-term storage with semantic search
+  - Commits are queued and written to Chroma in batches by a background thread
+  - A session leaves session memory when its write starts and is restored
+    if the write fails; steps or feedback recorded for it meanwhile are
+    rejected instead of lost. Records are upserted under IDs derived from
+    the session ID, so retries are idempotent. A failed batch is retried one session at a time, and
+    sessions that keep failing are parked in failed_commits
+  - Managers still open at interpreter exit are closed by a module-level hook
+    that holds them weakly
 - Training Data: Curated experiences for system improvement
 """
 
+import atexit
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
 import uuid
+import weakref
+import zlib
+from collections import OrderedDict
 from datetime import datetime
 from typing import Dict, List, Optional
 import json
@@ -36,35 +56,204 @@ import chromadb
 from chromadb.config import Settings
 from .audit_logger import AuditLogger
 
+logger = logging.getLogger(__name__)
+
+_DATETIME_FIELDS = ("created_at", "last_updated")
+
+# Open managers, closed at interpreter exit without being kept alive by it
+_open_managers: "weakref.WeakSet" = weakref.WeakSet()
+
+
+def _close_open_managers():
+    for manager in list(_open_managers):
+        manager.close()
+
+
+atexit.register(_close_open_managers)
+
+
+class SessionCommitInProgressError(Exception):
+    """Raised when a step or feedback is recorded for a session being written to permanent memory"""
+
+
+def _encode_session(session: Dict) -> bytes:
+    return json.dumps(session, default=lambda o: o.isoformat() if isinstance(o, datetime) else str(o)).encode("utf-8")
+
+
+def _decode_session(raw: bytes) -> Dict:
+    session = json.loads(raw)
+    for field in _DATETIME_FIELDS:
+        if isinstance(session.get(field), str):
+            session[field] = datetime.fromisoformat(session[field])
+    return session
+
+
 class SessionMemory:
-    def __init__(self):
-        self.active_sessions = {}
+    def __init__(
+        self,
+        max_hot_sessions: Optional[int] = None,
+        max_hot_bytes: Optional[int] = None,
+        warm_path: Optional[str] = None
+    ):
+        """
+        Tiered session workspace.
+
+        Args:
+            max_hot_sessions: Sessions kept in memory (MEMORY_HOT_MAX_SESSIONS)
+            max_hot_bytes: Approximate serialized bytes kept in memory (MEMORY_HOT_MAX_BYTES)
+            warm_path: SQLite file for spilled sessions (MEMORY_WARM_PATH)
+        """
+        self.max_hot_sessions = max_hot_sessions or int(os.getenv("MEMORY_HOT_MAX_SESSIONS", "1000"))
+        self.max_hot_bytes = max_hot_bytes or int(os.getenv("MEMORY_HOT_MAX_BYTES", str(64 * 1024 * 1024)))
+        self.warm_path = warm_path or os.getenv("MEMORY_WARM_PATH", "./data/session_memory.db")
+
+        # Hot tier: session_id -> session, least recently used first
+        self.active_sessions: "OrderedDict[str, Dict]" = OrderedDict()
         self.session_metadata = {}
-        
+        self._sizes: Dict[str, int] = {}
+        self.hot_bytes = 0
+        # Sessions taken out for a permanent memory write
+        self._committing = set()
+        self._lock = threading.RLock()
+
+        if os.path.dirname(self.warm_path):
+            os.makedirs(os.path.dirname(self.warm_path), exist_ok=True)
+        self._warm = sqlite3.connect(self.warm_path, check_same_thread=False)
+        # Warm tier is a spill cache, not the system of record
+        self._warm.execute("PRAGMA journal_mode=WAL")
+        self._warm.execute("PRAGMA synchronous=NORMAL")
+        self._warm.execute(
+            "CREATE TABLE IF NOT EXISTS warm_sessions (session_id TEXT PRIMARY KEY, data BLOB NOT NULL)"
+        )
+        self._warm.commit()
+
     def create_session(self, session_id: str = None) -> str:
         """Creates a new session workspace"""
         session_id = session_id or str(uuid.uuid4())
-        self.active_sessions[session_id] = {
-            "workflow_steps": [],
-            "feedback_history": [],
-            "state_backups": [],
-            "confidence_scores": [],
-            "created_at": datetime.utcnow(),
-            "last_updated": datetime.utcnow()
-        }
+        with self._lock:
+            self.active_sessions[session_id] = {
+                "workflow_steps": [],
+                "feedback_history": [],
+                "state_backups": [],
+                "confidence_scores": [],
+                "created_at": datetime.utcnow(),
+                "last_updated": datetime.utcnow()
+            }
+            self._account(session_id, len(_encode_session(self.active_sessions[session_id])))
+            self._evict()
         return session_id
-    
+
+    def get_session(self, session_id: str) -> Optional[Dict]:
+        """Returns a session from either tier, promoting warm sessions to hot"""
+        with self._lock:
+            session = self.active_sessions.get(session_id)
+            if session is not None:
+                self.active_sessions.move_to_end(session_id)
+                return session
+
+            row = self._warm.execute(
+                "SELECT data FROM warm_sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            raw = zlib.decompress(row[0])
+            session = _decode_session(raw)
+            self._warm.execute("DELETE FROM warm_sessions WHERE session_id = ?", (session_id,))
+            self._warm.commit()
+            self.active_sessions[session_id] = session
+            self._account(session_id, len(raw))
+            self._evict(keep=session_id)
+            return session
+
+    def pop_session(self, session_id: str) -> Optional[Dict]:
+        """Removes and returns a session from whichever tier holds it"""
+        with self._lock:
+            session = self.get_session(session_id)
+            if session is not None:
+                del self.active_sessions[session_id]
+                self.hot_bytes -= self._sizes.pop(session_id, 0)
+            return session
+
+    def begin_commit(self, session_id: str) -> Optional[Dict]:
+        """Takes a session out for a permanent memory write; appends are rejected until end_commit"""
+        with self._lock:
+            session = self.pop_session(session_id)
+            if session is not None:
+                self._committing.add(session_id)
+            return session
+
+    def end_commit(self, session_id: str, restore: Optional[Dict] = None):
+        """Finishes a write; a failed one passes the session back to keep it in the hot tier"""
+        with self._lock:
+            self._committing.discard(session_id)
+            if restore is not None:
+                self.active_sessions[session_id] = restore
+                self._account(session_id, len(_encode_session(restore)))
+                self._evict(keep=session_id)
+
+    def __contains__(self, session_id: str) -> bool:
+        with self._lock:
+            if session_id in self.active_sessions:
+                return True
+            return self._warm.execute(
+                "SELECT 1 FROM warm_sessions WHERE session_id = ?", (session_id,)
+            ).fetchone() is not None
+
     def add_workflow_step(self, session_id: str, step_data: Dict):
         """Records a workflow step in session memory"""
-        if session_id in self.active_sessions:
-            self.active_sessions[session_id]["workflow_steps"].append(step_data)
-            self.active_sessions[session_id]["last_updated"] = datetime.utcnow()
-    
+        self._append(session_id, "workflow_steps", step_data)
+
     def add_feedback(self, session_id: str, feedback_data: Dict):
         """Records user feedback in session memory"""
-        if session_id in self.active_sessions:
-            self.active_sessions[session_id]["feedback_history"].append(feedback_data)
-            self.active_sessions[session_id]["last_updated"] = datetime.utcnow()
+        self._append(session_id, "feedback_history", feedback_data)
+
+    def _append(self, session_id: str, field: str, item: Dict):
+        with self._lock:
+            if session_id in self._committing:
+                raise SessionCommitInProgressError(f"Session {session_id} is being committed to permanent memory")
+            session = self.get_session(session_id)
+            if session is None:
+                return
+            session[field].append(item)
+            session["last_updated"] = datetime.utcnow()
+            self._account(session_id, self._sizes.get(session_id, 0) + len(_encode_session(item)))
+            self._evict(keep=session_id)
+
+    def _account(self, session_id: str, size: int):
+        self.hot_bytes += size - self._sizes.get(session_id, 0)
+        self._sizes[session_id] = size
+
+    def _evict(self, keep: Optional[str] = None):
+        """Spill least recently used sessions to the warm tier until under the caps"""
+        spilled = []
+        while self.active_sessions and (
+            len(self.active_sessions) > self.max_hot_sessions or self.hot_bytes > self.max_hot_bytes
+        ):
+            session_id = next(iter(self.active_sessions))
+            if session_id == keep:
+                if len(self.active_sessions) == 1:
+                    break
+                self.active_sessions.move_to_end(session_id)
+                continue
+            session = self.active_sessions.pop(session_id)
+            self.hot_bytes -= self._sizes.pop(session_id, 0)
+            spilled.append((session_id, zlib.compress(_encode_session(session))))
+        if spilled:
+            self._warm.executemany(
+                "INSERT OR REPLACE INTO warm_sessions (session_id, data) VALUES (?, ?)", spilled
+            )
+            self._warm.commit()
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            warm = self._warm.execute("SELECT COUNT(*) FROM warm_sessions").fetchone()[0]
+            return {
+                "hot_sessions": len(self.active_sessions),
+                "hot_bytes": self.hot_bytes,
+                "warm_sessions": warm,
+                "max_hot_sessions": self.max_hot_sessions,
+                "max_hot_bytes": self.max_hot_bytes
+            }
 
 class PermanentMemory:
     def __init__(self, persist_directory: str = "./chroma_db"):
@@ -79,39 +268,55 @@ class PermanentMemory:
         
     def store_workflow(self, session_data: Dict):
         """Stores completed workflow in permanent memory"""
-        workflow_id = str(uuid.uuid4())
-        
-        # Extract metadata and embed content
-        metadata = {
-            "workflow_id": workflow_id,
-            "timestamp": datetime.utcnow().isoformat(),
-            "confidence_scores": json.dumps(session_data.get("confidence_scores", [])),
-            "success_rate": self._calculate_success_rate(session_data)
-        }
-        
+        self.store_workflows([session_data])
+
+    def store_workflows(self, sessions: List[Dict], ids: Optional[List[str]] = None):
+        """
+        Stores several completed workflows with a single Chroma write
+
+        Records are upserted, so writing the same IDs again (a retried
+        commit) replaces them instead of adding duplicates.
+        """
+        if not sessions:
+            return
+        workflow_ids = ids or [str(uuid.uuid4()) for _ in sessions]
+        ids, documents, metadatas = [], [], []
+        for workflow_id, session_data in zip(workflow_ids, sessions):
+
+            # Extract metadata and embed content
+            ids.append(workflow_id)
+            documents.append(_encode_session(session_data).decode("utf-8"))
+            metadatas.append({
+                "workflow_id": workflow_id,
+                "timestamp": datetime.utcnow().isoformat(),
+                "confidence_scores": json.dumps(session_data.get("confidence_scores", [])),
+                "success_rate": self._calculate_success_rate(session_data)
+            })
+
         # Store in ChromaDB
-        self.collections["workflows"].add(
-            ids=[workflow_id],
-            documents=[json.dumps(session_data)],
-            metadatas=[metadata]
-        )
-        
+        self.collections["workflows"].upsert(ids=ids, documents=documents, metadatas=metadatas)
+
     def store_training_data(self, data: Dict):
         """Stores curated training data for system improvement"""
-        data_id = str(uuid.uuid4())
-        
-        metadata = {
-            "data_id": data_id,
-            "timestamp": datetime.utcnow().isoformat(),
-            "data_type": data.get("type", "general"),
-            "quality_score": data.get("quality_score", 0.0)
-        }
-        
-        self.collections["training_data"].add(
-            ids=[data_id],
-            documents=[json.dumps(data)],
-            metadatas=[metadata]
-        )
+        self.store_training_data_batch([data])
+
+    def store_training_data_batch(self, items: List[Dict], ids: Optional[List[str]] = None):
+        """Stores several curated training records with a single Chroma upsert"""
+        if not items:
+            return
+        data_ids = ids or [str(uuid.uuid4()) for _ in items]
+        ids, documents, metadatas = [], [], []
+        for data_id, data in zip(data_ids, items):
+            ids.append(data_id)
+            documents.append(_encode_session(data).decode("utf-8"))
+            metadatas.append({
+                "data_id": data_id,
+                "timestamp": datetime.utcnow().isoformat(),
+                "data_type": data.get("type", "general"),
+                "quality_score": data.get("quality_score", 0.0)
+            })
+
+        self.collections["training_data"].upsert(ids=ids, documents=documents, metadatas=metadatas)
 
     def _calculate_success_rate(self, session_data: Dict) -> float:
         """Calculates success rate based on feedback"""
@@ -123,44 +328,219 @@ class PermanentMemory:
         return positive_feedback / len(feedback)
 
 class EnhancedMemoryManager:
-    def __init__(self, persist_directory: str = "./chroma_db"):
-        self.session_memory = SessionMemory()
+    def __init__(
+        self,
+        persist_directory: str = "./chroma_db",
+        session_memory: Optional[SessionMemory] = None,
+        commit_batch_size: Optional[int] = None,
+        commit_queue_size: Optional[int] = None,
+        commit_batch_wait: Optional[float] = None,
+        commit_retries: Optional[int] = None,
+        commit_retry_wait: Optional[float] = None
+    ):
+        self.session_memory = session_memory or SessionMemory()
         self.permanent_memory = PermanentMemory(persist_directory)
         self.audit = AuditLogger()
-        
+
+        # Asynchronous, batched commits to permanent memory
+        self.commit_batch_size = commit_batch_size or int(os.getenv("MEMORY_COMMIT_BATCH_SIZE", "32"))
+        self.commit_batch_wait = commit_batch_wait or float(os.getenv("MEMORY_COMMIT_BATCH_WAIT_S", "0.1"))
+        self._commit_queue: "queue.Queue" = queue.Queue(
+            maxsize=commit_queue_size or int(os.getenv("MEMORY_COMMIT_QUEUE_SIZE", "1024"))
+        )
+        self.commit_retries = commit_retries if commit_retries is not None else int(os.getenv("MEMORY_COMMIT_RETRIES", "3"))
+        self.commit_retry_wait = commit_retry_wait if commit_retry_wait is not None else float(os.getenv("MEMORY_COMMIT_RETRY_WAIT_S", "1.0"))
+        # Session IDs queued or being written, and those whose retries ran out
+        self._pending = set()
+        self.failed_commits = set()
+        self._commit_lock = threading.Lock()
+        # close() waits for commit_session calls already past the closed check
+        self._puts_done = threading.Condition(self._commit_lock)
+        self._putting = 0
+        self._closed = False
+        self._committer = threading.Thread(target=self._run_committer, name="memory-committer", daemon=True)
+        self._committer.start()
+        _open_managers.add(self)
+
     def start_session(self) -> str:
         """Starts a new workflow session"""
         return self.session_memory.create_session()
         
     def record_step(self, session_id: str, step_data: Dict):
-        """Records a workflow step"""
+        """Records a workflow step; raises SessionCommitInProgressError while the session is being written"""
         self.session_memory.add_workflow_step(session_id, step_data)
         self.audit.log_workflow_step(session_id, step_data)
         
     def record_feedback(self, session_id: str, feedback_data: Dict):
-        """Records user feedback"""
+        """Records user feedback; raises SessionCommitInProgressError while the session is being written"""
         self.session_memory.add_feedback(session_id, feedback_data)
         self.audit.log_feedback(session_id, feedback_data)
         
+    def get_session(self, session_id: str) -> Optional[Dict]:
+        """Returns an active session from the hot or warm tier"""
+        return self.session_memory.get_session(session_id)
+
     def commit_session(self, session_id: str):
-        """Commits session to permanent memory"""
-        if session_id in self.session_memory.active_sessions:
-            session_data = self.session_memory.active_sessions[session_id]
-            
-            # Store in permanent memory
-            self.permanent_memory.store_workflow(session_data)
-            
-            # If session was high quality, store as training data
-            if self._is_valuable_training_data(session_data):
-                self.permanent_memory.store_training_data({
+        """
+        Queues session for commit to permanent memory
+
+        The session stays readable in session memory until its write
+        starts, and is restored if the write fails so it can be retried.
+        """
+        with self._commit_lock:
+            if session_id in self._pending or session_id not in self.session_memory:
+                return
+            self.failed_commits.discard(session_id)
+            if self._closed:
+                try:
+                    self._commit_ids([session_id])
+                except Exception:
+                    self.failed_commits.add(session_id)
+                    raise
+                return
+            self._pending.add(session_id)
+            self._putting += 1
+        try:
+            # Blocks when the queue is full, bounding memory held by pending commits
+            self._commit_queue.put((session_id, 0))
+        finally:
+            with self._commit_lock:
+                self._putting -= 1
+                self._puts_done.notify_all()
+
+    def retry_failed_commits(self) -> int:
+        """Requeues sessions whose commits ran out of retries; returns how many"""
+        with self._commit_lock:
+            failed = list(self.failed_commits)
+        for session_id in failed:
+            self.commit_session(session_id)
+        return len(failed)
+
+    def _commit_ids(self, session_ids: List[str]):
+        """Takes sessions still in session memory out, writes them, and restores them if the write fails"""
+        sessions = {}
+        for session_id in session_ids:
+            session_data = self.session_memory.begin_commit(session_id)
+            if session_data is not None:
+                sessions[session_id] = session_data
+        try:
+            self._commit_batch(sessions)
+        except Exception:
+            for session_id, session_data in sessions.items():
+                self.session_memory.end_commit(session_id, restore=session_data)
+            raise
+        for session_id in sessions:
+            self.session_memory.end_commit(session_id)
+
+    def _run_committer(self):
+        while True:
+            batch = [self._commit_queue.get()]
+            deadline = time.monotonic() + self.commit_batch_wait
+            while len(batch) < self.commit_batch_size and batch[-1] is not None:
+                try:
+                    batch.append(self._commit_queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            stop = None in batch
+            items = [item for item in batch if item is not None]
+            try:
+                self._commit_ids([session_id for session_id, _ in items])
+                with self._commit_lock:
+                    self._pending.difference_update(session_id for session_id, _ in items)
+            except Exception as e:
+                logger.error(f"Permanent memory commit failed for {len(items)} sessions: {e}")
+                # One bad session must not fail the rest of its batch
+                failed = self._commit_singly(items) if len(items) > 1 else items
+                if failed:
+                    if not stop:
+                        time.sleep(self.commit_retry_wait * (1 + max(a for _, a in failed)))
+                    self._requeue(failed, retry=not stop)
+            finally:
+                for _ in batch:
+                    self._commit_queue.task_done()
+            if stop:
+                return
+
+    def _commit_singly(self, items: List) -> List:
+        """Commits a failed batch one session at a time; returns the items that failed again"""
+        failed = []
+        for item in items:
+            session_id = item[0]
+            try:
+                self._commit_ids([session_id])
+            except Exception as e:
+                logger.error(f"Permanent memory commit failed for session {session_id}: {e}")
+                failed.append(item)
+                continue
+            with self._commit_lock:
+                self._pending.discard(session_id)
+        return failed
+
+    def _requeue(self, items: List, retry: bool):
+        """Puts a failed batch back on the queue, or parks it once retries run out"""
+        for item in items:
+            if item is None:
+                continue
+            session_id, attempt = item
+            if retry and attempt < self.commit_retries:
+                try:
+                    self._commit_queue.put_nowait((session_id, attempt + 1))
+                    continue
+                except queue.Full:
+                    pass
+            with self._commit_lock:
+                self._pending.discard(session_id)
+                self.failed_commits.add(session_id)
+            logger.error(f"Session {session_id} kept in session memory after {attempt + 1} failed commits")
+
+    def _commit_batch(self, sessions: Dict[str, Dict]):
+        # Record IDs derive from the session ID, so a retried commit
+        # overwrites whatever an earlier partial attempt already wrote
+        self.permanent_memory.store_workflows(list(sessions.values()), ids=list(sessions))
+
+        # High quality sessions are also stored as training data
+        valuable = {
+            session_id: session_data
+            for session_id, session_data in sessions.items()
+            if self._is_valuable_training_data(session_data)
+        }
+        self.permanent_memory.store_training_data_batch(
+            [
+                {
                     "type": "workflow",
                     "data": session_data,
                     "quality_score": self._calculate_training_value(session_data)
-                })
-                
-            # Cleanup session
-            del self.session_memory.active_sessions[session_id]
-            
+                }
+                for session_data in valuable.values()
+            ],
+            ids=[f"workflow:{session_id}" for session_id in valuable]
+        )
+
+    def flush(self):
+        """Blocks until every queued commit has been written or parked in failed_commits"""
+        self._commit_queue.join()
+
+    def close(self):
+        """Writes pending commits and stops the committer thread"""
+        with self._commit_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._puts_done.wait_for(lambda: self._putting == 0)
+        self._commit_queue.put(None)
+        self._committer.join()
+        # Retries requeued behind the stop marker never ran
+        leftover = []
+        while True:
+            try:
+                leftover.append(self._commit_queue.get_nowait())
+            except queue.Empty:
+                break
+            self._commit_queue.task_done()
+        self._requeue(leftover, retry=False)
+        _open_managers.discard(self)
+
+
     def _is_valuable_training_data(self, session_data: Dict) -> bool:
         """Determines if session should be used for training"""
         success_rate = self.permanent_memory._calculate_success_rate(session_data)
@@ -35,25 +35,124 @@ Edge Case Handling:
  - Maintain `protocol_version` for evolving formats
  - Enforce unique `packet_id` to support deduplication
  - Optionally add `transport_hint` for priority requirements
+
+Transport Reuse:
+ - One process-wide `transport_manager` owns a pooled Redis client and a single
+   shared gRPC channel; packets borrow them instead of dialing per instance
+ - Packets serialize once; size checks, sends and fallbacks reuse the bytes
+ - `send_batch` pipelines XADDs for bursts of small packets, per transport manager
+ - Large gRPC payloads go out as one client-streaming `StreamPacket` call
 """
 
+import logging
+import threading
 import uuid
 import json
+from typing import Dict, Iterable, List, Optional
 
 from .config import settings
 import redis
 import grpc
 
-# Hypothetical protobuf generated classes
+# Generated from proto/mcp.proto (see the generation command there)
 from .proto.mcp_pb2 import McpMessage, McpFragment
 from .proto.mcp_pb2_grpc import McpServiceStub
 
+REDIS_STREAM = "mcp_stream"
+
+logger = logging.getLogger(__name__)
+
 class MCPPacketError(Exception):
     pass
 
+class MCPTransportManager:
+    """
+    Process-wide Redis connection pool and shared gRPC channel.
+
+    Clients are created lazily on first use and reused by every packet.
+    Tests and benchmarks can pass fake clients in directly.
+    """
+
+    def __init__(self, redis_client=None, grpc_client=None):
+        self._redis = redis_client
+        self._grpc_client = grpc_client
+        self._channel = None
+        self._lock = threading.Lock()
+        self.pipeline_batch_size = getattr(settings, "REDIS_PIPELINE_BATCH", 128)
+
+    @property
+    def redis(self):
+        if self._redis is None:
+            with self._lock:
+                if self._redis is None:
+                    pool = redis.ConnectionPool(
+                        host=settings.REDIS_HOST,
+                        port=settings.REDIS_PORT,
+                        max_connections=getattr(settings, "REDIS_MAX_CONNECTIONS", 32),
+                    )
+                    self._redis = redis.Redis(connection_pool=pool, decode_responses=False)
+        return self._redis
+
+    @property
+    def grpc_client(self):
+        if self._grpc_client is None:
+            with self._lock:
+                if self._grpc_client is None:
+                    # Channels multiplex calls over one HTTP/2 connection
+                    self._channel = grpc.insecure_channel(settings.GRPC_ENDPOINT)
+                    self._grpc_client = McpServiceStub(self._channel)
+        return self._grpc_client
+
+    def xadd(self, message: bytes):
+        self.redis.xadd(REDIS_STREAM, {"message": message})
+
+    def xadd_many(self, messages: List[bytes]) -> List[Optional[Exception]]:
+        """
+        Pipeline XADDs; one round trip per `pipeline_batch_size` messages.
+
+        Pipelines are not transactional: chunks already executed stay in the
+        stream when a later one fails, so failures are reported per message
+        instead of raised.
+
+        Returns:
+            Per-message None once Redis acknowledged it, otherwise the error
+            that kept it out (messages after a failed chunk are not attempted)
+        """
+        errors: List[Optional[Exception]] = []
+        for start in range(0, len(messages), self.pipeline_batch_size):
+            chunk = messages[start:start + self.pipeline_batch_size]
+            try:
+                pipe = self.redis.pipeline(transaction=False)
+                for message in chunk:
+                    pipe.xadd(REDIS_STREAM, {"message": message})
+                replies = pipe.execute(raise_on_error=False)
+            except Exception as e:
+                errors.extend([e] * (len(messages) - start))
+                return errors
+            errors.extend(reply if isinstance(reply, Exception) else None for reply in replies)
+        return errors
+
+    def send_grpc(self, packet_json: str) -> bool:
+        return self.grpc_client.SendPacket(McpMessage(packet_json=packet_json)).success
+
+    def stream_fragments(self, fragments: Iterable[McpFragment]) -> bool:
+        """Send all fragments of one packet in a single client-streaming call."""
+        return self.grpc_client.StreamPacket(iter(fragments)).success
+
+    def close(self):
+        with self._lock:
+            if self._channel is not None:
+                self._channel.close()
+                self._channel = None
+                self._grpc_client = None
+            if self._redis is not None:
+                self._redis.close()
+                self._redis = None
+
 class MCPPacket:
     def __init__(self, agent_id: str, step_id: str, tool: str, payload: dict,
-                 memory_pointer: str, protocol_version: str = "1.0", transport_hint: str = None):
+                 memory_pointer: str, protocol_version: str = "1.0", transport_hint: str = None,
+                 transports: Optional[MCPTransportManager] = None):
         self.packet_id = str(uuid.uuid4())
         self.agent_id = agent_id
         self.step_id = step_id
@@ -64,26 +163,41 @@ class MCPPacket:
         self.transport_hint = transport_hint
         self.transport = None
 
-        # Initialize Redis and gRPC clients
-        self.redis = redis.Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT,
-                                 decode_responses=False)
-        channel = grpc.insecure_channel(settings.GRPC_ENDPOINT)
-        self.grpc_client = McpServiceStub(channel)
+        # Borrow pooled Redis / shared gRPC clients
+        self.transports = transports or transport_manager
+        self._json: Optional[str] = None
+        self._bytes: Optional[bytes] = None
+
+    @property
+    def redis(self):
+        return self.transports.redis
+
+    @property
+    def grpc_client(self):
+        return self.transports.grpc_client
 
     def to_json(self):
-        return json.dumps({
-            "packet_id": self.packet_id,
-            "agent_id": self.agent_id,
-            "step_id": self.step_id,
-            "tool": self.tool,
-            "payload": self.payload,
-            "memory_pointer": self.memory_pointer,
-            "protocol_version": self.protocol_version,
-            "transport_hint": self.transport_hint
-        })
+        # Packets are immutable once built; serialize a single time
+        if self._json is None:
+            self._json = json.dumps({
+                "packet_id": self.packet_id,
+                "agent_id": self.agent_id,
+                "step_id": self.step_id,
+                "tool": self.tool,
+                "payload": self.payload,
+                "memory_pointer": self.memory_pointer,
+                "protocol_version": self.protocol_version,
+                "transport_hint": self.transport_hint
+            })
+        return self._json
+
+    def to_bytes(self) -> bytes:
+        if self._bytes is None:
+            self._bytes = self.to_json().encode('utf-8')
+        return self._bytes
 
     def choose_transport(self):
-        size = len(self.to_json().encode('utf-8'))
+        size = len(self.to_bytes())
         threshold = settings.PAYLOAD_SIZE_THRESHOLD
         # honor hint if provided
         if self.transport_hint:
@@ -102,9 +216,8 @@ class MCPPacket:
             raise MCPPacketError(f"Unknown transport: {t}")
 
     def _send_redis(self):
-        msg = self.to_json()
         try:
-            self.redis.xadd("mcp_stream", {"message": msg})
+            self.transports.xadd(self.to_bytes())
             return True
         except Exception as e:
             # fallback to gRPC if Redis fails
@@ -112,25 +225,27 @@ class MCPPacket:
 
     def _send_grpc(self):
         try:
-            content = McpMessage(packet_json=self.to_json())
-            response = self.grpc_client.SendPacket(content)
-            return response.success
+            return self._grpc_call()
         except Exception as e:
             # fallback to Redis if gRPC fails
             return self._fallback("redis_stream", e)
 
+    def _grpc_call(self):
+        if len(self.to_bytes()) > settings.MAX_FRAGMENT_SIZE:
+            return self.transports.stream_fragments(self.fragment_payload())
+        return self.transports.send_grpc(self.to_json())
+
     def _fallback(self, fallback_transport: str, original_error: Exception):
+        original_transport = self.transport
         self.transport = fallback_transport
         try:
             if fallback_transport == "redis_stream":
-                self.redis.xadd("mcp_stream", {"message": self.to_json()})
-            else:
-                content = McpMessage(packet_json=self.to_json())
-                self.grpc_client.SendPacket(content)
-            return True
+                self.transports.xadd(self.to_bytes())
+                return True
+            return self._grpc_call()
         except Exception as e2:
             raise MCPPacketError(
-                f"Both {self.transport} and fallback {fallback_transport} failed: {e2}"
+                f"Both {original_transport} and fallback {fallback_transport} failed: {e2}"
             )
 
     def fragment_payload(self, max_size: int = settings.MAX_FRAGMENT_SIZE):
@@ -138,15 +253,54 @@ class MCPPacket:
         Split large payload into fragments for streaming.
         Returns a list of McpFragment messages ready for gRPC streaming.
         """
-        raw = self.to_json().encode('utf-8')
+        raw = self.to_bytes()
+        total = (len(raw) + max_size - 1) // max_size
         fragments = []
         for i in range(0, len(raw), max_size):
             chunk = raw[i:i + max_size]
             frag = McpFragment(
                 packet_id=self.packet_id,
                 fragment_index=i // max_size,
-                total_fragments=(len(raw) + max_size - 1) // max_size,
+                total_fragments=total,
                 data=chunk
             )
             fragments.append(frag)
         return fragments
+
+def send_batch(packets: List[MCPPacket]) -> List[bool]:
+    """
+    Send a burst of packets over each packet's own transports: Redis-bound
+    packets sharing a transport manager go out as pipelined XADDs,
+    gRPC-bound packets reuse their manager's channel.
+
+    Returns:
+        Per-packet success flags, in input order
+    """
+    results = [False] * len(packets)
+    redis_groups: Dict[int, List[int]] = {}
+    for i, packet in enumerate(packets):
+        if packet.choose_transport() == "redis_stream":
+            redis_groups.setdefault(id(packet.transports), []).append(i)
+            continue
+        try:
+            results[i] = packet.send()
+        except MCPPacketError as e:
+            # One undeliverable packet must not abort the rest of the batch
+            logger.warning("MCP packet %s not delivered: %s", packet.packet_id, e)
+
+    for indexes in redis_groups.values():
+        transports = packets[indexes[0]].transports
+        errors = transports.xadd_many([packets[i].to_bytes() for i in indexes])
+        for i, error in zip(indexes, errors):
+            if error is None:
+                results[i] = True
+                continue
+            # Only packets Redis did not acknowledge go through the gRPC
+            # fallback, so none is delivered twice
+            try:
+                results[i] = packets[i]._fallback("grpc", error)
+            except MCPPacketError as e:
+                logger.warning("MCP packet %s not delivered: %s", packets[i].packet_id, e)
+    return results
+
+transport_manager = MCPTransportManager()
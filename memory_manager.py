@@ -33,10 +33,30 @@ Edge Cases & Handling:
  - Embedding collision: create unique vector ID with timestamp
  - Store failures: buffer and retry
  - Missing trace: return empty or prompt new session
+
+Write Path:
+ - `store_session` only enqueues onto a bounded queue and returns the vector id;
+   a background writer persists sessions off the caller's critical path
+ - The writer drains micro-batches: one Redis pipeline, one batched embedding
+   call, one bulk vector upsert, then the audit records
+ - A full queue applies backpressure, then falls back to an inline write
+ - Sessions still in the queue are served by `get_session` (read-your-writes)
+ - Trace embeddings are cached, so recall and store of the same trace embed once
+ - `flush()` / `close()` drain the queue; a store racing `close` is either queued
+   ahead of the stop marker or written inline, never dropped
+ - Managers still open at interpreter exit are closed by one module-level hook
+   that holds them weakly, so a closed manager can be garbage collected
 """
 
+import atexit
+import hashlib
+import queue
+import threading
+import time
 import uuid
+import weakref
 import json
+from collections import OrderedDict
 from datetime import datetime
 from .audit_logger import AuditLogger
 import logging
@@ -47,21 +67,66 @@ import redis
 from chromadb import Client as VectorClient
 from Transformers import OpenAIEmbedder  # hypothetical embedding class
 
+_STOP = object()
+
+# Open managers, closed at interpreter exit without being kept alive by it
+_open_managers: "weakref.WeakSet" = weakref.WeakSet()
+
+
+def _close_open_managers():
+    for manager in list(_open_managers):
+        manager.close()
+
+
+atexit.register(_close_open_managers)
+
 class MemoryManager:
     def __init__(self,
                  redis_host='localhost', redis_port=6379,
-                 vector_host=None, vector_port=None):
+                 vector_host=None, vector_port=None,
+                 queue_size: int = 1024, batch_size: int = 32,
+                 max_batch_wait: float = 0.05, enqueue_timeout: float = 1.0,
+                 embedding_cache_size: int = 256):
         """
-        Initializes Redis client (v8+) and vector database client.
+        Initializes Redis client (v8+) and vector database client,
+        and starts the background session writer.
+
+        Args:
+            queue_size: Bound on sessions waiting to be persisted
+            batch_size: Maximum sessions written per micro-batch
+            max_batch_wait: Seconds to wait for a batch to fill
+            enqueue_timeout: Seconds to block on a full queue before writing inline
+            embedding_cache_size: Trace embeddings kept for recall/store reuse
         """ 
         self.redis = redis.Redis(host=redis_host, port=redis_port, decode_responses=True)
         self.vector = VectorClient(host=vector_host, port=vector_port)  # stub
         self.embedder = OpenAIEmbedder()
         self.audit = AuditLogger()
 
+        self.batch_size = batch_size
+        self.max_batch_wait = max_batch_wait
+        self.enqueue_timeout = enqueue_timeout
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._pending = {}  # redis_key -> payload not yet in Redis
+        self._pending_lock = threading.Lock()
+        self._embeddings: "OrderedDict[str, list]" = OrderedDict()
+        self._embeddings_lock = threading.Lock()
+        self._embedding_cache_size = embedding_cache_size
+        self._closed = False
+        # close() waits for store_session calls already past the closed check
+        self._state_lock = threading.Lock()
+        self._puts_done = threading.Condition(self._state_lock)
+        self._putting = 0
+        self._writer = threading.Thread(target=self._run_writer, name="memory-writer", daemon=True)
+        self._writer.start()
+        _open_managers.add(self)
+
     def store_session(self, agent_id: str, request: dict, trace: list, tool_calls: list):
         """
-        Saves session data to Redis and Vector DB, and records audit metadata.
+        Queues session data for Redis, Vector DB and audit persistence.
+
+        Returns:
+            The vector id the session will be stored under
         """
         redis_key = f"session:{agent_id}"
         payload = {
@@ -71,32 +136,140 @@ class MemoryManager:
             "trace": trace,
             "tool_calls": tool_calls
         }
+        item = {
+            "redis_key": redis_key,
+            "vector_id": f"{agent_id}:{uuid.uuid4()}",
+            "payload": payload,
+            "trace_json": json.dumps(trace),
+        }
+
+        with self._pending_lock:
+            self._pending[redis_key] = payload
+
+        with self._state_lock:
+            closed = self._closed
+            if not closed:
+                self._putting += 1
+        if closed:
+            self._write_batch([item])
+            return item["vector_id"]
+        try:
+            self._queue.put(item, timeout=self.enqueue_timeout)
+        except queue.Full:
+            # Never drop memory: degrade to a synchronous write
+            logger.warning("[MemoryManager] Write queue full; persisting %s inline", redis_key)
+            self._write_batch([item])
+        finally:
+            with self._state_lock:
+                self._putting -= 1
+                self._puts_done.notify_all()
+        return item["vector_id"]
 
-        # Short-term store in Redis (JSON support & TTL possible)
+    def _run_writer(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                return
+            batch = [item]
+            stop = False
+            deadline = time.monotonic() + self.max_batch_wait
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    nxt = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is _STOP:
+                    stop = True
+                    break
+                batch.append(nxt)
+            try:
+                self._write_batch(batch)
+            except Exception as e:
+                logger.error("[MemoryManager] Batch write failed: %s", e)
+            finally:
+                for _ in range(len(batch) + stop):
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def _write_batch(self, batch: list):
+        # Short-term store in Redis, one round trip for the whole batch
         try:
-            self.redis.set(redis_key, json.dumps(payload))
+            pipe = self.redis.pipeline(transaction=False)
+            for item in batch:
+                pipe.set(item["redis_key"], json.dumps(item["payload"]))
+            pipe.execute()
         except Exception as e:
             # If Redis fails, still proceed to vector DB but log alert
             logger.warning("[MemoryManager] Redis write failed: %s", e)
+        finally:
+            with self._pending_lock:
+                for item in batch:
+                    if self._pending.get(item["redis_key"]) is item["payload"]:
+                        del self._pending[item["redis_key"]]
 
-        # Long-term vector embedding for semantic retrieval
-        embed = self.embedder.embed(json.dumps(trace))
-        vector_id = f"{agent_id}:{uuid.uuid4()}"
-        metadata = {
-            "agent_id": agent_id,
-            "timestamp": payload["timestamp"],
-            "request": request,
-            "tool_calls": tool_calls
-        }
+        # Long-term vector embeddings for semantic retrieval
         try:
-            self.vector.upsert(id=vector_id, vector=embed, metadata=metadata)
+            embeds = self._embed_traces([item["trace_json"] for item in batch])
+            records = [
+                {
+                    "id": item["vector_id"],
+                    "vector": embed,
+                    "metadata": {
+                        "agent_id": item["payload"]["agent_id"],
+                        "timestamp": item["payload"]["timestamp"],
+                        "request": item["payload"]["request"],
+                        "tool_calls": item["payload"]["tool_calls"]
+                    }
+                }
+                for item, embed in zip(batch, embeds)
+            ]
+            self._bulk_upsert(records)
         except Exception as e:
             logger.warning("[MemoryManager] Vector DB upsert failed: %s", e)
 
         # Audit linkage for legal/compliance trace
-        self.audit.record_memory(agent_id=agent_id,
-                                 redis_key=redis_key,
-                                 vector_id=vector_id)
+        for item in batch:
+            self.audit.record_memory(agent_id=item["payload"]["agent_id"],
+                                     redis_key=item["redis_key"],
+                                     vector_id=item["vector_id"])
+
+    def _bulk_upsert(self, records: list):
+        if hasattr(self.vector, "upsert_many"):
+            self.vector.upsert_many(records)
+        else:
+            for record in records:
+                self.vector.upsert(id=record["id"], vector=record["vector"], metadata=record["metadata"])
+
+    def _embed_traces(self, trace_jsons: list) -> list:
+        """Embed serialized traces, reusing cached vectors and batching misses."""
+        keys = [hashlib.sha256(t.encode("utf-8")).hexdigest() for t in trace_jsons]
+        results = [None] * len(keys)
+        missing = {}
+        with self._embeddings_lock:
+            for i, key in enumerate(keys):
+                if key in self._embeddings:
+                    self._embeddings.move_to_end(key)
+                    results[i] = self._embeddings[key]
+                else:
+                    missing.setdefault(key, []).append(i)
+
+        if missing:
+            texts = [trace_jsons[idxs[0]] for idxs in missing.values()]
+            if hasattr(self.embedder, "embed_batch"):
+                vectors = self.embedder.embed_batch(texts)
+            else:
+                vectors = [self.embedder.embed(t) for t in texts]
+            with self._embeddings_lock:
+                for (key, idxs), vector in zip(missing.items(), vectors):
+                    self._embeddings[key] = vector
+                    for i in idxs:
+                        results[i] = vector
+                while len(self._embeddings) > self._embedding_cache_size:
+                    self._embeddings.popitem(last=False)
+        return results
 
     def recall_similar(self, current_trace: list, top_k: int = 5):
         """
@@ -104,7 +277,7 @@ class MemoryManager:
         Falls back gracefully if vector store fails.
         """
         try:
-            query_vec = self.embedder.embed(json.dumps(current_trace))
+            query_vec = self._embed_traces([json.dumps(current_trace)])[0]
             results = self.vector.query(query_vector=query_vec, top_k=top_k)
             return results  # list of dicts with metadata
         except Exception as e:
@@ -113,12 +286,37 @@ class MemoryManager:
 
     def get_session(self, agent_id: str):
         """
-        Fetches session data directly from Redis if available.
+        Fetches session data from the write queue or directly from Redis if available.
         """
         redis_key = f"session:{agent_id}"
+        with self._pending_lock:
+            pending = self._pending.get(redis_key)
+        if pending is not None:
+            return pending
         try:
             raw = self.redis.get(redis_key)
             return json.loads(raw) if raw else None
         except Exception as e:
             logger.warning("[MemoryManager] Redis retrieval failed: %s", e)
             return None
+
+    def flush(self):
+        """
+        Blocks until every queued session has been persisted.
+        """
+        self._queue.join()
+
+    def close(self):
+        """
+        Drains the write queue and stops the background writer.
+        Later store_session calls write inline.
+        """
+        with self._state_lock:
+            if self._closed:
+                return
+            self._closed = True
+            # Stores already past the closed check enqueue ahead of _STOP
+            self._puts_done.wait_for(lambda: self._putting == 0)
+        self._queue.put(_STOP)
+        self._writer.join()
+        _open_managers.discard(self)
@@ -1,25 +1,43 @@
 # Copyright (c) 2025 LALO AI LLC. All rights reserved.
 #
-# Recursive Task Interpreter (RTI) with VectorStore retrieval example.
+# Recursive Task Interpreter (RTI) with plan-example retrieval.
 
 from fastapi import FastAPI
 from pydantic import BaseModel
+from typing import List, Optional
+import asyncio
+import os
 import random
-import time
 import sys
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from vector_store import VectorStore
+from vector_store import QueryBatcher
+from plan_index import PlanIndex
+
+# Simulated model latency; awaited so concurrent requests overlap
+SIMULATED_LATENCY = float(os.getenv("SIMULATED_LATENCY_SECONDS", "0.5"))
+# Only plans rated at least this well are kept as examples
+MIN_PLAN_RATING = float(os.getenv("PLAN_INDEX_MIN_RATING", "0.6"))
 
 app = FastAPI(title="Recursive Task Interpreter (RTI)")
 
-# Initialize the in-memory vector store with some past successful Action Plans
-vs = VectorStore()
-vs.add_document("Run a report for Q2 high margin shoes, formatted using the Marketing-Samples template from SharePoint.")
-vs.add_document("Generate a Workday report for employee productivity in the production department.")
-vs.add_document("Prepare a combined S4/HANA and Workday data export for quarterly HR and production review.")
+# Persistent index of past successful Action Plans (memory-mapped; O(1) load)
+plan_index = PlanIndex()
+if not len(plan_index):
+    plan_index.add_plans([
+        {"request": "Run a report for Q2 high margin shoes, formatted using the Marketing-Samples template from SharePoint."},
+        {"request": "Generate a Workday report for employee productivity in the production department."},
+        {"request": "Prepare a combined S4/HANA and Workday data export for quarterly HR and production review."},
+    ])
+
+# Concurrent /interpret calls share batched similarity lookups
+batcher = QueryBatcher(
+    plan_index,
+    max_batch=int(os.getenv("RTI_QUERY_BATCH_SIZE", "32")),
+    max_wait_ms=float(os.getenv("RTI_QUERY_BATCH_WAIT_MS", "5")),
+)
 
 class InterpretRequest(BaseModel):
     user_input: str
@@ -30,23 +48,23 @@ class InterpretResponse(BaseModel):
     critique: str
     retrieved_examples: list
 
-@app.post("/interpret", response_model=InterpretResponse)
-async def interpret(req: InterpretRequest):
-    """
-    Multi-step semantic interpretation:
-    1. Retrieve relevant historical Action Plans from vector DB.
-    2. Simulate alignment scoring.
-    3. Produce a proposed plan with critique.
-    """
-    time.sleep(0.5)
+class InterpretBatchRequest(BaseModel):
+    user_inputs: List[str]
+
+class PlanExample(BaseModel):
+    request: str
+    plan: str = ""
+    rating: Optional[float] = None
+    session_id: Optional[str] = None
 
-    # Step 1: Retrieve relevant examples
-    examples = vs.query(req.user_input, top_k=2)
+class PlanExamplesRequest(BaseModel):
+    plans: List[PlanExample]
 
-    # Step 2: Generate a simulated plan (placeholder for real model output)
-    plan = f"Simulated action plan for: {req.user_input}"
+def _build_response(user_input: str, examples: list) -> InterpretResponse:
+    # Generate a simulated plan (placeholder for real model output)
+    plan = f"Simulated action plan for: {user_input}"
 
-    # Step 3: Simulate alignment confidence scoring
+    # Simulate alignment confidence scoring
     confidence = round(random.uniform(0.85, 0.97), 2)
     critique = (
         "Interpretation aligns with user intent, "
@@ -57,5 +75,43 @@ async def interpret(req: InterpretRequest):
         plan=plan,
         confidence=confidence,
         critique=critique,
-        retrieved_examples=[{"document": doc, "similarity": score} for doc, score in examples]
+        retrieved_examples=examples
     )
+
+@app.post("/interpret", response_model=InterpretResponse)
+async def interpret(req: InterpretRequest):
+    """
+    Multi-step semantic interpretation:
+    1. Retrieve relevant historical Action Plans from the plan index.
+    2. Simulate alignment scoring.
+    3. Produce a proposed plan with critique.
+    """
+    await asyncio.sleep(SIMULATED_LATENCY)
+    examples = await batcher.query(req.user_input, top_k=2)
+    return _build_response(req.user_input, examples)
+
+@app.post("/interpret_batch", response_model=List[InterpretResponse])
+async def interpret_batch(req: InterpretBatchRequest):
+    """
+    Interpret several inputs at once; retrieval is a single batched lookup.
+    """
+    await asyncio.sleep(SIMULATED_LATENCY)
+    all_examples = await asyncio.to_thread(plan_index.query_batch, req.user_inputs, 2)
+    return [_build_response(text, examples) for text, examples in zip(req.user_inputs, all_examples)]
+
+@app.post("/plans")
+async def add_plans(req: PlanExamplesRequest):
+    """
+    Append successful plans (fed from completed, rated WorkflowSessions).
+    """
+    accepted = [
+        p.dict() for p in req.plans
+        if p.rating is None or p.rating >= MIN_PLAN_RATING
+    ]
+    ids = await asyncio.to_thread(plan_index.add_plans, accepted)
+    return {"added": len(ids), "skipped": len(req.plans) - len(ids), "ids": ids, "total": len(plan_index)}
+
+@app.get("/stats")
+async def stats():
+    """Query batching and plan index statistics."""
+    return {**batcher.get_stats(), "plans": len(plan_index)}
@@ -20,25 +20,38 @@ Purpose:
 - Handles resource allocation and cleanup
 - Provides secure execution boundaries
 - Manages state comparison and validation
+
+Provisioning (see sandbox_provisioner):
+- Sandboxes are copy-on-write views of the codebase, not full copies:
+  an overlayfs mount over a filtered base layer where available, otherwise
+  a reflink farm, with a plain copy as the last resort; a hardlink farm
+  shares inodes with the live tree and is only used when pinned, mounted
+  read-only
+- A manifest of base file hashes (reused across runs via size/mtime checks)
+  lets change detection skip unchanged files; with overlayfs only the upper
+  layer is inspected, so creation and diffing cost O(changes)
 """
 
 import docker
 import asyncio
+import logging
 import tempfile
 import shutil
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 import json
-import hashlib
 from datetime import datetime
 import resource
 import psutil
 import os
 
 from .audit_logger import AuditLogger
+from .sandbox_provisioner import CodebaseProvisioner
 from .config.self_improvement_config import SANDBOX_SETTINGS
 
+logger = logging.getLogger(__name__)
+
 @dataclass
 class SandboxMetrics:
     cpu_usage: float
@@ -100,8 +113,10 @@ class ResourceMonitor:
 class StateManager:
     """Manages and compares sandbox states"""
     
-    def __init__(self, base_path: Path):
+    def __init__(self, base_path: Path, provisioner: Optional[CodebaseProvisioner] = None):
         self.base_path = base_path
+        self.provisioner = provisioner or CodebaseProvisioner(Path.cwd(), base_path)
+        self.layouts: Dict[str, Dict] = {}
         self.state_history = {}
         
     async def capture_state(self, sandbox_id: str) -> SandboxState:
@@ -109,7 +124,7 @@ class StateManager:
         sandbox_path = self.base_path / sandbox_id
         
         state = SandboxState(
-            files_changed=await self._get_changed_files(sandbox_path),
+            files_changed=await self._get_changed_files(sandbox_id, sandbox_path),
             modules_loaded=await self._get_loaded_modules(),
             dependencies_added=await self._get_dependencies(sandbox_path),
             environment_vars=dict(os.environ),
@@ -119,28 +134,14 @@ class StateManager:
         self.state_history[sandbox_id] = state
         return state
         
-    async def _get_changed_files(self, path: Path) -> List[str]:
-        """Tracks changed files in sandbox"""
-        changed_files = []
-        for file in path.rglob("*"):
-            if file.is_file():
-                file_hash = self._calculate_file_hash(file)
-                orig_file = Path.cwd() / file.relative_to(path)
-                if orig_file.exists():
-                    orig_hash = self._calculate_file_hash(orig_file)
-                    if file_hash != orig_hash:
-                        changed_files.append(str(file.relative_to(path)))
-                else:
-                    changed_files.append(str(file.relative_to(path)))
-        return changed_files
+    async def _get_changed_files(self, sandbox_id: str, path: Path) -> List[str]:
+        """Tracks changed files in sandbox against the base manifest"""
+        layout = self.layouts.get(sandbox_id, {})
+        return await asyncio.to_thread(self.provisioner.changed_files, path, layout)
         
     def _calculate_file_hash(self, file_path: Path) -> str:
         """Calculates SHA256 hash of file"""
-        sha256_hash = hashlib.sha256()
-        with open(file_path, "rb") as f:
-            for byte_block in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(byte_block)
-        return sha256_hash.hexdigest()
+        return CodebaseProvisioner._hash(file_path)
 
 class SandboxManager:
     """Main sandbox management class"""
@@ -150,7 +151,10 @@ class SandboxManager:
         self.base_path = Path("./sandboxes")
         self.active_sandboxes = {}
         self.resource_monitor = ResourceMonitor(SANDBOX_SETTINGS)
-        self.state_manager = StateManager(self.base_path)
+        self.provisioner = CodebaseProvisioner(
+            Path.cwd(), self.base_path, mode=SANDBOX_SETTINGS.get("provisioning_mode", "auto")
+        )
+        self.state_manager = StateManager(self.base_path, self.provisioner)
         self.audit = AuditLogger()
         
     async def create_sandbox(self, 
@@ -159,19 +163,24 @@ class SandboxManager:
         """Creates new sandbox environment"""
         sandbox_id = f"sandbox_{improvement_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         sandbox_path = self.base_path / sandbox_id
+        created = False
+        container = None
         
         try:
             # Create sandbox directory
             sandbox_path.mkdir(parents=True)
+            created = True
             
-            # Copy current codebase
-            await self._copy_codebase(sandbox_path)
+            # Copy-on-write view of the current codebase
+            await self._copy_codebase(sandbox_id, sandbox_path)
             
             # Apply code changes
             await self._apply_changes(sandbox_path, code_changes)
             
             # Create docker container
-            container = await self._create_container(sandbox_id, sandbox_path)
+            container = await self._create_container(
+                sandbox_id, sandbox_path, self.state_manager.layouts.get(sandbox_id, {})
+            )
             
             # Capture initial state
             initial_state = await self.state_manager.capture_state(sandbox_id)
@@ -188,27 +197,41 @@ class SandboxManager:
             return sandbox_id
             
         except Exception as e:
-            await self._cleanup_sandbox(sandbox_id)
+            # Not registered yet: release what was provisioned so far
+            await self._discard_sandbox(sandbox_id, sandbox_path if created else None, container)
             raise
 
-    async def _copy_codebase(self, target_path: Path):
-        """Copies current codebase to sandbox"""
-        ignore_patterns = shutil.ignore_patterns(
-            '__pycache__',
-            '*.pyc',
-            '*.pyo',
-            '*.pyd',
-            '.git',
-            '.env',
-            'sandboxes',
-            'backups'
-        )
-        shutil.copytree(Path.cwd(), target_path, ignore=ignore_patterns, dirs_exist_ok=True)
+    async def _copy_codebase(self, sandbox_id: str, target_path: Path):
+        """Provisions a copy-on-write view of the current codebase"""
+        await asyncio.to_thread(self.provisioner.build_manifest)
+        layout = await asyncio.to_thread(self.provisioner.provision, sandbox_id, target_path)
+        self.state_manager.layouts[sandbox_id] = layout
+        logger.info(f"Provisioned {sandbox_id} via {layout['mode']}")
+
+    async def _apply_changes(self, sandbox_path: Path, code_changes: Dict[str, str]):
+        """Writes changed files; replacing (not editing) keeps base files untouched"""
+        for rel_path, content in code_changes.items():
+            target = sandbox_path / rel_path
+            target.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=".sandbox_")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(tmp, target)
 
     async def _create_container(self, 
                               sandbox_id: str, 
-                              sandbox_path: Path) -> docker.models.containers.Container:
+                              sandbox_path: Path,
+                              layout: Optional[Dict] = None) -> docker.models.containers.Container:
         """Creates docker container for sandbox"""
+        # Hardlinked trees are the live files: the container must not write them
+        mount_mode = self.provisioner.mount_mode(layout or {})
+        environment = {
+            "PYTHONPATH": "/app",
+            "SANDBOX_ID": sandbox_id,
+            "SANDBOX_MODE": "true"
+        }
+        if mount_mode == "ro":
+            environment["PYTHONDONTWRITEBYTECODE"] = "1"
         return self.docker_client.containers.run(
             "python:3.11-slim",
             name=f"lalo_sandbox_{sandbox_id}",
@@ -216,14 +239,10 @@ class SandboxManager:
             volumes={
                 str(sandbox_path): {
                     'bind': '/app',
-                    'mode': 'rw'
+                    'mode': mount_mode
                 }
             },
-            environment={
-                "PYTHONPATH": "/app",
-                "SANDBOX_ID": sandbox_id,
-                "SANDBOX_MODE": "true"
-            },
+            environment=environment,
             cpu_period=100000,  # CPU quota period in microseconds
             cpu_quota=int(100000 * SANDBOX_SETTINGS["max_cpu_cores"]),  # CPU quota in microseconds
             mem_limit=f"{SANDBOX_SETTINGS['max_memory_gb']}g",
@@ -308,17 +327,33 @@ class SandboxManager:
 
     async def _cleanup_sandbox(self, sandbox_id: str):
         """Removes sandbox container and files"""
-        if sandbox_id in self.active_sandboxes:
+        sandbox = self.active_sandboxes.pop(sandbox_id, None)
+        if sandbox is not None:
+            await self._discard_sandbox(sandbox_id, sandbox["path"], sandbox["container"])
+
+    async def _discard_sandbox(self,
+                               sandbox_id: str,
+                               path: Optional[Path],
+                               container=None):
+        """Stops the container, releases provisioned layers and removes the sandbox directory"""
+        if container is not None:
             try:
                 # Stop and remove container
-                self.active_sandboxes[sandbox_id]["container"].stop()
+                container.stop()
             except:
                 pass
-                
+
+        layout = self.state_manager.layouts.pop(sandbox_id, None)
+        if path is None:
+            return
+        if layout is not None:
             try:
-                # Remove sandbox directory
-                shutil.rmtree(self.active_sandboxes[sandbox_id]["path"])
-            except:
-                pass
-                
-            del self.active_sandboxes[sandbox_id]
+                self.provisioner.release(path, layout, sandbox_id)
+            except Exception as e:
+                logger.warning(f"Failed to release sandbox layers for {sandbox_id}: {e}")
+
+        try:
+            # Remove sandbox directory
+            shutil.rmtree(path)
+        except:
+            pass
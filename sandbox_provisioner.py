@@ -0,0 +1,303 @@
+"""
+Copyright (c) 2025 LALO AI SYSTEMS, LLC. All rights reserved.
+
+PROPRIETARY AND CONFIDENTIAL
+
+This file is part of LALO AI Platform and is protected by copyright law.
+Unauthorized copying, modification, distribution, or use of this software,
+via any medium, is strictly prohibited without the express written permission
+of LALO AI SYSTEMS, LLC.
+"""
+
+# © 2025 LALO AI, LLC. All Rights Reserved
+# SPDX-License-Identifier: All-Rights-Reserved
+
+"""
+Module: CodebaseProvisioner
+
+Purpose:
+- Materializes sandbox trees as copy-on-write views of the codebase
+- Keeps a manifest of base file hashes for change detection
+
+Modes:
+- overlay: overlayfs over a filtered base layer (CODEBASE_IGNORE applied),
+  built once per manifest generation and shared by all sandboxes; writes
+  land in the sandbox's upper layer
+- reflink: per-file FICLONE clones, private to the sandbox once written
+- copy: plain copies
+- hardlink: shares inodes with the live tree, so it is never chosen by
+  "auto" and is mounted read-only into the container
+"""
+
+import errno
+import fnmatch
+import hashlib
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+CODEBASE_IGNORE = (
+    '__pycache__',
+    '*.pyc',
+    '*.pyo',
+    '*.pyd',
+    '.git',
+    '.env',
+    'sandboxes',
+    'backups'
+)
+
+# Linux FICLONE ioctl: share extents with the source until either side writes
+FICLONE = 0x40049409
+
+
+class CodebaseProvisioner:
+    """Provisions copy-on-write sandbox trees and detects their changes"""
+
+    MODES = ("overlay", "reflink", "hardlink", "copy")
+    # Modes where a sandbox write cannot reach the live tree
+    AUTO_MODES = ("overlay", "reflink", "copy")
+    # Modes whose files are the live tree's inodes
+    SHARED_INODE_MODES = ("hardlink",)
+
+    def __init__(self, source: Path, base_path: Path, mode: str = "auto",
+                 ignore: Tuple[str, ...] = CODEBASE_IGNORE):
+        self.source = source
+        self.base_path = base_path
+        self.mode = mode
+        self.ignore = ignore
+        self.manifest_path = base_path / ".base_manifest.json"
+        self.layers_root = base_path / ".base_layers"
+        self.manifest: Dict[str, Dict] = {}
+        self._layer_users: Dict[str, Set[str]] = {}
+
+    def _ignored(self, name: str) -> bool:
+        return any(fnmatch.fnmatch(name, pattern) for pattern in self.ignore)
+
+    def _walk(self, root: Path):
+        """Yields (relative path, os.stat_result) for files not ignored"""
+        stack = [root]
+        while stack:
+            current = stack.pop()
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if self._ignored(entry.name):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(Path(entry.path))
+                    elif entry.is_file(follow_symlinks=False):
+                        yield Path(entry.path).relative_to(root).as_posix(), entry.stat(follow_symlinks=False)
+
+    @staticmethod
+    def _hash(file_path: Path) -> str:
+        sha256_hash = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for byte_block in iter(lambda: f.read(1024 * 1024), b""):
+                sha256_hash.update(byte_block)
+        return sha256_hash.hexdigest()
+
+    def build_manifest(self) -> Dict[str, Dict]:
+        """
+        Refreshes the base manifest {path: {size, mtime_ns, sha256}}.
+
+        Files whose size and mtime match the persisted manifest keep their
+        hash, so only files edited since the last run are re-read.
+        """
+        previous = self.manifest
+        if not previous and self.manifest_path.exists():
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                previous = json.load(f)
+
+        manifest = {}
+        rehashed = 0
+        for rel, st in self._walk(self.source):
+            entry = previous.get(rel)
+            if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+                manifest[rel] = entry
+            else:
+                manifest[rel] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns,
+                                 "sha256": self._hash(self.source / rel)}
+                rehashed += 1
+
+        if manifest != previous:
+            self.base_path.mkdir(parents=True, exist_ok=True)
+            tmp = self.manifest_path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(manifest, f)
+            os.replace(tmp, self.manifest_path)
+        logger.info(f"Base manifest: {len(manifest)} files, {rehashed} re-hashed")
+        self.manifest = manifest
+        return manifest
+
+    def provision(self, sandbox_id: str, target: Path) -> Dict:
+        """
+        Materializes the codebase at `target`.
+
+        Returns:
+            Layout info: mode used, whether it must be mounted read-only
+            and, for overlayfs, the layer directories
+        """
+        if not self.manifest:
+            self.build_manifest()
+        modes = self.AUTO_MODES if self.mode == "auto" else (self.mode, "copy")
+        for mode in modes:
+            try:
+                if mode == "overlay":
+                    return self._mount_overlay(sandbox_id, target)
+                return self._farm(target, mode)
+            except OSError as e:
+                logger.info(f"Sandbox provisioning via {mode} unavailable: {e}")
+                self._reset(target)
+        raise RuntimeError(f"Could not provision sandbox {sandbox_id}")
+
+    @classmethod
+    def mount_mode(cls, layout: Dict) -> str:
+        """Docker volume mode for a layout: "ro" when its files are the live tree's"""
+        return "ro" if layout.get("mode") in cls.SHARED_INODE_MODES else "rw"
+
+    def _reset(self, target: Path):
+        shutil.rmtree(target, ignore_errors=True)
+        target.mkdir(parents=True, exist_ok=True)
+
+    def _generation(self) -> str:
+        digest = hashlib.sha256(json.dumps(self.manifest, sort_keys=True).encode("utf-8"))
+        return digest.hexdigest()[:16]
+
+    def _base_layer(self, sandbox_id: str) -> Path:
+        """
+        Filtered read-only lower layer for the current manifest
+
+        Holds only manifest files (CODEBASE_IGNORE applied), linked or
+        cloned from the source; overlayfs never writes to a lower layer,
+        so sharing inodes here is safe. Built once per manifest generation.
+        """
+        generation = self._generation()
+        layer = self.layers_root / generation
+        if not layer.exists():
+            building = self.layers_root / f".{generation}.{sandbox_id}"
+            shutil.rmtree(building, ignore_errors=True)
+            building.mkdir(parents=True)
+            try:
+                for rel in self.manifest:
+                    src, dst = self.source / rel, building / rel
+                    dst.parent.mkdir(parents=True, exist_ok=True)
+                    try:
+                        os.link(src, dst)
+                    except OSError:
+                        shutil.copy2(src, dst)
+                os.rename(building, layer)
+            except OSError:
+                shutil.rmtree(building, ignore_errors=True)
+                if not layer.exists():
+                    raise
+        self._layer_users.setdefault(generation, set()).add(sandbox_id)
+        self._prune_layers(keep=generation)
+        return layer
+
+    def _prune_layers(self, keep: str):
+        """Removes base layers of older manifests no sandbox still mounts"""
+        if not self.layers_root.exists():
+            return
+        for path in self.layers_root.iterdir():
+            if path.name.startswith(".") or path.name == keep or self._layer_users.get(path.name):
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            self._layer_users.pop(path.name, None)
+
+    def _mount_overlay(self, sandbox_id: str, target: Path) -> Dict:
+        if not sys.platform.startswith("linux"):
+            raise OSError(errno.ENOTSUP, "overlayfs requires Linux")
+        lower = self._base_layer(sandbox_id)
+        # Upper/work must not overlap the lower dir
+        layers = Path(os.getenv("SANDBOX_LAYERS_DIR", tempfile.gettempdir())) / "lalo_sandbox_layers" / sandbox_id
+        upper, work = layers / "upper", layers / "work"
+        upper.mkdir(parents=True, exist_ok=True)
+        work.mkdir(parents=True, exist_ok=True)
+        result = subprocess.run(
+            ["mount", "-t", "overlay", "overlay",
+             "-o", f"lowerdir={lower},upperdir={upper},workdir={work}", str(target)],
+            capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            shutil.rmtree(layers, ignore_errors=True)
+            self._release_layer(sandbox_id)
+            raise OSError(errno.EPERM, result.stderr.strip() or "mount failed")
+        return {"mode": "overlay", "layers": layers, "upper": upper, "lower": lower}
+
+    def _farm(self, target: Path, mode: str) -> Dict:
+        """Recreates the tree with cloned, linked or copied files"""
+        for rel in self.manifest:
+            src = self.source / rel
+            dst = target / rel
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            if mode == "reflink":
+                self._reflink(src, dst)
+            elif mode == "hardlink":
+                # Shares the inode with the live tree: the container gets it read-only
+                os.link(src, dst)
+            else:
+                shutil.copy2(src, dst)
+        return {"mode": mode}
+
+    @staticmethod
+    def _reflink(src: Path, dst: Path):
+        import fcntl
+
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+        shutil.copystat(src, dst)
+
+    def changed_files(self, sandbox_path: Path, layout: Dict) -> List[str]:
+        """Lists files added, modified or deleted relative to the base manifest"""
+        if layout.get("mode") == "overlay":
+            return self._changed_in_upper(layout["upper"])
+
+        changed = []
+        seen = set()
+        for rel, st in self._walk(sandbox_path):
+            seen.add(rel)
+            entry = self.manifest.get(rel)
+            if entry is None:
+                changed.append(rel)
+            elif entry["size"] != st.st_size:
+                changed.append(rel)
+            elif entry["mtime_ns"] != st.st_mtime_ns and self._hash(sandbox_path / rel) != entry["sha256"]:
+                changed.append(rel)
+        changed.extend(rel for rel in self.manifest if rel not in seen)
+        return changed
+
+    def _changed_in_upper(self, upper: Path) -> List[str]:
+        """Everything in the upper layer was written (or whited out) by the sandbox"""
+        changed = []
+        for rel, st in self._walk(upper):
+            entry = self.manifest.get(rel)
+            if entry and entry["size"] == st.st_size and self._hash(upper / rel) == entry["sha256"]:
+                continue  # copied up but rewritten with identical content
+            changed.append(rel)
+        for root, _dirs, files in os.walk(upper):
+            for name in files:
+                path = Path(root) / name
+                st = path.lstat()
+                # overlayfs records deletions as 0/0 character devices
+                if not path.is_file() and os.major(st.st_rdev) == 0 and os.minor(st.st_rdev) == 0:
+                    changed.append(path.relative_to(upper).as_posix())
+        return changed
+
+    def _release_layer(self, sandbox_id: str):
+        for users in self._layer_users.values():
+            users.discard(sandbox_id)
+
+    def release(self, target: Path, layout: Dict, sandbox_id: str = ""):
+        """Unmounts overlay layers; farm trees are removed with the sandbox directory"""
+        if layout.get("mode") == "overlay":
+            subprocess.run(["umount", str(target)], capture_output=True)
+            shutil.rmtree(layout["layers"], ignore_errors=True)
+            self._release_layer(sandbox_id or Path(layout["layers"]).name)
@@ -0,0 +1,384 @@
+"""
+Copyright (c) 2025 LALO AI SYSTEMS, LLC. All rights reserved.
+
+PROPRIETARY AND CONFIDENTIAL
+
+This file is part of LALO AI Platform and is protected by copyright law.
+Unauthorized copying, modification, distribution, or use of this software,
+via any medium, is strictly prohibited without the express written permission
+of LALO AI SYSTEMS, LLC.
+"""
+
+"""
+LALO MCP Transport Benchmark
+
+Sends MCP packets through mcp_packet.py against a local fake Redis server
+(RESP over TCP, answers XADD) and a real gRPC server implementing
+proto/mcp.proto, and compares:
+- per-packet: a new transport manager (Redis pool + gRPC channel) for every
+  packet, which is what MCPPacket did before transports were shared
+- shared: one transport manager, packet.send() per packet
+- batch: one transport manager, send_batch() (pipelined XADDs)
+Large packets compare one unary SendPacket per packet on a new channel
+with the shared channel's client-streaming StreamPacket.
+
+Both fake servers wait --rtt-ms before every reply they write, so round
+trips cost what they would on a network. The Redis server counts
+connections, XADDs and reply writes: one per client round trip, or a few
+when a pipeline spans several socket reads.
+
+The tree has no mcp_packet config module or generated proto code, so the
+harness compiles proto/mcp.proto into a temporary directory and loads
+mcp_packet with the settings below. Needs redis, grpcio and grpcio-tools.
+
+Usage:
+    python scripts/benchmark_mcp_transport.py [--packets N] [--large-packets N] [--rtt-ms MS] [--json]
+
+Examples:
+    python scripts/benchmark_mcp_transport.py
+    python scripts/benchmark_mcp_transport.py --packets 5000 --rtt-ms 0.5
+"""
+
+import argparse
+import importlib
+import importlib.util
+import json
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+import types
+from concurrent import futures
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+PACKAGE = "lalo_mcp_bench"
+
+DEFAULT_SETTINGS = {
+    "REDIS_HOST": "127.0.0.1",
+    "REDIS_PORT": 0,
+    "GRPC_ENDPOINT": "",
+    "PAYLOAD_SIZE_THRESHOLD": 64 * 1024,
+    "MAX_FRAGMENT_SIZE": 64 * 1024,
+    "REDIS_PIPELINE_BATCH": 128,
+    "REDIS_MAX_CONNECTIONS": 32,
+}
+
+
+def load_mcp_packet(settings: Dict[str, Any], proto_out: Optional[str] = None):
+    """
+    Compile proto/mcp.proto and import mcp_packet with `settings`
+
+    Args:
+        settings: Values for mcp_packet's `settings` (REDIS_HOST, ...)
+        proto_out: Directory for the generated modules (a new temporary one when omitted)
+
+    Returns:
+        (mcp_packet module, mcp_pb2, mcp_pb2_grpc)
+    """
+    from grpc_tools import protoc
+
+    proto_out = proto_out or tempfile.mkdtemp(prefix="mcp_proto_")
+    code = protoc.main([
+        "grpc_tools.protoc", f"-I{ROOT / 'proto'}", f"--python_out={proto_out}",
+        f"--grpc_python_out={proto_out}", str(ROOT / "proto" / "mcp.proto"),
+    ])
+    if code != 0:
+        raise RuntimeError(f"protoc failed with exit code {code}")
+    # mcp_pb2_grpc does a top-level "import mcp_pb2"
+    mcp_pb2 = _load_file("mcp_pb2", Path(proto_out) / "mcp_pb2.py")
+    mcp_pb2_grpc = _load_file("mcp_pb2_grpc", Path(proto_out) / "mcp_pb2_grpc.py")
+
+    for name in [m for m in sys.modules if m == PACKAGE or m.startswith(f"{PACKAGE}.")]:
+        del sys.modules[name]
+    package = types.ModuleType(PACKAGE)
+    package.__path__ = [str(ROOT)]
+    config = types.ModuleType(f"{PACKAGE}.config")
+    config.settings = types.SimpleNamespace(**{**DEFAULT_SETTINGS, **settings})
+    sys.modules[PACKAGE] = package
+    sys.modules[f"{PACKAGE}.config"] = config
+    sys.modules[f"{PACKAGE}.proto"] = types.ModuleType(f"{PACKAGE}.proto")
+    sys.modules[f"{PACKAGE}.proto.mcp_pb2"] = mcp_pb2
+    sys.modules[f"{PACKAGE}.proto.mcp_pb2_grpc"] = mcp_pb2_grpc
+    return importlib.import_module(f"{PACKAGE}.mcp_packet"), mcp_pb2, mcp_pb2_grpc
+
+
+def _load_file(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+class _RESPHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        server: FakeRedisServer = self.server.owner
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        buffer = bytearray()
+        while True:
+            data = self.request.recv(65536)
+            if not data:
+                return
+            buffer += data
+            commands, consumed = _parse_commands(buffer)
+            if not commands:
+                continue
+            del buffer[:consumed]
+            replies = b"".join(server.execute(command) for command in commands)
+            server.count("reply_writes")
+            if server.rtt:
+                time.sleep(server.rtt)
+            self.request.sendall(replies)
+
+
+def _parse_commands(buffer: bytearray):
+    """Complete RESP command arrays at the start of `buffer`, and the bytes they span"""
+    commands, pos = [], 0
+    while pos < len(buffer):
+        end = buffer.find(b"\r\n", pos)
+        if end < 0:
+            break
+        args, cursor = [], end + 2
+        for _ in range(int(buffer[pos + 1:end])):
+            end = buffer.find(b"\r\n", cursor)
+            if end < 0:
+                return commands, pos
+            start = end + 2
+            stop = start + int(buffer[cursor + 1:end])
+            if len(buffer) < stop + 2:
+                return commands, pos
+            args.append(bytes(buffer[start:stop]))
+            cursor = stop + 2
+        commands.append(args)
+        pos = cursor
+    return commands, pos
+
+
+class FakeRedisServer:
+    """
+    Threaded RESP server that stores XADDed entries, accepts HELLO and answers
+    +OK to anything else; once `xadd_limit` entries are stored, further XADDs
+    get an error reply
+    """
+
+    def __init__(self, rtt: float = 0.0, xadd_limit: Optional[int] = None):
+        self.rtt = rtt
+        self.xadd_limit = xadd_limit
+        self.entries: Dict[bytes, List[Dict[bytes, bytes]]] = {}
+        self.stats: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _RESPHandler)
+        self._server.daemon_threads = True
+        self._server.owner = self
+        self.port = self._server.server_address[1]
+
+    def count(self, key: str, n: int = 1):
+        with self._lock:
+            self.stats[key] = self.stats.get(key, 0) + n
+
+    def execute(self, command: List[bytes]) -> bytes:
+        name = command[0].upper()
+        if name == b"XADD":
+            fields = dict(zip(command[3::2], command[4::2]))
+            with self._lock:
+                stream = self.entries.setdefault(command[1], [])
+                if self.xadd_limit is not None and len(stream) >= self.xadd_limit:
+                    return b"-ERR stream is full\r\n"
+                stream.append(fields)
+                entry_id = f"{int(time.time() * 1000)}-{len(stream)}".encode()
+            self.count("xadd")
+            return b"$%d\r\n%s\r\n" % (len(entry_id), entry_id)
+        if name == b"HELLO":
+            # redis-py negotiates RESP3 on connect
+            self.count("connections")
+            return b"%3\r\n+server\r\n+redis\r\n+version\r\n+7.2.0\r\n+proto\r\n:3\r\n"
+        return b"+OK\r\n"
+
+    def reset(self):
+        with self._lock:
+            self.entries.clear()
+            self.stats.clear()
+
+    def start(self) -> "FakeRedisServer":
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class FakeMcpServer:
+    """grpc server for McpService that counts calls and reassembles fragments"""
+
+    def __init__(self, mcp_pb2, mcp_pb2_grpc, rtt: float = 0.0):
+        import grpc
+
+        self.rtt = rtt
+        self.packets: List[bytes] = []
+        self.stats: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        fake = self
+
+        class Servicer(mcp_pb2_grpc.McpServiceServicer):
+            def SendPacket(self, request, context):
+                fake._received("send_packet", request.packet_json.encode("utf-8"))
+                return mcp_pb2.McpAck(success=True)
+
+            def StreamPacket(self, request_iterator, context):
+                fragments = {f.fragment_index: f for f in request_iterator}
+                total = next(iter(fragments.values())).total_fragments if fragments else 0
+                complete = bool(fragments) and sorted(fragments) == list(range(total))
+                if complete:
+                    fake._received("stream_packet", b"".join(fragments[i].data for i in range(total)))
+                return mcp_pb2.McpAck(success=complete)
+
+        options = [("grpc.max_receive_message_length", 64 * 1024 * 1024)]
+        self._server = grpc.server(futures.ThreadPoolExecutor(max_workers=8), options=options)
+        mcp_pb2_grpc.add_McpServiceServicer_to_server(Servicer(), self._server)
+        self.port = self._server.add_insecure_port("127.0.0.1:0")
+
+    def _received(self, call: str, packet: bytes):
+        if self.rtt:
+            time.sleep(self.rtt)
+        with self._lock:
+            self.packets.append(packet)
+            self.stats[call] = self.stats.get(call, 0) + 1
+
+    def reset(self):
+        with self._lock:
+            self.packets.clear()
+            self.stats.clear()
+
+    def start(self) -> "FakeMcpServer":
+        self._server.start()
+        return self
+
+    def stop(self):
+        self._server.stop(grace=None)
+
+
+def _packets(mcp_packet, count: int, payload_bytes: int, transports=None):
+    return [
+        mcp_packet.MCPPacket(
+            agent_id="agent-1", step_id=f"step-{i}", tool="bench",
+            payload={"i": i, "data": "x" * payload_bytes}, memory_pointer=f"mem:{i}",
+            transports=transports,
+        )
+        for i in range(count)
+    ]
+
+
+def _timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def run(packets: int = 1000, large_packets: int = 20, rtt_ms: float = 0.2, payload_bytes: int = 256,
+        large_payload_bytes: int = 1024 * 1024) -> Dict[str, Any]:
+    """
+    Run all scenarios against fresh fake servers
+
+    Returns:
+        {"settings", "small": [...], "large": [...]}, one row per scenario with
+        seconds, packets/s and what the servers counted
+    """
+    rtt = rtt_ms / 1000
+    redis_server = FakeRedisServer(rtt).start()
+    _, mcp_pb2, mcp_pb2_grpc = load_mcp_packet({})
+    grpc_server = FakeMcpServer(mcp_pb2, mcp_pb2_grpc, rtt).start()
+    settings = {"REDIS_PORT": redis_server.port, "GRPC_ENDPOINT": f"127.0.0.1:{grpc_server.port}"}
+    mcp_packet, _, _ = load_mcp_packet(settings)
+    Manager = mcp_packet.MCPTransportManager
+
+    def row(name: str, count: int, fn) -> Dict[str, Any]:
+        redis_server.reset()
+        grpc_server.reset()
+        seconds = _timed(fn)
+        return {
+            "scenario": name,
+            "packets": count,
+            "seconds": round(seconds, 4),
+            "packets_per_s": round(count / seconds, 1),
+            "redis": dict(redis_server.stats),
+            "grpc": dict(grpc_server.stats),
+        }
+
+    def per_packet_send(batch):
+        for packet in batch:
+            packet.transports = Manager()
+            packet.send()
+            packet.transports.close()
+
+    def per_packet_unary(batch):
+        for packet in batch:
+            transports = Manager()
+            transports.send_grpc(packet.to_json())
+            transports.close()
+
+    try:
+        shared = Manager()
+        small = [
+            row("per-packet", packets, lambda: per_packet_send(_packets(mcp_packet, packets, payload_bytes))),
+            row("shared", packets, lambda: [p.send() for p in _packets(mcp_packet, packets, payload_bytes, shared)]),
+            row("batch", packets, lambda: mcp_packet.send_batch(_packets(mcp_packet, packets, payload_bytes, shared))),
+        ]
+        large = [
+            row("per-packet unary", large_packets,
+                lambda: per_packet_unary(_packets(mcp_packet, large_packets, large_payload_bytes))),
+            row("shared stream", large_packets,
+                lambda: [p.send() for p in _packets(mcp_packet, large_packets, large_payload_bytes, shared)]),
+        ]
+        shared.close()
+    finally:
+        grpc_server.stop()
+        redis_server.stop()
+
+    return {
+        "settings": {
+            "rtt_ms": rtt_ms,
+            "payload_bytes": payload_bytes,
+            "large_payload_bytes": large_payload_bytes,
+            **{k: v for k, v in DEFAULT_SETTINGS.items() if k not in ("REDIS_HOST", "REDIS_PORT", "GRPC_ENDPOINT")},
+        },
+        "small": small,
+        "large": large,
+    }
+
+
+def _print_table(rows: List[Dict[str, Any]]):
+    print(f"{'scenario':<18} {'packets':>8} {'seconds':>9} {'pkt/s':>10}  server counts")
+    for r in rows:
+        counts = ", ".join(f"{k}={v}" for k, v in {**r["redis"], **r["grpc"]}.items())
+        print(f"{r['scenario']:<18} {r['packets']:>8} {r['seconds']:>9} {r['packets_per_s']:>10}  {counts}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark MCP packet transports against local fakes")
+    parser.add_argument("--packets", type=int, default=1000, help="Small (Redis-bound) packets per scenario")
+    parser.add_argument("--large-packets", type=int, default=20, help="Large (gRPC-bound) packets per scenario")
+    parser.add_argument("--rtt-ms", type=float, default=0.2, help="Delay the fake servers add before each reply")
+    parser.add_argument("--payload-bytes", type=int, default=256)
+    parser.add_argument("--large-payload-bytes", type=int, default=1024 * 1024)
+    parser.add_argument("--json", action="store_true", help="Print the raw results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.packets, args.large_packets, args.rtt_ms, args.payload_bytes, args.large_payload_bytes)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+    print(f"Settings: {json.dumps(results['settings'])}")
+    print("\nSmall packets (Redis stream)")
+    _print_table(results["small"])
+    print("\nLarge packets (gRPC)")
+    _print_table(results["large"])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
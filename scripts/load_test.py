@@ -0,0 +1,174 @@
+"""
+Copyright (c) 2025 LALO AI SYSTEMS, LLC. All rights reserved.
+
+PROPRIETARY AND CONFIDENTIAL
+
+This file is part of LALO AI Platform and is protected by copyright law.
+Unauthorized copying, modification, distribution, or use of this software,
+via any medium, is strictly prohibited without the express written permission
+of LALO AI SYSTEMS, LLC.
+"""
+
+"""
+LALO Microservice Load Test
+
+Drives one of the demo microservices at a fixed concurrency and reports
+throughput and latency percentiles (p50/p95/p99).
+
+Usage:
+    python scripts/load_test.py SERVICE [--requests N] [--concurrency C] [--base-url URL] [--in-process]
+
+Examples:
+    python scripts/load_test.py rti --concurrency 50 --requests 500
+    python scripts/load_test.py workday --in-process --concurrency 20   # no server needed
+    python scripts/load_test.py all --in-process
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import math
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# name -> app module, default URL, request
+SERVICES: Dict[str, Dict[str, Any]] = {
+    "rti": {
+        "module": "rtinterpreter/main.py",
+        "base_url": "http://localhost:8101",
+        "method": "POST",
+        "path": "/interpret",
+        "json": {"user_input": "Run a Q2 report for high margin shoes"},
+    },
+    "creation": {
+        "module": "creation/main.py",
+        "base_url": "http://localhost:8103",
+        "method": "POST",
+        "path": "/creation/generate",
+        "json": {"type": "connector", "description": "demo", "task_spec": "fetch orders"},
+    },
+    "s4": {
+        "module": "connectors/mock_s4/mock_s4.py",
+        "base_url": "http://localhost:8201",
+        "method": "GET",
+        "path": "/production_report?year=2025&quarter=2",
+    },
+    "workday": {
+        "module": "connectors/mock_workday/mock_workday.py",
+        "base_url": "http://localhost:8202",
+        "method": "GET",
+        "path": "/employee_list?department=Production",
+    },
+    "sharepoint": {
+        "module": "connectors/mock_sharepoint/mock_sharepoint.py",
+        "base_url": "http://localhost:8203",
+        "method": "GET",
+        "path": "/fetch_document?folder=Marketing&filename=template.docx",
+    },
+}
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100.0 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def load_app(module_path: str) -> Any:
+    """Import a service's FastAPI app from its file path."""
+    path = ROOT / module_path
+    spec = importlib.util.spec_from_file_location(f"loadtest_{path.stem}_{path.parent.name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.app
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    method: str,
+    path: str,
+    payload: Optional[Dict[str, Any]] = None,
+    requests: int = 200,
+    concurrency: int = 20,
+) -> Dict[str, Any]:
+    """Issue `requests` calls with at most `concurrency` in flight.
+
+    Returns:
+        Dict with throughput (req/s), latency percentiles in ms and error count
+    """
+    latencies: List[float] = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=payload)
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append((time.perf_counter() - started) * 1000.0)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(requests / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50), 2),
+            "p95": round(percentile(latencies, 95), 2),
+            "p99": round(percentile(latencies, 99), 2),
+            "max": round(latencies[-1], 2) if latencies else 0.0,
+        },
+    }
+
+
+async def run_service(name: str, requests: int, concurrency: int, base_url: Optional[str], in_process: bool) -> Dict[str, Any]:
+    spec = SERVICES[name]
+    if in_process:
+        transport = httpx.ASGITransport(app=load_app(spec["module"]))
+        client = httpx.AsyncClient(transport=transport, base_url="http://loadtest")
+    else:
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        client = httpx.AsyncClient(base_url=base_url or spec["base_url"], limits=limits, timeout=60.0)
+
+    async with client:
+        result = await run_load(client, spec["method"], spec["path"], spec.get("json"), requests, concurrency)
+    return {"service": name, **result}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test LALO microservices")
+    parser.add_argument("service", choices=sorted(SERVICES) + ["all"])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--base-url", default=None, help="Override the service URL")
+    parser.add_argument("--in-process", action="store_true", help="Drive the ASGI app directly instead of over HTTP")
+    args = parser.parse_args()
+
+    names = sorted(SERVICES) if args.service == "all" else [args.service]
+    for name in names:
+        result = asyncio.run(run_service(name, args.requests, args.concurrency, args.base_url, args.in_process))
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""
+Copyright (c) 2025 LALO AI SYSTEMS, LLC. All rights reserved.
+
+PROPRIETARY AND CONFIDENTIAL
+
+This file is part of LALO AI Platform and is protected by copyright law.
+Unauthorized copying, modification, distribution, or use of this software,
+via any medium, is strictly prohibited without the express written permission
+of LALO AI SYSTEMS, LLC.
+"""
+
+"""
+LALO Model Memory Measurement
+
+Starts N worker processes that each load the same model the way an API
+worker does, then reports RSS, PSS and USS per worker. With mmap'd
+weights the model pages are shared through the page cache: RSS still
+counts them in every worker, but PSS/USS show each worker's real share.
+
+Modes:
+- baseline: Llama() with only the arguments the loader passed before it
+  set memory options. llama-cpp-python defaults to use_mmap=True, so this
+  was already mmap'd; expect it to match "mmap"
+- mmap: the current loader (explicit use_mmap=True)
+- private: use_mmap=False, weights read into each worker's own memory
+
+Usage:
+    python scripts/measure_model_memory.py (--model NAME | --gguf PATH | --simulate-mb N) [--workers N] [--mode baseline|mmap|private|all]
+
+Examples:
+    python scripts/measure_model_memory.py --model tinyllama --workers 4
+    python scripts/measure_model_memory.py --gguf ./models/tiny.gguf --workers 4
+    python scripts/measure_model_memory.py --simulate-mb 512 --workers 4   # no llama.cpp; mmap vs private only
+"""
+
+import argparse
+import json
+import mmap
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+import psutil
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+PAGE = 4096
+
+
+def _load_simulated(path: str, mode: str):
+    """Stand-in for Llama(): mmap and touch every page, or read into private memory"""
+    with open(path, "rb") as f:
+        if mode in ("baseline", "mmap"):
+            weights = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            weights = bytearray(f.read())
+    # Touch every page, as a forward pass over all layers would
+    sum(weights[i] for i in range(0, len(weights), PAGE))
+    return weights
+
+
+def _load_gguf(path: str, mode: str, n_ctx: int = 512):
+    from llama_cpp import Llama
+    if mode == "baseline":
+        # The loader's call before memory options: library defaults apply
+        llama = Llama(model_path=path, n_ctx=n_ctx, verbose=False)
+    else:
+        llama = Llama(model_path=path, n_ctx=n_ctx, use_mmap=mode == "mmap", verbose=False)
+    # One short completion pages the weights in
+    llama("Hello", max_tokens=1)
+    return llama
+
+
+def _load_llama(model_name: str, mode: str):
+    from core.services.local_llm_service import LocalInferenceServer
+    server = LocalInferenceServer()
+    config = server.model_configs[model_name]
+    if mode == "baseline":
+        return _load_gguf(os.path.join(server.model_dir, config["path"]), mode, config["n_ctx"])
+    config["use_mmap"] = mode == "mmap"
+    if not server.load_model(model_name):
+        raise RuntimeError(f"Could not load {model_name}")
+    server.models[model_name]("Hello", max_tokens=1)
+    return server
+
+
+def _worker(target: str, source: str, mode: str, loaded, done, results):
+    loaders = {"simulate": _load_simulated, "gguf": _load_gguf, "model": _load_llama}
+    handle = loaders[source](target, mode)
+    loaded.wait()  # measure only once every worker holds the model
+    mem = psutil.Process().memory_full_info()
+    results.put({"pid": os.getpid(), "rss": mem.rss, "pss": getattr(mem, "pss", 0), "uss": mem.uss})
+    done.wait()
+    del handle
+
+
+def measure(target: str, source: str, mode: str, workers: int) -> Dict:
+    ctx = mp.get_context("spawn")
+    loaded = ctx.Barrier(workers + 1)
+    done = ctx.Event()
+    results = ctx.Queue()
+    procs = [ctx.Process(target=_worker, args=(target, source, mode, loaded, done, results)) for _ in range(workers)]
+    for proc in procs:
+        proc.start()
+    loaded.wait()
+    rows: List[Dict] = [results.get(timeout=600) for _ in procs]
+    done.set()
+    for proc in procs:
+        proc.join()
+
+    mb = 1024 * 1024
+    return {
+        "mode": mode,
+        "workers": workers,
+        "per_worker_mb": [
+            {"rss": round(r["rss"] / mb, 1), "pss": round(r["pss"] / mb, 1), "uss": round(r["uss"] / mb, 1)}
+            for r in rows
+        ],
+        "total_rss_mb": round(sum(r["rss"] for r in rows) / mb, 1),
+        "total_pss_mb": round(sum(r["pss"] for r in rows) / mb, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure per-worker memory of a loaded model")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--model", help="Model name from LocalInferenceServer.model_configs")
+    source.add_argument("--gguf", help="Load this GGUF file directly")
+    source.add_argument("--simulate-mb", type=int, help="Use a synthetic weights file of this size instead")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--mode", choices=["baseline", "mmap", "private", "all"], default="all")
+    args = parser.parse_args()
+
+    blob = None
+    if args.simulate_mb:
+        fd, blob = tempfile.mkstemp(suffix=".gguf")
+        with os.fdopen(fd, "wb") as f:
+            for _ in range(args.simulate_mb):
+                f.write(os.urandom(1024 * 1024))
+    target = blob or args.gguf or args.model
+    source = "simulate" if blob else "gguf" if args.gguf else "model"
+
+    try:
+        if args.mode != "all":
+            modes = [args.mode]
+        else:
+            # A simulated file has no library defaults; its baseline is mmap
+            modes = ["private", "mmap"] if blob else ["baseline", "private", "mmap"]
+        for mode in modes:
+            print(json.dumps(measure(target, source, mode, args.workers)))
+    finally:
+        if blob:
+            os.remove(blob)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
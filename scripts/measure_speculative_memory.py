@@ -0,0 +1,117 @@
+"""
+Copyright (c) 2025 LALO AI SYSTEMS, LLC. All rights reserved.
+
+PROPRIETARY AND CONFIDENTIAL
+
+This file is part of LALO AI Platform and is protected by copyright law.
+Unauthorized copying, modification, distribution, or use of this software,
+via any medium, is strictly prohibited without the express written permission
+of LALO AI SYSTEMS, LLC.
+"""
+
+"""
+LALO Speculative Decoding Memory Measurement
+
+Loads a model in a fresh process with and without logits_all (what
+Llama(draft_model=...) forces), fills the context and reports RSS/USS
+next to the size logits_buffer_bytes() predicts. llama-cpp-python keeps
+the n_ctx x n_vocab float32 scores array for the life of the model; its
+pages become resident as positions are evaluated and are not returned.
+
+Usage:
+    python scripts/measure_speculative_memory.py (--model NAME | --gguf PATH) [--n-ctx N] [--tokens N]
+
+Examples:
+    python scripts/measure_speculative_memory.py --model mistral-instruct
+    python scripts/measure_speculative_memory.py --gguf ./models/tiny.gguf --n-ctx 4096
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Optional
+
+import psutil
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+def _worker(model_path: str, n_ctx: int, tokens: Optional[int], logits_all: bool, results):
+    from llama_cpp import Llama
+
+    llama = Llama(model_path=model_path, n_ctx=n_ctx, n_batch=512, logits_all=logits_all, verbose=False)
+    baseline = psutil.Process().memory_full_info()
+    count = min(tokens or n_ctx - 8, n_ctx - 8)
+    vocab = llama.n_vocab()
+    # Ordinary token ids; their meaning does not matter for the buffer
+    llama.eval([(i % (vocab - 300)) + 260 for i in range(count)])
+    mem = psutil.Process().memory_full_info()
+    results.put({
+        "logits_all": logits_all,
+        "n_vocab": vocab,
+        "evaluated_tokens": count,
+        "rss_after_load": baseline.rss,
+        "rss": mem.rss,
+        "uss": mem.uss,
+    })
+
+
+def measure(model_path: str, n_ctx: int, tokens: Optional[int]) -> Dict:
+    from core.services.speculative_decoding import logits_buffer_bytes
+
+    ctx = mp.get_context("spawn")
+    rows = []
+    for logits_all in (False, True):
+        results = ctx.Queue()
+        proc = ctx.Process(target=_worker, args=(model_path, n_ctx, tokens, logits_all, results))
+        proc.start()
+        proc.join()
+        if proc.exitcode != 0:
+            raise RuntimeError(f"Measurement process failed (logits_all={logits_all}, exit code {proc.exitcode})")
+        rows.append(results.get(timeout=10))
+
+    mb = 1024 * 1024
+    plain, full = rows
+    return {
+        "model": os.path.basename(model_path),
+        "n_ctx": n_ctx,
+        "n_vocab": plain["n_vocab"],
+        "evaluated_tokens": plain["evaluated_tokens"],
+        "rss_mb": {"plain": round(plain["rss"] / mb, 1), "logits_all": round(full["rss"] / mb, 1)},
+        "uss_mb": {"plain": round(plain["uss"] / mb, 1), "logits_all": round(full["uss"] / mb, 1)},
+        "logits_all_extra_uss_mb": round((full["uss"] - plain["uss"]) / mb, 1),
+        "predicted_buffer_mb": round(logits_buffer_bytes(n_ctx, plain["n_vocab"]) / mb, 1),
+        "predicted_at_evaluated_tokens_mb": round(
+            logits_buffer_bytes(plain["evaluated_tokens"], plain["n_vocab"]) / mb, 1
+        ),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the memory cost of logits_all (speculative decoding)")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--model", help="Model name from LocalInferenceServer.model_configs")
+    source.add_argument("--gguf", help="Path to a GGUF file")
+    parser.add_argument("--n-ctx", type=int, help="Context length (default: the model's configured n_ctx, else 4096)")
+    parser.add_argument("--tokens", type=int, help="Tokens to evaluate (default: fill the context)")
+    args = parser.parse_args()
+
+    n_ctx = args.n_ctx or 4096
+    model_path = args.gguf
+    if args.model:
+        from core.services.local_llm_service import LocalInferenceServer
+
+        server = LocalInferenceServer()
+        config = server.model_configs[args.model]
+        model_path = os.path.join(server.model_dir, config["path"])
+        n_ctx = args.n_ctx or config["n_ctx"]
+
+    print(json.dumps(measure(model_path, n_ctx, args.tokens)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
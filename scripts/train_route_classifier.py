@@ -0,0 +1,96 @@
+"""
+Copyright (c) 2025 LALO AI SYSTEMS, LLC. All rights reserved.
+
+PROPRIETARY AND CONFIDENTIAL
+
+This file is part of LALO AI Platform and is protected by copyright law.
+Unauthorized copying, modification, distribution, or use of this software,
+via any medium, is strictly prohibited without the express written permission
+of LALO AI SYSTEMS, LLC.
+"""
+
+
+"""
+LALO Route Classifier Training
+
+Exports labelled routing examples from the request/feedback logs, trains
+the route classifier on a hash-based train split, evaluates it on the
+held-out split and stores it as the next version under
+ROUTE_CLASSIFIER_DIR (activated unless --no-activate). RouterModel loads
+the active version as its first-tier router.
+
+Usage:
+    python scripts/train_route_classifier.py [--examples FILE | --export FILE] [--eval-llm] [--report FILE]
+
+Examples:
+    python scripts/train_route_classifier.py --export data/routing_examples.jsonl
+    python scripts/train_route_classifier.py --examples data/routing_examples.jsonl --eval-llm --report data/routing_eval.md
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from core.services.route_classifier import RouteClassifierRegistry  # noqa: E402
+from core.services.route_training import (  # noqa: E402
+    evaluate_routers,
+    export_routing_examples,
+    format_report,
+    read_examples,
+    split_examples,
+    train_route_classifier,
+    write_examples,
+)
+from core.services.router_model import ROUTE_CLASSIFIER_MARGIN, router_model  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Train and evaluate the first-tier route classifier")
+    parser.add_argument("--examples", help="Train from this JSONL file instead of the database")
+    parser.add_argument("--export", help="Write the exported examples to this JSONL file")
+    parser.add_argument("--holdout", type=float, default=0.2, help="Share of examples held out for evaluation")
+    parser.add_argument("--min-examples", type=int, default=50, help="Refuse to train on fewer examples")
+    parser.add_argument("--margin", type=float, default=ROUTE_CLASSIFIER_MARGIN, help="Margin below which the LLM decides")
+    parser.add_argument("--eval-llm", action="store_true", help="Also route the held-out requests with the LLM router")
+    parser.add_argument("--report", help="Write the markdown report here (JSON next to it)")
+    parser.add_argument("--dir", help="Registry directory (default ROUTE_CLASSIFIER_DIR)")
+    parser.add_argument("--no-activate", action="store_true", help="Store the version without activating it")
+    args = parser.parse_args()
+
+    examples = read_examples(args.examples) if args.examples else export_routing_examples()
+    if args.export:
+        write_examples(examples, args.export)
+        print(f"Exported {len(examples)} examples to {args.export}")
+    if len(examples) < args.min_examples:
+        print(f"Only {len(examples)} labelled examples (need {args.min_examples}); not training")
+        return 1
+
+    train, holdout = split_examples(examples, args.holdout)
+    classifier = train_route_classifier(train, router_model)
+
+    async def _llm_route(request):
+        return await router_model.route(request, use_classifier=False)
+
+    llm_route = _llm_route if args.eval_llm else None
+
+    report = asyncio.run(evaluate_routers(holdout, classifier, router_model, args.margin, llm_route)) if holdout else {}
+    registry = RouteClassifierRegistry(args.dir)
+    version = registry.save(classifier, metrics=report, activate=not args.no_activate)
+    print(f"Saved route classifier v{version} to {registry.directory} ({len(train)} train / {len(holdout)} held out)")
+
+    if report:
+        text = format_report(report)
+        print(text)
+        if args.report:
+            Path(args.report).write_text(text, encoding="utf-8")
+            Path(args.report).with_suffix(".json").write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
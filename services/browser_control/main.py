@@ -11,10 +11,11 @@ of LALO AI SYSTEMS, LLC.
 
 from fastapi import FastAPI, WebSocket, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
+import json
 import logging
 from datetime import datetime
 import uuid
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from models import (
     BrowserAction,
@@ -22,6 +23,8 @@ from models import (
     NavigationResult,
     InteractionResult,
     AutomationResult,
+    BatchRunRequest,
+    BatchRunResult,
     TabInfo
 )
 from services.browser_manager import BrowserManager
@@ -54,12 +57,34 @@ async def websocket_endpoint(websocket: WebSocket, tab_id: str):
         await browser_manager.connect_websocket(tab_id, websocket)
         while True:
             data = await websocket.receive_json()
-            await browser_manager.handle_message(tab_id, data)
+            if data.get("type") == "batch_run":
+                await stream_batch_run(websocket, data)
+            else:
+                await browser_manager.handle_message(tab_id, data)
     except Exception as e:
         logger.error(f"WebSocket error: {str(e)}")
     finally:
         await browser_manager.disconnect_websocket(tab_id)
 
+async def stream_batch_run(websocket: WebSocket, message: dict):
+    """Run a script over many inputs, pushing each result as it finishes."""
+    script = await automation_engine.get_script(message.get("script_id", ""))
+    if not script:
+        await websocket.send_json({"type": "error", "error": "Script not found"})
+        return
+
+    async def send_result(result: AutomationResult):
+        await websocket.send_json({"type": "automation_result", "result": json.loads(result.json())})
+
+    batch = await automation_engine.run_batch(
+        script,
+        message.get("inputs") or [],
+        concurrency=message.get("concurrency"),
+        on_result=send_result
+    )
+    summary = json.loads(batch.json(exclude={"results"}))
+    await websocket.send_json({"type": "batch_complete", "summary": summary})
+
 @app.post("/browser/navigate", response_model=NavigationResult)
 async def navigate(
     url: str,
@@ -116,6 +141,20 @@ async def run_script(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/automation/run/{script_id}/batch", response_model=BatchRunResult)
+async def run_script_batch(
+    script_id: str,
+    request: BatchRunRequest,
+    current_user: str = Depends(get_current_user)
+) -> BatchRunResult:
+    script = await automation_engine.get_script(script_id)
+    if not script:
+        raise HTTPException(status_code=404, detail="Script not found")
+    try:
+        return await automation_engine.run_batch(script, request.inputs, concurrency=request.concurrency)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get("/browser/tabs", response_model=List[TabInfo])
 async def list_tabs(
     current_user: str = Depends(get_current_user)
@@ -124,3 +163,13 @@ async def list_tabs(
         return await browser_manager.list_tabs()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/browser/pool", response_model=Dict[str, Any])
+async def pool_stats(
+    current_user: str = Depends(get_current_user)
+) -> Dict[str, Any]:
+    return browser_manager.get_pool_stats()
+
+@app.on_event("shutdown")
+async def shutdown_pool():
+    await browser_manager.pool.shutdown()
@@ -9,7 +9,7 @@ via any medium, is strictly prohibited without the express written permission
 of LALO AI SYSTEMS, LLC.
 """
 
-from typing import Optional, List
+from typing import Any, Dict, Optional, List, Union
 from pydantic import BaseModel
 from datetime import datetime
 
@@ -17,6 +17,7 @@ class BrowserAction(BaseModel):
     type: str
     selector: str
     value: Optional[str] = None
+    url: Optional[str] = None
     timeout: Optional[int] = 30
     wait_for: Optional[str] = None
 
@@ -35,23 +36,42 @@ class NavigationResult(BaseModel):
     success: bool
     url: str
     status: str
+    tab_id: Optional[str] = None
+    start_time: Optional[datetime] = None
+    end_time: Optional[datetime] = None
     errors: Optional[List[str]] = None
 
 class InteractionResult(BaseModel):
     success: bool
     action: str
     selector: str
+    tab_id: Optional[str] = None
     result: Optional[dict] = None
     errors: Optional[List[str]] = None
 
 class AutomationResult(BaseModel):
     success: bool
     script_id: str
-    results: List[InteractionResult]
+    results: List[Union[InteractionResult, NavigationResult]]
     start_time: datetime
     end_time: datetime
+    input_index: Optional[int] = None
     errors: Optional[List[str]] = None
 
+class BatchRunRequest(BaseModel):
+    inputs: List[Dict[str, Any]]
+    concurrency: Optional[int] = None
+
+class BatchRunResult(BaseModel):
+    script_id: str
+    total: int
+    succeeded: int
+    failed: int
+    concurrency: int
+    results: List[AutomationResult]
+    start_time: datetime
+    end_time: datetime
+
 class TabInfo(BaseModel):
     id: str
     url: str
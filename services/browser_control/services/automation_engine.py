@@ -9,44 +9,115 @@ via any medium, is strictly prohibited without the express written permission
 of LALO AI SYSTEMS, LLC.
 """
 
+import asyncio
+import json
 import logging
-from typing import Dict, Optional
+import os
+import re
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 from datetime import datetime
 
 from models import (
     AutomationScript,
     AutomationResult,
+    BatchRunResult,
     BrowserAction
 )
 from .browser_manager import BrowserManager
 
 logger = logging.getLogger(__name__)
 
+_PLACEHOLDER_RE = re.compile(r"\{(\w+)\}")
+
+
+def _substitute(value: Optional[str], inputs: Dict[str, Any]) -> Optional[str]:
+    """Replace {name} placeholders with run inputs; unknown names are left as-is."""
+    if not value or not inputs:
+        return value
+    return _PLACEHOLDER_RE.sub(lambda m: str(inputs.get(m.group(1), m.group(0))), value)
+
+
 class AutomationEngine:
-    def __init__(self, browser_manager: BrowserManager):
+    def __init__(self, browser_manager: BrowserManager, scripts_dir: Optional[str] = None):
         self.browser_manager = browser_manager
+        self.scripts_dir = scripts_dir or os.getenv("AUTOMATION_SCRIPTS_DIR", "./data/automation_scripts")
+        self.max_concurrency = int(os.getenv("AUTOMATION_MAX_CONCURRENCY", "4"))
         self.scripts: Dict[str, AutomationScript] = {}
-        
+        self._load_scripts()
+
+    def _script_path(self, script_id: str) -> str:
+        # ids are generated server-side, but never let one escape the directory
+        return os.path.join(self.scripts_dir, f"{os.path.basename(script_id)}.json")
+
+    def _load_scripts(self):
+        """Load persisted scripts so they survive restarts."""
+        if not os.path.isdir(self.scripts_dir):
+            return
+        for name in os.listdir(self.scripts_dir):
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.scripts_dir, name), "r", encoding="utf-8") as f:
+                    script = AutomationScript(**json.load(f))
+                self.scripts[script.id] = script
+            except Exception as e:
+                logger.error(f"Failed to load automation script {name}: {str(e)}")
+
+    def _persist(self, script: AutomationScript):
+        os.makedirs(self.scripts_dir, exist_ok=True)
+        path = self._script_path(script.id)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(script.json())
+        os.replace(tmp_path, path)
+
     async def save_script(self, script: AutomationScript) -> AutomationScript:
         """Save an automation script."""
         self.scripts[script.id] = script
+        await asyncio.to_thread(self._persist, script)
         return script
-        
+
     async def get_script(self, script_id: str) -> Optional[AutomationScript]:
         """Retrieve an automation script by ID."""
         return self.scripts.get(script_id)
-        
-    async def run_script(self, script: AutomationScript) -> AutomationResult:
-        """Execute an automation script."""
+
+    async def run_script(
+        self,
+        script: AutomationScript,
+        inputs: Optional[Dict[str, Any]] = None,
+        input_index: Optional[int] = None
+    ) -> AutomationResult:
+        """Execute an automation script in its own tab.
+
+        Args:
+            script: Script to run
+            inputs: Values for {placeholders} in action urls/selectors/values.
+                An "url" input opens that page first when the script has no
+                navigation action of its own.
+            input_index: Position of inputs within a batch, echoed in the result
+
+        Returns:
+            AutomationResult for this run
+        """
+        inputs = inputs or {}
         start_time = datetime.utcnow()
         tab_id = None
         results = []
         success = True
         error = None
-        
+
         try:
+            actions = list(script.actions)
+            if inputs.get("url") and not any(a.type == "navigation" for a in actions):
+                actions.insert(0, BrowserAction(type="navigation", selector="", url=inputs["url"]))
+
             # Execute each action in sequence
-            for action in script.actions:
+            for action in actions:
+                action = action.copy(update={
+                    "url": _substitute(action.url, inputs),
+                    "selector": _substitute(action.selector, inputs),
+                    "value": _substitute(action.value, inputs)
+                })
                 if action.type == "navigation":
                     result = await self.browser_manager.navigate(
                         action.url,
@@ -57,25 +128,87 @@ class AutomationEngine:
                     if not tab_id:
                         raise ValueError("No active tab for interaction")
                     result = await self.browser_manager.interact(action, tab_id)
-                
+
                 results.append(result)
                 if not result.success:
                     success = False
-                    error = result.error
+                    error = "; ".join(result.errors or []) or f"{action.type} failed"
                     break
-                    
+
         except Exception as e:
             success = False
             error = str(e)
             logger.error(f"Script execution error: {error}")
-            
+        finally:
+            # Each run gets its own tab; hand the page back to the pool
+            if tab_id:
+                await self.browser_manager.close_tab(tab_id)
+
         end_time = datetime.utcnow()
-        
+
         return AutomationResult(
             script_id=script.id,
             success=success,
             start_time=start_time,
             end_time=end_time,
             results=results,
-            error=error
+            input_index=input_index,
+            errors=[error] if error else None
+        )
+
+    async def run_batch(
+        self,
+        script: AutomationScript,
+        inputs: List[Dict[str, Any]],
+        concurrency: Optional[int] = None,
+        on_result: Optional[Callable[[AutomationResult], Awaitable[None]]] = None
+    ) -> BatchRunResult:
+        """Run one script against many inputs across concurrent pooled tabs.
+
+        Args:
+            script: Script to run
+            inputs: One dict of placeholder values per run
+            concurrency: Max simultaneous runs (default AUTOMATION_MAX_CONCURRENCY,
+                never more than the browser pool's page cap)
+            on_result: Awaited with each AutomationResult as soon as it finishes
+
+        Returns:
+            BatchRunResult with per-run results ordered by input index
+        """
+        limit = max(1, min(concurrency or self.max_concurrency, self.browser_manager.pool.max_pages))
+        semaphore = asyncio.Semaphore(limit)
+        start_time = datetime.utcnow()
+
+        async def _run(index: int, run_inputs: Dict[str, Any]) -> AutomationResult:
+            async with semaphore:
+                return await self.run_script(script, run_inputs, input_index=index)
+
+        tasks = [asyncio.ensure_future(_run(i, item)) for i, item in enumerate(inputs)]
+        results: List[AutomationResult] = []
+        try:
+            for finished in asyncio.as_completed(tasks):
+                result = await finished
+                results.append(result)
+                if on_result is not None:
+                    try:
+                        await on_result(result)
+                    except Exception as e:
+                        # A dropped listener must not abort the remaining runs
+                        logger.warning(f"Batch result callback failed: {str(e)}")
+                        on_result = None
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        results.sort(key=lambda r: r.input_index)
+        succeeded = sum(1 for r in results if r.success)
+        return BatchRunResult(
+            script_id=script.id,
+            total=len(results),
+            succeeded=succeeded,
+            failed=len(results) - succeeded,
+            concurrency=limit,
+            results=results,
+            start_time=start_time,
+            end_time=datetime.utcnow()
         )
@@ -10,9 +10,10 @@ of LALO AI SYSTEMS, LLC.
 """
 
 import logging
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 from fastapi import WebSocket
 from datetime import datetime
+import uuid
 
 from models import (
     BrowserAction,
@@ -21,28 +22,48 @@ from models import (
     TabInfo
 )
 from .chrome_client import ChromeClient
+from .browser_pool import BrowserPool, browser_pool
 
 logger = logging.getLogger(__name__)
 
 class BrowserManager:
-    def __init__(self):
+    def __init__(self, pool: Optional[BrowserPool] = None):
+        self.pool = pool or browser_pool
         self.tabs: Dict[str, ChromeClient] = {}
         self.websockets: Dict[str, WebSocket] = {}
+        # Tabs reaped for idleness disappear from the registry too
+        self.pool.on_reap(self._forget_tab)
+
+    def _forget_tab(self, tab_id: str):
+        client = self.tabs.pop(tab_id, None)
+        if client is not None:
+            client.lease = None
+            client.page = None
+            logger.info(f"Reaped idle tab {tab_id}")
+
+    async def _open_tab(self, tab_id: str) -> ChromeClient:
+        client = ChromeClient(self.pool, tab_id=tab_id)
+        await client.connect()
+        self.tabs[tab_id] = client
+        return client
+
+    async def close_tab(self, tab_id: str):
+        """Release a tab's page back to the pool."""
+        client = self.tabs.pop(tab_id, None)
+        if client is not None:
+            await client.disconnect()
         
     async def connect_websocket(self, tab_id: str, websocket: WebSocket):
         """Connect a WebSocket to a specific tab."""
         self.websockets[tab_id] = websocket
         if tab_id not in self.tabs:
-            self.tabs[tab_id] = ChromeClient()
-            await self.tabs[tab_id].connect()
+            await self._open_tab(tab_id)
             
     async def disconnect_websocket(self, tab_id: str):
         """Disconnect a WebSocket from a specific tab."""
         if tab_id in self.websockets:
             del self.websockets[tab_id]
-        if tab_id in self.tabs:
-            await self.tabs[tab_id].disconnect()
-            del self.tabs[tab_id]
+        await self.close_tab(tab_id)
             
     async def handle_message(self, tab_id: str, message: dict):
         """Handle incoming WebSocket messages."""
@@ -67,9 +88,8 @@ class BrowserManager:
     async def navigate(self, url: str, tab_id: Optional[str] = None) -> NavigationResult:
         """Navigate to a URL in a specific tab or create a new tab."""
         if not tab_id:
-            tab_id = str(len(self.tabs))
-            self.tabs[tab_id] = ChromeClient()
-            await self.tabs[tab_id].connect()
+            tab_id = str(uuid.uuid4())
+            await self._open_tab(tab_id)
             
         if tab_id not in self.tabs:
             raise ValueError(f"Tab {tab_id} not found")
@@ -81,6 +101,7 @@ class BrowserManager:
         return NavigationResult(
             success=success,
             url=url,
+            status="loaded" if success else "failed",
             tab_id=tab_id,
             start_time=start_time,
             end_time=end_time
@@ -91,29 +112,33 @@ class BrowserManager:
         if tab_id not in self.tabs:
             raise ValueError(f"Tab {tab_id} not found")
             
-        start_time = datetime.utcnow()
         result = await self.tabs[tab_id].execute_action(action)
-        end_time = datetime.utcnow()
         
         return InteractionResult(
             success=result["success"],
-            action=action,
+            action=action.type,
+            selector=action.selector,
             tab_id=tab_id,
-            start_time=start_time,
-            end_time=end_time,
-            error=result.get("error"),
-            data=result.get("data")
+            result=result.get("data"),
+            errors=[result["error"]] if result.get("error") else None
         )
         
     async def list_tabs(self) -> List[TabInfo]:
         """List all active browser tabs."""
         tabs = []
-        for tab_id, client in self.tabs.items():
+        for tab_id, client in list(self.tabs.items()):
             info = await client.get_tab_info()
+            now = datetime.utcnow()
             tabs.append(TabInfo(
                 id=tab_id,
                 url=info["url"],
                 title=info["title"],
-                status=info["status"]
+                status=info["status"],
+                created_at=info.get("created_at") or now,
+                last_active=info.get("last_active") or now
             ))
         return tabs
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Pool utilization and page-acquire latency."""
+        return self.pool.get_stats()
@@ -0,0 +1,286 @@
+"""
+Copyright (c) 2025 LALO AI SYSTEMS, LLC. All rights reserved.
+
+PROPRIETARY AND CONFIDENTIAL
+
+This file is part of LALO AI Platform and is protected by copyright law.
+Unauthorized copying, modification, distribution, or use of this software,
+via any medium, is strictly prohibited without the express written permission
+of LALO AI SYSTEMS, LLC.
+"""
+
+"""
+Shared Playwright browser pool.
+
+A handful of long-lived Chromium processes serve every tab. A tab is an
+isolated BrowserContext + Page leased from the least-loaded browser, so
+opening one costs a context creation instead of a browser cold start.
+Total pages are capped; callers wait (with a timeout) for a free slot.
+Leases idle longer than the idle timeout are reaped in the background.
+"""
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+import asyncio
+import logging
+import os
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+try:
+    from playwright.async_api import async_playwright
+    PLAYWRIGHT_AVAILABLE = True
+except ImportError:
+    PLAYWRIGHT_AVAILABLE = False
+
+
+class PoolExhaustedError(RuntimeError):
+    """Raised when no page slot frees up within the acquire timeout."""
+
+
+@dataclass
+class _PooledBrowser:
+    browser: Any
+    pages: int = 0
+    launched_at: float = field(default_factory=time.monotonic)
+
+    def is_connected(self) -> bool:
+        check = getattr(self.browser, "is_connected", None)
+        return check() if callable(check) else True
+
+
+@dataclass
+class PageLease:
+    """A tab leased from the pool: its own context and page."""
+    id: str
+    page: Any
+    context: Any
+    created_at: datetime
+    last_active: datetime
+    _owner: Optional[_PooledBrowser] = None
+    _last_active_mono: float = field(default_factory=time.monotonic)
+
+    def touch(self) -> None:
+        self.last_active = datetime.utcnow()
+        self._last_active_mono = time.monotonic()
+
+    @property
+    def idle_seconds(self) -> float:
+        return time.monotonic() - self._last_active_mono
+
+
+class BrowserPool:
+    """Leases pages from a small set of long-lived browsers."""
+
+    def __init__(
+        self,
+        max_browsers: Optional[int] = None,
+        max_pages: Optional[int] = None,
+        idle_timeout: Optional[float] = None,
+        acquire_timeout: Optional[float] = None,
+        reap_interval: float = 30.0,
+        launcher: Optional[Callable[[], Awaitable[Any]]] = None,
+    ):
+        """
+        Args:
+            max_browsers: Chromium processes to keep (BROWSER_POOL_SIZE, default 2)
+            max_pages: Cap on concurrently leased pages (BROWSER_MAX_PAGES, default 16)
+            idle_timeout: Seconds before an untouched lease is reaped (BROWSER_TAB_IDLE_SECONDS, default 300)
+            acquire_timeout: Seconds to wait for a free slot (BROWSER_ACQUIRE_TIMEOUT, default 30)
+            reap_interval: Seconds between reaper sweeps
+            launcher: Coroutine returning a browser; defaults to headless Playwright Chromium
+        """
+        self.max_browsers = max_browsers or int(os.getenv("BROWSER_POOL_SIZE", "2"))
+        self.max_pages = max_pages or int(os.getenv("BROWSER_MAX_PAGES", "16"))
+        self.idle_timeout = idle_timeout if idle_timeout is not None else float(os.getenv("BROWSER_TAB_IDLE_SECONDS", "300"))
+        self.acquire_timeout = acquire_timeout if acquire_timeout is not None else float(os.getenv("BROWSER_ACQUIRE_TIMEOUT", "30"))
+        self.reap_interval = reap_interval
+        self._launcher = launcher or self._launch_chromium
+
+        self._playwright = None
+        self._browsers: List[_PooledBrowser] = []
+        self._leases: Dict[str, PageLease] = {}
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._reaper: Optional[asyncio.Task] = None
+        self._on_reap: List[Callable[[str], Any]] = []
+
+        self._acquire_ms: Deque[float] = deque(maxlen=512)
+        self.acquired = 0
+        self.reaped = 0
+        self.timeouts = 0
+        self.launches = 0
+
+    def _ensure_primitives(self) -> None:
+        # Created lazily so the pool can be built outside a running loop
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pages)
+            self._lock = asyncio.Lock()
+
+    async def _launch_chromium(self) -> Any:
+        if not PLAYWRIGHT_AVAILABLE:
+            raise RuntimeError("playwright is not installed")
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        return await self._playwright.chromium.launch(headless=True)
+
+    def on_reap(self, callback: Callable[[str], Any]) -> None:
+        """Register a callback invoked with the lease id of each reaped tab."""
+        self._on_reap.append(callback)
+
+    # ----- leasing -----
+
+    async def acquire(self, lease_id: Optional[str] = None, timeout: Optional[float] = None) -> PageLease:
+        """Lease a fresh context + page.
+
+        Raises:
+            PoolExhaustedError: if max_pages are in use for longer than the timeout
+        """
+        self._ensure_primitives()
+        self._start_reaper()
+        started = time.perf_counter()
+
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout if timeout is not None else self.acquire_timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise PoolExhaustedError(f"All {self.max_pages} browser pages are in use")
+
+        try:
+            owner = await self._pick_browser()
+            context = await owner.browser.new_context()
+            try:
+                page = await context.new_page()
+            except Exception:
+                await context.close()
+                raise
+        except Exception:
+            self._slots.release()
+            raise
+
+        owner.pages += 1
+        now = datetime.utcnow()
+        lease = PageLease(
+            id=lease_id or str(uuid.uuid4()),
+            page=page,
+            context=context,
+            created_at=now,
+            last_active=now,
+            _owner=owner,
+        )
+        self._leases[lease.id] = lease
+        self.acquired += 1
+        self._acquire_ms.append((time.perf_counter() - started) * 1000.0)
+        return lease
+
+    async def release(self, lease: PageLease) -> None:
+        """Close the lease's context and return its slot. Idempotent."""
+        if self._leases.pop(lease.id, None) is None:
+            return
+        try:
+            await lease.context.close()
+        except Exception as e:
+            logger.debug("Context close failed for %s: %s", lease.id, e)
+        if lease._owner is not None:
+            lease._owner.pages = max(0, lease._owner.pages - 1)
+        self._slots.release()
+
+    def get_lease(self, lease_id: str) -> Optional[PageLease]:
+        return self._leases.get(lease_id)
+
+    async def _pick_browser(self) -> _PooledBrowser:
+        async with self._lock:
+            # Drop browsers that crashed or were closed underneath us
+            self._browsers = [b for b in self._browsers if b.is_connected()]
+
+            per_browser = max(1, -(-self.max_pages // self.max_browsers))
+            least = min(self._browsers, key=lambda b: b.pages, default=None)
+            if least is not None and (least.pages < per_browser or len(self._browsers) >= self.max_browsers):
+                return least
+
+            browser = await self._launcher()
+            self.launches += 1
+            pooled = _PooledBrowser(browser=browser)
+            self._browsers.append(pooled)
+            return pooled
+
+    # ----- reaping -----
+
+    def _start_reaper(self) -> None:
+        if self.idle_timeout <= 0:
+            return
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.get_running_loop().create_task(self._reap_loop())
+
+    async def _reap_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.reap_interval)
+            try:
+                await self.reap_idle()
+            except Exception as e:
+                logger.error("Browser pool reaper error: %s", e)
+
+    async def reap_idle(self) -> int:
+        """Release leases idle longer than idle_timeout; returns how many."""
+        stale = [l for l in list(self._leases.values()) if l.idle_seconds > self.idle_timeout]
+        for lease in stale:
+            await self.release(lease)
+            self.reaped += 1
+            for callback in self._on_reap:
+                try:
+                    result = callback(lease.id)
+                    if asyncio.iscoroutine(result):
+                        await result
+                except Exception as e:
+                    logger.debug("Reap callback failed: %s", e)
+        return len(stale)
+
+    # ----- metrics / lifecycle -----
+
+    def get_stats(self) -> Dict[str, Any]:
+        samples = sorted(self._acquire_ms)
+
+        def pct(p: float) -> float:
+            return round(samples[min(len(samples) - 1, int(p * len(samples)))], 3) if samples else 0.0
+
+        in_use = len(self._leases)
+        return {
+            "browsers": len(self._browsers),
+            "max_browsers": self.max_browsers,
+            "pages_in_use": in_use,
+            "max_pages": self.max_pages,
+            "utilization": in_use / self.max_pages if self.max_pages else 0.0,
+            "acquired": self.acquired,
+            "reaped": self.reaped,
+            "timeouts": self.timeouts,
+            "launches": self.launches,
+            "acquire_latency_ms": {
+                "avg": round(sum(samples) / len(samples), 3) if samples else 0.0,
+                "p50": pct(0.5),
+                "p95": pct(0.95),
+                "max": round(samples[-1], 3) if samples else 0.0,
+            },
+        }
+
+    async def shutdown(self) -> None:
+        if self._reaper is not None:
+            self._reaper.cancel()
+            self._reaper = None
+        for lease in list(self._leases.values()):
+            await self.release(lease)
+        for pooled in self._browsers:
+            try:
+                await pooled.browser.close()
+            except Exception:
+                pass
+        self._browsers = []
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+
+# Global pool shared by every tab in the service
+browser_pool = BrowserPool()
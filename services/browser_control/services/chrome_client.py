@@ -11,45 +11,43 @@ of LALO AI SYSTEMS, LLC.
 
 import logging
 from typing import Dict, Any, Optional
-from playwright.async_api import async_playwright, Browser, Page
 import asyncio
 
 from models import BrowserAction
+from .browser_pool import BrowserPool, PageLease, browser_pool
 
 logger = logging.getLogger(__name__)
 
 class ChromeClient:
-    def __init__(self):
-        self.browser: Optional[Browser] = None
-        self.page: Optional[Page] = None
-        self.playwright = None
+    def __init__(self, pool: Optional[BrowserPool] = None, tab_id: Optional[str] = None):
+        self.pool = pool or browser_pool
+        self.tab_id = tab_id
+        self.lease: Optional[PageLease] = None
+        self.page = None
         
     async def connect(self):
-        """Initialize browser and create a new page."""
-        if not self.playwright:
-            self.playwright = await async_playwright().start()
-            self.browser = await self.playwright.chromium.launch(
-                headless=True,  # Set to False for debugging
-            )
-        self.page = await self.browser.new_page()
+        """Lease an isolated context + page from the shared browser pool."""
+        if self.lease is None:
+            self.lease = await self.pool.acquire(lease_id=self.tab_id)
+            self.page = self.lease.page
         
     async def disconnect(self):
-        """Close browser and cleanup resources."""
-        if self.page:
-            await self.page.close()
-            self.page = None
-        if self.browser:
-            await self.browser.close()
-            self.browser = None
-        if self.playwright:
-            await self.playwright.stop()
-            self.playwright = None
+        """Return the page to the pool; the browser process stays up."""
+        if self.lease is not None:
+            await self.pool.release(self.lease)
+        self.lease = None
+        self.page = None
+
+    def touch(self):
+        if self.lease is not None:
+            self.lease.touch()
             
     async def navigate(self, url: str) -> bool:
         """Navigate to a URL."""
         try:
             if not self.page:
                 raise ValueError("Browser not initialized")
+            self.touch()
             await self.page.goto(url)
             return True
         except Exception as e:
@@ -61,6 +59,7 @@ class ChromeClient:
         if not self.page:
             return {"success": False, "error": "Browser not initialized"}
             
+        self.touch()
         try:
             result = {"success": True}
             
@@ -118,17 +117,21 @@ class ChromeClient:
         except Exception as e:
             raise ValueError(f"Error finding element: {str(e)}")
             
-    async def get_tab_info(self) -> Dict[str, str]:
+    async def get_tab_info(self) -> Dict[str, Any]:
         """Get information about the current tab."""
         if not self.page:
             return {
                 "url": "",
                 "title": "",
-                "status": "disconnected"
+                "status": "disconnected",
+                "created_at": None,
+                "last_active": None
             }
             
         return {
             "url": self.page.url,
             "title": await self.page.title(),
-            "status": "connected"
+            "status": "connected",
+            "created_at": self.lease.created_at,
+            "last_active": self.lease.last_active
         }
@@ -26,6 +26,7 @@ from models import (
 )
 from services.document_processor import DocumentProcessor
 from services.storage import StorageService
+from services.ingestion import spool_upload
 from services.auth import get_current_user
 from services.document_service.services.background_indexer import list_dead_letter, enqueue_index_job
 from core.database import SessionLocal
@@ -55,17 +56,19 @@ async def upload_document(
     file: UploadFile = File(...),
     current_user: str = Depends(get_current_user)
 ) -> ProcessingResult:
+    parsed = None
     try:
-        # Read file content
-        content = await file.read()
+        # Spool the upload to disk in chunks; the parsed handle is shared by
+        # scoring, metadata extraction, chunking and storage
+        parsed = await spool_upload(file)
         
         # Create document
         doc = Document(
             id=str(uuid.uuid4()),
             name=file.filename,
             type=DocumentType.OTHER,  # Will be updated during processing
-            content=content,
-            metadata={},
+            content=None,
+            metadata={"size_bytes": parsed.size, "sha256": parsed.sha256},
             version=1,
             created_at=datetime.utcnow(),
             updated_at=datetime.utcnow(),
@@ -74,12 +77,12 @@ async def upload_document(
         )
         
         # Process document
-        result = await document_processor.process_document(doc)
+        result = await document_processor.process_document(doc, parsed)
         if not result.success:
             raise HTTPException(status_code=400, detail=result.errors)
             
         # Store document
-        storage_result = await storage_service.store_document(doc)
+        storage_result = await storage_service.store_document(doc, source=parsed)
         if not storage_result.success:
             raise HTTPException(status_code=500, detail=storage_result.errors)
             
@@ -92,6 +95,9 @@ async def upload_document(
     except Exception as e:
         logger.error(f"Error processing document: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if parsed is not None:
+            parsed.close()
 
 @app.get("/documents/{doc_id}", response_model=Document)
 async def get_document(
@@ -35,7 +35,8 @@ class Document(BaseModel):
     id: str
     name: str
     type: DocumentType
-    content: bytes
+    # None for streamed uploads; the bytes live in the spool file / blob store
+    content: Optional[bytes] = None
     metadata: Dict
     version: int
     created_at: datetime
@@ -46,15 +47,15 @@ class Document(BaseModel):
 class ProcessingResult(BaseModel):
     success: bool
     document_id: str
-    message: Optional[str]
-    errors: Optional[List[str]]
+    message: Optional[str] = None
+    errors: Optional[List[str]] = None
 
 class StorageResult(BaseModel):
     success: bool
     location: str
-    errors: Optional[List[str]]
+    errors: Optional[List[str]] = None
 
 class UpdateResult(BaseModel):
     success: bool
     document: Document
-    errors: Optional[List[str]]
+    errors: Optional[List[str]] = None
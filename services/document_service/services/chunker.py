@@ -4,7 +4,7 @@ Simple hierarchical chunker: document -> paragraph -> sentence.
 This is intentionally minimal: paragraph splitting on double-newline, sentence
 splitting via a naive regex. Returns list of chunk dicts with metadata.
 """
-from typing import List, Dict
+from typing import Dict, Iterable, Iterator, List, Tuple
 import re
 import hashlib
 from .token_utils import count_tokens
@@ -78,3 +78,21 @@ def chunk_text_hierarchical(text: str, doc_id: str = "", max_tokens: int = 400)
         pos = para_end + 2
 
     return chunks
+
+
+def chunk_pages(pages: Iterable[Tuple[int, str]], doc_id: str = "", max_tokens: int = 400) -> Iterator[Dict]:
+    """Chunk a stream of (page_number, text) pairs lazily.
+
+    Each page is chunked independently with chunk_text_hierarchical; offsets
+    are shifted to be document-relative and a 'page' key is added. Only one
+    page of text is held at a time.
+    """
+    offset = 0
+    for page_number, text in pages:
+        for chunk in chunk_text_hierarchical(text, doc_id=doc_id, max_tokens=max_tokens):
+            chunk['page'] = page_number
+            chunk['start_char'] += offset
+            chunk['end_char'] += offset
+            yield chunk
+        # pages are joined by a paragraph break in document coordinates
+        offset += len(text) + 2
@@ -9,7 +9,8 @@ via any medium, is strictly prohibited without the express written permission
 of LALO AI SYSTEMS, LLC.
 """
 
-from typing import Optional, List
+from typing import Optional, List, Dict, Any, Iterable
+from itertools import islice
 from ..models import Document, DocumentType, ProcessingResult
 from .processors import (
     ExcelProcessor,
@@ -17,13 +18,16 @@ from .processors import (
     PDFProcessor,
     DefaultProcessor
 )
-from .quality import score_document
+from .quality import score_parsed
+from .ingestion import ParsedDocument
 from .background_indexer import enqueue_index_job
 import os
 from core.vectorstores import get_vector_store
 
 # INDEXING_MODE: 'sync' | 'background' | 'redis' (background uses in-memory queue if REDIS_URL not set)
 INDEXING_MODE = os.getenv('INDEXING_MODE', 'background').lower()
+# Chunks are indexed in batches of this size as they are produced
+INDEX_BATCH_SIZE = int(os.getenv('INDEX_BATCH_SIZE', '256'))
 
 class DocumentProcessor:
     def __init__(self):
@@ -34,31 +38,21 @@ class DocumentProcessor:
             DocumentType.OTHER: DefaultProcessor()
         }
         
-    async def process_document(self, document: Document) -> ProcessingResult:
+    async def process_document(self, document: Document, parsed: Optional[ParsedDocument] = None) -> ProcessingResult:
+        """Score, extract metadata and chunk a document from one parsed handle.
+
+        Args:
+            document: Document being ingested (content may be None when parsed is given)
+            parsed: Spooled document from spool_upload(); built from
+                document.content when omitted
+
+        Returns:
+            ProcessingResult from the type-specific processor
+        """
         try:
-            # Detect file type. Try to use python-magic if available; otherwise
-            # fall back to simple signature heuristics to avoid import-time
-            # failures on systems without libmagic.
-            mime_type = ""
-            try:
-                import magic
-                m = magic.Magic(mime=True)
-                mime_type = m.from_buffer(document.content)
-            except Exception:
-                # graceful fallback heuristics
-                head = document.content[:16]
-                if head.startswith(b"%PDF"):
-                    mime_type = "application/pdf"
-                elif head.startswith(b"PK"):
-                    # docx/xlsx/pptx are ZIP based - let later checks classify
-                    mime_type = "application/zip"
-                else:
-                    try:
-                        # try UTF-8 text detect
-                        _ = document.content.decode('utf-8')
-                        mime_type = "text/plain"
-                    except Exception:
-                        mime_type = "application/octet-stream"
+            # MIME type is sniffed once, from the leading bytes
+            parsed = parsed or ParsedDocument.from_bytes(document.content)
+            mime_type = parsed.mime_type
             
             # Update document type
             if "spreadsheet" in mime_type or "excel" in mime_type:
@@ -69,9 +63,9 @@ class DocumentProcessor:
                 document.type = DocumentType.PDF
             
             # Run lightweight quality scoring and attach to metadata
+            document.metadata = document.metadata or {}
             try:
-                qscore, qdetails = score_document(document.content, mime_type)
-                document.metadata = document.metadata or {}
+                qscore, qdetails = score_parsed(parsed)
                 document.metadata['quality'] = {
                     'score': qscore,
                     'details': qdetails
@@ -92,30 +86,15 @@ class DocumentProcessor:
             processor = self.processors.get(document.type, self.processors[DocumentType.OTHER])
 
             # Process document
-            result = await processor.process(document)
+            result = await processor.process(document, parsed)
 
-            # After processing, if chunks were produced, upsert them to vector store
+            # After processing, upsert chunks to the vector store as they are produced
             try:
-                chunks = document.metadata.get('chunks', []) if document.metadata else []
-                if chunks:
-                    # Prepare lists for add_documents: texts, ids, metadatas
-                    texts = [c.get('text', '') for c in chunks]
-                    ids = [c.get('chunk_id') for c in chunks]
-                    metadatas = [
-                        {k: v for k, v in c.items() if k not in ('text',)} for c in chunks
-                    ]
-
-                    try:
-                        if INDEXING_MODE == 'sync':
-                            # perform synchronous upsert
-                            store = get_vector_store()
-                            await store.add_documents(documents=texts, ids=ids, metadatas=metadatas)
-                        else:
-                            enqueue_index_job(documents=texts, ids=ids, metadatas=metadatas)
-                    except Exception:
-                        # non-fatal
-                        pass
-
+                if hasattr(processor, 'iter_chunks'):
+                    chunks = processor.iter_chunks(document, parsed)
+                else:
+                    chunks = document.metadata.get('chunks', []) if document.metadata else []
+                document.metadata['chunk_count'] = await self._index_chunks(chunks)
             except Exception:
                 # non-fatal
                 pass
@@ -128,3 +107,32 @@ class DocumentProcessor:
                 document_id=document.id,
                 errors=[str(e)]
             )
+
+    async def _index_chunks(self, chunks: Iterable[Dict[str, Any]]) -> int:
+        """Upsert chunks in INDEX_BATCH_SIZE batches; returns the number seen."""
+        total = 0
+        iterator = iter(chunks)
+        store = None
+        while True:
+            batch = list(islice(iterator, INDEX_BATCH_SIZE))
+            if not batch:
+                return total
+            total += len(batch)
+
+            # Prepare lists for add_documents: texts, ids, metadatas
+            texts = [c.get('text', '') for c in batch]
+            ids = [c.get('chunk_id') for c in batch]
+            metadatas = [
+                {k: v for k, v in c.items() if k not in ('text',)} for c in batch
+            ]
+
+            try:
+                if INDEXING_MODE == 'sync':
+                    # perform synchronous upsert
+                    store = store or get_vector_store()
+                    await store.add_documents(documents=texts, ids=ids, metadatas=metadatas)
+                else:
+                    enqueue_index_job(documents=texts, ids=ids, metadatas=metadatas)
+            except Exception:
+                # non-fatal
+                pass
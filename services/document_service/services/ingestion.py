@@ -0,0 +1,285 @@
+"""
+Copyright (c) 2025 LALO AI SYSTEMS, LLC. All rights reserved.
+
+PROPRIETARY AND CONFIDENTIAL
+
+This file is part of LALO AI Platform and is protected by copyright law.
+Unauthorized copying, modification, distribution, or use of this software,
+via any medium, is strictly prohibited without the express written permission
+of LALO AI SYSTEMS, LLC.
+"""
+
+"""
+Streaming ingestion: spool uploads to disk and parse each document once.
+
+Uploads are copied to a temporary file in fixed-size chunks (never held in
+memory as a whole), hashed and MIME-sniffed on the way through. The
+resulting ParsedDocument owns a single lazily-opened parser handle (PDF
+reader over a memory map, docx document, read-only workbook) that quality
+scoring, metadata extraction and chunking all share. Page text is exposed
+as a generator so large PDFs are never materialized as one string.
+"""
+from typing import Any, Iterator, Optional, Tuple
+from io import BytesIO
+import hashlib
+import logging
+import mmap
+import os
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+SPOOL_CHUNK_SIZE = int(os.getenv("INGEST_SPOOL_CHUNK_SIZE", str(1024 * 1024)))
+SPOOL_DIR = os.getenv("INGEST_SPOOL_DIR") or None
+SNIFF_BYTES = 8192
+
+
+def sniff_mime_type(head: bytes) -> str:
+    """Detect the MIME type from the first bytes of a file.
+
+    Uses python-magic when available, otherwise simple signature heuristics
+    so systems without libmagic still ingest.
+    """
+    try:
+        import magic
+        return magic.Magic(mime=True).from_buffer(head)
+    except Exception:
+        pass
+
+    if head.startswith(b"%PDF"):
+        return "application/pdf"
+    if head.startswith(b"PK"):
+        # docx/xlsx/pptx are ZIP based; the content types entry names them
+        if b"word/" in head:
+            return "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+        if b"xl/" in head:
+            return "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        return "application/zip"
+    try:
+        head.decode("utf-8")
+        return "text/plain"
+    except UnicodeDecodeError:
+        # A multi-byte character may straddle the sniff boundary
+        try:
+            head[:-3].decode("utf-8")
+            return "text/plain"
+        except UnicodeDecodeError:
+            return "application/octet-stream"
+
+
+class ParsedDocument:
+    """A spooled document plus the single parser handle shared by all stages.
+
+    Build with ``spool_upload`` (streamed, file backed) or ``from_bytes``
+    (in-memory, for callers that already hold the content).
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        content: Optional[bytes] = None,
+        mime_type: Optional[str] = None,
+        size: Optional[int] = None,
+        sha256: Optional[str] = None,
+        owns_file: bool = False,
+    ):
+        if path is None and content is None:
+            raise ValueError("ParsedDocument needs a path or content")
+        self.path = path
+        self._content = content
+        self._owns_file = owns_file
+        self.size = size if size is not None else (len(content) if content is not None else os.path.getsize(path))
+        self.sha256 = sha256
+        self.mime_type = mime_type or sniff_mime_type(self.read_head())
+
+        self._file = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._handles: dict = {}
+
+    @classmethod
+    def from_bytes(cls, content: bytes, mime_type: Optional[str] = None) -> "ParsedDocument":
+        return cls(content=content, mime_type=mime_type)
+
+    # ----- raw access -----
+
+    def read_head(self, n: int = SNIFF_BYTES) -> bytes:
+        if self._content is not None:
+            return self._content[:n]
+        with open(self.path, "rb") as f:
+            return f.read(n)
+
+    def open_stream(self) -> Any:
+        """Seekable binary stream over the content (memory-mapped when spooled)."""
+        if self._content is not None:
+            return BytesIO(self._content)
+        if self._mmap is None:
+            self._file = open(self.path, "rb")
+            if self.size:
+                self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                # mmap cannot map an empty file
+                return BytesIO(b"")
+        self._mmap.seek(0)
+        return self._mmap
+
+    def iter_bytes(self, chunk_size: int = SPOOL_CHUNK_SIZE) -> Iterator[bytes]:
+        if self._content is not None:
+            for start in range(0, len(self._content), chunk_size):
+                yield self._content[start:start + chunk_size]
+            return
+        with open(self.path, "rb") as f:
+            while True:
+                block = f.read(chunk_size)
+                if not block:
+                    return
+                yield block
+
+    # ----- shared parser handles -----
+
+    @property
+    def kind(self) -> str:
+        mime = (self.mime_type or "").lower()
+        if "pdf" in mime:
+            return "pdf"
+        if "spreadsheet" in mime or "excel" in mime:
+            return "excel"
+        if "word" in mime or "docx" in mime:
+            return "word"
+        if mime.startswith("text/"):
+            return "text"
+        return "other"
+
+    def _handle(self, name: str, factory) -> Any:
+        if name not in self._handles:
+            self._handles[name] = factory()
+        return self._handles[name]
+
+    @property
+    def pdf(self) -> Any:
+        """PdfReader over the memory map; pages are decoded on demand."""
+        def _open():
+            import PyPDF2
+            return PyPDF2.PdfReader(self.open_stream())
+        return self._handle("pdf", _open)
+
+    @property
+    def docx(self) -> Any:
+        def _open():
+            from docx import Document as DocxDocument
+            return DocxDocument(self.path if self.path else BytesIO(self._content))
+        return self._handle("docx", _open)
+
+    @property
+    def workbook(self) -> Any:
+        """Read-only openpyxl workbook; rows stream from the zip on iteration."""
+        def _open():
+            import openpyxl
+            source = self.path if self.path else BytesIO(self._content)
+            return openpyxl.load_workbook(source, read_only=True, data_only=True)
+        return self._handle("workbook", _open)
+
+    # ----- text -----
+
+    def iter_pages(self) -> Iterator[Tuple[int, str]]:
+        """Yield (page_number, text) one page at a time.
+
+        PDFs yield real pages; text files yield ~1 MB blocks split on
+        paragraph boundaries; other formats yield nothing (their processors
+        chunk structurally).
+        """
+        if self.kind == "pdf":
+            for i, page in enumerate(self.pdf.pages):
+                try:
+                    yield i + 1, page.extract_text() or ""
+                except Exception as e:
+                    logger.debug("Text extraction failed on page %d: %s", i + 1, e)
+                    yield i + 1, ""
+        elif self.kind == "text":
+            yield from self._iter_text_blocks()
+
+    def _iter_text_blocks(self) -> Iterator[Tuple[int, str]]:
+        import codecs
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+        pending = ""
+        block_no = 0
+        for raw in self.iter_bytes():
+            pending += decoder.decode(raw)
+            cut = pending.rfind("\n\n")
+            if cut > 0:
+                block_no += 1
+                yield block_no, pending[:cut]
+                pending = pending[cut + 2:]
+        pending += decoder.decode(b"", final=True)
+        if pending:
+            yield block_no + 1, pending
+
+    def sample_text(self, max_chars: int = 2000) -> str:
+        """Leading text for cheap heuristics, without a full read."""
+        if self.kind != "text":
+            return ""
+        return self.read_head(max_chars * 4).decode("utf-8", errors="ignore")[:max_chars]
+
+    # ----- lifecycle -----
+
+    def close(self) -> None:
+        self._handles.clear()
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # A parser still holds an export of the map; the GC will release it
+                pass
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._owns_file and self.path and os.path.exists(self.path):
+            try:
+                os.unlink(self.path)
+            except OSError as e:
+                logger.warning("Failed to remove spool file %s: %s", self.path, e)
+
+    def __enter__(self) -> "ParsedDocument":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+async def spool_upload(upload: Any, chunk_size: int = SPOOL_CHUNK_SIZE, spool_dir: Optional[str] = None) -> ParsedDocument:
+    """Copy an UploadFile-like object to a temp file in chunks.
+
+    Args:
+        upload: Object with ``async read(n)`` (e.g. FastAPI UploadFile)
+        chunk_size: Bytes per read
+        spool_dir: Directory for the temp file (default INGEST_SPOOL_DIR or system temp)
+
+    Returns:
+        A file-backed ParsedDocument that deletes its spool file on close()
+    """
+    digest = hashlib.sha256()
+    head = b""
+    size = 0
+    fd, path = tempfile.mkstemp(prefix="lalo-upload-", suffix=".part", dir=spool_dir or SPOOL_DIR)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                block = await upload.read(chunk_size)
+                if not block:
+                    break
+                if len(head) < SNIFF_BYTES:
+                    head += block[:SNIFF_BYTES - len(head)]
+                digest.update(block)
+                out.write(block)
+                size += len(block)
+    except Exception:
+        os.unlink(path)
+        raise
+
+    return ParsedDocument(
+        path=path,
+        mime_type=sniff_mime_type(head),
+        size=size,
+        sha256=digest.hexdigest(),
+        owns_file=True,
+    )
@@ -9,20 +9,21 @@ via any medium, is strictly prohibited without the express written permission
 of LALO AI SYSTEMS, LLC.
 """
 
-import magic
+from typing import Any, Dict, Iterator, Optional
 from ...models import Document, ProcessingResult
+from ..chunker import chunk_pages
+from ..ingestion import ParsedDocument
 
 class DefaultProcessor:
-    async def process(self, document: Document) -> ProcessingResult:
+    async def process(self, document: Document, parsed: Optional[ParsedDocument] = None) -> ProcessingResult:
         try:
-            # Use python-magic to get MIME type
-            mime = magic.Magic(mime=True)
-            mime_type = mime.from_buffer(document.content)
+            # MIME type was sniffed once while spooling
+            parsed = parsed or ParsedDocument.from_bytes(document.content)
             
             # Basic metadata
             metadata = {
-                "mime_type": mime_type,
-                "size_bytes": len(document.content),
+                "mime_type": parsed.mime_type,
+                "size_bytes": parsed.size,
                 "properties": {}
             }
             
@@ -41,3 +42,7 @@ class DefaultProcessor:
                 document_id=document.id,
                 errors=[f"Default processing error: {str(e)}"]
             )
+
+    def iter_chunks(self, document: Document, parsed: ParsedDocument) -> Iterator[Dict[str, Any]]:
+        """Plain-text uploads are chunked block by block; binaries yield nothing."""
+        return chunk_pages(parsed.iter_pages(), doc_id=document.id)
@@ -9,16 +9,20 @@ via any medium, is strictly prohibited without the express written permission
 of LALO AI SYSTEMS, LLC.
 """
 
-from typing import Dict, Any
-import openpyxl
+from typing import Dict, Any, Optional
 from ...models import Document, ProcessingResult
 from ..table_extractor import excel_tables_to_chunks
+from ..ingestion import ParsedDocument
 
 class ExcelProcessor:
-    async def process(self, document: Document) -> ProcessingResult:
+    async def process(self, document: Document, parsed: Optional[ParsedDocument] = None) -> ProcessingResult:
         try:
-            # Load workbook from bytes
-            workbook = openpyxl.load_workbook(document.content)
+            # Reuse the shared read-only workbook; only wrap bytes for legacy callers
+            parsed = parsed or ParsedDocument.from_bytes(
+                document.content,
+                mime_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            )
+            workbook = parsed.workbook
             
             # Extract metadata
             metadata: Dict[str, Any] = {
@@ -33,8 +37,9 @@ class ExcelProcessor:
                     "name": sheet,
                     "row_count": ws.max_row,
                     "column_count": ws.max_column,
-                    "has_charts": len(ws._charts) > 0,
-                    "has_tables": len(ws.tables) > 0
+                    # read-only worksheets do not load charts/tables
+                    "has_charts": len(getattr(ws, '_charts', [])) > 0,
+                    "has_tables": len(getattr(ws, 'tables', {})) > 0
                 }
                 metadata["sheets"].append(sheet_info)
             
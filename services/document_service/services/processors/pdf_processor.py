@@ -9,17 +9,17 @@ via any medium, is strictly prohibited without the express written permission
 of LALO AI SYSTEMS, LLC.
 """
 
-from typing import Dict, Any
-from io import BytesIO
-import PyPDF2
+from typing import Dict, Any, Iterator, Optional
 from ...models import Document, ProcessingResult
-from ..chunker import chunk_text_hierarchical
+from ..chunker import chunk_pages
+from ..ingestion import ParsedDocument
 
 class PDFProcessor:
-    async def process(self, document: Document) -> ProcessingResult:
+    async def process(self, document: Document, parsed: Optional[ParsedDocument] = None) -> ProcessingResult:
         try:
-            # Load PDF from bytes
-            pdf = PyPDF2.PdfReader(BytesIO(document.content))
+            # Reuse the shared reader; only wrap bytes for legacy callers
+            parsed = parsed or ParsedDocument.from_bytes(document.content, mime_type="application/pdf")
+            pdf = parsed.pdf
             
             # Extract metadata
             metadata: Dict[str, Any] = {
@@ -39,9 +39,8 @@ class PDFProcessor:
                     "producer": pdf.metadata.get('/Producer', '')
                 }
             
-            # Extract page information
+            # Extract page information (text is streamed later by iter_chunks)
             metadata["page_info"] = []
-            page_texts = []
             for i, page in enumerate(pdf.pages):
                 try:
                     page_info = {
@@ -51,24 +50,10 @@ class PDFProcessor:
                         "has_images": len(page.images) > 0
                     }
                     metadata["page_info"].append(page_info)
-                    # Collect text for chunking (limit to first 50 pages to avoid huge memory)
-                    if i < 50:
-                        try:
-                            page_texts.append(page.extract_text() or "")
-                        except Exception:
-                            page_texts.append("")
                 except Exception:
                     # best-effort; continue
                     continue
 
-            # Chunk the collected text
-            try:
-                full_text = "\n\n".join(page_texts)
-                chunks = chunk_text_hierarchical(full_text, doc_id=document.id)
-                document.metadata['chunks'] = chunks
-            except Exception:
-                document.metadata['chunks'] = []
-            
             # Update document metadata
             document.metadata.update(metadata)
             
@@ -84,3 +69,7 @@ class PDFProcessor:
                 document_id=document.id,
                 errors=[f"PDF processing error: {str(e)}"]
             )
+
+    def iter_chunks(self, document: Document, parsed: ParsedDocument) -> Iterator[Dict[str, Any]]:
+        """Chunks for every page, extracted one page at a time."""
+        return chunk_pages(parsed.iter_pages(), doc_id=document.id)
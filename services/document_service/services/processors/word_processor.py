@@ -9,18 +9,21 @@ via any medium, is strictly prohibited without the express written permission
 of LALO AI SYSTEMS, LLC.
 """
 
-from typing import Dict, Any
-from io import BytesIO
-from docx import Document as DocxDocument
+from typing import Dict, Any, Optional
 from ...models import Document, ProcessingResult
 from ..chunker import chunk_text_hierarchical
 from ..table_extractor import word_table_to_chunks
+from ..ingestion import ParsedDocument
 
 class WordProcessor:
-    async def process(self, document: Document) -> ProcessingResult:
+    async def process(self, document: Document, parsed: Optional[ParsedDocument] = None) -> ProcessingResult:
         try:
-            # Load document from bytes
-            doc = DocxDocument(BytesIO(document.content))
+            # Reuse the shared docx handle; only wrap bytes for legacy callers
+            parsed = parsed or ParsedDocument.from_bytes(
+                document.content,
+                mime_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+            )
+            doc = parsed.docx
             
             # Extract metadata
             metadata: Dict[str, Any] = {
@@ -12,7 +12,6 @@ non-zero score and never raise.
 """
 from typing import Tuple, Dict
 import re
-import io
 import logging
 
 logger = logging.getLogger('doc_quality')
@@ -33,7 +32,15 @@ def score_document(content_bytes: bytes, mime_type: str = "") -> Tuple[int, Dict
     """Score a document and return (score, details).
 
     Score 0-100 where higher is better. Details contains heuristic metrics.
+    Callers that already hold a ParsedDocument should use score_parsed()
+    so the parser handle is shared instead of re-opening the bytes.
     """
+    from .ingestion import ParsedDocument
+    return score_parsed(ParsedDocument.from_bytes(content_bytes, mime_type=mime_type or None))
+
+
+def score_parsed(parsed) -> Tuple[int, Dict]:
+    """Score a ParsedDocument using its shared parser handle."""
     try:
         text_estimate = ""
         page_count = None
@@ -41,11 +48,9 @@ def score_document(content_bytes: bytes, mime_type: str = "") -> Tuple[int, Dict
         tables = 0
 
         # Lightweight PDF handling
-        if "pdf" in mime_type.lower():
+        if parsed.kind == "pdf":
             try:
-                import PyPDF2
-                from io import BytesIO
-                reader = PyPDF2.PdfReader(BytesIO(content_bytes))
+                reader = parsed.pdf
                 page_count = len(reader.pages)
                 # quick text concat from first few pages to estimate quality
                 sample_pages = min(5, page_count)
@@ -58,18 +63,16 @@ def score_document(content_bytes: bytes, mime_type: str = "") -> Tuple[int, Dict
                 text_estimate = "\n".join(texts)
                 # detect images heuristic
                 try:
-                    has_images = any(len(p.images) > 0 for p in reader.pages[:sample_pages])
+                    has_images = any(len(reader.pages[i].images) > 0 for i in range(sample_pages))
                 except Exception:
                     has_images = False
             except Exception:
                 text_estimate = ""
 
         # Word (docx)
-        elif "word" in mime_type.lower() or "docx" in mime_type.lower():
+        elif parsed.kind == "word":
             try:
-                from docx import Document as DocxDocument
-                from io import BytesIO
-                doc = DocxDocument(BytesIO(content_bytes))
+                doc = parsed.docx
                 paragraphs = [p.text for p in doc.paragraphs if p.text]
                 text_estimate = "\n".join(paragraphs[:40])
                 page_count = len(doc.paragraphs)
@@ -82,11 +85,9 @@ def score_document(content_bytes: bytes, mime_type: str = "") -> Tuple[int, Dict
                 text_estimate = ""
 
         # Excel
-        elif "spreadsheet" in mime_type.lower() or "excel" in mime_type.lower():
+        elif parsed.kind == "excel":
             try:
-                import openpyxl
-                from io import BytesIO
-                wb = openpyxl.load_workbook(BytesIO(content_bytes), read_only=True)
+                wb = parsed.workbook
                 # Collect limited cell text to estimate quality
                 snippets = []
                 for i, sheet in enumerate(wb.sheetnames[:3]):
@@ -101,10 +102,10 @@ def score_document(content_bytes: bytes, mime_type: str = "") -> Tuple[int, Dict
             except Exception:
                 text_estimate = ""
 
-        # Fallback: try to decode as utf-8 text
+        # Fallback: leading bytes decoded as utf-8 text
         else:
             try:
-                text_estimate = content_bytes.decode('utf-8', errors='ignore')[:2000]
+                text_estimate = parsed.read_head(8000).decode('utf-8', errors='ignore')[:2000]
             except Exception:
                 text_estimate = ""
 
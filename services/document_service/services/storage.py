@@ -22,7 +22,14 @@ class StorageService:
         self.container_name = "documents"
         self.dead_letter_container = "dead_letters"
         
-    async def store_document(self, document: Document) -> StorageResult:
+    async def store_document(self, document: Document, source=None) -> StorageResult:
+        """Persist content and metadata.
+
+        Args:
+            document: Document to store
+            source: Optional ParsedDocument; when given the content is
+                streamed from its spool file instead of document.content
+        """
         try:
             # Get container client
             container_client = self.blob_service_client.get_container_client(self.container_name)
@@ -30,7 +37,11 @@ class StorageService:
             # Store document content
             content_blob_name = f"{document.id}/content"
             content_blob = container_client.get_blob_client(content_blob_name)
-            content_blob.upload_blob(document.content, overwrite=True)
+            if source is not None and source.path:
+                with open(source.path, "rb") as stream:
+                    content_blob.upload_blob(stream, length=source.size, overwrite=True)
+            else:
+                content_blob.upload_blob(document.content, overwrite=True)
             
             # Store metadata separately
             metadata_blob_name = f"{document.id}/metadata.json"
@@ -10,6 +10,9 @@ of LALO AI SYSTEMS, LLC.
 """
 
 import os
+import shutil
+import tempfile
+
 import pytest
 from fastapi.testclient import TestClient
 
@@ -37,6 +40,10 @@ def test_app_overrides():
     # Ensure tool package doesn't instantiate heavy tools during tests
     os.environ.setdefault("SKIP_TOOL_INIT", "true")
 
+    # Keep any default-constructed BM25 index out of the repository's ./data
+    bm25_dir = tempfile.mkdtemp(prefix="lalo-bm25-")
+    os.environ.setdefault("BM25_INDEX_DIR", bm25_dir)
+
     # Lazy imports after filesystem and env setup
     from app import app
     from core.services.auth import get_current_user
@@ -85,6 +92,7 @@ def test_app_overrides():
     key_management.key_manager.get_keys = original_get_keys
     key_management.key_manager.validate_keys = original_validate_keys
     ai_service.models = original_models
+    shutil.rmtree(bm25_dir, ignore_errors=True)
 
     # Remove temporary build/static dirs if we created them (ignore errors)
     try:
@@ -103,3 +111,30 @@ def client():
     from app import app
 
     return TestClient(app)
+
+
+@pytest.fixture()
+def workflow_db(tmp_path, monkeypatch):
+    """
+    Point the workflow services at a throwaway SQLite file instead of
+    ./lalo.db, so sessions left mid-stage by a test are never resumed by
+    the app's startup recovery (a file, not :memory:, so forked workers share it)
+    """
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    import core.routes.workflow_routes as routes_module
+    import core.services.tool_executor as executor_module
+    import core.services.workflow_checkpoints as checkpoints_module
+    import core.services.workflow_leases as leases_module
+    import core.services.workflow_orchestrator as orchestrator_module
+    from core.database import Base, FeedbackEvent, ToolExecution, WorkflowCheckpoint, WorkflowLease, WorkflowSession
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'workflow.db'}", connect_args={"check_same_thread": False})
+    tables = [WorkflowSession, WorkflowCheckpoint, WorkflowLease, FeedbackEvent, ToolExecution]
+    Base.metadata.create_all(bind=engine, tables=[model.__table__ for model in tables])
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    for module in (orchestrator_module, checkpoints_module, leases_module, executor_module, routes_module):
+        monkeypatch.setattr(module, "SessionLocal", session_factory)
+    yield engine
+    engine.dispose()
@@ -0,0 +1,120 @@
+"""
+Copyright (c) 2025 LALO AI SYSTEMS, LLC. All rights reserved.
+
+PROPRIETARY AND CONFIDENTIAL
+
+This file is part of LALO AI Platform and is protected by copyright law.
+Unauthorized copying, modification, distribution, or use of this software,
+via any medium, is strictly prohibited without the express written permission
+of LALO AI SYSTEMS, LLC.
+"""
+
+import asyncio
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# The browser service imports its models as a top-level module
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "services" / "browser_control"))
+
+from models import AutomationScript, BrowserAction, InteractionResult, NavigationResult  # noqa: E402
+from services.browser_control.services.automation_engine import AutomationEngine  # noqa: E402
+
+
+class FakePool:
+    max_pages = 8
+
+
+class FakeBrowserManager:
+    """Records tab usage and how many runs were in flight at once."""
+
+    def __init__(self, delay=0.02):
+        self.pool = FakePool()
+        self.delay = delay
+        self.open_tabs = set()
+        self.closed = []
+        self.visited = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def navigate(self, url, tab_id=None):
+        tab_id = tab_id or f"tab-{len(self.visited)}"
+        self.open_tabs.add(tab_id)
+        self.visited.append(url)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        return NavigationResult(success=True, url=url, status="loaded", tab_id=tab_id)
+
+    async def interact(self, action, tab_id):
+        ok = "missing" not in action.selector
+        return InteractionResult(
+            success=ok,
+            action=action.type,
+            selector=action.selector,
+            tab_id=tab_id,
+            result={"text": action.selector} if ok else None,
+            errors=None if ok else ["Element not found"],
+        )
+
+    async def close_tab(self, tab_id):
+        self.open_tabs.discard(tab_id)
+        self.closed.append(tab_id)
+
+
+def _script(actions):
+    now = datetime.utcnow()
+    return AutomationScript(
+        id="s1", name="scrape", description="", actions=actions,
+        created_at=now, updated_at=now, created_by="tester",
+    )
+
+
+def test_batch_runs_concurrently_with_limit(tmp_path):
+    manager = FakeBrowserManager()
+    engine = AutomationEngine(manager, scripts_dir=str(tmp_path))
+    script = _script([BrowserAction(type="extract", selector="#price-{sku}")])
+    inputs = [{"url": f"https://shop.example/{i}", "sku": str(i)} for i in range(12)]
+    streamed = []
+
+    async def on_result(result):
+        streamed.append(result.input_index)
+
+    batch = asyncio.run(engine.run_batch(script, inputs, concurrency=4, on_result=on_result))
+
+    assert batch.total == 12 and batch.succeeded == 12
+    assert batch.concurrency == 4
+    assert manager.peak == 4
+    assert sorted(streamed) == list(range(12))
+    assert [r.input_index for r in batch.results] == list(range(12))
+    assert batch.results[3].results[1].result == {"text": "#price-3"}
+    # every run had its own tab and returned it
+    assert manager.open_tabs == set()
+    assert len(manager.closed) == 12
+
+
+def test_failed_run_is_isolated(tmp_path):
+    manager = FakeBrowserManager(delay=0)
+    engine = AutomationEngine(manager, scripts_dir=str(tmp_path))
+    script = _script([
+        BrowserAction(type="navigation", selector="", url="https://x.example/{page}"),
+        BrowserAction(type="click", selector="{target}"),
+    ])
+
+    batch = asyncio.run(engine.run_batch(script, [{"page": "a", "target": "#ok"}, {"page": "b", "target": "#missing"}]))
+
+    assert batch.succeeded == 1 and batch.failed == 1
+    assert batch.results[1].errors == ["Element not found"]
+    assert manager.visited == ["https://x.example/a", "https://x.example/b"]
+
+
+def test_scripts_survive_restart(tmp_path):
+    engine = AutomationEngine(FakeBrowserManager(), scripts_dir=str(tmp_path))
+    script = _script([BrowserAction(type="click", selector="#go")])
+    asyncio.run(engine.save_script(script))
+
+    reloaded = AutomationEngine(FakeBrowserManager(), scripts_dir=str(tmp_path))
+    restored = asyncio.run(reloaded.get_script("s1"))
+    assert restored is not None
+    assert restored.actions[0].selector == "#go"
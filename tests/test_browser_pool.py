@@ -0,0 +1,135 @@
+"""
+Copyright (c) 2025 LALO AI SYSTEMS, LLC. All rights reserved.
+
+PROPRIETARY AND CONFIDENTIAL
+
+This file is part of LALO AI Platform and is protected by copyright law.
+Unauthorized copying, modification, distribution, or use of this software,
+via any medium, is strictly prohibited without the express written permission
+of LALO AI SYSTEMS, LLC.
+"""
+
+import asyncio
+
+import pytest
+
+from services.browser_control.services.browser_pool import BrowserPool, PoolExhaustedError
+
+
+class FakePage:
+    url = "about:blank"
+
+    async def title(self):
+        return ""
+
+
+class FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+        self.closed = False
+
+    async def new_page(self):
+        return FakePage()
+
+    async def close(self):
+        self.closed = True
+        self.browser.open_contexts -= 1
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.open_contexts = 0
+        self.connected = True
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self):
+        self.open_contexts += 1
+        return FakeContext(self)
+
+    async def close(self):
+        self.connected = False
+
+
+def _pool(**kwargs):
+    launched = []
+
+    async def launcher():
+        browser = FakeBrowser()
+        launched.append(browser)
+        return browser
+
+    kwargs.setdefault("idle_timeout", 0)
+    return BrowserPool(launcher=launcher, **kwargs), launched
+
+
+def test_tabs_share_long_lived_browsers():
+    pool, launched = _pool(max_browsers=2, max_pages=4)
+
+    async def _run():
+        leases = [await pool.acquire() for _ in range(4)]
+        stats = pool.get_stats()
+        for lease in leases:
+            await pool.release(lease)
+        again = await pool.acquire()
+        return stats, again
+
+    stats, again = asyncio.run(_run())
+
+    assert len(launched) == 2  # 4 tabs, 2 browser processes
+    assert sum(b.open_contexts for b in launched) == 1  # released contexts were closed
+    assert stats["pages_in_use"] == 4
+    assert stats["utilization"] == 1.0
+    assert stats["acquire_latency_ms"]["max"] >= 0.0
+    assert pool.get_stats()["launches"] == 2
+    assert again.page is not None
+
+
+def test_page_cap_blocks_then_times_out():
+    pool, _ = _pool(max_browsers=1, max_pages=1)
+
+    async def _run():
+        first = await pool.acquire()
+        with pytest.raises(PoolExhaustedError):
+            await pool.acquire(timeout=0.05)
+
+        waiter = asyncio.create_task(pool.acquire(timeout=1.0))
+        await asyncio.sleep(0.01)
+        await pool.release(first)
+        return await waiter
+
+    second = asyncio.run(_run())
+    assert second.context.closed is False
+    assert pool.get_stats()["timeouts"] == 1
+
+
+def test_idle_leases_are_reaped():
+    pool, launched = _pool(max_browsers=1, max_pages=2)
+    pool.idle_timeout = 0.01
+    reaped = []
+    pool.on_reap(reaped.append)
+
+    async def _run():
+        await pool.acquire(lease_id="idle")
+        busy = await pool.acquire(lease_id="busy")
+        await asyncio.sleep(0.03)
+        busy.touch()
+        return await pool.reap_idle()
+
+    assert asyncio.run(_run()) == 1
+    assert reaped == ["idle"]
+    assert pool.get_lease("busy") is not None
+    assert launched[0].open_contexts == 1
+
+
+def test_crashed_browser_is_replaced():
+    pool, launched = _pool(max_browsers=1, max_pages=4)
+
+    async def _run():
+        await pool.acquire()
+        launched[0].connected = False
+        return await pool.acquire()
+
+    asyncio.run(_run())
+    assert len(launched) == 2
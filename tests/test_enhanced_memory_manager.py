@@ -0,0 +1,236 @@
+"""
+Copyright (c) 2025 LALO AI SYSTEMS, LLC. All rights reserved.
+
+PROPRIETARY AND CONFIDENTIAL
+
+This file is part of LALO AI Platform and is protected by copyright law.
+Unauthorized copying, modification, distribution, or use of this software,
+via any medium, is strictly prohibited without the express written permission
+of LALO AI SYSTEMS, LLC.
+"""
+
+import gc
+import importlib
+import sys
+import threading
+import types
+import weakref
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("chromadb")
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _module():
+    # The root modules use package-relative imports
+    if "lalo_root" not in sys.modules:
+        package = types.ModuleType("lalo_root")
+        package.__path__ = [str(ROOT)]
+        sys.modules["lalo_root"] = package
+    return importlib.import_module("lalo_root.enhanced_memory_manager")
+
+
+class FakePermanentMemory:
+    """
+    Records Chroma writes; fails the next `fail` store_workflows calls, any
+    write containing a marker in `poison`, and the next `fail_training`
+    training-data writes
+    """
+
+    def __init__(self, persist_directory=None):
+        self.batches = []
+        self.records = {}
+        self.writes = 0
+        self.fail = 0
+        self.poison = set()
+        self.fail_training = 0
+        self.lock = threading.Lock()
+
+    def store_workflows(self, sessions, ids=None):
+        with self.lock:
+            if self.fail:
+                self.fail -= 1
+                raise RuntimeError("chroma unavailable")
+            if any(s["marker"] in self.poison for s in sessions):
+                raise ValueError("unserializable session")
+            self.batches.append([s["marker"] for s in sessions])
+            self.writes += len(sessions)
+            self.records.update(zip(ids, (s["marker"] for s in sessions)))
+
+    def store_training_data_batch(self, items, ids=None):
+        with self.lock:
+            if self.fail_training:
+                self.fail_training -= 1
+                raise RuntimeError("chroma unavailable")
+
+    def _calculate_success_rate(self, session_data):
+        return 0.0
+
+
+class FakeAudit:
+    def log_workflow_step(self, *args):
+        pass
+
+    def log_feedback(self, *args):
+        pass
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    module = _module()
+    monkeypatch.setattr(module, "PermanentMemory", FakePermanentMemory)
+    monkeypatch.setattr(module, "AuditLogger", FakeAudit)
+    managers = []
+
+    def make(**kwargs):
+        kwargs.setdefault("commit_retry_wait", 0.0)
+        memory = module.SessionMemory(warm_path=str(tmp_path / "warm.db"))
+        m = module.EnhancedMemoryManager(str(tmp_path / "chroma"), session_memory=memory, **kwargs)
+        managers.append(m)
+        return m
+
+    yield make
+    for m in managers:
+        m.close()
+
+
+def _session(m, marker):
+    session_id = m.start_session()
+    m.get_session(session_id)["marker"] = marker
+    return session_id
+
+
+def test_commits_are_batched_and_leave_session_memory(manager):
+    m = manager(commit_batch_size=8, commit_batch_wait=0.5)
+    ids = [_session(m, i) for i in range(5)]
+    for session_id in ids:
+        m.commit_session(session_id)
+    m.flush()
+
+    assert m.permanent_memory.batches == [[0, 1, 2, 3, 4]]
+    assert all(m.get_session(session_id) is None for session_id in ids)
+
+
+def test_duplicate_commit_is_written_once(manager):
+    m = manager(commit_batch_wait=0.2)
+    session_id = _session(m, "a")
+    m.commit_session(session_id)
+    m.commit_session(session_id)
+    m.flush()
+    m.commit_session(session_id)
+    m.flush()
+
+    assert m.permanent_memory.batches == [["a"]]
+
+
+def test_failed_commit_is_retried_and_keeps_the_session(manager):
+    m = manager(commit_retries=2)
+    m.permanent_memory.fail = 2
+    session_id = _session(m, "a")
+    m.commit_session(session_id)
+    m.flush()
+
+    assert m.permanent_memory.batches == [["a"]]
+    assert m.get_session(session_id) is None
+    assert not m.failed_commits
+
+
+def test_session_survives_when_retries_run_out(manager):
+    m = manager(commit_retries=1)
+    m.permanent_memory.fail = 5
+    session_id = _session(m, "a")
+    m.commit_session(session_id)
+    m.flush()
+
+    assert m.permanent_memory.batches == []
+    assert m.failed_commits == {session_id}
+    assert m.get_session(session_id)["marker"] == "a"
+
+    m.permanent_memory.fail = 0
+    assert m.retry_failed_commits() == 1
+    m.flush()
+    assert m.permanent_memory.batches == [["a"]]
+    assert not m.failed_commits and m.get_session(session_id) is None
+
+
+def test_retry_after_a_partial_write_overwrites_instead_of_duplicating(manager):
+    m = manager(commit_retries=2)
+    m.permanent_memory.fail_training = 1  # workflows land, training data fails
+    session_id = _session(m, "a")
+    m.commit_session(session_id)
+    m.flush()
+
+    assert m.permanent_memory.writes == 2
+    assert m.permanent_memory.records == {session_id: "a"}
+    assert m.get_session(session_id) is None and not m.failed_commits
+
+
+def test_bad_session_does_not_fail_its_batch(manager):
+    m = manager(commit_batch_size=8, commit_batch_wait=0.5, commit_retries=1)
+    m.permanent_memory.poison = {"bad"}
+    ids = [_session(m, marker) for marker in ("a", "bad", "b")]
+    for session_id in ids:
+        m.commit_session(session_id)
+    m.flush()
+
+    assert sorted(m.permanent_memory.records.values()) == ["a", "b"]
+    assert m.failed_commits == {ids[1]}
+    assert m.get_session(ids[0]) is None and m.get_session(ids[2]) is None
+    assert m.get_session(ids[1])["marker"] == "bad"
+
+
+
+def test_steps_recorded_during_a_write_are_rejected_not_lost(manager):
+    m = manager(commit_retries=0)
+    session_id = _session(m, "a")
+    writing, release = threading.Event(), threading.Event()
+    store_workflows = m.permanent_memory.store_workflows
+
+    def slow_failing_store(sessions, ids=None):
+        writing.set()
+        release.wait(5)
+        store_workflows(sessions, ids)
+
+    m.permanent_memory.store_workflows = slow_failing_store
+    m.permanent_memory.fail = 1
+    m.commit_session(session_id)
+    assert writing.wait(5)
+    with pytest.raises(_module().SessionCommitInProgressError):
+        m.record_step(session_id, {"step": "late"})
+    release.set()
+    m.flush()
+
+    # The failed write put the session back, and appends work again
+    assert m.failed_commits == {session_id}
+    m.record_step(session_id, {"step": "retried"})
+    assert m.get_session(session_id)["workflow_steps"] == [{"step": "retried"}]
+
+def test_close_writes_queued_commits_and_later_ones_synchronously(manager):
+    m = manager(commit_batch_wait=5.0)
+    first = _session(m, "queued")
+    late = _session(m, "late")
+    m.commit_session(first)
+    m.close()
+    assert m.permanent_memory.batches == [["queued"]]
+
+    m.commit_session(late)
+    assert m.permanent_memory.batches == [["queued"], ["late"]]
+    assert m.get_session(late) is None
+
+
+def test_closed_manager_can_be_collected(manager, tmp_path):
+    # The fixture only patches Chroma and audit; this manager must not stay referenced
+    module = _module()
+    memory = module.SessionMemory(warm_path=str(tmp_path / "warm.db"))
+    m = module.EnhancedMemoryManager(str(tmp_path / "chroma"), session_memory=memory)
+    assert m in module._open_managers
+
+    m.close()
+    assert m not in module._open_managers
+    ref = weakref.ref(m)
+    del m
+    gc.collect()
+    assert ref() is None
@@ -0,0 +1,148 @@
+"""
+Copyright (c) 2025 LALO AI SYSTEMS, LLC. All rights reserved.
+
+PROPRIETARY AND CONFIDENTIAL
+
+This file is part of LALO AI Platform and is protected by copyright law.
+Unauthorized copying, modification, distribution, or use of this software,
+via any medium, is strictly prohibited without the express written permission
+of LALO AI SYSTEMS, LLC.
+"""
+
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import core.services.response_log as response_log_module
+from core.database import Base, RoutedResponse
+from core.services.route_classifier import RouteClassifier, embed_request
+from core.services.router_model import RouterModel
+from core.services.unified_request_handler import UnifiedRequestHandler
+
+SIMPLE = ["what is the capital of france", "who is the president", "define entropy", "hello there"]
+COMPLEX = ["design a microservice architecture for payments", "research and compare three databases",
+           "write a business strategy for a bakery", "analyze our sales data and create a plan"]
+
+
+class FakeConfidence:
+    def __init__(self):
+        self.calls = []
+
+    async def score(self, output, original_request, model_used=None, **kwargs):
+        self.calls.append(output)
+        return {"confidence": 0.9, "recommendation": "accept"}
+
+
+class FakeOrchestrator:
+    def __init__(self):
+        self.confidence = FakeConfidence()
+        self.generations = 0
+        self.score_flags = []
+
+    async def execute_simple_request(self, user_request, routing_decision, user_id, available_models, score=True):
+        self.generations += 1
+        self.score_flags.append(score)
+        result = {"response": "Paris", "model": "tinyllama", "path": "simple", "usage": None}
+        if score:
+            confidence = await self.confidence.score(output="Paris", original_request=user_request)
+            return {**result, "confidence": confidence["confidence"], "confidence_details": confidence}
+        return {**result, "confidence": None, "confidence_details": {"status": "pending"}}
+
+
+class CountingRouter(RouterModel):
+    def __init__(self):
+        super().__init__()
+        self.llm_routes = 0
+
+    async def route(self, user_request, context=None):
+        self.llm_routes += 1
+        return {"path": "simple", "complexity": 0.1, "confidence": 0.9, "recommended_model": "tinyllama"}
+
+
+@pytest.fixture(autouse=True)
+def response_db(monkeypatch):
+    """
+    Keep the handler's RoutedResponse rows out of ./lalo.db; the route
+    classifier trains on that table, so test requests would become labels
+    """
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine, tables=[RoutedResponse.__table__])
+    monkeypatch.setattr(response_log_module, "SessionLocal", sessionmaker(bind=engine))
+    yield engine
+    engine.dispose()
+
+
+def make_handler():
+    handler = UnifiedRequestHandler()
+    handler.router = CountingRouter()
+    handler.router.classifier = RouteClassifier()  # heuristics only
+    handler.orchestrator = FakeOrchestrator()
+    return handler
+
+
+def test_embedding_is_stable_and_normalized():
+    vector = embed_request("What is the capital of France?")
+    assert abs(float((vector ** 2).sum()) - 1.0) < 1e-5
+    assert (vector == embed_request("what is the capital of france")).all()
+    assert not embed_request("").any()
+
+
+def test_classifier_fits_saves_and_loads(tmp_path):
+    router = RouterModel()
+    texts = SIMPLE + COMPLEX
+    labels = ["simple"] * len(SIMPLE) + ["complex"] * len(COMPLEX)
+    classifier = RouteClassifier().fit(texts, [router.heuristic_features(t) for t in texts], labels)
+    path = str(tmp_path / "route_classifier.npz")
+    classifier.save(path)
+    router.classifier = RouteClassifier.load(path)
+
+    assert router.classifier.meta["examples"] == 8
+    for text, label in zip(texts, labels):
+        decision = router.fast_route(text)
+        assert decision["routing_method"] == "classifier"
+        assert decision["path"] == label
+    assert RouterModel().classify("") == router.fast_route("")  # empty requests stay heuristic
+
+
+def test_fast_path_answers_with_one_generation_and_scores_later():
+    handler = make_handler()
+
+    async def scenario():
+        result = await handler.handle_request("what is the capital of france", f"fast-{uuid.uuid4()}", ["tinyllama"], fast_path=True)
+        assert handler.router.llm_routes == 0
+        assert handler.orchestrator.generations == 1
+        assert handler.orchestrator.score_flags == [False]
+        assert result["confidence"] is None and result["metadata"]["fast_path"] is True
+        assert result["routing_decision"]["routing_method"] == "heuristic"
+
+        pending = handler.get_confidence(result["response_id"])
+        assert pending["path"] == "simple"
+        await handler.drain()
+        return result, pending
+
+    result, pending = asyncio.run(scenario())
+    scored = handler.get_confidence(result["response_id"])
+    assert pending["status"] in ("pending", "scored")
+    assert scored["status"] == "scored" and scored["confidence"] == 0.9
+    assert handler.orchestrator.confidence.calls == ["Paris"]
+
+
+def test_uncertain_requests_use_the_llm_router_and_score_inline():
+    handler = make_handler()
+
+    async def scenario():
+        # Heuristic says complex, so the fast path declines and the LLM router decides
+        result = await handler.handle_request("design a data platform architecture", f"slow-{uuid.uuid4()}", ["tinyllama"], fast_path=True)
+        await handler.drain()
+        return result
+
+    result = asyncio.run(scenario())
+    assert handler.router.llm_routes == 1
+    assert handler.orchestrator.score_flags == [True]
+    assert result["confidence"] == 0.9 and result["metadata"]["fast_path"] is False
+    record = handler.get_confidence(result["response_id"])
+    assert record["status"] == "scored" and record["routing_method"] == "llm"
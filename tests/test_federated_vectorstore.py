@@ -0,0 +1,122 @@
+"""
+Copyright (c) 2025 LALO AI SYSTEMS, LLC. All rights reserved.
+
+PROPRIETARY AND CONFIDENTIAL
+
+This file is part of LALO AI Platform and is protected by copyright law.
+Unauthorized copying, modification, distribution, or use of this software,
+via any medium, is strictly prohibited without the express written permission
+of LALO AI SYSTEMS, LLC.
+"""
+
+import asyncio
+import time
+
+from core.tools.rag_tool import RAGTool
+from core.vectorstores.federated_store import FederatedStore, rrf_fuse
+
+
+class SlowStore:
+    def __init__(self, ranked_ids, delay=0.0, fail=False):
+        self.ranked_ids = ranked_ids
+        self.delay = delay
+        self.fail = fail
+        self.added = []
+        self.deleted = []
+
+    async def initialize(self):
+        return
+
+    async def add_documents(self, documents, ids, metadatas):
+        self.added.extend(ids)
+
+    async def query(self, query_text, top_k=5, filter_metadata=None):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("backend down")
+        ids = self.ranked_ids[:top_k]
+        return {
+            "ids": [ids],
+            "documents": [[f"doc {i}" for i in ids]],
+            "metadatas": [[{"title": i} for i in ids]],
+            "distances": [[0.1 * n for n in range(len(ids))]],
+        }
+
+    async def count(self):
+        return len(self.ranked_ids)
+
+    async def get_sample(self, limit=100):
+        return {"metadatas": [{"title": i} for i in self.ranked_ids[:limit]]}
+
+    async def delete(self, ids):
+        self.deleted.extend(ids)
+
+
+def test_rrf_fuse_rewards_agreement():
+    fused = rrf_fuse([
+        ("chroma", {"ids": [["a", "b", "c"]], "documents": [["A", "B", "C"]], "metadatas": [[{}, {}, {}]]}),
+        ("qdrant", {"ids": [["b", "d"]], "documents": [["B", "D"]], "metadatas": [[{}, {}]]}),
+    ], top_k=3)
+
+    assert fused["ids"][0][0] == "b"
+    assert fused["sources"][0][0] == ["chroma", "qdrant"]
+    assert len(fused["ids"][0]) == 3
+    assert fused["scores"][0] == sorted(fused["scores"][0], reverse=True)
+
+
+def test_federated_query_runs_backends_concurrently():
+    store = FederatedStore({
+        "chroma": SlowStore(["a", "b"], delay=0.2),
+        "qdrant": SlowStore(["c", "a"], delay=0.2),
+    }, timeout=1.0)
+
+    start = time.perf_counter()
+    res = asyncio.run(store.query("q", top_k=3))
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.35  # max of backends, not the sum
+    assert res["ids"][0][0] == "a"
+    assert res["backends"]["chroma"]["status"] == "ok"
+    assert res["backends"]["qdrant"]["status"] == "ok"
+
+
+def test_federated_query_returns_partial_results():
+    store = FederatedStore({
+        "chroma": SlowStore(["a"], delay=0.0),
+        "qdrant": SlowStore(["z"], delay=1.0),
+        "broken": SlowStore(["x"], fail=True),
+    }, timeout=0.1)
+
+    res = asyncio.run(store.query("q"))
+
+    assert res["ids"][0] == ["a"]
+    assert res["backends"]["qdrant"]["status"] == "timeout"
+    assert res["backends"]["broken"]["status"] == "error"
+
+
+def test_federated_writes_and_deletes():
+    chroma, qdrant = SlowStore(["a"]), SlowStore(["b"])
+    store = FederatedStore({"chroma": chroma, "qdrant": qdrant}, write_backend="chroma")
+
+    asyncio.run(store.add_documents(["text"], ["new"], [{}]))
+    asyncio.run(store.delete(["a", "b"]))
+
+    assert chroma.added == ["new"] and qdrant.added == []
+    assert chroma.deleted == ["a", "b"] and qdrant.deleted == ["a", "b"]
+    assert asyncio.run(store.count()) == 2
+
+
+def test_rag_tool_reports_backend_status():
+    tool = RAGTool()
+    tool._store = FederatedStore({
+        "chroma": SlowStore(["a", "b"]),
+        "qdrant": SlowStore(["b"]),
+    })
+    tool._initialized = True
+
+    res = asyncio.run(tool._query_documents({"query": "anything"}))
+
+    assert res.success
+    assert res.output["documents"][0]["id"] == "b"
+    assert res.output["documents"][0]["distance"] is None
+    assert set(res.metadata["backends"]) == {"chroma", "qdrant"}
@@ -0,0 +1,144 @@
+"""
+Copyright (c) 2025 LALO AI SYSTEMS, LLC. All rights reserved.
+
+PROPRIETARY AND CONFIDENTIAL
+
+This file is part of LALO AI Platform and is protected by copyright law.
+Unauthorized copying, modification, distribution, or use of this software,
+via any medium, is strictly prohibited without the express written permission
+of LALO AI SYSTEMS, LLC.
+"""
+
+import json
+import os
+import time
+
+import core.services.local_llm_service as llm_module
+from core.services.hardware_tuner import HardwareProfile, HardwareTuner, detect_hardware, parse_cpu_list
+from core.services.local_llm_service import LocalInferenceServer
+
+GIB = 1024**3
+
+
+def _profile(physical=16, logical=32, nodes=None):
+    return HardwareProfile(physical, logical, nodes or [], 64 * GIB)
+
+
+class FakeBenchModel:
+    """Sleeps as if generating at a speed that depends on threads/batch"""
+
+    GEN_RATE = {1: 100, 2: 180, 3: 240, 4: 300}  # tokens/sec by thread count
+    PREFILL_RATE = {128: 2000, 256: 4000, 512: 3000}  # prompt tokens/sec by batch
+
+    def __init__(self, n_threads, n_batch):
+        self.n_threads, self.n_batch = n_threads, n_batch
+
+    def __call__(self, prompt, max_tokens, temperature):
+        if prompt == "Hi":
+            return {"usage": {"prompt_tokens": 1, "completion_tokens": 1}}
+        prompt_tokens = 200
+        time.sleep(max_tokens / self.GEN_RATE[self.n_threads] + prompt_tokens / self.PREFILL_RATE[self.n_batch])
+        return {"usage": {"prompt_tokens": prompt_tokens, "completion_tokens": max_tokens}}
+
+
+def test_detects_numa_nodes_from_sysfs(tmp_path):
+    for node, cpus in (("node0", "0-3,8-11\n"), ("node1", "4-7,12-15\n")):
+        (tmp_path / node).mkdir()
+        (tmp_path / node / "cpulist").write_text(cpus)
+
+    profile = detect_hardware(node_root=str(tmp_path))
+
+    assert parse_cpu_list("0-3,8-11") == [0, 1, 2, 3, 8, 9, 10, 11]
+    assert profile.numa_nodes == [[0, 1, 2, 3, 8, 9, 10, 11], [4, 5, 6, 7, 12, 13, 14, 15]]
+    assert profile.physical_cores >= 1 and profile.memory_total_bytes > 0
+
+
+def test_thread_budget_splits_cores_within_a_numa_node(tmp_path):
+    single = HardwareTuner(str(tmp_path / "t.json"), profile=_profile())
+    assert [single.thread_budget(n) for n in (1, 2, 3)] == [16, 8, 5]
+
+    # Two sockets: one model never spans both nodes
+    dual = HardwareTuner(str(tmp_path / "t.json"), profile=_profile(nodes=[list(range(16)), list(range(16, 32))]))
+    assert dual.thread_budget(1) == 8 and dual.thread_budget(2) == 8
+
+    small = HardwareTuner(str(tmp_path / "t.json"), profile=_profile(physical=4, logical=4), reserved_cores=1)
+    assert small.thread_budget(1) == 3 and small.thread_budget(4) == 1
+
+
+def test_context_shrinks_when_kv_cache_does_not_fit(tmp_path):
+    tuner = HardwareTuner(str(tmp_path / "t.json"), profile=_profile())
+    weights = 4 * GIB  # ~512KB of KV cache per token
+
+    assert tuner.context_size(4096, weights, available_bytes=32 * GIB) == 4096
+    assert tuner.context_size(4096, weights, available_bytes=4 * GIB + 1200 * 1024**2) == 1024
+    assert tuner.context_size(4096, weights, available_bytes=GIB) == 512
+
+
+def test_context_budget_includes_logits_buffer(tmp_path):
+    tuner = HardwareTuner(str(tmp_path / "t.json"), profile=_profile())
+    weights = 4 * GIB
+    logits = 4 * 32000  # logits_all: float32 per vocabulary entry and position
+
+    assert tuner.context_size(4096, weights, available_bytes=9 * GIB) == 4096
+    assert tuner.context_size(4096, weights, available_bytes=9 * GIB, extra_bytes_per_token=logits) == 2048
+
+
+def test_calibration_picks_fastest_settings_and_persists(tmp_path):
+    settings_path = tmp_path / "tuning.json"
+    weights = tmp_path / "m.gguf"
+    weights.write_bytes(b"\0" * 1024)
+    tuner = HardwareTuner(str(settings_path), profile=_profile(physical=4, logical=8))
+
+    entry = tuner.calibrate("m", str(weights), FakeBenchModel, max_tokens=8)
+
+    assert entry["n_threads"] == 4 and entry["n_batch"] == 256
+    assert [r["n_threads"] for r in entry["runs"][:4]] == [1, 2, 3, 4]
+    assert json.loads(settings_path.read_text())["m"]["n_batch"] == 256
+
+    # A fresh process reuses the result, capped by the share of the cores
+    reloaded = HardwareTuner(str(settings_path), profile=_profile(physical=4, logical=8))
+    assert reloaded.settings_for("m", str(weights), 2048)["source"] == "calibrated"
+    assert reloaded.settings_for("m", str(weights), 2048, concurrent=2)["n_threads"] == 2
+
+    # Other hardware, or a re-downloaded file, invalidates it
+    other = HardwareTuner(str(settings_path), profile=_profile(physical=8, logical=16))
+    assert other.settings_for("m", str(weights), 2048) == {"n_threads": 8, "n_batch": 512, "n_ctx": 2048, "source": "hardware"}
+    weights.write_bytes(b"\0" * 2048)
+    assert reloaded.calibrated("m", os.path.getsize(weights)) is None
+
+
+class FakeLlama:
+    def __init__(self, model_path, **kwargs):
+        self.kwargs = kwargs
+        self.n_threads = kwargs["n_threads"]
+
+
+def test_resident_models_split_and_rebalance_threads(tmp_path, monkeypatch):
+    monkeypatch.setattr(llm_module, "LLAMA_CPP_AVAILABLE", True)
+    monkeypatch.setattr(llm_module, "Llama", FakeLlama, raising=False)
+    monkeypatch.setattr(llm_module, "hardware_tuner", HardwareTuner(str(tmp_path / "t.json"), profile=_profile(physical=8, logical=16)))
+
+    def _set_threads(model, n_threads):
+        model.n_threads = n_threads
+        return True
+
+    monkeypatch.setattr(llm_module, "set_model_threads", _set_threads)
+    server = LocalInferenceServer(model_dir=str(tmp_path))
+    for name in ("qwen-0.5b", "tinyllama"):
+        path = tmp_path / server.model_configs[name]["path"]
+        path.parent.mkdir(parents=True)
+        path.write_bytes(b"\0" * 1024)
+
+    try:
+        assert server.load_model("qwen-0.5b")
+        assert server.models["qwen-0.5b"].n_threads == 8
+
+        assert server.load_model("tinyllama")
+        assert server.models["tinyllama"].kwargs["n_threads"] == 4
+        assert server.models["qwen-0.5b"].n_threads == 4  # shrunk so the two don't contend
+
+        server.unload_model("tinyllama")
+        assert server.models["qwen-0.5b"].n_threads == 8
+        assert server.model_settings["qwen-0.5b"]["n_threads"] == 8
+    finally:
+        server.executor.shutdown(wait=False)
@@ -0,0 +1,157 @@
+"""
+Copyright (c) 2025 LALO AI SYSTEMS, LLC. All rights reserved.
+
+PROPRIETARY AND CONFIDENTIAL
+
+This file is part of LALO AI Platform and is protected by copyright law.
+Unauthorized copying, modification, distribution, or use of this software,
+via any medium, is strictly prohibited without the express written permission
+of LALO AI SYSTEMS, LLC.
+"""
+
+import asyncio
+
+from core.tools.rag_tool import RAGTool
+from core.vectorstores.bm25_index import BM25Index, tokenize
+from core.vectorstores.hybrid_store import HybridStore
+
+
+class NoMatchVectorStore:
+    """Dense store stand-in that only 'understands' semantics, never identifiers."""
+
+    def __init__(self):
+        self.docs = {}
+
+    async def initialize(self):
+        return
+
+    async def add_documents(self, documents, ids, metadatas):
+        for doc_id, doc, meta in zip(ids, documents, metadatas):
+            self.docs[doc_id] = (doc, meta)
+
+    async def query(self, query_text, top_k=5, filter_metadata=None):
+        ids = [i for i, (doc, _) in self.docs.items() if "pump" in doc.lower() and "pump" in query_text.lower()][:top_k]
+        return {
+            "ids": [ids],
+            "documents": [[self.docs[i][0] for i in ids]],
+            "metadatas": [[self.docs[i][1] for i in ids]],
+            "distances": [[0.2 + 0.1 * n for n in range(len(ids))]],
+        }
+
+    async def count(self):
+        return len(self.docs)
+
+    async def get_sample(self, limit=100):
+        return {"metadatas": [m for _, m in list(self.docs.values())[:limit]]}
+
+    async def delete(self, ids):
+        for i in ids:
+            self.docs.pop(i, None)
+
+
+def test_tokenize_keeps_identifiers():
+    terms = tokenize("Order MAT-10023 for plant 4711/01")
+    assert "mat-10023" in terms
+    assert "10023" in terms
+    assert "4711/01" in terms
+
+
+def test_bm25_ranks_exact_identifier(tmp_path):
+    index = BM25Index(index_dir=str(tmp_path))
+    index.add_documents(
+        ["Pump housing part MAT-10023 in stock", "Generic pump maintenance guide", "Valve MAT-20001 spec"],
+        ["a", "b", "c"],
+        [{"src": "sap"}, {"src": "docs"}, {"src": "sap"}],
+    )
+
+    res = index.search("MAT-10023", top_k=2)
+    assert res["ids"][0][0] == "a"
+
+    filtered = index.search("MAT", top_k=5, filter_metadata={"src": "sap"})
+    assert set(filtered["ids"][0]) == {"a", "c"}
+
+
+def test_bm25_persistence_and_incremental_sync(tmp_path):
+    index = BM25Index(index_dir=str(tmp_path), compact_every=2)
+    index.add_documents(["alpha SAP-1"], ["1"])
+    index.add_documents(["beta SAP-2"], ["2"])  # triggers compaction
+    index.delete(["1"])  # lands in journal after snapshot
+    index.add_documents(["gamma SAP-3"], ["3"])  # compacts again
+
+    reloaded = BM25Index(index_dir=str(tmp_path))
+    assert len(reloaded) == 2
+    assert reloaded.search("alpha")["ids"][0] == []
+    assert reloaded.search("sap-3")["ids"][0][0] == "3"
+
+    # Replaying a journal-only state also works
+    reloaded.delete(["2"])
+    again = BM25Index(index_dir=str(tmp_path))
+    assert again.search("beta")["ids"][0] == []
+    assert len(again) == 1
+
+
+
+def test_bm25_collections_do_not_share_an_index(tmp_path, monkeypatch):
+    monkeypatch.setenv("BM25_INDEX_DIR", str(tmp_path))
+    BM25Index(collection="parts").add_documents(["Pump housing MAT-10023"], ["a"])
+    BM25Index(collection="manuals").add_documents(["Pump maintenance guide"], ["b"])
+
+    assert BM25Index(collection="parts").search("pump")["ids"][0] == ["a"]
+    assert BM25Index(collection="manuals").search("pump")["ids"][0] == ["b"]
+
+
+def test_unreadable_snapshot_is_never_compacted_over(tmp_path):
+    index = BM25Index(index_dir=str(tmp_path))
+    index.add_documents(["alpha SAP-1"], ["1"])
+    index.compact()
+    snapshot = (tmp_path / "bm25.idx").read_bytes()
+    (tmp_path / "bm25.idx").write_bytes(b"BM25" + b"\xff" * 8)
+
+    damaged = BM25Index(index_dir=str(tmp_path), compact_every=1)
+    damaged.add_documents(["beta SAP-2"], ["2"])
+    damaged.compact()
+
+    assert (tmp_path / "bm25.idx").read_bytes() == b"BM25" + b"\xff" * 8
+    assert "beta" in (tmp_path / "bm25.journal").read_text()
+    (tmp_path / "bm25.idx").write_bytes(snapshot)
+    assert len(BM25Index(index_dir=str(tmp_path))) == 2
+
+def test_hybrid_store_fuses_lexical_and_dense(tmp_path):
+    index = BM25Index(index_dir=str(tmp_path))
+    store = HybridStore(NoMatchVectorStore(), index)
+    assert store._bm25 is index  # an empty injected index must not be replaced
+
+    async def _run():
+        await store.initialize()
+        await store.add_documents(
+            ["Pump housing part MAT-10023", "Pump overview", "Unrelated memo"],
+            ["p1", "p2", "m1"],
+            [{}, {}, {}],
+        )
+        rrf = await store.query("pump MAT-10023", top_k=2)
+        weighted = await store.query("pump MAT-10023", top_k=2, fusion="weighted")
+        dense_only = await store.query("MAT-10023", top_k=2, fusion="vector")
+        await store.delete(["p1"])
+        after_delete = await store.query("MAT-10023", top_k=2, fusion="bm25")
+        return rrf, weighted, dense_only, after_delete
+
+    rrf, weighted, dense_only, after_delete = asyncio.run(_run())
+
+    assert rrf["ids"][0][0] == "p1"
+    assert rrf["fusion"] == "rrf"
+    assert weighted["ids"][0][0] == "p1"
+    assert dense_only["ids"][0] == []
+    assert after_delete["ids"][0] == []
+
+
+def test_rag_tool_passes_fusion_option(tmp_path):
+    tool = RAGTool()
+    tool._store = HybridStore(NoMatchVectorStore(), BM25Index(index_dir=str(tmp_path)))
+    tool._initialized = True
+
+    asyncio.run(tool._index_documents({"documents": [{"content": "SAP code 4711-XY for pumps", "title": "sap"}]}))
+    res = asyncio.run(tool._query_documents({"query": "4711-XY", "fusion": "bm25"}))
+
+    assert res.success
+    assert res.output["count"] == 1
+    assert res.metadata["fusion"] == "bm25"
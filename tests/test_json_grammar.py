@@ -0,0 +1,157 @@
+"""
+Copyright (c) 2025 LALO AI SYSTEMS, LLC. All rights reserved.
+
+PROPRIETARY AND CONFIDENTIAL
+
+This file is part of LALO AI Platform and is protected by copyright law.
+Unauthorized copying, modification, distribution, or use of this software,
+via any medium, is strictly prohibited without the express written permission
+of LALO AI SYSTEMS, LLC.
+"""
+
+import asyncio
+import json
+import re
+
+import pytest
+
+import core.services.local_llm_service as llm_module
+from core.services.agent_orchestrator import plan_schema
+from core.services.confidence_model import SCORES_SCHEMA
+from core.services.json_grammar import schema_to_gbnf
+from core.services.local_llm_service import LocalInferenceServer
+from core.services.router_model import ROUTING_SCHEMA
+
+GBNF_TOKEN = re.compile(
+    r'\s*(?:(?P<lit>"(?:\\.|[^"\\])*")|(?P<cls>\[(?:\\.|[^\]\\])*\])|(?P<rep>\{\d*,?\d*\})'
+    r'|(?P<op>[()|?*+])|(?P<name>[a-zA-Z0-9-]+))'
+)
+
+
+def gbnf_regex(grammar: str) -> re.Pattern:
+    """Translate a non-recursive GBNF grammar into an equivalent regex (test oracle)"""
+    rules = dict(line.split(" ::= ", 1) for line in grammar.strip().splitlines())
+
+    def body(name):
+        out, text, pos = [], rules[name], 0
+        while pos < len(text.rstrip()):
+            m = GBNF_TOKEN.match(text, pos)
+            pos = m.end()
+            if m["lit"]:
+                out.append(re.escape(json.loads(m["lit"])))
+            elif m["cls"] or m["rep"]:
+                out.append(m["cls"] or m["rep"])
+            elif m["op"]:
+                out.append("(?:" if m["op"] == "(" else m["op"])
+            else:
+                out.append(f"(?:{body(m['name'])})")
+        return "".join(out)
+
+    return re.compile(body("root"), re.S)
+
+
+def accepts(schema, text):
+    return gbnf_regex(schema_to_gbnf(schema)).fullmatch(text) is not None
+
+
+def test_routing_grammar_allows_only_compact_schema_json():
+    decision = {
+        "complexity": 0.25, "confidence": 0.9, "path": "simple", "reasoning": "Short factual question",
+        "recommended_model": "tinyllama", "requires_tools": False, "requires_workflow": False,
+    }
+    assert accepts(ROUTING_SCHEMA, json.dumps(decision, separators=(",", ":")))
+    assert accepts(ROUTING_SCHEMA, json.dumps(decision))
+    assert not accepts(ROUTING_SCHEMA, json.dumps(decision, indent=2))  # no tokens spent on layout
+    assert not accepts(ROUTING_SCHEMA, json.dumps({**decision, "path": "other"}))
+    assert not accepts(ROUTING_SCHEMA, json.dumps({**decision, "reasoning": "x" * 201}))
+    assert not accepts(ROUTING_SCHEMA, json.dumps(decision) + "\nThat is my answer.")
+
+
+def test_plan_and_score_grammars():
+    step = {"id": 1, "action": "generate", "model": "tinyllama", "description": "Answer",
+            "dependencies": [], "parallel": False}
+    schema = plan_schema(["tinyllama", "qwen-0.5b"])
+    assert accepts(schema, json.dumps({"steps": [step, {**step, "id": 2, "dependencies": [1]}]}))
+    assert not accepts(schema, json.dumps({"steps": []}))
+    assert not accepts(schema, json.dumps({"steps": [{**step, "model": "gpt-9"}]}))
+
+    scores = {"factual": 0.9, "consistent": 1, "complete": 0.75, "grounded": 0.5,
+              "issues": ["cites \"no\" source"], "reasoning": "ok"}
+    assert accepts(SCORES_SCHEMA, json.dumps(scores))
+    assert not accepts(SCORES_SCHEMA, json.dumps({**scores, "factual": "high"}))
+
+
+def test_unsupported_schema_is_rejected():
+    with pytest.raises(ValueError):
+        schema_to_gbnf({"anyOf": [{"type": "string"}, {"type": "integer"}]})
+
+
+class FakeGrammar:
+    @classmethod
+    def from_string(cls, grammar, verbose=True):
+        instance = cls()
+        instance.text = grammar
+        return instance
+
+
+class FakeLlama:
+    def __init__(self, model_path, **kwargs):
+        self.outputs = []
+        self.calls = []
+
+    def __call__(self, prompt, max_tokens, **kwargs):
+        self.calls.append(kwargs)
+        text, tokens = self.outputs.pop(0)
+        return {"choices": [{"text": text}], "usage": {"completion_tokens": tokens}}
+
+
+def test_json_schema_generation_uses_grammar_and_tracks_savings(tmp_path, monkeypatch):
+    monkeypatch.setattr(llm_module, "LLAMA_CPP_AVAILABLE", True)
+    monkeypatch.setattr(llm_module, "Llama", FakeLlama, raising=False)
+    monkeypatch.setattr(llm_module, "LlamaGrammar", FakeGrammar, raising=False)
+    server = LocalInferenceServer(model_dir=str(tmp_path))
+    path = tmp_path / server.model_configs["phi-2"]["path"]
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b"\0" * 1024)
+
+    async def _run():
+        assert server.load_model("phi-2")
+        server.models["phi-2"].outputs = [('{"path":"simple"}', 60), ('{"path":"sim', 256)]
+        first = await server.generate("route", model_name="phi-2", max_tokens=256, json_schema=ROUTING_SCHEMA)
+        await server.generate("route", model_name="phi-2", max_tokens=256, json_schema=ROUTING_SCHEMA)
+        return first
+
+    try:
+        assert json.loads(asyncio.run(_run())) == {"path": "simple"}
+        grammar = server.models["phi-2"].calls[0]["grammar"]
+        assert grammar.text == schema_to_gbnf(ROUTING_SCHEMA)
+        assert server.structured_stats["phi-2"] == {
+            "requests": 2, "parse_failures": 1, "completion_tokens": 316, "tokens_saved": 196,
+        }
+    finally:
+        server.executor.shutdown(wait=False)
+
+
+class RejectingGrammar:
+    @classmethod
+    def from_string(cls, grammar, verbose=True):
+        raise ValueError("from_string: error parsing grammar file")
+
+
+def test_grammar_parse_errors_fail_like_generation_errors(tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(llm_module, "LLAMA_CPP_AVAILABLE", True)
+    monkeypatch.setattr(llm_module, "Llama", FakeLlama, raising=False)
+    monkeypatch.setattr(llm_module, "LlamaGrammar", RejectingGrammar, raising=False)
+    server = LocalInferenceServer(model_dir=str(tmp_path))
+    path = tmp_path / server.model_configs["phi-2"]["path"]
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b"\0" * 1024)
+
+    try:
+        assert server.load_model("phi-2")
+        with pytest.raises(RuntimeError, match="Generation failed: from_string"):
+            asyncio.run(server.generate_with_usage("route", model_name="phi-2", json_schema=ROUTING_SCHEMA))
+        assert "Generation failed with phi-2" in caplog.text
+        assert server.models["phi-2"].calls == []
+    finally:
+        server.executor.shutdown(wait=False)
@@ -0,0 +1,91 @@
+"""
+Copyright (c) 2025 LALO AI SYSTEMS, LLC. All rights reserved.
+
+PROPRIETARY AND CONFIDENTIAL
+
+This file is part of LALO AI Platform and is protected by copyright law.
+Unauthorized copying, modification, distribution, or use of this software,
+via any medium, is strictly prohibited without the express written permission
+of LALO AI SYSTEMS, LLC.
+"""
+
+import mmap
+import os
+
+import pytest
+
+import core.services.local_llm_service as llm_module
+from core.services.local_llm_service import LocalInferenceServer, mapped_file_memory
+
+SIZE = 2 * 1024 * 1024
+
+
+class FakeLlama:
+    """Maps the weights file read-only, like llama.cpp with use_mmap=True"""
+
+    def __init__(self, model_path, **kwargs):
+        self.kwargs = kwargs
+        self._file = open(model_path, "rb")
+        self.weights = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        sum(self.weights[i] for i in range(0, len(self.weights), 4096))
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    monkeypatch.setattr(llm_module, "LLAMA_CPP_AVAILABLE", True)
+    monkeypatch.setattr(llm_module, "Llama", FakeLlama, raising=False)
+    srv = LocalInferenceServer(model_dir=str(tmp_path))
+    for name in ("qwen-0.5b", "tinyllama"):
+        path = tmp_path / srv.model_configs[name]["path"]
+        path.parent.mkdir(parents=True)
+        path.write_bytes(os.urandom(SIZE))
+    yield srv
+    srv.executor.shutdown(wait=False)
+
+
+def test_models_load_memory_mapped_and_pinned_on_request(server, monkeypatch):
+    monkeypatch.setattr(llm_module, "MLOCK_MODELS", {"qwen-0.5b"})
+    monkeypatch.setattr(llm_module, "memlock_limit", lambda: None)
+
+    assert server.load_model("qwen-0.5b") and server.load_model("tinyllama")
+
+    assert server.models["qwen-0.5b"].kwargs["use_mmap"] is True
+    assert server.models["qwen-0.5b"].kwargs["use_mlock"] is True
+    assert server.models["tinyllama"].kwargs["use_mlock"] is False
+    models = server.get_memory_stats()["models"]
+    assert models["qwen-0.5b"]["mlock_requested"] and models["qwen-0.5b"]["mlocked"]
+    assert not models["tinyllama"]["mlock_requested"] and not models["tinyllama"]["mlocked"]
+
+
+def test_pinning_is_skipped_when_memlock_limit_is_too_low(server, monkeypatch):
+    monkeypatch.setattr(llm_module, "MLOCK_MODELS", {"qwen-0.5b"})
+    monkeypatch.setattr(llm_module, "memlock_limit", lambda: 64 * 1024)
+
+    assert server.load_model("qwen-0.5b")
+    assert server.models["qwen-0.5b"].kwargs["use_mlock"] is False
+    model = server.get_memory_stats()["models"]["qwen-0.5b"]
+    assert model["mlock_requested"] is True
+    assert model["mlocked"] is False
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/smaps"), reason="needs Linux smaps")
+def test_memory_stats_report_mapped_weights(server):
+    assert server.load_model("tinyllama")
+
+    stats = server.get_memory_stats()
+    model = stats["models"]["tinyllama"]
+    assert stats["rss_bytes"] > 0
+    assert model["file_bytes"] == SIZE
+    assert model["mapped_rss_bytes"] == SIZE
+    # Clean file-backed pages: reclaimable page cache, shareable across workers
+    assert model["mapped_shared_bytes"] + model["mapped_private_bytes"] == SIZE
+
+    server.unload_model("tinyllama")
+    assert server.get_memory_stats()["models"] == {}
+
+
+def test_mapped_file_memory_ignores_other_files(tmp_path):
+    path = tmp_path / "w.gguf"
+    path.write_bytes(b"\0" * 4096)
+    assert mapped_file_memory([str(path)]) == {}
+    assert mapped_file_memory([]) == {}
@@ -0,0 +1,119 @@
+"""
+Copyright (c) 2025 LALO AI SYSTEMS, LLC. All rights reserved.
+
+PROPRIETARY AND CONFIDENTIAL
+
+This file is part of LALO AI Platform and is protected by copyright law.
+Unauthorized copying, modification, distribution, or use of this software,
+via any medium, is strictly prohibited without the express written permission
+of LALO AI SYSTEMS, LLC.
+"""
+
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+
+redis = pytest.importorskip("redis")
+pytest.importorskip("grpc")
+pytest.importorskip("grpc_tools")
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _load_harness():
+    spec = importlib.util.spec_from_file_location(
+        "benchmark_mcp_transport", ROOT / "scripts" / "benchmark_mcp_transport.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+bench = _load_harness()
+
+
+@pytest.fixture
+def servers(tmp_path):
+    first, second = bench.FakeRedisServer().start(), bench.FakeRedisServer().start()
+    _, mcp_pb2, mcp_pb2_grpc = bench.load_mcp_packet({}, str(tmp_path))
+    grpc_server = bench.FakeMcpServer(mcp_pb2, mcp_pb2_grpc).start()
+    mcp_packet, _, _ = bench.load_mcp_packet({
+        "REDIS_PORT": first.port,
+        "GRPC_ENDPOINT": f"127.0.0.1:{grpc_server.port}",
+        "MAX_FRAGMENT_SIZE": 1024,
+        "PAYLOAD_SIZE_THRESHOLD": 1024,
+    }, str(tmp_path))
+    yield mcp_packet, first, second, grpc_server
+    grpc_server.stop()
+    first.stop()
+    second.stop()
+
+
+def _packet(mcp_packet, i, transports=None, size=16):
+    return mcp_packet.MCPPacket("agent", f"step-{i}", "tool", {"data": "x" * size}, f"mem:{i}",
+                                transports=transports)
+
+
+def _sent_steps(server):
+    return [json.loads(e[b"message"])["step_id"] for e in server.entries.get(b"mcp_stream", [])]
+
+
+def test_send_batch_uses_each_packets_own_transports(servers):
+    mcp_packet, first, second, _ = servers
+    other = mcp_packet.MCPTransportManager(redis_client=redis.Redis(port=second.port))
+    packets = [_packet(mcp_packet, i, other if i % 2 else None) for i in range(6)]
+
+    assert mcp_packet.send_batch(packets) == [True] * 6
+    assert _sent_steps(first) == ["step-0", "step-2", "step-4"]
+    assert _sent_steps(second) == ["step-1", "step-3", "step-5"]
+    other.close()
+
+
+def test_batch_pipelines_xadds(servers):
+    mcp_packet, first, _, _ = servers
+    mcp_packet.transport_manager.pipeline_batch_size = 50
+    packets = [_packet(mcp_packet, i) for i in range(200)]
+    mcp_packet.send_batch(packets[:1])
+    first.reset()
+
+    assert mcp_packet.send_batch(packets[1:]) == [True] * 199
+    assert first.stats["xadd"] == 199
+    # 4 pipelines; a pipeline may span more than one socket read
+    assert first.stats["reply_writes"] < 199 // 10
+
+
+def test_failed_pipeline_chunk_falls_back_only_for_unacknowledged_packets(servers):
+    mcp_packet, first, _, grpc_server = servers
+    mcp_packet.transport_manager.pipeline_batch_size = 50
+    packets = [_packet(mcp_packet, i) for i in range(120)]
+    first.xadd_limit = 60  # the second chunk is cut off part way
+
+    assert mcp_packet.send_batch(packets) == [True] * 120
+    in_stream = _sent_steps(first)
+    over_grpc = [json.loads(p)["step_id"] for p in grpc_server.packets]
+    assert in_stream == [f"step-{i}" for i in range(60)]
+    assert over_grpc == [f"step-{i}" for i in range(60, 120)]
+
+
+
+def test_batch_reports_undeliverable_packets_instead_of_raising(servers):
+    mcp_packet, first, _, grpc_server = servers
+    first.xadd_limit = 4
+    grpc_server.stop()
+
+    packets = [_packet(mcp_packet, i) for i in range(6)]
+    assert mcp_packet.send_batch(packets) == [True] * 4 + [False] * 2
+    assert _sent_steps(first) == [f"step-{i}" for i in range(4)]
+    # gRPC-bound packet whose Redis fallback is full too
+    assert mcp_packet.send_batch([_packet(mcp_packet, 6, size=5000)]) == [False]
+
+def test_large_packet_streams_fragments_over_grpc(servers):
+    mcp_packet, _, _, grpc_server = servers
+    packet = _packet(mcp_packet, 0, size=5000)
+
+    assert packet.send() is True
+    assert packet.transport == "grpc"
+    assert grpc_server.stats == {"stream_packet": 1}
+    assert grpc_server.packets == [packet.to_bytes()]
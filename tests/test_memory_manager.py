@@ -0,0 +1,195 @@
+"""
+Copyright (c) 2025 LALO AI SYSTEMS, LLC. All rights reserved.
+
+PROPRIETARY AND CONFIDENTIAL
+
+This file is part of LALO AI Platform and is protected by copyright law.
+Unauthorized copying, modification, distribution, or use of this software,
+via any medium, is strictly prohibited without the express written permission
+of LALO AI SYSTEMS, LLC.
+"""
+
+import gc
+import importlib
+import sys
+import threading
+import time
+import types
+import weakref
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("redis")
+pytest.importorskip("chromadb")
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _module():
+    # The root modules use package-relative imports
+    if "lalo_root" not in sys.modules:
+        package = types.ModuleType("lalo_root")
+        package.__path__ = [str(ROOT)]
+        sys.modules["lalo_root"] = package
+    return importlib.import_module("lalo_root.memory_manager")
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def set(self, key, value):
+        self.commands.append((key, value))
+
+    def execute(self):
+        self.redis.release.wait(5)
+        with self.redis.lock:
+            self.redis.pipelines.append(len(self.commands))
+            self.redis.data.update(self.commands)
+
+
+class FakeRedis:
+    """Pipelines block until `release` is set, holding the writer mid-batch"""
+
+    def __init__(self, *args, **kwargs):
+        self.data = {}
+        self.pipelines = []
+        self.lock = threading.Lock()
+        self.release = threading.Event()
+        self.release.set()
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def get(self, key):
+        return self.data.get(key)
+
+
+class FakeVector:
+    def __init__(self, *args, **kwargs):
+        self.upserts = []
+
+    def upsert_many(self, records):
+        self.upserts.append([r["id"] for r in records])
+
+
+class FakeEmbedder:
+    def __init__(self):
+        self.calls = []
+
+    def embed_batch(self, texts):
+        self.calls.append(len(texts))
+        return [[float(len(t))] for t in texts]
+
+
+class FakeAudit:
+    def __init__(self):
+        self.records = []
+
+    def record_memory(self, agent_id, redis_key, vector_id):
+        self.records.append(vector_id)
+
+
+@pytest.fixture
+def make_manager(monkeypatch):
+    # memory_manager imports a placeholder embedding module that is not a real package
+    embedders = types.ModuleType("Transformers")
+    embedders.OpenAIEmbedder = FakeEmbedder
+    monkeypatch.setitem(sys.modules, "Transformers", embedders)
+    module = _module()
+    monkeypatch.setattr(module.redis, "Redis", FakeRedis)
+    monkeypatch.setattr(module, "VectorClient", FakeVector)
+    monkeypatch.setattr(module, "OpenAIEmbedder", FakeEmbedder)
+    monkeypatch.setattr(module, "AuditLogger", FakeAudit)
+    managers = []
+
+    def make(**kwargs):
+        manager = module.MemoryManager(**kwargs)
+        managers.append(manager)
+        return manager
+
+    yield make
+    for manager in managers:
+        manager.redis.release.set()
+        manager.close()
+
+
+def _store(manager, agent_id):
+    return manager.store_session(agent_id, {"q": agent_id}, [{"step": agent_id}], [])
+
+
+def test_writes_are_batched_and_readable_before_persisted(make_manager):
+    manager = make_manager(batch_size=8, max_batch_wait=0.2)
+    manager.redis.release.clear()
+
+    ids = [_store(manager, f"agent-{i}") for i in range(20)]
+    assert manager.get_session("agent-5")["request"] == {"q": "agent-5"}
+
+    manager.redis.release.set()
+    manager.flush()
+    assert sorted(manager.redis.data) == sorted(f"session:agent-{i}" for i in range(20))
+    assert sum(manager.redis.pipelines) == 20
+    assert len(manager.redis.pipelines) < 20
+    assert max(manager.redis.pipelines) <= 8
+    assert sorted(i for batch in manager.vector.upserts for i in batch) == sorted(ids)
+    assert len(manager.embedder.calls) == len(manager.redis.pipelines)
+    assert sorted(manager.audit.records) == sorted(ids)
+
+
+def test_full_queue_writes_inline(make_manager):
+    manager = make_manager(queue_size=1, batch_size=1, enqueue_timeout=0.01)
+    manager.redis.release.clear()
+    _store(manager, "held")      # taken by the writer, blocked in Redis
+    time.sleep(0.1)
+    _store(manager, "queued")    # fills the queue
+
+    inline = threading.Thread(target=_store, args=(manager, "inline"))
+    inline.start()
+    time.sleep(0.1)
+    manager.redis.release.set()
+    inline.join(5)
+    manager.flush()
+    assert set(manager.redis.data) == {"session:held", "session:queued", "session:inline"}
+
+
+def test_store_racing_close_is_not_dropped(make_manager):
+    manager = make_manager()
+    in_put, stop_queued = threading.Event(), threading.Event()
+    put, stop = manager._queue.put, _module()._STOP
+
+    def slow_put(item, *args, **kwargs):
+        if item is stop:
+            stop_queued.set()
+        elif not in_put.is_set():
+            # Past the closed check; give close() the chance to queue _STOP first
+            in_put.set()
+            stop_queued.wait(0.5)
+        return put(item, *args, **kwargs)
+
+    manager._queue.put = slow_put
+    racing = threading.Thread(target=_store, args=(manager, "racing"))
+    racing.start()
+    in_put.wait(5)
+    manager.close()
+    racing.join(5)
+    assert "session:racing" in manager.redis.data
+
+    _store(manager, "after-close")
+    assert "session:after-close" in manager.redis.data
+
+
+def test_closed_manager_can_be_collected(make_manager):
+    # make_manager only patches the clients; this manager must not stay referenced
+    module = _module()
+    manager = module.MemoryManager()
+    _store(manager, "agent")
+    assert manager in module._open_managers
+
+    manager.close()
+    assert manager not in module._open_managers
+    ref = weakref.ref(manager)
+    del manager
+    gc.collect()
+    assert ref() is None
@@ -0,0 +1,293 @@
+"""
+Copyright (c) 2025 LALO AI SYSTEMS, LLC. All rights reserved.
+
+PROPRIETARY AND CONFIDENTIAL
+
+This file is part of LALO AI Platform and is protected by copyright law.
+Unauthorized copying, modification, distribution, or use of this software,
+via any medium, is strictly prohibited without the express written permission
+of LALO AI SYSTEMS, LLC.
+"""
+
+import asyncio
+import hashlib
+import os
+import threading
+from collections import namedtuple
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import core.services.model_downloader as downloader_module
+from core.services.model_downloader import InsufficientDiskSpaceError, ModelDownloadManager
+
+CHUNK = 64 * 1024
+BLOB = os.urandom(5 * CHUNK + 123)
+BLOB_SHA = hashlib.sha256(BLOB).hexdigest()
+
+
+class BlobServer:
+    """
+    Serves BLOB at /model.gguf with optional range support and failure injection
+
+    With redirect_etag, the URL is /resolve/model.gguf, which answers like a
+    Hugging Face resolve endpoint: a 302 carrying X-Linked-ETag to a CDN-style
+    response that only has its own ETag.
+    """
+
+    def __init__(self, ranges=True, fail_from=None, etag=BLOB_SHA, redirect_etag=None):
+        self.ranges = ranges
+        self.fail_from = fail_from  # byte offset from which range requests fail
+        self.etag = etag
+        self.redirect_etag = redirect_etag
+        self.requests = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _headers(self, code, start, end):
+                self.send_response(code)
+                self.send_header("Content-Length", str(end - start + 1))
+                if server.ranges:
+                    self.send_header("Accept-Ranges", "bytes")
+                if code == 206:
+                    self.send_header("Content-Range", f"bytes {start}-{end}/{len(BLOB)}")
+                if server.redirect_etag:
+                    self.send_header("ETag", '"cdn-object-etag"')
+                elif server.etag:
+                    self.send_header("X-Linked-ETag", f'"{server.etag}"')
+                self.end_headers()
+
+            def _redirected(self):
+                if not self.path.startswith("/resolve/"):
+                    return False
+                self.send_response(302)
+                self.send_header("Location", "/model.gguf")
+                self.send_header("X-Linked-ETag", f'"{server.redirect_etag}"')
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return True
+
+            def do_HEAD(self):
+                if not self._redirected():
+                    self._headers(200, 0, len(BLOB) - 1)
+
+            def do_GET(self):
+                if self._redirected():
+                    return
+                header = self.headers.get("Range")
+                server.requests.append(header)
+                with server.lock:
+                    server.active += 1
+                    server.max_active = max(server.max_active, server.active)
+                try:
+                    if header and server.ranges:
+                        start, end = (int(v) for v in header.split("=")[1].split("-"))
+                        if server.fail_from is not None and start >= server.fail_from:
+                            self.send_error(503)
+                            return
+                        self._headers(206, start, end)
+                        threading.Event().wait(0.02)  # keep connections overlapping
+                        self.wfile.write(BLOB[start:end + 1])
+                    else:
+                        self._headers(200, 0, len(BLOB) - 1)
+                        self.wfile.write(BLOB)
+                finally:
+                    with server.lock:
+                        server.active -= 1
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        path = "/resolve/model.gguf" if redirect_etag else "/model.gguf"
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}{path}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def blob_server():
+    servers = []
+
+    def _start(**kwargs):
+        server = BlobServer(**kwargs)
+        servers.append(server)
+        return server
+
+    yield _start
+    for server in servers:
+        server.close()
+
+
+def _manager(**kwargs):
+    return ModelDownloadManager(
+        **{"connections_per_file": 3, "chunk_size": CHUNK, "min_free_bytes": 0, "retries": 0, **kwargs}
+    )
+
+
+async def _download(manager, url, dest, **kwargs):
+    job = await manager.enqueue("test-model", url, str(dest), **kwargs)
+    await manager.wait("test-model", timeout=20)
+    await manager.shutdown()
+    return job
+
+
+def test_parallel_chunked_download_is_verified(blob_server, tmp_path):
+    server = blob_server()
+    dest = tmp_path / "test-model" / "model.gguf"
+
+    job = asyncio.run(_download(_manager(), server.url, dest))
+
+    assert job.status == "downloaded", job.error
+    assert job.sha256 == BLOB_SHA  # taken from X-Linked-ETag
+    assert dest.read_bytes() == BLOB
+    assert not os.path.exists(job.part_path) and not os.path.exists(job.state_path)
+    assert len([r for r in server.requests if r]) == 6
+    assert server.max_active > 1
+    assert job.to_dict()["downloaded_bytes"] == len(BLOB)
+
+
+def test_checksum_is_taken_from_the_resolve_redirect(blob_server, tmp_path):
+    server = blob_server(redirect_etag=BLOB_SHA)
+    dest = tmp_path / "model.gguf"
+
+    job = asyncio.run(_download(_manager(), server.url, dest))
+
+    assert job.status == "downloaded", job.error
+    assert job.sha256 == BLOB_SHA and job.etag == BLOB_SHA
+    assert dest.read_bytes() == BLOB
+
+
+def test_redirected_checksum_mismatch_is_rejected(blob_server, tmp_path):
+    server = blob_server(redirect_etag="0" * 64)
+    job = asyncio.run(_download(_manager(), server.url, tmp_path / "model.gguf"))
+
+    assert job.status == "error" and "SHA-256 mismatch" in job.error
+
+
+def test_interrupted_download_resumes_missing_ranges(blob_server, tmp_path):
+    dest = tmp_path / "model.gguf"
+
+    # First attempt: everything from the third chunk on fails
+    broken = blob_server(fail_from=2 * CHUNK)
+    first = asyncio.run(_download(_manager(), broken.url, dest))
+    assert first.status == "error"
+    assert os.path.getsize(first.part_path) == len(BLOB)
+    first_attempt = len(broken.requests)
+
+    # Server recovers: only the missing chunks are requested
+    broken.fail_from = None
+    second = asyncio.run(_download(_manager(), broken.url, dest))
+    assert second.status == "downloaded", second.error
+    assert second.resumed_bytes == 2 * CHUNK
+    assert dest.read_bytes() == BLOB
+
+    retried = broken.requests[first_attempt:]
+    assert len(retried) == 4
+    assert f"bytes=0-{CHUNK - 1}" not in retried
+    assert f"bytes={CHUNK}-{2 * CHUNK - 1}" not in retried
+
+
+def test_checksum_mismatch_discards_partial_file(blob_server, tmp_path):
+    server = blob_server(etag=None)
+    dest = tmp_path / "model.gguf"
+
+    job = asyncio.run(_download(_manager(), server.url, dest, sha256="0" * 64))
+
+    assert job.status == "error"
+    assert "SHA-256 mismatch" in job.error
+    assert not dest.exists() and not os.path.exists(job.part_path)
+
+
+def test_server_without_ranges_streams_whole_file(blob_server, tmp_path):
+    server = blob_server(ranges=False)
+    dest = tmp_path / "model.gguf"
+
+    job = asyncio.run(_download(_manager(), server.url, dest))
+
+    assert job.status == "downloaded", job.error
+    assert server.requests == [None]
+    assert dest.read_bytes() == BLOB
+
+
+def test_disk_space_preflight(blob_server, tmp_path, monkeypatch):
+    server = blob_server()
+    usage = namedtuple("usage", "total used free")
+    monkeypatch.setattr(downloader_module.shutil, "disk_usage", lambda path: usage(10**9, 10**9, len(BLOB) // 2))
+
+    async def _run():
+        with pytest.raises(InsufficientDiskSpaceError):
+            await _manager().enqueue("test-model", server.url, str(tmp_path / "model.gguf"))
+
+    asyncio.run(_run())
+    assert server.requests == []  # nothing was downloaded
+
+
+def test_preflight_counts_completed_chunks_not_the_preallocated_part(blob_server, tmp_path, monkeypatch):
+    dest = tmp_path / "model.gguf"
+    broken = blob_server(fail_from=2 * CHUNK)
+    assert asyncio.run(_download(_manager(), broken.url, dest)).status == "error"
+
+    # Two of six chunks are on disk although .part already has the full length
+    usage = namedtuple("usage", "total used free")
+    free = len(BLOB) - 2 * CHUNK - 1
+    monkeypatch.setattr(downloader_module.shutil, "disk_usage", lambda path: usage(10**9, 10**9, free))
+
+    async def _run():
+        with pytest.raises(InsufficientDiskSpaceError, match=f"needs {len(BLOB) - 2 * CHUNK} bytes"):
+            await _manager().enqueue("test-model", broken.url, str(dest))
+
+    asyncio.run(_run())
+
+
+def test_concurrent_enqueue_starts_one_download(blob_server, tmp_path, monkeypatch):
+    server = blob_server()
+    manager = _manager()
+    probe = manager._probe
+    probes = []
+
+    async def slow_probe(job):
+        probes.append(job)
+        await asyncio.sleep(0.1)
+        await probe(job)
+
+    monkeypatch.setattr(manager, "_probe", slow_probe)
+
+    async def _run():
+        first, second = await asyncio.gather(
+            manager.enqueue("test-model", server.url, str(tmp_path / "model.gguf")),
+            manager.enqueue("test-model", server.url, str(tmp_path / "model.gguf")),
+        )
+        await manager.wait("test-model", timeout=20)
+        await manager.shutdown()
+        return first, second
+
+    first, second = asyncio.run(_run())
+    assert first is second and len(probes) == 1
+    assert first.status == "downloaded", first.error
+
+
+def test_status_endpoint_reports_byte_progress(client, monkeypatch):
+    import core.routes.model_management_routes as routes
+
+    manager = ModelDownloadManager()
+    job = downloader_module.DownloadJob(
+        model_name="tinyllama", url="http://example.invalid/x", dest_path="/nonexistent/x.gguf",
+        status="error", total_bytes=1000, downloaded_bytes=250, error="connection reset",
+    )
+    manager.jobs["tinyllama"] = job
+    monkeypatch.setattr(routes, "model_download_manager", manager)
+
+    body = client.get("/api/admin/models/tinyllama/status").json()
+
+    assert body["status"] == "error"
+    assert body["downloaded_bytes"] == 250 and body["total_bytes"] == 1000
+    assert body["progress"] == 25.0
+    assert body["error"] == "connection reset"
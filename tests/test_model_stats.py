@@ -0,0 +1,99 @@
+"""
+Copyright (c) 2025 LALO AI SYSTEMS, LLC. All rights reserved.
+
+PROPRIETARY AND CONFIDENTIAL
+
+This file is part of LALO AI Platform and is protected by copyright law.
+Unauthorized copying, modification, distribution, or use of this software,
+via any medium, is strictly prohibited without the express written permission
+of LALO AI SYSTEMS, LLC.
+"""
+
+import asyncio
+import os
+import threading
+
+import pytest
+
+from core.services.model_stats import ModelStatsCollector
+
+
+@pytest.fixture
+def collector(tmp_path):
+    (tmp_path / "a").mkdir()
+    (tmp_path / "a" / "a.gguf").write_bytes(b"x" * 1000)
+    (tmp_path / "other.bin").write_bytes(b"y" * 24)
+    paths = {"a": str(tmp_path / "a" / "a.gguf"), "b": str(tmp_path / "b" / "b.gguf")}
+    stats = ModelStatsCollector(str(tmp_path), lambda: paths, refresh_seconds=3600)
+    yield stats
+    stats.close()
+
+
+def test_snapshot_is_cached_between_refreshes(collector, monkeypatch):
+    first = collector.snapshot()
+    assert first["models"]["a"] == {"path": first["models"]["a"]["path"], "on_disk": True, "size_bytes": 1000}
+    assert first["models"]["b"]["on_disk"] is False
+    assert first["disk_used_bytes"] == 1024
+    assert first["timestamp"]
+
+    # Serving the snapshot touches neither the filesystem nor psutil
+    def _forbidden(*args, **kwargs):
+        raise AssertionError("stats were recomputed on read")
+
+    monkeypatch.setattr(os, "scandir", _forbidden)
+    monkeypatch.setattr(os, "stat", _forbidden)
+    for _ in range(100):
+        assert collector.snapshot() is first
+    assert collector.full_refreshes == 1
+
+
+def test_model_event_refreshes_only_that_model(collector, tmp_path):
+    before = collector.snapshot()
+
+    (tmp_path / "b").mkdir()
+    (tmp_path / "b" / "b.gguf").write_bytes(b"z" * 500)
+    collector.invalidate("b")
+    assert collector.flush(timeout=5)
+
+    after = collector.snapshot()
+    assert after["models"]["b"]["on_disk"] and after["models"]["b"]["size_bytes"] == 500
+    assert after["disk_used_bytes"] == before["disk_used_bytes"] + 500
+    assert after["refreshed_at"] >= before["refreshed_at"]
+    assert collector.full_refreshes == 1 and collector.model_refreshes == 1
+
+    os.remove(tmp_path / "a" / "a.gguf")
+    collector.invalidate("a")
+    assert collector.flush(timeout=5)
+    assert collector.model("a")["on_disk"] is False
+    assert collector.snapshot()["disk_used_bytes"] == 524
+
+
+def test_stats_endpoints_include_snapshot_time(client):
+    stats = client.get("/api/admin/models/stats")
+    assert stats.status_code == 200
+    assert stats.json()["snapshot_at"]
+
+    listing = client.get("/api/admin/models").json()
+    assert listing["snapshot_at"]
+    assert {m["name"] for m in listing["models"]} >= {"tinyllama", "qwen-0.5b"}
+
+
+def test_cold_collector_is_built_off_the_event_loop(collector, monkeypatch):
+    import core.routes.model_management_routes as routes
+
+    build = collector._build_full
+    threads = []
+
+    def _recording_build():
+        threads.append(threading.current_thread())
+        return build()
+
+    monkeypatch.setattr(collector, "_build_full", _recording_build)
+    monkeypatch.setattr(routes, "model_stats", collector)
+    assert not collector.ready
+
+    asyncio.run(routes._warm_model_stats())
+    assert collector.ready and threads and threads[0] is not threading.main_thread()
+
+    asyncio.run(routes._warm_model_stats())  # warm: nothing rebuilt
+    assert len(threads) == 1
@@ -0,0 +1,189 @@
+"""
+Copyright (c) 2025 LALO AI SYSTEMS, LLC. All rights reserved.
+
+PROPRIETARY AND CONFIDENTIAL
+
+This file is part of LALO AI Platform and is protected by copyright law.
+Unauthorized copying, modification, distribution, or use of this software,
+via any medium, is strictly prohibited without the express written permission
+of LALO AI SYSTEMS, LLC.
+"""
+
+import asyncio
+
+import core.vectorstores as vectorstores
+from core.tools.rag_tool import RAGTool
+from core.vectorstores.cached_store import CachedStore, CollectionVersions, QueryResultCache
+from core.vectorstores.embedding_cache import EmbeddingCache
+
+
+class CountingStore:
+    def __init__(self):
+        self.docs = {}
+        self.queries = 0
+
+    async def initialize(self):
+        return
+
+    async def add_documents(self, documents, ids, metadatas):
+        self.docs.update(zip(ids, documents))
+
+    async def query(self, query_text, top_k=5, filter_metadata=None):
+        self.queries += 1
+        ids = [i for i, d in self.docs.items() if query_text.lower().strip() in d.lower()][:top_k]
+        return {
+            "ids": [ids],
+            "documents": [[self.docs[i] for i in ids]],
+            "metadatas": [[{} for _ in ids]],
+            "distances": [[0.0 for _ in ids]],
+        }
+
+    async def count(self):
+        return len(self.docs)
+
+    async def get_sample(self, limit=100):
+        return {"metadatas": []}
+
+    async def delete(self, ids):
+        for i in ids:
+            self.docs.pop(i, None)
+
+
+def _cached(inner, max_entries=16):
+    return CachedStore(inner, collection="test", cache=QueryResultCache(max_entries=max_entries), versions=CollectionVersions())
+
+
+def test_repeated_query_served_from_cache():
+    inner = CountingStore()
+    store = _cached(inner)
+
+    async def _run():
+        await store.add_documents(["invoice total"], ["a"], [{}])
+        first = await store.query("Invoice", top_k=3)
+        second = await store.query("  invoice ", top_k=3)
+        other_k = await store.query("invoice", top_k=1)
+        return first, second, other_k
+
+    first, second, _ = asyncio.run(_run())
+
+    assert first["cache_hit"] is False
+    assert second["cache_hit"] is True
+    assert second["ids"] == first["ids"]
+    assert inner.queries == 2  # top_k is part of the key
+    assert store.get_stats()["hits"] == 1
+
+
+def test_writes_bump_version_and_invalidate():
+    inner = CountingStore()
+    store = _cached(inner)
+
+    async def _run():
+        await store.add_documents(["invoice one"], ["a"], [{}])
+        before = await store.query("invoice")
+        await store.add_documents(["invoice two"], ["b"], [{}])
+        after_add = await store.query("invoice")
+        await store.delete(["a"])
+        after_delete = await store.query("invoice")
+        return before, after_add, after_delete
+
+    before, after_add, after_delete = asyncio.run(_run())
+
+    assert before["ids"][0] == ["a"]
+    assert sorted(after_add["ids"][0]) == ["a", "b"]
+    assert after_delete["ids"][0] == ["b"]
+    assert store.collection_version == 3
+    assert inner.queries == 3
+
+
+
+def test_degraded_federated_results_are_not_cached():
+    inner = CountingStore()
+    plain_query = inner.query
+    statuses = [{"chroma": {"status": "ok"}, "qdrant": {"status": "timeout"}}, {"chroma": {"status": "ok"}}]
+
+    async def federated_query(query_text, top_k=5, filter_metadata=None):
+        return {**await plain_query(query_text, top_k, filter_metadata), "backends": statuses.pop(0)}
+
+    inner.query = federated_query
+    store = _cached(inner)
+
+    async def _run():
+        return [await store.query("invoice") for _ in range(3)]
+
+    degraded, healthy, cached = asyncio.run(_run())
+
+    assert not degraded["cache_hit"] and not healthy["cache_hit"]
+    assert cached["cache_hit"]
+    assert inner.queries == 2
+
+def test_lru_bound_and_filter_in_key():
+    inner = CountingStore()
+    store = _cached(inner, max_entries=2)
+
+    async def _run():
+        await store.query("a")
+        await store.query("b")
+        await store.query("c")  # evicts "a"
+        await store.query("a")
+        await store.query("a", filter_metadata={"src": "sap"})
+
+    asyncio.run(_run())
+
+    stats = store.get_stats()
+    assert stats["entries"] == 2
+    assert stats["evictions"] >= 1
+    assert inner.queries == 5
+
+
+def test_cached_results_are_isolated_copies():
+    inner = CountingStore()
+    store = _cached(inner)
+
+    async def _run():
+        await store.add_documents(["alpha"], ["a"], [{}])
+        res = await store.query("alpha")
+        res["ids"][0].append("mutated")
+        return await store.query("alpha")
+
+    assert asyncio.run(_run())["ids"][0] == ["a"]
+
+
+def test_embedding_cache_batches_misses():
+    cache = EmbeddingCache(max_entries=10)
+    calls = []
+
+    def embed(texts):
+        calls.append(list(texts))
+        return [[float(len(t))] for t in texts]
+
+    assert cache.get_or_compute("m", ["ab", "abc"], embed) == [[2.0], [3.0]]
+    assert cache.get_or_compute("m", ["ab", "abcd"], embed) == [[2.0], [4.0]]
+    assert calls == [["ab", "abc"], ["abcd"]]
+    assert cache.get_stats()["hits"] == 1
+
+
+def test_rag_tool_reports_cache_hit():
+    tool = RAGTool()
+    tool._store = _cached(CountingStore())
+    tool._initialized = True
+
+    asyncio.run(tool._index_documents({"documents": [{"content": "quarterly revenue", "title": "q"}]}))
+    first = asyncio.run(tool._query_documents({"query": "revenue"}))
+    second = asyncio.run(tool._query_documents({"query": "revenue"}))
+
+    assert first.metadata["cache_hit"] is False
+    assert second.metadata["cache_hit"] is True
+    assert second.output["count"] == 1
+
+
+def test_reinit_passes_backend_options_beneath_the_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("VECTOR_BACKEND", "chroma")
+    monkeypatch.setenv("RAG_QUERY_CACHE", "true")
+    monkeypatch.setattr(vectorstores, "_STORE_INSTANCE", None, raising=False)
+
+    store = vectorstores.reinit_vector_store("chroma", persist_directory=str(tmp_path), collection_name="scratch")
+
+    assert isinstance(store, CachedStore) and vectorstores.get_vector_store() is store
+    assert store._collection == "scratch"
+    assert store._store._persist_directory == str(tmp_path)
+    assert store._store._collection_name == "scratch"
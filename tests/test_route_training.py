@@ -0,0 +1,160 @@
+"""
+Copyright (c) 2025 LALO AI SYSTEMS, LLC. All rights reserved.
+
+PROPRIETARY AND CONFIDENTIAL
+
+This file is part of LALO AI Platform and is protected by copyright law.
+Unauthorized copying, modification, distribution, or use of this software,
+via any medium, is strictly prohibited without the express written permission
+of LALO AI SYSTEMS, LLC.
+"""
+
+import asyncio
+import uuid
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from core.database import Base, Feedback, FeedbackEvent, RoutedResponse, WorkflowSession
+from core.services.route_classifier import RouteClassifier, RouteClassifierRegistry, load_route_classifier
+from core.services.route_training import (
+    evaluate_routers,
+    export_routing_examples,
+    format_report,
+    split_examples,
+    train_route_classifier,
+)
+from core.services.router_model import RouterModel
+
+TOPICS = ["france", "the moon", "python", "photosynthesis", "jazz", "the roman empire", "volcanoes", "chess"]
+TEMPLATES = {
+    "simple": ["what is {}", "who invented {}", "define {}"],
+    "specialized": ["extract the dates from this text about {}", "translate this paragraph about {} to german"],
+    "complex": ["research {} and write a report with sources", "design a course curriculum about {}"],
+}
+
+
+def labelled_examples():
+    return [
+        {"request": template.format(topic), "label": label}
+        for label, templates in TEMPLATES.items() for template in templates for topic in TOPICS
+    ]
+
+
+class FakeServer:
+    def __init__(self):
+        self.calls = 0
+
+    def is_available(self):
+        return True
+
+    async def generate(self, prompt, **kwargs):
+        self.calls += 1
+        return '{"complexity": 0.5, "confidence": 0.8, "path": "specialized", "reasoning": "llm", ' \
+               '"recommended_model": "liquid-tool", "requires_tools": false, "requires_workflow": false}'
+
+
+def test_export_labels_llm_routes_and_reviewed_decisions():
+    engine = create_engine("sqlite://")
+    tables = [RoutedResponse, Feedback, WorkflowSession, FeedbackEvent]
+    Base.metadata.create_all(bind=engine, tables=[model.__table__ for model in tables])
+    db = sessionmaker(bind=engine)()
+
+    def routed(request, path, method, helpful=None):
+        response_id = str(uuid.uuid4())
+        db.add(RoutedResponse(id=response_id, request=request, path=path, routing_method=method))
+        if helpful is not None:
+            db.add(Feedback(id=str(uuid.uuid4()), response_id=response_id, helpful=helpful))
+
+    routed("what is jazz", "simple", "llm")
+    routed("summarize this contract", "simple", "llm", helpful=False)  # wrong route per the user
+    routed("define entropy", "simple", "classifier")  # unreviewed own decision
+    routed("extract the invoice totals", "specialized", "classifier", helpful=True)
+    db.add(WorkflowSession(session_id="s1", user_id="u", original_request="plan a product launch"))
+    db.add(FeedbackEvent(id="e1", workflow_session_id="s1", user_id="u", step="review", feedback_type="approve"))
+    db.add(WorkflowSession(session_id="s2", user_id="u", original_request="rejected workflow"))
+    db.add(FeedbackEvent(id="e2", workflow_session_id="s2", user_id="u", step="planning", feedback_type="reject"))
+    db.commit()
+
+    examples = {e["request"]: (e["label"], e["feedback"]) for e in export_routing_examples(db)}
+    db.close()
+    assert examples == {
+        "what is jazz": ("simple", False),
+        "extract the invoice totals": ("specialized", True),
+        "plan a product launch": ("complex", True),
+    }
+
+
+def test_registry_versions_and_activation(tmp_path):
+    router = RouterModel()
+    registry = RouteClassifierRegistry(str(tmp_path / "route_classifier"))
+    assert registry.load() is None and not load_route_classifier(registry=registry).trained
+
+    first = registry.save(train_route_classifier(labelled_examples(), router), metrics={"accuracy": 0.9})
+    second = registry.save(train_route_classifier(labelled_examples()[:30], router), activate=False)
+    assert (first, second) == (1, 2)
+    assert registry.current_version() == 1
+    assert load_route_classifier(registry=registry).meta["version"] == 1
+    assert registry.versions()[0]["metrics"] == {"accuracy": 0.9}
+
+    registry.activate(2)
+    loaded = load_route_classifier(registry=registry)
+    assert loaded.meta["version"] == 2 and loaded.idf is not None
+
+
+def test_router_defers_to_llm_below_the_margin():
+    router = RouterModel()
+    router.server = FakeServer()
+    router.classifier = train_route_classifier(labelled_examples(), router)
+
+    confident = asyncio.run(router.route("who invented chess"))
+    assert confident["routing_method"] == "classifier" and confident["path"] == "simple"
+    assert router.server.calls == 0
+
+    router.classifier_margin = 1.01  # nothing clears it
+    deferred = asyncio.run(router.route("who invented chess"))
+    assert deferred["routing_method"] == "llm" and deferred["path"] == "specialized"
+    assert router.server.calls == 1
+
+    router.classifier = RouteClassifier()  # untrained: straight to the LLM
+    assert asyncio.run(router.route("who invented chess"))["routing_method"] == "llm"
+
+
+def test_evaluation_report_compares_classifier_llm_and_tiered():
+    router = RouterModel()
+    train, holdout = split_examples(labelled_examples(), holdout=0.25)
+    assert train and holdout
+    classifier = train_route_classifier(train, router)
+
+    async def llm_route(request):
+        return {"path": "complex"}
+
+    report = asyncio.run(evaluate_routers(holdout, classifier, router, margin=0.2, llm_route=llm_route))
+    assert report["examples"] == len(holdout)
+    assert report["classifier"]["agreement"] >= 0.8
+    assert report["llm"]["agreement"] == round(sum(e["label"] == "complex" for e in holdout) / len(holdout), 4)
+    # No feedback-confirmed labels: nothing to measure accuracy against
+    assert report["feedback_examples"] == 0 and report["llm"]["accuracy"] is None
+    assert 0.0 <= report["tiered"]["classifier_share"] <= 1.0
+    assert report["classifier"]["latency_ms"]["p50"] < report["llm"]["latency_ms"]["p95"] + 50
+    assert sum(sum(row.values()) for row in report["classifier"]["confusion"].values()) == len(holdout)
+    assert "| classifier |" in format_report(report)
+
+
+def test_llm_accuracy_counts_only_feedback_labels():
+    router = RouterModel()
+    classifier = train_route_classifier(labelled_examples(), router)
+    # The LLM router labelled these itself, then answers the same way again
+    logged = [{"request": "what is jazz", "label": "simple", "feedback": False},
+              {"request": "define chess", "label": "simple", "feedback": False}]
+    confirmed = [{"request": "research volcanoes and write a report with sources", "label": "complex", "feedback": True},
+                 {"request": "translate this paragraph about jazz to german", "label": "specialized", "feedback": True}]
+
+    async def llm_route(request):
+        return {"path": "simple" if request.startswith(("what", "define")) else "complex"}
+
+    report = asyncio.run(evaluate_routers(logged + confirmed, classifier, router, margin=0.2, llm_route=llm_route))
+    assert report["feedback_examples"] == 2
+    assert report["llm"]["agreement"] == 0.75
+    assert report["llm"]["accuracy"] == 0.5
+    assert "accuracy on feedback labels" in format_report(report)
@@ -0,0 +1,179 @@
+"""
+Copyright (c) 2025 LALO AI SYSTEMS, LLC. All rights reserved.
+
+PROPRIETARY AND CONFIDENTIAL
+
+This file is part of LALO AI Platform and is protected by copyright law.
+Unauthorized copying, modification, distribution, or use of this software,
+via any medium, is strictly prohibited without the express written permission
+of LALO AI SYSTEMS, LLC.
+"""
+
+import asyncio
+import importlib
+import os
+import sys
+import types
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+import sandbox_provisioner
+from sandbox_provisioner import CodebaseProvisioner
+
+ROOT = Path(__file__).resolve().parents[1]
+IGNORED = (".env", ".git/config", "backups/db.bak", "sandboxes/other/app.py", "pkg/__pycache__/mod.cpython-311.pyc")
+
+
+def make_tree(root: Path) -> Path:
+    source = root / "source"
+    files = {"app.py": "print('app')\n", "pkg/mod.py": "VALUE = 1\n"}
+    files.update({rel: "secret\n" for rel in IGNORED})
+    for rel, content in files.items():
+        path = source / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    return source
+
+
+def listing(root: Path):
+    return sorted(p.relative_to(root).as_posix() for p in root.rglob("*") if p.is_file())
+
+
+def provision(tmp_path, mode, sandbox_id="sb1"):
+    source = make_tree(tmp_path)
+    provisioner = CodebaseProvisioner(source, source / "sandboxes", mode=mode)
+    target = source / "sandboxes" / sandbox_id
+    target.mkdir(parents=True)
+    return source, provisioner, target, provisioner.provision(sandbox_id, target)
+
+
+def test_auto_mode_never_hardlinks_the_live_tree(tmp_path, monkeypatch):
+    monkeypatch.setattr(sandbox_provisioner.subprocess, "run",
+                        lambda *a, **k: SimpleNamespace(returncode=32, stderr="permission denied"))
+    monkeypatch.setattr(CodebaseProvisioner, "_reflink",
+                        staticmethod(lambda src, dst: (_ for _ in ()).throw(OSError("no reflink"))))
+    source, provisioner, target, layout = provision(tmp_path, "auto")
+
+    assert "hardlink" not in CodebaseProvisioner.AUTO_MODES
+    assert layout["mode"] == "copy" and provisioner.mount_mode(layout) == "rw"
+    assert os.stat(target / "app.py").st_ino != os.stat(source / "app.py").st_ino
+
+
+def test_copy_mode_isolates_writes_and_skips_ignored_files(tmp_path):
+    source, provisioner, target, layout = provision(tmp_path, "copy")
+    assert listing(target) == ["app.py", "pkg/mod.py"]
+
+    (target / "app.py").write_text("print('changed')\n")
+    (target / "new.py").write_text("")
+    (target / "pkg" / "mod.py").unlink()
+    assert (source / "app.py").read_text() == "print('app')\n"
+    assert sorted(provisioner.changed_files(target, layout)) == ["app.py", "new.py", "pkg/mod.py"]
+
+
+def test_hardlink_mode_is_explicit_and_mounted_read_only(tmp_path):
+    source, provisioner, target, layout = provision(tmp_path, "hardlink")
+    assert layout["mode"] == "hardlink"
+    assert os.stat(target / "app.py").st_ino == os.stat(source / "app.py").st_ino
+    assert provisioner.mount_mode(layout) == "ro"
+    assert listing(target) == ["app.py", "pkg/mod.py"]
+
+
+def test_reflink_mode_clones_private_files(tmp_path):
+    source, provisioner, target, layout = provision(tmp_path, "reflink")
+    if layout["mode"] != "reflink":
+        pytest.skip("filesystem does not support FICLONE")
+    assert provisioner.mount_mode(layout) == "rw"
+    (target / "app.py").write_text("print('changed')\n")
+    assert (source / "app.py").read_text() == "print('app')\n"
+    assert provisioner.changed_files(target, layout) == ["app.py"]
+
+
+def test_overlay_lower_layer_excludes_ignored_paths(tmp_path, monkeypatch):
+    mounts = []
+
+    def fake_run(cmd, **kwargs):
+        mounts.append(cmd)
+        return SimpleNamespace(returncode=0, stderr="")
+
+    monkeypatch.setattr(sandbox_provisioner.subprocess, "run", fake_run)
+    monkeypatch.setenv("SANDBOX_LAYERS_DIR", str(tmp_path / "layers"))
+    source, provisioner, target, layout = provision(tmp_path, "overlay")
+
+    options = dict(part.split("=", 1) for part in mounts[0][mounts[0].index("-o") + 1].split(","))
+    lower = Path(options["lowerdir"])
+    assert layout["mode"] == "overlay" and lower == layout["lower"]
+    assert lower != source
+    assert listing(lower) == ["app.py", "pkg/mod.py"]
+    assert provisioner.mount_mode(layout) == "rw"
+
+    # The base layer is shared while its manifest is current, and dropped once unused and stale
+    second = source / "sandboxes" / "sb2"
+    second.mkdir()
+    assert provisioner.provision("sb2", second)["lower"] == lower
+    provisioner.release(target, layout, "sb1")
+    provisioner.release(second, {"mode": "overlay", "layers": tmp_path / "layers" / "sb2"}, "sb2")
+    (source / "app.py").write_text("print('edited')\n")
+    provisioner.build_manifest()
+    third = source / "sandboxes" / "sb3"
+    third.mkdir()
+    assert provisioner.provision("sb3", third)["lower"] != lower
+    assert not lower.exists()
+
+
+def test_overlay_mount_end_to_end(tmp_path, monkeypatch):
+    monkeypatch.setenv("SANDBOX_LAYERS_DIR", str(tmp_path / "layers"))
+    source, provisioner, target, layout = provision(tmp_path, "overlay", f"sb-{uuid.uuid4().hex[:8]}")
+    if layout["mode"] != "overlay":
+        pytest.skip("overlayfs mounts are not permitted here")
+    try:
+        assert listing(target) == ["app.py", "pkg/mod.py"]
+        (target / "app.py").write_text("print('changed')\n")
+        assert (source / "app.py").read_text() == "print('app')\n"
+        assert provisioner.changed_files(target, layout) == ["app.py"]
+    finally:
+        provisioner.release(target, layout)
+
+
+def _sandbox_manager_module():
+    # sandbox_manager uses package-relative imports
+    if "lalo_root" not in sys.modules:
+        package = types.ModuleType("lalo_root")
+        package.__path__ = [str(ROOT)]
+        sys.modules["lalo_root"] = package
+    return importlib.import_module("lalo_root.sandbox_manager")
+
+
+def test_failed_sandbox_creation_releases_its_overlay(tmp_path, monkeypatch):
+    pytest.importorskip("docker")
+    module = _sandbox_manager_module()
+    commands = []
+
+    def fake_run(cmd, **kwargs):
+        commands.append(cmd)
+        return SimpleNamespace(returncode=0, stderr="")
+
+    async def no_docker(*args, **kwargs):
+        raise RuntimeError("docker daemon unavailable")
+
+    monkeypatch.setattr(sandbox_provisioner.subprocess, "run", fake_run)
+    monkeypatch.setenv("SANDBOX_LAYERS_DIR", str(tmp_path / "layers"))
+    source = make_tree(tmp_path)
+    manager = module.SandboxManager.__new__(module.SandboxManager)
+    manager.base_path = source / "sandboxes"
+    manager.active_sandboxes = {}
+    manager.provisioner = module.CodebaseProvisioner(source, manager.base_path, mode="overlay")
+    manager.state_manager = module.StateManager(manager.base_path, manager.provisioner)
+    manager._create_container = no_docker
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(manager.create_sandbox("imp1", {"app.py": "print('changed')\n"}))
+
+    mounted = Path(commands[0][-1])
+    assert commands[-1] == ["umount", str(mounted)]
+    assert not mounted.exists()
+    assert not (tmp_path / "layers" / "lalo_sandbox_layers" / mounted.name).exists()
+    assert not manager.state_manager.layouts and not manager.active_sandboxes
+    assert not any(manager.provisioner._layer_users.values())
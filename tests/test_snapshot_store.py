@@ -0,0 +1,219 @@
+"""
+Copyright (c) 2025 LALO AI SYSTEMS, LLC. All rights reserved.
+
+PROPRIETARY AND CONFIDENTIAL
+
+This file is part of LALO AI Platform and is protected by copyright law.
+Unauthorized copying, modification, distribution, or use of this software,
+via any medium, is strictly prohibited without the express written permission
+of LALO AI SYSTEMS, LLC.
+"""
+
+import asyncio
+import os
+
+from core.services.snapshot_store import SnapshotStore, record_touch, tracking
+from core.services.tool_executor import ToolExecutor
+from core.tools import ToolExecutionResult
+
+
+def _objects(store):
+    return sorted(
+        name
+        for prefix in os.listdir(store.objects_dir)
+        if os.path.isdir(os.path.join(store.objects_dir, prefix))
+        for name in os.listdir(os.path.join(store.objects_dir, prefix))
+    )
+
+
+def test_store_creates_nothing_until_a_file_is_recorded(tmp_path):
+    store = SnapshotStore(str(tmp_path / "store"))
+    store.snapshot("wf1")
+    assert not (tmp_path / "store").exists()
+
+
+def test_restore_reverts_edits_creates_and_deletes(tmp_path):
+    root = tmp_path / "sandbox"
+    (root / "sub").mkdir(parents=True)
+    (root / "a.txt").write_text("original a")
+    (root / "sub" / "b.txt").write_text("original b")
+    store = SnapshotStore(str(tmp_path / "store"))
+
+    snap = store.snapshot("wf1")
+    for path in (root / "a.txt", root / "sub" / "b.txt", root / "new.txt"):
+        store.record(snap, str(path))
+    (root / "a.txt").write_text("edited a, now longer")
+    (root / "sub" / "b.txt").unlink()
+    (root / "new.txt").write_text("created")
+
+    assert store.restore(snap) == 3
+    assert (root / "a.txt").read_text() == "original a"
+    assert (root / "sub" / "b.txt").read_text() == "original b"
+    assert not (root / "new.txt").exists()
+
+
+def test_restore_leaves_untouched_paths_alone(tmp_path):
+    root = tmp_path / "sandbox"
+    root.mkdir()
+    (root / "mine.txt").write_text("before")
+    store = SnapshotStore(str(tmp_path / "store"))
+
+    snap = store.snapshot("wf1")
+    store.record(snap, str(root / "mine.txt"))
+    (root / "mine.txt").write_text("failed step")
+    # Another session writes into the shared root while wf1's step runs
+    (root / "theirs.txt").write_text("other session")
+    (root / "mine.txt.bak").write_text("other session")
+
+    assert store.restore(snap) == 1
+    assert (root / "mine.txt").read_text() == "before"
+    assert (root / "theirs.txt").read_text() == "other session"
+    assert (root / "mine.txt.bak").read_text() == "other session"
+
+
+def test_only_the_first_touch_is_recorded_and_contents_deduplicated(tmp_path, monkeypatch):
+    root = tmp_path / "sandbox"
+    root.mkdir()
+    (root / "a.txt").write_text("same")
+    (root / "b.txt").write_text("same")
+    store = SnapshotStore(str(tmp_path / "store"))
+
+    hashed = []
+    original = store._store_object
+    monkeypatch.setattr(store, "_store_object", lambda path: hashed.append(path) or original(path))
+    snap = store.snapshot("wf1")
+    store.record(snap, str(root / "a.txt"))
+    (root / "a.txt").write_text("changed")
+    store.record(snap, str(root / "a.txt"))
+    store.record(snap, str(root / "b.txt"))
+
+    assert hashed == [str(root / "a.txt"), str(root / "b.txt")]
+    assert len(_objects(store)) == 1
+    store.restore(snap)
+    assert (root / "a.txt").read_text() == "same"
+
+
+def test_release_session_collects_unreferenced_objects(tmp_path):
+    root = tmp_path / "sandbox"
+    root.mkdir()
+    (root / "a.txt").write_text("v1")
+    store = SnapshotStore(str(tmp_path / "store"))
+
+    store.record(store.snapshot("wf1"), str(root / "a.txt"))
+    (root / "a.txt").write_text("v2")
+    kept = store.snapshot("wf2")
+    store.record(kept, str(root / "a.txt"))
+
+    assert store.release_session("wf1") == 1  # only "v1" is unreferenced
+    assert not os.path.exists(os.path.join(store.sessions_dir, "wf1"))
+    (root / "a.txt").write_text("v3")
+    store.restore(kept)
+    assert (root / "a.txt").read_text() == "v2"
+
+
+def test_journal_survives_a_new_store_instance(tmp_path):
+    root = tmp_path / "sandbox"
+    root.mkdir()
+    (root / "a.txt").write_text("before")
+    snap = SnapshotStore(str(tmp_path / "store")).snapshot("wf1")
+    first = SnapshotStore(str(tmp_path / "store"))
+    first.record(snap, str(root / "a.txt"))
+    (root / "a.txt").write_text("after")
+
+    SnapshotStore(str(tmp_path / "store")).restore(snap)
+    assert (root / "a.txt").read_text() == "before"
+
+
+def test_restore_session_undoes_only_unfinished_steps(tmp_path):
+    root = tmp_path / "sandbox"
+    root.mkdir()
+    (root / "a.txt").write_text("v1")
+    store = SnapshotStore(str(tmp_path / "store"))
+
+    finished = store.snapshot("wf1")
+    store.record(finished, str(root / "a.txt"))
+    (root / "a.txt").write_text("v2")
+    interrupted = store.snapshot("wf1")
+    store.record(interrupted, str(root / "a.txt"))
+    store.record(interrupted, str(root / "b.txt"))
+    (root / "a.txt").write_text("v3 (half")
+    (root / "b.txt").write_text("partial")
+
+    restarted = SnapshotStore(str(tmp_path / "store"))
+    assert restarted.restore_session("wf1", keep=[finished]) == 1
+    assert (root / "a.txt").read_text() == "v2"
+    assert not (root / "b.txt").exists()
+    assert restarted.restore_session("wf1", keep=[finished]) == 0
+    assert restarted.restore_session("missing") == 0
+
+
+def test_record_touch_outside_a_step_is_a_no_op(tmp_path):
+    store = SnapshotStore(str(tmp_path / "store"))
+    snap = store.snapshot("wf1")
+    record_touch(str(tmp_path / "x.txt"))
+    with tracking(store, snap):
+        record_touch(str(tmp_path / "y.txt"))
+    assert store.touched(snap) == [str(tmp_path / "y.txt")]
+
+
+def test_tool_executor_rolls_back_failed_step(tmp_path, monkeypatch):
+    root = tmp_path / "sandbox"
+    root.mkdir()
+    (root / "report.txt").write_text("before")
+    executor = ToolExecutor(snapshots=SnapshotStore(str(tmp_path / "store")))
+
+    async def failing_tool(**kwargs):
+        # Tools record a path before writing it, and do so from worker threads
+        await asyncio.to_thread(record_touch, str(root / "report.txt"))
+        (root / "report.txt").write_text("half-written")
+        (root / "other_session.txt").write_text("not ours")
+        return ToolExecutionResult(success=False, error="boom")
+
+    monkeypatch.setattr(executor, "_execute_tool", failing_tool)
+    result = asyncio.run(executor.execute_step({"step": 1, "action": "write file", "tool": "file_operations"}, "u1", "wf1"))
+
+    assert not result.success and result.backup_restored
+    assert (root / "report.txt").read_text() == "before"
+    assert (root / "other_session.txt").read_text() == "not ours"
+
+    asyncio.run(executor.release_session("wf1"))
+    assert not os.path.exists(os.path.join(executor.snapshots.sessions_dir, "wf1"))
+
+
+
+def test_failed_rollback_stops_the_plan(tmp_path, monkeypatch):
+    executor = ToolExecutor(snapshots=SnapshotStore(str(tmp_path / "store")))
+
+    async def failing_tool(**kwargs):
+        return ToolExecutionResult(success=False, error="boom")
+
+    def broken_restore(snapshot_id):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(executor, "_execute_tool", failing_tool)
+    monkeypatch.setattr(executor.snapshots, "restore", broken_restore)
+    plan = type("Plan", (), {"steps": [{"step": 1, "tool": "file_operations"}, {"step": 2, "tool": "file_operations"}]})
+    results = asyncio.run(executor.execute_plan(plan, "u1", "wf1"))
+
+    assert len(results) == 1
+    assert not results[0].backup_restored
+
+def test_file_tool_records_writes_and_deletes(tmp_path, monkeypatch):
+    from core.tools import file_operations
+
+    monkeypatch.setattr(file_operations, "ALLOWED_ROOT", str(tmp_path))
+    (tmp_path / "keep.txt").write_text("keep")
+    store = SnapshotStore(str(tmp_path / ".store"))
+    snap = store.snapshot("wf1")
+    tool = file_operations.FileOperationsTool()
+
+    async def run():
+        with tracking(store, snap):
+            await tool.execute(op="write", path="new.txt", content="x")
+            await tool.execute(op="delete", path="keep.txt")
+
+    asyncio.run(run())
+    assert store.touched(snap) == [str(tmp_path / "keep.txt"), str(tmp_path / "new.txt")]
+    store.restore(snap)
+    assert (tmp_path / "keep.txt").read_text() == "keep"
+    assert not (tmp_path / "new.txt").exists()
@@ -0,0 +1,204 @@
+"""
+Copyright (c) 2025 LALO AI SYSTEMS, LLC. All rights reserved.
+
+PROPRIETARY AND CONFIDENTIAL
+
+This file is part of LALO AI Platform and is protected by copyright law.
+Unauthorized copying, modification, distribution, or use of this software,
+via any medium, is strictly prohibited without the express written permission
+of LALO AI SYSTEMS, LLC.
+"""
+
+import asyncio
+
+import numpy as np
+
+import core.services.local_llm_service as llm_module
+from core.services.local_llm_service import LocalInferenceServer
+from core.services.speculative_decoding import SpeculativeDraft, prompt_lookup
+
+PROMPT = b"Repeat the line: "
+ANSWER = b"the cat sat on the mat. " * 6
+
+
+class FakeLlama:
+    """
+    Greedy model that continues PROMPT with ANSWER, decoding like llama.cpp:
+    one forward pass evaluates the last token plus every draft token and
+    keeps drafts up to the first one the target disagrees with
+    """
+
+    def __init__(self, model_path, **kwargs):
+        self.model_path = model_path
+        self.kwargs = kwargs
+        self.draft_model = kwargs.get("draft_model")
+        self.forward_passes = 0
+        self.accepted = 0
+        self.vocab = 151936 if "qwen" in model_path else 32000
+        self.wrong_every = 5 if "tinyllama" in model_path else None  # draft-quality model
+
+    # vocabulary
+    def n_vocab(self):
+        return self.vocab
+
+    def token_eos(self):
+        return 2
+
+    def tokenize(self, text):
+        return list(text) if self.vocab == 32000 else [self.vocab - b for b in text]
+
+    def n_ctx(self):
+        return 4096
+
+    # decoding
+    def _next(self, history):
+        position = len(history)
+        sequence = PROMPT + ANSWER
+        token = sequence[position] if position < len(sequence) else ord(".")
+        if self.wrong_every and position % self.wrong_every == 0:
+            token = ord("#")
+        return token
+
+    def generate(self, tokens, temp):
+        history = list(tokens)
+        while True:
+            token = self._next(history)
+            history.append(token)
+            yield token
+
+    def _decode(self, max_tokens):
+        history, out, drafts = list(PROMPT), [], []
+        while len(out) < max_tokens:
+            self.forward_passes += 1
+            for i in range(len(drafts) + 1):
+                token = self._next(history)
+                history.append(token)
+                out.append(token)
+                if len(out) >= max_tokens or i == len(drafts) or token != drafts[i]:
+                    break
+                self.accepted += 1
+            if len(out) >= max_tokens:
+                break
+            drafts = list(self.draft_model(np.array(history, dtype=np.intc))) if self.draft_model else []
+        return out
+
+    def __call__(self, prompt, max_tokens, stream=False, **kwargs):
+        tokens = self._decode(max_tokens)
+        if stream:
+            return ({"choices": [{"text": chr(t)}]} for t in tokens)
+        return {"choices": [{"text": bytes(tokens).decode()}], "usage": {"completion_tokens": len(tokens)}}
+
+
+def test_prompt_lookup_proposes_repeated_continuation():
+    ids = np.array(list(b"abcXabc"), dtype=np.intc)
+    assert bytes(prompt_lookup(ids, 3).tolist()) == b"Xab"
+    assert len(prompt_lookup(np.array(list(b"abcd"), dtype=np.intc), 3)) == 0
+
+
+def test_speculation_keeps_output_and_saves_forward_passes():
+    plain = FakeLlama("mistral.gguf")
+    expected = plain._decode(len(ANSWER))
+
+    draft = SpeculativeDraft("mistral-instruct", num_pred_tokens=6)
+    target = FakeLlama("mistral.gguf", draft_model=draft)
+    assert draft.begin()
+    output = target._decode(len(ANSWER))
+    stats = draft.end()
+
+    assert output == expected == list(ANSWER)
+    assert target.forward_passes < plain.forward_passes / 2
+    # Only the final proposal's outcome is unobservable from the draft side
+    assert 0 < stats["accepted"] <= target.accepted <= stats["accepted"] + draft.num_pred_tokens
+    assert stats["drafted"] >= stats["accepted"]
+    assert draft.stats()["acceptance_rate"] == stats["acceptance_rate"]
+
+
+class WrongProposer:
+    def __call__(self, input_ids, num_pred_tokens):
+        return np.full(num_pred_tokens, ord("#"), dtype=np.intc)
+
+
+def test_poor_acceptance_falls_back_then_retries():
+    draft = SpeculativeDraft("mistral-instruct", num_pred_tokens=4, min_acceptance=0.3, window=8, retry_after=2)
+    draft._proposer = WrongProposer()
+    target = FakeLlama("mistral.gguf", draft_model=draft)
+
+    assert draft.begin()
+    target._decode(10)
+    stats = draft.end()
+    assert stats["accepted"] == 0
+    assert not draft.active and draft.stats()["fallbacks"] == 1
+
+    # Plain decoding for retry_after generations, then speculation is re-tried
+    assert [draft.begin() for _ in range(3)] == [False, False, True]
+
+
+def _server(tmp_path, monkeypatch, draft_for_mistral):
+    monkeypatch.setattr(llm_module, "LLAMA_CPP_AVAILABLE", True)
+    monkeypatch.setattr(llm_module, "SPECULATIVE_ENABLED", True)
+    monkeypatch.setattr(llm_module, "Llama", FakeLlama, raising=False)
+    monkeypatch.setattr(llm_module, "DRAFT_MODELS", {"mistral-instruct": draft_for_mistral})
+    server = LocalInferenceServer(model_dir=str(tmp_path))
+    for name in ("mistral-instruct", "tinyllama", "qwen-0.5b"):
+        path = tmp_path / server.model_configs[name]["path"]
+        path.parent.mkdir(parents=True)
+        path.write_bytes(b"\0" * 1024)
+    return server
+
+
+def test_generate_and_stream_use_compatible_draft_model(tmp_path, monkeypatch):
+    server = _server(tmp_path, monkeypatch, "tinyllama")
+
+    async def _run():
+        result = await server.generate_with_usage(PROMPT.decode(), model_name="mistral-instruct", max_tokens=len(ANSWER))
+        chunks = [c async for c in server.generate_stream(PROMPT.decode(), model_name="mistral-instruct", max_tokens=len(ANSWER))]
+        return result, "".join(chunks)
+
+    try:
+        result, streamed = asyncio.run(_run())
+
+        assert result["text"] == ANSWER.decode().strip()
+        assert streamed == ANSWER.decode()
+        assert result["speculative"]["source"] == "tinyllama"
+        assert 0 < result["speculative"]["accepted"] < result["speculative"]["drafted"]
+        assert server.get_speculative_stats()["mistral-instruct"]["generations"] == 2
+        assert "tinyllama" not in server.models  # the draft instance is private to the target
+    finally:
+        server.executor.shutdown(wait=False)
+
+
+def test_incompatible_draft_model_falls_back_to_prompt_lookup(tmp_path, monkeypatch):
+    server = _server(tmp_path, monkeypatch, "qwen-0.5b")
+    try:
+        assert server.load_model("mistral-instruct")
+        assert server.drafts["mistral-instruct"].source == "prompt-lookup"
+        assert "mistral-instruct" not in server.draft_models
+        assert server.load_model("tinyllama")
+        assert "tinyllama" not in server.drafts  # small models decode plainly
+    finally:
+        server.executor.shutdown(wait=False)
+
+
+def test_speculation_is_opt_in(tmp_path, monkeypatch):
+    server = _server(tmp_path, monkeypatch, "tinyllama")
+    monkeypatch.setattr(llm_module, "SPECULATIVE_ENABLED", False)
+    try:
+        assert server.load_model("mistral-instruct")
+        assert server.drafts == {} and server.draft_models == {}
+    finally:
+        server.executor.shutdown(wait=False)
+
+
+def test_speculation_skipped_when_logits_buffer_would_shrink_context(tmp_path, monkeypatch):
+    import core.services.hardware_tuner as tuner_module
+
+    server = _server(tmp_path, monkeypatch, "tinyllama")
+    # Room for the (tiny) weights' KV cache at full context, not for 4096 x 32000 float32 logits
+    memory = type("Memory", (), {"available": 256 * 1024**2})()
+    monkeypatch.setattr(tuner_module.psutil, "virtual_memory", lambda: memory)
+    try:
+        assert server.load_model("mistral-instruct")
+        assert "mistral-instruct" not in server.drafts
+        assert server.model_settings["mistral-instruct"]["n_ctx"] == 4096
+    finally:
+        server.executor.shutdown(wait=False)
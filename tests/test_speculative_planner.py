@@ -0,0 +1,158 @@
+"""
+Copyright (c) 2025 LALO AI SYSTEMS, LLC. All rights reserved.
+
+PROPRIETARY AND CONFIDENTIAL
+
+This file is part of LALO AI Platform and is protected by copyright law.
+Unauthorized copying, modification, distribution, or use of this software,
+via any medium, is strictly prohibited without the express written permission
+of LALO AI SYSTEMS, LLC.
+"""
+
+import asyncio
+import json
+import time
+
+import core.services.action_planner as planner_module
+from core.services.action_planner import ActionPlanner
+
+# Simulated latency of one LLM call
+CALL = 0.1
+
+
+class FakeAIService:
+    """Drafts a one-step plan naming the model; critiques score by that name."""
+
+    def __init__(self, scores, delays=None):
+        self.scores = scores
+        self.delays = delays or {}
+        self.models = {"u1": {name: None for name in scores}}
+        self.calls = []
+        self.cancelled = 0
+
+    async def generate(self, prompt, model_name="gpt-4", user_id=None, **kwargs):
+        critique = prompt.startswith("Critique")
+        self.calls.append(("critique" if critique else "generate", model_name))
+        try:
+            if critique:
+                await asyncio.sleep(CALL)
+                source = next(name for name in self.scores if f"by {name}" in prompt)
+                return json.dumps({"confidence": self.scores[source], "critique": f"{source} ok"})
+            await asyncio.sleep(self.delays.get(model_name, CALL))
+            return json.dumps({"steps": [{"step": 1, "action": f"by {model_name}", "tool": "t"}]})
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+
+
+class FakeRTIClient:
+    def __init__(self, delay=CALL):
+        self.delay = delay
+
+    async def interpret(self, user_input):
+        await asyncio.sleep(self.delay)
+        return {"plan": "1. by rti", "confidence": 0.9, "retrieved_examples": [{"document": "x"}]}
+
+
+def _planner(monkeypatch, ai, rti=None, **kwargs):
+    monkeypatch.setattr(planner_module, "rti_client", rti or FakeRTIClient())
+    kwargs.setdefault("candidate_models", ["model-a", "model-b"])
+    return ActionPlanner(ai, mode="speculative", **kwargs)
+
+
+def test_best_candidate_wins_in_about_one_generate_plus_critique(monkeypatch):
+    ai = FakeAIService({"rti": 0.6, "model-a": 0.7, "model-b": 0.75})
+    planner = _planner(monkeypatch, ai)
+
+    started = time.monotonic()
+    plan = asyncio.run(planner.create_plan("make a report", "u1"))
+    elapsed = time.monotonic() - started
+
+    # Three drafts and three critiques overlap: ~2 calls, not 6
+    assert elapsed < 3.5 * CALL
+    assert plan.metadata["selected_source"] == "model-b"
+    assert plan.confidence == 0.75
+    assert sorted(c["source"] for c in plan.metadata["candidates"]) == ["model-a", "model-b", "rti"]
+    assert plan.metadata["llm_calls"] == 5  # RTI drafts without an LLM call
+    assert not plan.metadata["early_stop"]
+
+
+def test_early_stop_cancels_outstanding_candidates(monkeypatch):
+    ai = FakeAIService({"rti": 0.9, "model-a": 0.95, "model-b": 0.95}, delays={"model-a": 1.0, "model-b": 1.0})
+    planner = _planner(monkeypatch, ai)
+
+    started = time.monotonic()
+    plan = asyncio.run(planner.create_plan("make a report", "u1"))
+
+    assert time.monotonic() - started < 0.5
+    assert plan.metadata["selected_source"] == "rti"
+    assert plan.metadata["early_stop"]
+    assert plan.retrieved_examples == [{"document": "x"}]
+    assert ai.cancelled == 2
+
+
+def test_latency_budget_returns_best_so_far(monkeypatch):
+    ai = FakeAIService({"rti": 0.5, "model-a": 0.99, "model-b": 0.99}, delays={"model-a": 2.0, "model-b": 2.0})
+    planner = _planner(monkeypatch, ai, latency_budget_s=0.4)
+
+    started = time.monotonic()
+    plan = asyncio.run(planner.create_plan("make a report", "u1"))
+
+    assert time.monotonic() - started < 0.6
+    assert plan.metadata["selected_source"] == "rti"
+    assert plan.confidence == 0.5
+
+
+def test_call_budget_limits_llm_calls(monkeypatch):
+    ai = FakeAIService({"rti": 0.5, "model-a": 0.6, "model-b": 0.7})
+    planner = _planner(monkeypatch, ai, max_llm_calls=2)
+
+    plan = asyncio.run(planner.create_plan("make a report", "u1"))
+
+    assert len(ai.calls) == 2
+    assert plan.metadata["llm_calls"] == 2
+
+
+
+class FailingRTIClient:
+    async def interpret(self, user_input):
+        return {"plan": "", "confidence": 0.0}
+
+
+class FirstDraftFailsAIService(FakeAIService):
+    """Returns unparseable drafts until the first draft has failed."""
+
+    async def generate(self, prompt, model_name="gpt-4", user_id=None, **kwargs):
+        response = await super().generate(prompt, model_name, user_id, **kwargs)
+        if len(self.calls) == 1:
+            return "not json"
+        return response
+
+
+def test_fallback_uses_an_available_model_and_counts_the_call(monkeypatch):
+    ai = FirstDraftFailsAIService({"model-b": 0.7})
+    planner = _planner(monkeypatch, ai, rti=FailingRTIClient())
+
+    plan = asyncio.run(planner.create_plan("make a report", "u1"))
+
+    assert plan.metadata["selected_source"] == "fallback"
+    assert ai.calls == [("generate", "model-b"), ("generate", "model-b")]
+    assert plan.metadata["llm_calls"] == 2
+    assert plan.steps[0]["action"] == "by model-b"
+
+
+def test_fallback_stays_inside_the_latency_budget(monkeypatch):
+    ai = FakeAIService({"model-a": 0.9, "model-b": 0.9}, delays={"model-a": 2.0, "model-b": 2.0})
+    planner = _planner(monkeypatch, ai, rti=FakeRTIClient(delay=2.0), latency_budget_s=0.3)
+
+    started = time.monotonic()
+    plan = asyncio.run(planner.create_plan("make a report", "u1"))
+
+    assert time.monotonic() - started < 0.5
+    assert plan.metadata["selected_source"] == "fallback"
+    assert plan.metadata["llm_calls"] == 2
+    assert plan.steps[0]["action"] == "Unable to generate plan"
+
+def test_sequential_mode_is_default(monkeypatch):
+    monkeypatch.delenv("PLANNER_MODE", raising=False)
+    assert ActionPlanner(FakeAIService({})).mode == "sequential"
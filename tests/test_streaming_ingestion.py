@@ -0,0 +1,156 @@
+"""
+Copyright (c) 2025 LALO AI SYSTEMS, LLC. All rights reserved.
+
+PROPRIETARY AND CONFIDENTIAL
+
+This file is part of LALO AI Platform and is protected by copyright law.
+Unauthorized copying, modification, distribution, or use of this software,
+via any medium, is strictly prohibited without the express written permission
+of LALO AI SYSTEMS, LLC.
+"""
+
+import asyncio
+import hashlib
+import os
+from datetime import datetime
+
+import pytest
+
+from services.document_service.models import Document, DocumentType
+from services.document_service.services import document_processor as dp
+from services.document_service.services.chunker import chunk_pages
+from services.document_service.services.ingestion import ParsedDocument, spool_upload
+
+
+class FakeUpload:
+    """Mimics UploadFile.read(n) and records the read sizes."""
+
+    def __init__(self, data: bytes):
+        self._data = data
+        self._pos = 0
+        self.reads = []
+
+    async def read(self, n=-1):
+        self.reads.append(n)
+        if n is None or n < 0:
+            n = len(self._data) - self._pos
+        block = self._data[self._pos:self._pos + n]
+        self._pos += len(block)
+        return block
+
+
+def _make_pdf(pages):
+    """Build a minimal text PDF with one content stream per page."""
+    objects = []
+    n = len(pages)
+    kids = " ".join(f"{3 + 2 * i} 0 R" for i in range(n))
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {n} >>".encode())
+    font_ref = 3 + 2 * n
+    for i, text in enumerate(pages):
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {4 + 2 * i} 0 R "
+            f"/Resources << /Font << /F1 {font_ref} 0 R >> >> >>".encode()
+        )
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for num, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % num + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for off in offsets:
+        out += b"%010d 00000 n \n" % off
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def _document():
+    return Document(
+        id="doc-1",
+        name="upload",
+        type=DocumentType.OTHER,
+        content=None,
+        metadata={},
+        version=1,
+        created_at=datetime.utcnow(),
+        updated_at=datetime.utcnow(),
+        owner="tester",
+        permissions=[],
+    )
+
+
+def test_spool_upload_streams_in_chunks(tmp_path):
+    data = b"Plain text paragraph one.\n\n" * 200
+    upload = FakeUpload(data)
+
+    parsed = asyncio.run(spool_upload(upload, chunk_size=1024, spool_dir=str(tmp_path)))
+
+    assert all(n == 1024 for n in upload.reads)
+    assert parsed.size == len(data)
+    assert parsed.sha256 == hashlib.sha256(data).hexdigest()
+    assert parsed.mime_type.startswith("text/")
+    assert os.path.exists(parsed.path)
+
+    pages = list(parsed.iter_pages())
+    assert "".join(text for _, text in pages).count("paragraph one") == 200
+
+    parsed.close()
+    assert not os.path.exists(parsed.path)
+
+
+def test_chunk_pages_tracks_page_and_offsets():
+    chunks = list(chunk_pages([(1, "First page."), (2, "Second page.")], doc_id="d"))
+
+    paragraphs = [c for c in chunks if c["level"] == "paragraph"]
+    assert [c["page"] for c in paragraphs] == [1, 2]
+    assert paragraphs[1]["start_char"] == len("First page.") + 2
+
+
+def test_pdf_parsed_once_and_chunked_per_page(tmp_path, monkeypatch):
+    PyPDF2 = pytest.importorskip("PyPDF2")
+    pages = [f"Page {i} covers pump maintenance step {i}." for i in range(1, 8)]
+    upload = FakeUpload(_make_pdf(pages))
+    parsed = asyncio.run(spool_upload(upload, chunk_size=256, spool_dir=str(tmp_path)))
+
+    opened = []
+    real_reader = PyPDF2.PdfReader
+
+    def counting_reader(stream, *args, **kwargs):
+        opened.append(stream)
+        return real_reader(stream, *args, **kwargs)
+
+    batches = []
+    monkeypatch.setattr(PyPDF2, "PdfReader", counting_reader)
+    monkeypatch.setattr(dp, "INDEXING_MODE", "background")
+    monkeypatch.setattr(dp, "INDEX_BATCH_SIZE", 4)
+    monkeypatch.setattr(dp, "enqueue_index_job", lambda documents, ids, metadatas: batches.append(metadatas))
+    # Tiny test pages would otherwise be routed to manual review
+    monkeypatch.setattr(dp, "score_parsed", lambda p: (80, {"category": "clean", "pages": len(p.pdf.pages)}))
+
+    doc = _document()
+    with parsed:
+        result = asyncio.run(dp.DocumentProcessor().process_document(doc, parsed))
+
+    assert result.success, result.errors
+    assert doc.type == DocumentType.PDF
+    assert len(opened) == 1
+    assert doc.metadata["pages"] == 7
+    assert "chunks" not in doc.metadata
+    assert doc.metadata["chunk_count"] == sum(len(b) for b in batches)
+    assert max(len(b) for b in batches) <= 4
+    assert sorted({m["page"] for b in batches for m in b}) == list(range(1, 8))
+
+
+def test_score_document_bytes_compat():
+    parsed = ParsedDocument.from_bytes(b"%PDF-1.4 not really")
+    assert parsed.kind == "pdf"
+
+    from services.document_service.services.quality import score_document
+    score, details = score_document(b"word " * 600, mime_type="text/plain")
+    assert details["words"] > 100
+    assert score >= 30
@@ -0,0 +1,321 @@
+"""
+Copyright (c) 2025 LALO AI SYSTEMS, LLC. All rights reserved.
+
+PROPRIETARY AND CONFIDENTIAL
+
+This file is part of LALO AI Platform and is protected by copyright law.
+Unauthorized copying, modification, distribution, or use of this software,
+via any medium, is strictly prohibited without the express written permission
+of LALO AI SYSTEMS, LLC.
+"""
+
+import asyncio
+import os
+import threading
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+import core.services.workflow_orchestrator as orchestrator_module
+from core.database import WorkflowLease, WorkflowSession, WorkflowState
+from core.services.action_planner import ActionPlanner
+from core.services.snapshot_store import SnapshotStore, record_touch, tracking
+from core.services.tool_executor import ExecutionResult, ToolExecutor
+from core.services.workflow_checkpoints import workflow_checkpoints
+from core.services.workflow_engine import WorkflowEngine, WorkflowEventBus
+from core.services.workflow_leases import WorkflowLeaseStore
+from core.services.workflow_orchestrator import WorkflowOrchestrator
+
+pytestmark = pytest.mark.usefixtures("workflow_db")
+
+USER = "checkpoint-test@example.com"
+STEPS = [{"step": n, "action": f"step {n}", "tool": "web_search"} for n in (1, 2, 3)]
+
+
+class Crash(BaseException):
+    """Stands in for the process dying"""
+
+
+class CountingInterpreter:
+    def __init__(self):
+        self.calls = []
+
+    async def interpret(self, user_request, user_id):
+        self.calls.append(user_request)
+        return SimpleNamespace(
+            interpreted_intent=f"intent: {user_request}",
+            confidence_score=0.95,
+            reasoning_trace=[],
+            suggested_clarifications=[],
+            feedback_required=False,
+        )
+
+
+class CountingPlanner(ActionPlanner):
+    """Real refinement loop; drafting and critique calls are counted per intent"""
+
+    def __init__(self, confidences=(0.6, 0.9)):
+        super().__init__(ai_service_instance=object(), mode="sequential")
+        self.confidences = list(confidences)
+        self.calls = []
+
+    async def _generate_initial_plan(self, intent, user_id, context=None):
+        self.calls.append(("generate", intent))
+        return {"steps": STEPS, "retrieved_examples": []}
+
+    async def _refine_plan(self, intent, current_plan, critique, user_id, context=None):
+        self.calls.append(("refine", intent))
+        return {**current_plan, "refined": True}
+
+    async def _critique_plan(self, intent, plan, user_id):
+        done = sum(1 for kind, i in self.calls if kind == "critique" and i == intent)
+        self.calls.append(("critique", intent))
+        return {"confidence": self.confidences[done], "critique_text": f"critique {done + 1}"}
+
+
+class CountingExecutor(ToolExecutor):
+    """Real step loop; individual steps are recorded and may kill the process"""
+
+    def __init__(self, store_dir, crash_at=None):
+        super().__init__(snapshots=SnapshotStore(str(store_dir / "store")))
+        self.crash_at = crash_at
+        self.report = store_dir / "report.txt"
+        self.calls = []
+
+    async def execute_step(self, step, user_id, workflow_session_id):
+        # Every step appends to one report; the crashing step dies mid-write
+        backup_id = await self._create_backup(workflow_session_id)
+        with tracking(self.snapshots, backup_id):
+            record_touch(str(self.report))
+            with open(self.report, "a") as f:
+                f.write(f"step {step['step']}" + ("" if step["step"] == self.crash_at else "\n"))
+        if step["step"] == self.crash_at:
+            os._exit(137)
+        self.calls.append((workflow_session_id, step["step"]))
+        return ExecutionResult(
+            success=True, step_number=step["step"], tool_name=step["tool"],
+            tool_output=f"output {step['step']}", verification_passed=True, backup_id=backup_id,
+        )
+
+
+class FakeRTI:
+    def __init__(self):
+        self.sent = []
+
+    async def add_plan_examples(self, plans):
+        self.sent.extend(plans)
+        return {"added": len(plans)}
+
+
+def _patch(monkeypatch, tmp_path, crash_at=None):
+    fakes = SimpleNamespace(
+        interpreter=CountingInterpreter(),
+        planner=CountingPlanner(),
+        executor=CountingExecutor(tmp_path, crash_at=crash_at),
+        rti=FakeRTI(),
+    )
+    monkeypatch.setattr(orchestrator_module, "semantic_interpreter", fakes.interpreter)
+    monkeypatch.setattr(orchestrator_module, "action_planner", fakes.planner)
+    monkeypatch.setattr(orchestrator_module, "tool_executor", fakes.executor)
+    monkeypatch.setattr(orchestrator_module, "rti_client", fakes.rti)
+    return fakes
+
+
+def _find_session(request: str) -> dict:
+    db = orchestrator_module.SessionLocal()
+    try:
+        session = db.query(WorkflowSession).filter(WorkflowSession.original_request == request).one()
+        return WorkflowOrchestrator()._session_to_dict(session)
+    finally:
+        db.close()
+
+
+def _expire_leases():
+    """Stand in for the lease of a dead worker running out"""
+    db = orchestrator_module.SessionLocal()
+    try:
+        db.query(WorkflowLease).update({"expires_at": datetime.utcnow() - timedelta(seconds=1)})
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_planner_resumes_after_last_iteration():
+    planner = CountingPlanner(confidences=(0.6, 0.9))
+    records = []
+
+    def _crash_after_first(record):
+        records.append(record)
+        raise Crash()
+
+    with pytest.raises(Crash):
+        asyncio.run(planner.create_plan("intent", USER, on_iteration=_crash_after_first))
+    assert [r["iteration"] for r in records] == [1] and not records[0]["done"]
+
+    resumed = CountingPlanner(confidences=(0.9,))
+    plan = asyncio.run(resumed.create_plan("intent", USER, checkpoints=records, on_iteration=records.append))
+    assert [kind for kind, _ in resumed.calls] == ["refine", "critique"]
+    assert plan.iterations == 2
+    assert plan.confidence == 0.9
+    assert plan.critiques == ["critique 1", "critique 1"]
+    assert records[-1]["done"]
+
+    # A finished plan is returned from its checkpoint without any model call
+    again = CountingPlanner()
+    restored = asyncio.run(again.create_plan("intent", USER, checkpoints=records))
+    assert again.calls == []
+    assert restored == plan
+
+
+def test_executor_skips_completed_steps(tmp_path):
+    executor = CountingExecutor(tmp_path)
+    done = [ExecutionResult(success=True, step_number=1, tool_name="web_search", tool_output="x", verification_passed=True)]
+    seen = []
+    plan = SimpleNamespace(steps=STEPS)
+
+    results = asyncio.run(executor.execute_plan(plan, USER, "sid", completed=done, on_result=seen.append))
+
+    assert [r.step_number for r in results] == [1, 2, 3]
+    assert executor.calls == [("sid", 2), ("sid", 3)]
+    assert [r.step_number for r in seen] == [2, 3]
+
+
+def test_pending_stage_ignores_sessions_waiting_on_humans():
+    base = {"interpreted_intent": None, "interpretation_approved": 0, "action_plan": None}
+    stage = WorkflowOrchestrator._pending_stage
+    assert stage({**base, "current_state": "interpreting"}) == "interpretation"
+    assert stage({**base, "current_state": "interpreting", "interpreted_intent": "x"}) is None
+    assert stage({**base, "current_state": "interpreting", "interpreted_intent": "x", "interpretation_approved": 1}) == "refinement"
+    assert stage({**base, "current_state": "planning", "interpretation_approved": 1}) == "planning"
+    assert stage({**base, "current_state": "planning", "interpretation_approved": 1, "action_plan": {}}) is None
+    assert stage({**base, "current_state": "executing"}) == "execution"
+    assert stage({**base, "current_state": "finalizing"}) == "commit"
+    assert stage({**base, "current_state": "reviewing"}) is None
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="crash injection needs fork")
+def test_worker_killed_between_steps_resumes_without_repeating_calls(monkeypatch, tmp_path, workflow_db):
+    request = f"Crash-test report {uuid.uuid4()}"
+
+    # Worker process: runs the workflow and dies while starting step 2
+    _patch(monkeypatch, tmp_path, crash_at=2)
+    pid = os.fork()
+    if pid == 0:
+        try:
+            workflow_db.dispose(close=False)
+            orch = WorkflowOrchestrator(engine=WorkflowEngine(), event_bus=WorkflowEventBus())
+
+            async def _run():
+                session = await orch.start_workflow(request, USER)
+                await orch.engine.wait(session["session_id"], timeout=10)
+
+            asyncio.run(_run())
+        finally:
+            os._exit(1)  # only reached if the crash was not injected
+
+    _, status = os.waitpid(pid, 0)
+    assert os.WEXITSTATUS(status) == 137
+
+    crashed = _find_session(request)
+    sid = crashed["session_id"]
+    assert crashed["current_state"] == "executing"
+    assert len(workflow_checkpoints.load(sid, "interpretation")) == 1
+    assert [r["iteration"] for r in workflow_checkpoints.load(sid, "planning")] == [1, 2]
+    assert [r["step_number"] for r in workflow_checkpoints.load(sid, "execution")] == [1]
+    assert (tmp_path / "report.txt").read_text() == "step 1\nstep 2"
+
+    # Restarted process (new lease owner): recovery waits out the dead
+    # worker's lease, then resumes from the last completed step
+    fakes = _patch(monkeypatch, tmp_path)
+    orch = WorkflowOrchestrator(engine=WorkflowEngine(), event_bus=WorkflowEventBus(), leases=WorkflowLeaseStore())
+    assert asyncio.run(orch.recover_workflows()) == []
+    _expire_leases()
+
+    async def _recover():
+        resumed = await orch.recover_workflows()
+        await orch.engine.wait(sid, timeout=10)
+        reviewing = await orch.get_workflow_status(sid)
+        await orch.approve_results(sid, USER, rating=0.9)
+        await orch.engine.wait(sid, timeout=10)
+        return resumed, reviewing, await orch.get_workflow_status(sid)
+
+    resumed, reviewing, final = asyncio.run(_recover())
+
+    assert sid in resumed
+    assert request not in fakes.interpreter.calls
+    assert not [c for c in fakes.planner.calls if c[1] == f"intent: {request}"]
+    assert [step for session, step in fakes.executor.calls if session == sid] == [2, 3]
+    # Step 2's half-applied write was undone before it ran again; step 1's kept
+    assert (tmp_path / "report.txt").read_text() == "step 1\nstep 2\nstep 3\n"
+
+    assert reviewing["current_state"] == "reviewing"
+    assert [s["step"] for s in reviewing["execution_results"]["steps"]] == [1, 2, 3]
+    assert reviewing["execution_success"] == 1
+
+    assert final["current_state"] == "completed"
+    assert [p["session_id"] for p in fakes.rti.sent] == [sid]
+    assert workflow_checkpoints.load(sid, "execution") == []
+
+
+def test_lease_is_exclusive_until_it_expires():
+    sid = str(uuid.uuid4())
+    first, second = WorkflowLeaseStore(owner="worker-a"), WorkflowLeaseStore(owner="worker-b")
+
+    assert first.claim(sid) and first.claim(sid)
+    assert not second.claim(sid) and not second.renew(sid)
+    second.release(sid)  # not the holder: no effect
+    assert not second.claim(sid)
+
+    _expire_leases()
+    assert second.claim(sid)
+    assert not first.renew(sid)
+    second.release(sid)
+    assert first.claim(sid)
+
+
+def test_two_workers_recovering_one_database_resume_each_session_once(monkeypatch, tmp_path):
+    request = f"Shared-db report {uuid.uuid4()}"
+    fakes = _patch(monkeypatch, tmp_path)
+    db = orchestrator_module.SessionLocal()
+    try:
+        # Left mid-interpretation by a worker that died without a lease row
+        db.add(WorkflowSession(
+            session_id=str(uuid.uuid4()), user_id=USER, original_request=request,
+            current_state=WorkflowState.INTERPRETING,
+            created_at=datetime.utcnow(), updated_at=datetime.utcnow(),
+        ))
+        db.commit()
+    finally:
+        db.close()
+    sid = _find_session(request)["session_id"]
+
+    workers = [
+        WorkflowOrchestrator(engine=WorkflowEngine(), event_bus=WorkflowEventBus(), leases=WorkflowLeaseStore(owner=name))
+        for name in ("worker-a", "worker-b")
+    ]
+    start = threading.Barrier(len(workers))
+    resumed = {}
+
+    def _recover(orch):
+        async def _run():
+            start.wait()
+            resumed[orch.leases.owner] = await orch.recover_workflows()
+            if orch.engine.is_running(sid):
+                await orch.engine.wait(sid, timeout=10)
+        asyncio.run(_run())
+
+    threads = [threading.Thread(target=_recover, args=(orch,)) for orch in workers]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(len(r) for r in resumed.values()) == [0, 1]
+    assert fakes.interpreter.calls == [request]
+    assert [step for session, step in fakes.executor.calls if session == sid] == [1, 2, 3]
+    assert _find_session(request)["current_state"] == "reviewing"
+
+    # The stage chain ended, so its lease is free for whichever worker takes the review
+    assert WorkflowLeaseStore(owner="worker-c").claim(sid)
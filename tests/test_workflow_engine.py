@@ -0,0 +1,279 @@
+"""
+Copyright (c) 2025 LALO AI SYSTEMS, LLC. All rights reserved.
+
+PROPRIETARY AND CONFIDENTIAL
+
+This file is part of LALO AI Platform and is protected by copyright law.
+Unauthorized copying, modification, distribution, or use of this software,
+via any medium, is strictly prohibited without the express written permission
+of LALO AI SYSTEMS, LLC.
+"""
+
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import core.services.workflow_orchestrator as orchestrator_module
+from core.services.action_planner import ActionPlan
+from core.services.tool_executor import ExecutionResult
+from core.services.workflow_engine import StageInProgressError, WorkflowEngine, WorkflowEventBus
+from core.services.workflow_orchestrator import WorkflowOrchestrator
+
+pytestmark = pytest.mark.usefixtures("workflow_db")
+
+USER = "engine-test@example.com"
+
+
+class FakeInterpreter:
+    def __init__(self, delay=0.2, confidence=0.95, fail=False):
+        self.delay = delay
+        self.confidence = confidence
+        self.fail = fail
+
+    async def interpret(self, user_request, user_id):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("model unavailable")
+        return SimpleNamespace(
+            interpreted_intent=f"intent: {user_request}",
+            confidence_score=self.confidence,
+            reasoning_trace=["read request"],
+            suggested_clarifications=[],
+            feedback_required=self.confidence < 0.8,
+        )
+
+
+    async def refine_with_feedback(self, original_request, user_feedback, user_id):
+        await asyncio.sleep(self.delay)
+        return SimpleNamespace(
+            interpreted_intent=f"intent: {original_request} ({user_feedback})",
+            confidence_score=0.9,
+            reasoning_trace=["applied clarification"],
+        )
+
+
+class FakePlanner:
+    async def create_plan(self, interpreted_intent, user_id, **kwargs):
+        await asyncio.sleep(0.01)
+        return ActionPlan(
+            steps=[{"step": 1, "action": "search", "tool": "web_search"}],
+            confidence=0.9, iterations=1, critiques=[], retrieved_examples=[], metadata={},
+        )
+
+
+class FakeExecutor:
+    async def execute_plan(self, action_plan, user_id, workflow_session_id, human_approval=True, **kwargs):
+        await asyncio.sleep(0.01)
+        return [ExecutionResult(success=True, step_number=1, tool_name="web_search", tool_output="ok", verification_passed=True)]
+
+
+class FakeRTI:
+    async def add_plan_examples(self, plans):
+        return {"added": len(plans)}
+
+
+def _orchestrator(monkeypatch, interpreter=None):
+    monkeypatch.setattr(orchestrator_module, "semantic_interpreter", interpreter or FakeInterpreter())
+    monkeypatch.setattr(orchestrator_module, "action_planner", FakePlanner())
+    monkeypatch.setattr(orchestrator_module, "tool_executor", FakeExecutor())
+    monkeypatch.setattr(orchestrator_module, "rti_client", FakeRTI())
+    return WorkflowOrchestrator(engine=WorkflowEngine(), event_bus=WorkflowEventBus())
+
+
+def test_start_returns_immediately_and_streams_transitions(monkeypatch):
+    orch = _orchestrator(monkeypatch, FakeInterpreter(delay=1.0))
+
+    async def _run():
+        started = time.monotonic()
+        session = await orch.start_workflow("Summarize quarterly sales", USER)
+        start_latency = time.monotonic() - started
+        sid = session["session_id"]
+
+        events = []
+
+        async def _consume():
+            async for event in orch.event_bus.subscribe(sid):
+                events.append(event)
+                if event["state"] == "reviewing":
+                    await orch.approve_results(sid, USER, rating=0.9, feedback="great")
+
+        await asyncio.wait_for(_consume(), timeout=5)
+        return session, start_latency, events, sid
+
+    session, start_latency, events, sid = asyncio.run(_run())
+
+    assert session["current_state"] == "interpreting"
+    assert start_latency < 0.5  # interpretation alone takes 1 s
+    states = [e["state"] for e in events]
+    assert states[0] == "interpreting"
+    assert states[-1] == "completed"
+    for expected in ("planning", "executing", "reviewing", "finalizing"):
+        assert expected in states
+
+    # Terminal sessions are evicted from in-memory state
+    assert sid not in orch.active_workflows
+    assert orch.event_bus.latest(sid) is None
+    assert not orch.engine.is_running(sid)
+
+
+def test_stage_failure_moves_session_to_error(monkeypatch):
+    orch = _orchestrator(monkeypatch, FakeInterpreter(delay=0.01, fail=True))
+
+    async def _run():
+        session = await orch.start_workflow("Break please", USER)
+        await orch.engine.wait(session["session_id"], timeout=5)
+        return await orch.get_workflow_status(session["session_id"])
+
+    status = asyncio.run(_run())
+    assert status["current_state"] == "error"
+    assert "model unavailable" in status["error_message"]
+
+
+def test_approvals_wait_for_running_stage(monkeypatch):
+    orch = _orchestrator(monkeypatch, FakeInterpreter(delay=0.1, confidence=0.5))
+
+    async def _run():
+        session = await orch.start_workflow("Ambiguous ask", USER)
+        sid = session["session_id"]
+        early = await orch.advance_workflow(sid, USER)  # interpretation still running
+        with pytest.raises(StageInProgressError):
+            await orch.approve_interpretation(sid, USER)
+        with pytest.raises(StageInProgressError):
+            await orch.submit_feedback(sid, USER, "approve")
+        await orch.engine.wait(sid, timeout=5)
+        paused = await orch.get_workflow_status(sid)
+        approved = await orch.approve_interpretation(sid, USER)
+        await orch.engine.wait(sid, timeout=5)
+        return early, paused, approved, await orch.get_workflow_status(sid)
+
+    early, paused, approved, final = asyncio.run(_run())
+    assert early["interpreted_intent"] is None
+    assert paused["current_state"] == "interpreting" and paused["interpretation_approved"] == 0
+    assert approved["current_state"] == "planning"
+    assert final["current_state"] == "reviewing"
+
+
+def test_clarified_approval_refines_in_the_background(monkeypatch):
+    orch = _orchestrator(monkeypatch, FakeInterpreter(delay=0.01, confidence=0.5))
+
+    async def _run():
+        session = await orch.start_workflow("Ambiguous ask", USER)
+        sid = session["session_id"]
+        await orch.engine.wait(sid, timeout=5)
+        monkeypatch.setattr(orchestrator_module.semantic_interpreter, "delay", 1.0)
+        started = time.monotonic()
+        approved = await orch.approve_interpretation(sid, USER, feedback="only Q3")
+        latency = time.monotonic() - started
+        await orch.engine.wait(sid, timeout=5)
+        return approved, latency, await orch.get_workflow_status(sid)
+
+    approved, latency, final = asyncio.run(_run())
+    assert latency < 0.5  # refinement alone takes 1 s
+    assert approved["current_state"] == "interpreting" and approved["interpretation_approved"] == 1
+    assert final["interpreted_intent"] == "intent: Ambiguous ask (only Q3)"
+    assert final["current_state"] == "reviewing"
+
+
+def test_event_stream_endpoint_sends_current_status(client, monkeypatch):
+    orch = orchestrator_module.workflow_orchestrator
+    monkeypatch.setattr(orchestrator_module, "semantic_interpreter", FakeInterpreter(delay=0, fail=True))
+
+    async def _start():
+        session = await orch.start_workflow("Stream me", USER)
+        await orch.engine.wait(session["session_id"], timeout=5)
+        return session["session_id"]
+
+    sid = asyncio.run(_start())
+    with client.stream("GET", f"/api/workflow/{sid}/events") as resp:
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/event-stream")
+        lines = [line for line in resp.iter_lines() if line.startswith("data: ")]
+
+    first = json.loads(lines[0][len("data: "):])
+    assert first["type"] == "status" and first["state"] == "error"
+    assert client.get("/api/workflow/does-not-exist/events").status_code == 404
+
+
+
+def test_approval_during_a_running_stage_is_a_conflict(client, monkeypatch):
+    orch = orchestrator_module.workflow_orchestrator
+    monkeypatch.setattr(orch.engine, "is_running", lambda session_id: True)
+
+    for path in ("approve_plan", "approve_results"):
+        assert client.post(f"/api/workflow/busy-session/{path}").status_code == 409
+
+def test_approval_is_a_conflict_while_another_worker_holds_the_session(client):
+    from datetime import datetime
+
+    from core.database import WorkflowSession, WorkflowState
+    from core.services.workflow_leases import WorkflowLeaseStore
+
+    db = orchestrator_module.SessionLocal()
+    try:
+        db.add(WorkflowSession(
+            session_id="busy-elsewhere", user_id=USER, original_request="Remote",
+            current_state=WorkflowState.REVIEWING, created_at=datetime.utcnow(), updated_at=datetime.utcnow(),
+        ))
+        db.commit()
+    finally:
+        db.close()
+    # Another process sharing the database is running this session's stage
+    assert WorkflowLeaseStore(owner="other-worker").claim("busy-elsewhere")
+
+    for path in ("approve_plan", "approve_results", "advance"):
+        assert client.post(f"/api/workflow/busy-elsewhere/{path}").status_code == 409
+
+
+def test_event_stream_follows_a_stage_running_in_another_worker(client, monkeypatch):
+    import core.routes.workflow_routes as routes_module
+
+    # Row as another worker moves it along; nothing is published in this process
+    rows = iter([
+        {"session_id": "remote", "current_state": "executing", "updated_at": "t1"},
+        {"session_id": "remote", "current_state": "executing", "updated_at": "t1"},
+        {"session_id": "remote", "current_state": "reviewing", "updated_at": "t2"},
+        {"session_id": "remote", "current_state": "finalizing", "updated_at": "t3"},
+        {"session_id": "remote", "current_state": "completed", "updated_at": "t4"},
+    ])
+
+    async def status_from_database(session_id):
+        return next(rows)
+
+    monkeypatch.setattr(routes_module, "EVENT_STREAM_POLL_SECONDS", 0.01)
+    monkeypatch.setattr(routes_module.workflow_orchestrator, "get_workflow_status", status_from_database)
+    with client.stream("GET", "/api/workflow/remote/events") as resp:
+        states = [json.loads(line[len("data: "):])["state"] for line in resp.iter_lines() if line.startswith("data: ")]
+
+    assert states == ["executing", "reviewing", "finalizing", "completed"]
+
+
+def test_event_bus_retains_latest_for_a_bounded_number_of_sessions():
+    bus = WorkflowEventBus(max_retained=3)
+    for n in range(5):
+        bus.publish(f"s{n}", {"state": "reviewing"})
+    bus.publish("s2", {"state": "reviewing", "type": "feedback"})
+    bus.publish("s5", {"state": "planning"})
+
+    assert [sid for sid in ("s0", "s1", "s2", "s3", "s4", "s5") if bus.latest(sid)] == ["s2", "s4", "s5"]
+    assert bus.get_stats()["sessions_tracked"] == 3
+
+
+def test_event_stream_sees_completion_during_status_read(client, monkeypatch):
+    import core.routes.workflow_routes as routes_module
+
+    bus = routes_module.workflow_event_bus
+
+    async def status_racing_completion(session_id):
+        # The workflow finishes while the route reads the (now stale) status
+        bus.publish(session_id, {"type": "transition", "state": "completed"})
+        return {"session_id": session_id, "current_state": "finalizing"}
+
+    monkeypatch.setattr(routes_module.workflow_orchestrator, "get_workflow_status", status_racing_completion)
+    with client.stream("GET", "/api/workflow/racy-session/events") as resp:
+        states = [json.loads(line[len("data: "):])["state"] for line in resp.iter_lines() if line.startswith("data: ")]
+
+    assert states == ["finalizing", "completed"]
+    assert "racy-session" not in bus._subscribers
@@ -4,7 +4,8 @@
 # Uses TF-IDF to embed text and cosine similarity to retrieve closest matches.
 # In production, replace with FAISS / Chroma / Weaviate for persistence & scale.
 
-from typing import List, Tuple
+from typing import List, Optional, Tuple
+import asyncio
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
@@ -34,6 +35,87 @@ class VectorStore:
         results = [(self.documents[i], float(similarities[i])) for i in ranked_indices]
         return results
 
+    def query_batch(self, texts: List[str], top_k: int = 1) -> List[List[Tuple[str, float]]]:
+        """
+        Retrieve top_k matches for several queries with one matrix product.
+        Returns one result list per input text, in order.
+        """
+        if not self.documents or not texts:
+            return [[] for _ in texts]
+
+        query_vecs = self.vectorizer.transform(texts)
+        similarities = cosine_similarity(query_vecs, self.doc_vectors)
+        results = []
+        for row in similarities:
+            ranked_indices = row.argsort()[::-1][:top_k]
+            results.append([(self.documents[i], float(row[i])) for i in ranked_indices])
+        return results
+
+
+class QueryBatcher:
+    """
+    Coalesces concurrent VectorStore queries into batched lookups.
+
+    Callers await query(); requests arriving within max_wait_ms of each other
+    (up to max_batch) are answered by a single query_batch() call, run in a
+    worker thread so the event loop never blocks on the similarity math.
+    """
+
+    def __init__(self, store: "VectorStore", max_batch: int = 32, max_wait_ms: float = 5.0):
+        self.store = store
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self.batches = 0
+        self.queries = 0
+
+    async def query(self, text: str, top_k: int = 1) -> List[Tuple[str, float]]:
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, top_k, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            texts = [text for text, _, _ in batch]
+            top_k = max(k for _, k, _ in batch)
+            try:
+                results = await asyncio.to_thread(self.store.query_batch, texts, top_k)
+            except Exception as e:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.queries += len(batch)
+            for (_, k, future), matches in zip(batch, results):
+                if not future.done():
+                    future.set_result(matches[:k])
+
+    def get_stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "queries": self.queries,
+            "avg_batch_size": (self.queries / self.batches) if self.batches else 0.0,
+        }
+
 
 # Example usage for standalone testing
 if __name__ == "__main__":